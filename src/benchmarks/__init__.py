@@ -0,0 +1,25 @@
+"""Benchmarks for the data-structures package.
+
+Modules
+-------
+
+    bench_queues:
+        Throughput of the Queue class for growing amounts of items.
+
+    bench_concurrent:
+        Throughput of the ConcurrentQueue class with many threads.
+
+    bench_shared:
+        Throughput of the SharedNumberQueue class between processes.
+
+    bench_segmented:
+        Push latency and memory after drain of the SegmentedStack.
+
+    bench_suite:
+        Throughput, scaling and memory of the stacks, queues, deques
+        and elements next to the standard library, with regression
+        checks.
+
+    results:
+        Storage of benchmark results as JSON and comparison of runs.
+"""
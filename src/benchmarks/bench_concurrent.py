@@ -0,0 +1,104 @@
+"""Benchmarks for the data_structures.queues.ConcurrentQueue class.
+
+Compares the throughput of ConcurrentQueue with queue.Queue and
+collections.deque, with half of the threads producing and the other
+half consuming items.
+
+Run it from the src directory with:
+
+    python -m benchmarks.bench_concurrent
+"""
+
+from collections import deque
+from queue import Queue as StdQueue
+from threading import Thread
+from time import perf_counter
+from typing import Callable, Iterable, NoReturn, Tuple
+from data_structures.queues import ConcurrentQueue
+
+THREADS = (8, 16, 32)
+N_ITEMS = 200_000
+MAXSIZE = 1024
+STOP = None
+
+
+def _concurrent_queue() -> Tuple[Callable, Callable]:
+    queue = ConcurrentQueue(maxsize=MAXSIZE)
+    return queue.push, queue.pop
+
+
+def _std_queue() -> Tuple[Callable, Callable]:
+    queue = StdQueue(maxsize=MAXSIZE)
+    return queue.put, queue.get
+
+
+def _deque() -> Tuple[Callable, Callable]:
+    # unbounded and non-blocking, consumers spin when it's empty
+    queue = deque()
+
+    def pop():
+        while True:
+            try:
+                return queue.popleft()
+            except IndexError:
+                pass
+
+    return queue.append, pop
+
+
+IMPLEMENTATIONS = {'ConcurrentQueue': _concurrent_queue,
+                   'queue.Queue': _std_queue,
+                   'collections.deque': _deque}
+
+
+def bench_threads(factory: Callable[[], Tuple[Callable, Callable]],
+                  n_threads: int, n_items: int = N_ITEMS) -> float:
+    """Moves n_items from producer threads to consumer threads.
+
+    Returns
+    -------
+    throughput: float
+        Items per second.
+    """
+
+    push, pop = factory()
+    n_producers = n_threads // 2
+    n_consumers = n_threads - n_producers
+    per_producer = n_items // n_producers
+
+    def produce():
+        for index in range(per_producer):
+            push(index)
+
+    def consume():
+        while pop() is not STOP:
+            pass
+
+    producers = [Thread(target=produce) for _ in range(n_producers)]
+    consumers = [Thread(target=consume) for _ in range(n_consumers)]
+    start = perf_counter()
+    for thread in producers + consumers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    for _ in consumers:
+        push(STOP)
+    for thread in consumers:
+        thread.join()
+    elapsed = perf_counter() - start
+
+    return per_producer * n_producers / elapsed
+
+
+def main(threads: Iterable[int] = THREADS) -> NoReturn:
+    """Prints the throughput of each implementation."""
+
+    for n_threads in threads:
+        for name, factory in IMPLEMENTATIONS.items():
+            throughput = bench_threads(factory, n_threads)
+            print(f"{n_threads:>3} threads, {name:>17}: "
+                  f"{throughput:12,.0f} items/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Benchmarks for the data_structures.queues module.
+
+The time per operation of push, pop and peak should not grow with the
+amount of items in the queue, since each item is moved from the input
+stack to the output stack at most once.
+
+Run it from the src directory with:
+
+    python -m benchmarks.bench_queues
+"""
+
+from time import perf_counter
+from typing import Dict, Iterable, NoReturn
+from data_structures.queues import Queue
+
+SIZES = (10**3, 10**4, 10**5, 10**6)
+
+
+def bench_push_then_pop(n_items: int) -> Dict[str, float]:
+    """Pushes n_items to a queue, then peaks and pops all of them.
+
+    Returns
+    -------
+    timings: dict
+        Nanoseconds per push, per peak and per pop.
+    """
+
+    queue = Queue()
+    start = perf_counter()
+    for index in range(n_items):
+        queue.push(index)
+    push_time = perf_counter() - start
+
+    start = perf_counter()
+    for _ in range(n_items):
+        queue.peak()
+    peak_time = perf_counter() - start
+
+    start = perf_counter()
+    for _ in range(n_items):
+        queue.pop()
+    pop_time = perf_counter() - start
+
+    return {'push': push_time / n_items * 1e9,
+            'peak': peak_time / n_items * 1e9,
+            'pop': pop_time / n_items * 1e9}
+
+
+def bench_interleaved(n_items: int, backlog: int = 1000) -> Dict[str, float]:
+    """Producer/consumer pattern, keeping a backlog of items queued.
+
+    Returns
+    -------
+    timings: dict
+        Nanoseconds per push/pop pair.
+    """
+
+    queue = Queue()
+    for index in range(backlog):
+        queue.push(index)
+    start = perf_counter()
+    for index in range(n_items):
+        queue.push(index)
+        queue.pop()
+    elapsed = perf_counter() - start
+
+    return {'push_pop': elapsed / n_items * 1e9}
+
+
+def main(sizes: Iterable[int] = SIZES) -> NoReturn:
+    """Prints the time per operation for each size."""
+
+    for n_items in sizes:
+        timings = bench_push_then_pop(n_items)
+        timings.update(bench_interleaved(n_items, backlog=n_items))
+        row = ", ".join(f"{name}: {value:7.1f} ns"
+                        for name, value in timings.items())
+        print(f"n = {n_items:>9}: {row}")
+
+
+if __name__ == '__main__':
+    main()
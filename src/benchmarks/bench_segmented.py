@@ -0,0 +1,77 @@
+"""Benchmarks for the data_structures.stacks.SegmentedStack class.
+
+Compares Stack and SegmentedStack on the latency of single pushes
+(median, p99 and worst case) and on the memory still allocated after
+a burst of items is drained.
+
+Run it from the src directory with:
+
+    python -m benchmarks.bench_segmented [n_items]
+"""
+
+import gc
+import sys
+import tracemalloc
+from time import perf_counter_ns
+from typing import Callable, Dict, NoReturn
+from data_structures.stacks import Stack, SegmentedStack
+
+N_ITEMS = 10**6
+
+
+def bench_push_latency(factory: Callable[[], Stack],
+                       n_items: int) -> Dict[str, float]:
+    """Measures every push of n_items, in nanoseconds.
+
+    The garbage collector is disabled while measuring, so its pauses
+    aren't attributed to the pushes.
+    """
+
+    stack = factory()
+    latencies = [0] * n_items
+    gc.disable()
+    try:
+        for index in range(n_items):
+            start = perf_counter_ns()
+            stack.push(index)
+            latencies[index] = perf_counter_ns() - start
+    finally:
+        gc.enable()
+    latencies.sort()
+    return {'p50': latencies[n_items // 2],
+            'p99': latencies[int(n_items * 0.99)],
+            'max': latencies[-1]}
+
+
+def bench_memory_after_drain(factory: Callable[[], Stack],
+                             n_items: int) -> Dict[str, float]:
+    """Memory allocated at the peak of a burst and after popping it."""
+
+    tracemalloc.start()
+    stack = factory()
+    for index in range(n_items):
+        stack.push(index)
+    peak = tracemalloc.get_traced_memory()[0]
+    for _ in range(n_items):
+        stack.pop()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {'peak MiB': peak / 2**20, 'after drain MiB': after / 2**20}
+
+
+IMPLEMENTATIONS = {'Stack': Stack, 'SegmentedStack': SegmentedStack}
+
+
+def main(n_items: int = N_ITEMS) -> NoReturn:
+    """Prints the push latencies and memory of each implementation."""
+
+    for name, factory in IMPLEMENTATIONS.items():
+        results = bench_push_latency(factory, n_items)
+        results.update(bench_memory_after_drain(factory, n_items))
+        row = ", ".join(f"{key}: {value:,.1f}"
+                        for key, value in results.items())
+        print(f"{name:>15} (ns / MiB): {row}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else N_ITEMS)
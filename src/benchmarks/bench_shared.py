@@ -0,0 +1,99 @@
+"""Benchmarks for the data_structures.queues.SharedNumberQueue class.
+
+Compares moving numbers from a producer process to the main process
+through a SharedNumberQueue (in batches) and through a
+multiprocessing.Queue (one pickled Number at a time, and in batches).
+
+Run it from the src directory with:
+
+    python -m benchmarks.bench_shared [n_items]
+"""
+
+import sys
+from array import array
+from multiprocessing import Process, Queue as ProcessQueue
+from time import perf_counter
+from typing import NoReturn
+from data_structures.elements import Number
+from data_structures.queues import SharedNumberQueue
+
+N_ITEMS = 10**6
+BATCH = 4096
+CAPACITY = 1 << 16
+
+
+def _produce_shared(queue: SharedNumberQueue, n_items: int) -> NoReturn:
+    index = 0
+    while index < n_items:
+        batch = array('d', range(index, min(index + BATCH, n_items)))
+        while True:
+            try:
+                queue.push_many(batch)
+                break
+            except OverflowError:
+                pass
+        index += len(batch)
+    queue.close()
+
+
+def _produce_numbers(queue: ProcessQueue, n_items: int) -> NoReturn:
+    for index in range(n_items):
+        queue.put(Number(float(index)))
+
+
+def _produce_batches(queue: ProcessQueue, n_items: int) -> NoReturn:
+    for index in range(0, n_items, BATCH):
+        queue.put([Number(float(value))
+                   for value in range(index, min(index + BATCH, n_items))])
+
+
+def bench_shared(n_items: int, raw: bool) -> float:
+    """Items per second through a SharedNumberQueue."""
+
+    with SharedNumberQueue(CAPACITY, raw=raw) as queue:
+        producer = Process(target=_produce_shared, args=(queue, n_items))
+        start = perf_counter()
+        producer.start()
+        received = 0
+        while received < n_items:
+            try:
+                received += len(queue.pop_many(BATCH))
+            except IndexError:
+                pass
+        elapsed = perf_counter() - start
+        producer.join()
+    return n_items / elapsed
+
+
+def bench_process_queue(n_items: int, batches: bool) -> float:
+    """Items per second through a multiprocessing.Queue."""
+
+    queue = ProcessQueue()
+    target = _produce_batches if batches else _produce_numbers
+    producer = Process(target=target, args=(queue, n_items))
+    start = perf_counter()
+    producer.start()
+    received = 0
+    while received < n_items:
+        item = queue.get()
+        received += len(item) if batches else 1
+    elapsed = perf_counter() - start
+    producer.join()
+    return n_items / elapsed
+
+
+def main(n_items: int = N_ITEMS) -> NoReturn:
+    """Prints the throughput of each way of moving items."""
+
+    results = {
+        'SharedNumberQueue (raw floats)': bench_shared(n_items, True),
+        'SharedNumberQueue (Numbers)': bench_shared(n_items, False),
+        'multiprocessing.Queue (batches)': bench_process_queue(n_items, True),
+        'multiprocessing.Queue (items)': bench_process_queue(n_items, False),
+    }
+    for name, throughput in results.items():
+        print(f"{name:>32}: {throughput:14,.0f} items/s")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else N_ITEMS)
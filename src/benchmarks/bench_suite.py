@@ -0,0 +1,386 @@
+"""Benchmark suite for the stacks, queues, deques and elements modules.
+
+Each case measures the data structures of the package next to the
+standard library structures they replace (list, collections.deque,
+queue.Queue and heapq), for each amount of items. Times are in
+nanoseconds per operation and memory is in bytes per item, the best
+of a few repetitions is kept.
+
+Run it from the src directory with:
+
+    python -m benchmarks.bench_suite [--sizes N ... | --full]
+        [--cases CASE ...] [--output FILE] [--baseline FILE]
+        [--threshold FRACTION]
+
+--full measures from 10**3 to 10**7 items, it can't be combined with
+--sizes. With --baseline, every metric more than threshold slower than
+in the baseline is flagged, and the exit status is 1.
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from collections import deque
+from functools import partial
+from heapq import heappop, heappush
+from queue import Queue as StdQueue
+from random import Random
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional
+from benchmarks import results
+from data_structures.deques import Deque
+from data_structures.elements import Number, NumberArray
+from data_structures.priority_queues import (PriorityQueue,
+                                             IndexedPriorityQueue)
+from data_structures.queues import (Queue, ConcurrentQueue, SegmentedQueue,
+                                    RingQueue)
+from data_structures.stacks import (Stack, TypeRestrictedStack, NumericStack,
+                                    SegmentedStack)
+
+SIZES = (10**3, 10**4, 10**5, 10**6)
+FULL_SIZES = (10**3, 10**4, 10**5, 10**6, 10**7)
+BACKLOG = 1000
+
+Timings = Dict[str, float]
+
+
+def _per_item(elapsed: float, n_items: int) -> float:
+    return elapsed / n_items * 1e9
+
+
+def _push_peak_pop(push: Callable, peak: Optional[Callable], pop: Callable,
+                   n_items: int) -> Timings:
+    """Pushes n_items, then peaks and pops all of them."""
+
+    start = perf_counter()
+    for index in range(n_items):
+        push(index)
+    timings = {'push': _per_item(perf_counter() - start, n_items)}
+    if peak is not None:
+        start = perf_counter()
+        for _ in range(n_items):
+            peak()
+        timings['peak'] = _per_item(perf_counter() - start, n_items)
+    start = perf_counter()
+    for _ in range(n_items):
+        pop()
+    timings['pop'] = _per_item(perf_counter() - start, n_items)
+    return timings
+
+
+def _prefixed(prefix: str, timings: Timings) -> Timings:
+    return {prefix + '.' + name: value for name, value in timings.items()}
+
+
+def bench_stacks(n_items: int) -> Timings:
+    """Push, peak and pop of each stack, next to a list."""
+
+    timings = {}
+    items = []
+    timings.update(_prefixed('list', _push_peak_pop(
+        items.append, partial(items.__getitem__, -1), items.pop, n_items)))
+    for name, stack in (('Stack', Stack()),
+                        ('NumericStack', NumericStack(raw=True)),
+                        ('SegmentedStack', SegmentedStack())):
+        timings.update(_prefixed(name, _push_peak_pop(
+            stack.push, stack.peak, stack.pop, n_items)))
+    return timings
+
+
+def bench_queues(n_items: int) -> Timings:
+    """Push, peak and pop of each queue, next to deque and queue.Queue."""
+
+    timings = {}
+    items = deque()
+    timings.update(_prefixed('deque', _push_peak_pop(
+        items.append, partial(items.__getitem__, 0), items.popleft,
+        n_items)))
+    std_queue = StdQueue()
+    timings.update(_prefixed('queue.Queue', _push_peak_pop(
+        std_queue.put, None, std_queue.get, n_items)))
+    for name, queue in (('Queue', Queue()),
+                        ('SegmentedQueue', SegmentedQueue()),
+                        ('ConcurrentQueue', ConcurrentQueue()),
+                        ('Deque', Deque()),
+                        ('RingQueue', RingQueue(n_items))):
+        timings.update(_prefixed(name, _push_peak_pop(
+            queue.push, queue.peak, queue.pop, n_items)))
+    return timings
+
+
+def _interleaved(push: Callable, pop: Callable, n_items: int) -> Timings:
+    """Producer/consumer patterns, keeping a backlog of items queued.
+
+    'pairs' alternates single pushes and pops, 'bursts' pushes and then
+    pops BACKLOG items at a time.
+    """
+
+    for index in range(BACKLOG):
+        push(index)
+    start = perf_counter()
+    for index in range(n_items):
+        push(index)
+        pop()
+    timings = {'pairs': _per_item(perf_counter() - start, n_items)}
+    n_bursts = max(1, n_items // BACKLOG)
+    start = perf_counter()
+    for _ in range(n_bursts):
+        for index in range(BACKLOG):
+            push(index)
+        for _ in range(BACKLOG):
+            pop()
+    timings['bursts'] = _per_item(perf_counter() - start,
+                                  n_bursts * BACKLOG)
+    return timings
+
+
+def bench_interleaved(n_items: int) -> Timings:
+    """Interleaved pushes and pops of each queue."""
+
+    timings = {}
+    items = deque()
+    timings.update(_prefixed('deque', _interleaved(
+        items.append, items.popleft, n_items)))
+    std_queue = StdQueue()
+    timings.update(_prefixed('queue.Queue', _interleaved(
+        std_queue.put, std_queue.get, n_items)))
+    for name, queue in (('Queue', Queue()),
+                        ('SegmentedQueue', SegmentedQueue()),
+                        ('ConcurrentQueue', ConcurrentQueue()),
+                        ('Deque', Deque()),
+                        ('RingQueue', RingQueue(2 * BACKLOG))):
+        timings.update(_prefixed(name, _interleaved(
+            queue.push, queue.pop, n_items)))
+    return timings
+
+
+def bench_priority(n_items: int) -> Timings:
+    """Push and pop of random keys, next to heapq on a list."""
+
+    random = Random(0).random
+    keys = [random() for _ in range(n_items)]
+    heap = []
+    timings = {}
+    start = perf_counter()
+    for key in keys:
+        heappush(heap, key)
+    timings['heapq.push'] = _per_item(perf_counter() - start, n_items)
+    start = perf_counter()
+    for _ in range(n_items):
+        heappop(heap)
+    timings['heapq.pop'] = _per_item(perf_counter() - start, n_items)
+    for name, queue in (('PriorityQueue', PriorityQueue()),
+                        ('PriorityQueue(4)', PriorityQueue(arity=4)),
+                        ('IndexedPriorityQueue', IndexedPriorityQueue())):
+        start = perf_counter()
+        for key in keys:
+            queue.push(key)
+        timings[name + '.push'] = _per_item(perf_counter() - start,
+                                            n_items)
+        start = perf_counter()
+        for _ in range(n_items):
+            queue.pop()
+        timings[name + '.pop'] = _per_item(perf_counter() - start, n_items)
+    return timings
+
+
+def bench_validation(n_items: int) -> Timings:
+    """Cost of pushing Numbers to type restricted stacks."""
+
+    numbers = [Number(index) for index in range(n_items)]
+    stacks = [('Stack', Stack())]
+    stacks.extend((f'TypeRestrictedStack({mode})',
+                   TypeRestrictedStack(Number, validation=mode))
+                  for mode in ('strict', 'exact', 'trusted'))
+    timings = {}
+    for name, stack in stacks:
+        push = stack.push
+        start = perf_counter()
+        for number in numbers:
+            push(number)
+        timings[name + '.push'] = _per_item(perf_counter() - start,
+                                            n_items)
+        stack.drain()
+        start = perf_counter()
+        stack.push_many(numbers)
+        timings[name + '.push_many'] = _per_item(perf_counter() - start,
+                                                 n_items)
+    return timings
+
+
+def bench_numbers(n_items: int) -> Timings:
+    """Construction, interning, comparison, hashing and sorting of Numbers.
+
+    Sorting is also measured for floats and for a NumberArray.
+    """
+
+    values = [index + 0.5 for index in range(n_items)]
+    timings = {}
+    start = perf_counter()
+    numbers = [Number(value) for value in values]
+    timings['Number.init'] = _per_item(perf_counter() - start, n_items)
+    start = perf_counter()
+    for index in range(n_items):
+        Number.interned(index % 256)
+    timings['Number.interned'] = _per_item(perf_counter() - start,
+                                           n_items)
+    for name, items in (('float', values), ('Number', numbers)):
+        start = perf_counter()
+        for left, right in zip(items, items[1:]):
+            left < right
+        timings[name + '.lt'] = _per_item(perf_counter() - start, n_items)
+        start = perf_counter()
+        for left, right in zip(items, items[1:]):
+            left == right
+        timings[name + '.eq'] = _per_item(perf_counter() - start, n_items)
+        # the hash of a Number is cached by the first call
+        for metric in ('hash', 'rehash'):
+            start = perf_counter()
+            for item in items:
+                hash(item)
+            timings[name + '.' + metric] = _per_item(perf_counter() - start,
+                                                     n_items)
+    shuffled = numbers[::-1]
+    Random(0).shuffle(shuffled)
+    for name, items in (('float', [number.number for number in shuffled]),
+                        ('Number', shuffled)):
+        start = perf_counter()
+        sorted(items)
+        timings[name + '.sort'] = _per_item(perf_counter() - start, n_items)
+    start = perf_counter()
+    number_array = NumberArray(shuffled)
+    timings['NumberArray.init'] = _per_item(perf_counter() - start,
+                                            n_items)
+    start = perf_counter()
+    number_array.sort()
+    timings['NumberArray.sort'] = _per_item(perf_counter() - start, n_items)
+    return timings
+
+
+def _bytes_per_item(build: Callable[[List[float]], object],
+                    n_items: int) -> float:
+    """Memory allocated to build a structure of n_items new floats."""
+
+    tracemalloc.start()
+    try:
+        structure = build([index + 0.5 for index in range(n_items)])
+        allocated = tracemalloc.get_traced_memory()[0]
+        del structure
+    finally:
+        tracemalloc.stop()
+    return allocated / n_items
+
+
+def _filled(factory: Callable[[], object],
+            wrap: Optional[Callable] = None
+            ) -> Callable[[List[float]], object]:
+    """Builder of a structure filled by pushing each value."""
+
+    def build(values: List[float]) -> object:
+        structure = factory()
+        for value in values:
+            structure.push(wrap(value) if wrap else value)
+        return structure
+
+    return build
+
+
+def bench_memory(n_items: int) -> Timings:
+    """Bytes per item, including the item itself."""
+
+    builders = {
+        'list[float]': list,
+        'deque[float]': deque,
+        'list[Number]': lambda values: [Number(value) for value in values],
+        'Stack[float]': _filled(Stack),
+        'Stack[Number]': _filled(Stack, Number),
+        'NumericStack': _filled(NumericStack, Number),
+        'SegmentedStack[float]': _filled(SegmentedStack),
+        'Queue[float]': _filled(Queue),
+    }
+    return {name + '.bytes': _bytes_per_item(build, n_items)
+            for name, build in builders.items()}
+
+
+CASES = {'stacks': bench_stacks,
+         'queues': bench_queues,
+         'interleaved': bench_interleaved,
+         'priority': bench_priority,
+         'validation': bench_validation,
+         'numbers': bench_numbers,
+         'memory': bench_memory}
+
+
+def run(cases: Iterable[str], sizes: Iterable[int],
+        repeat: int = 3) -> results.Results:
+    """Runs the cases for each size, keeping the best of repeat runs.
+
+    The garbage collector is disabled while a case runs, so its pauses
+    aren't attributed to the operations.
+
+    Returns
+    -------
+    results: dict
+        For each metric, named after its case, its structure and its
+        operation, the value for each amount of items.
+    """
+
+    measured = {}
+    for case in cases:
+        for n_items in sizes:
+            # large sizes are slow and stable enough to run once
+            n_runs = repeat if n_items < 10**6 else 1
+            best = {}
+            for _ in range(n_runs):
+                gc.collect()
+                gc.disable()
+                try:
+                    timings = CASES[case](n_items)
+                finally:
+                    gc.enable()
+                for name, value in timings.items():
+                    best[name] = min(value, best.get(name, value))
+            for name, value in best.items():
+                metric = measured.setdefault(case + ':' + name, {})
+                metric[str(n_items)] = value
+            print(f"{case:>12} n = {n_items:>9}: done", file=sys.stderr)
+    return measured
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs the suite, saving and comparing the results if asked to."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sizes = parser.add_mutually_exclusive_group()
+    sizes.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    sizes.add_argument('--full', action='store_true',
+                       help="measure from 10**3 to 10**7 items")
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES),
+                        default=list(CASES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="JSON file for the results")
+    parser.add_argument('--baseline', help="JSON file to compare with")
+    parser.add_argument('--threshold', type=float,
+                        default=results.THRESHOLD)
+    args = parser.parse_args(argv)
+
+    sizes = FULL_SIZES if args.full else args.sizes
+    measured = run(args.cases, sizes, args.repeat)
+    if args.output:
+        run_metadata = results.metadata()
+        run_metadata.update(sizes=list(sizes), repeat=args.repeat)
+        results.save(args.output, measured, run_metadata)
+    if args.baseline:
+        rows = results.compare(results.load(args.baseline), measured,
+                               args.threshold)
+        return 1 if results.report(rows) else 0
+    for metric, values in measured.items():
+        row = ", ".join(f"{n_items}: {value:9.1f}"
+                        for n_items, value in values.items())
+        print(f"{metric:<50} {row}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
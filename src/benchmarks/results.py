@@ -0,0 +1,109 @@
+"""Storage and comparison of benchmark results.
+
+Results are stored as JSON files with the run metadata and, for each
+metric, its value for each amount of items. Every metric is a cost
+(nanoseconds per operation or bytes per item), so lower is better.
+
+Compare two result files from the src directory with:
+
+    python -m benchmarks.results baseline.json current.json [threshold]
+"""
+
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NoReturn, Tuple
+
+# a metric regresses when it's this much slower than the baseline
+THRESHOLD = 0.1
+
+Results = Dict[str, Dict[str, float]]
+
+
+def metadata() -> Dict[str, Any]:
+    """Description of the interpreter and machine running the benchmarks."""
+
+    return {'date': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'system': platform.system()}
+
+
+def save(path: str, results: Results,
+         run_metadata: Dict[str, Any]) -> NoReturn:
+    """Writes the results and their metadata to a JSON file."""
+
+    with open(path, 'w') as file:
+        json.dump({'metadata': run_metadata, 'results': results}, file,
+                  indent=2, sort_keys=True)
+
+
+def load(path: str) -> Results:
+    """Reads the results of a JSON file written by save."""
+
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def compare(baseline: Results, current: Results,
+            threshold: float = THRESHOLD
+            ) -> List[Tuple[str, str, float, float, bool]]:
+    """Compares the metrics measured in both runs.
+
+    Parameters
+    ----------
+    baseline: dict
+        Results of the reference run.
+
+    current: dict
+        Results of the run to check.
+
+    threshold: float, optional
+        Relative increase of a metric that counts as a regression. The
+        default value is THRESHOLD.
+
+    Returns
+    -------
+    rows: list of tuples
+        Metric name, amount of items, baseline value, current value
+        and whether it's a regression, for each metric and amount of
+        items in both runs.
+    """
+
+    rows = []
+    for metric in sorted(baseline.keys() & current.keys()):
+        values = current[metric]
+        for n_items, old_value in baseline[metric].items():
+            if n_items not in values:
+                continue
+            new_value = values[n_items]
+            regression = new_value > old_value * (1 + threshold)
+            rows.append((metric, n_items, old_value, new_value, regression))
+    return rows
+
+
+def report(rows: List[Tuple[str, str, float, float, bool]]) -> int:
+    """Prints the comparison rows and returns the amount of regressions."""
+
+    n_regressions = 0
+    for metric, n_items, old_value, new_value, regression in rows:
+        change = (new_value / old_value - 1) * 100 if old_value else 0.
+        flag = "REGRESSION" if regression else ""
+        n_regressions += regression
+        print(f"{metric:<50} n = {n_items:>9}: {old_value:10.1f} -> "
+              f"{new_value:10.1f} ({change:+6.1f}%) {flag}")
+    return n_regressions
+
+
+def main(argv: List[str]) -> int:
+    """Compares two result files, returns 1 if there are regressions."""
+
+    threshold = float(argv[2]) if len(argv) > 2 else THRESHOLD
+    rows = compare(load(argv[0]), load(argv[1]), threshold)
+    return 1 if report(rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
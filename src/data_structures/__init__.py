@@ -11,6 +11,9 @@ elements:
     Number:
         Immutable real numbers.
 
+    NumberArray:
+        Columnar array of real numbers, wrapped in Numbers on access.
+
 stacks:
     Stack-like data structures.
 
@@ -23,6 +26,18 @@ stacks:
         Stack that only allow instances of a certain class to be
         pushed.
 
+    NumericStack:
+        Compact stack of real numbers, stored as raw doubles.
+
+    AggregateStack:
+        Stack that keeps a running aggregate of its items.
+
+    MinMaxStack:
+        Type restricted stack with constant time minimum and maximum.
+
+    SegmentedStack:
+        Stack stored in fixed-size blocks of items.
+
 queues:
     Queue-like data structures.
 
@@ -30,4 +45,144 @@ queues:
     -------
     Queue:
         Basic queue data structure.
+
+    AggregatingQueue:
+        Queue that keeps a running aggregate of its items.
+
+    SlidingWindow:
+        Aggregating queue that evicts items by count or by age.
+
+    ConcurrentQueue:
+        Thread-safe, optionally bounded, blocking queue.
+
+    SharedNumberQueue:
+        Inter-process ring queue of real numbers in shared memory.
+
+    SegmentedQueue:
+        Queue stored in fixed-size blocks of items.
+
+    RingQueue:
+        Fixed-capacity queue stored in a preallocated circular buffer.
+
+asynchronous:
+    Data structures for asyncio applications.
+
+    Classes
+    -------
+    AsyncStack:
+        Stack with awaitable, optionally bounded, push and pop.
+
+    AsyncQueue:
+        Queue with awaitable, optionally bounded, push and pop.
+
+spilling:
+    Data structures that spill items to disk.
+
+    Classes
+    -------
+    PickleSerializer:
+        Serializes segments of any picklable items.
+
+    NumberSerializer:
+        Serializes segments of real numbers as packed doubles.
+
+    SpillingStack:
+        Stack that keeps its top in memory and spills the rest to disk.
+
+    SpillingQueue:
+        Queue that keeps its ends in memory and spills the rest to disk.
+
+deques:
+    Double-ended data structures.
+
+    Classes
+    -------
+    Deque:
+        Double-ended queue stored in linked fixed-size blocks of items.
+
+priority_queues:
+    Priority-ordered data structures.
+
+    Classes
+    -------
+    PriorityQueue:
+        Min-priority queue implemented as a d-ary heap.
+
+    IndexedPriorityQueue:
+        Priority queue with handles to update or remove pushed items.
+
+persistent:
+    Immutable data structures that share structure between versions.
+
+    Classes
+    -------
+    PersistentStack:
+        Immutable stack where push and pop return new versions.
+
+    PersistentQueue:
+        Immutable queue made of two persistent stacks.
+
+instrumentation:
+    Opt-in instrumentation of stacks and queues.
+
+    Classes
+    -------
+    Metrics:
+        Operation counters, size high-water mark, flushes and latencies.
+
+    PrometheusTextFile:
+        Sink that writes metrics in the Prometheus text format.
+
+    InstrumentedStack:
+        Stack that records its operations.
+
+    InstrumentedTypeRestrictedStack:
+        Type restricted stack that records its operations and failures.
+
+    InstrumentedQueue:
+        Queue that records its operations and flushes.
+
+work_stealing:
+    Work-stealing data structures for parallel task execution.
+
+    Classes
+    -------
+    WorkStealingDeque:
+        Stack whose owner works at the top while thieves steal the bottom.
+
+    Task:
+        Handle of a task spawned in a WorkStealingExecutor.
+
+    WorkStealingExecutor:
+        Pool of worker threads that balance their tasks by stealing.
+
+    ProcessAdapter:
+        Runs functions in a pool of processes, for CPU-bound tasks.
+
+expressions:
+    Arithmetic expressions compiled to programs for a stack machine.
+
+    Classes
+    -------
+    Program:
+        Infix arithmetic expression compiled to stack machine op-codes.
+
+pipeline:
+    Streaming pipelines of stages connected by bounded queues.
+
+    Classes
+    -------
+    Stage:
+        Function applied to every item of a pipeline by its own workers.
+
+    Pipeline:
+        Stages that process a stream of items concurrently, in sequence.
+
+graphs:
+    Graphs stored in compact arrays, with iterative traversals.
+
+    Classes
+    -------
+    Graph:
+        Directed graph stored in compressed sparse row arrays.
 """
@@ -0,0 +1,468 @@
+"""Data structures for asyncio applications.
+
+Classes
+-------
+
+AsyncStack:
+    Stack with awaitable, optionally bounded, push and pop.
+
+AsyncQueue:
+    Queue with awaitable, optionally bounded, push and pop.
+"""
+
+__all__ = ['AsyncStack', 'AsyncQueue']
+
+from asyncio import Future, TimeoutError, get_running_loop, wait_for
+from collections import deque
+from time import monotonic
+from typing import (Any, Deque, Iterable, Iterator, List, NoReturn,
+                    Optional, Tuple)
+from data_structures.queues import Queue
+from data_structures.stacks import Stack
+
+
+class _AsyncMixin:
+    """Awaitable push and pop on top of a synchronous data structure.
+
+    The storage and the order of the items are given by the base data
+    structure (Stack or Queue), this class only suspends the callers
+    while the structure is full or empty. Suspended callers wait on
+    futures, with the amount of items they wait for. Only one waiting
+    pop is woken up per item pushed, and after a pop every waiting
+    push whose items fit is woken up, so a large push that still
+    doesn't fit can't hold back a smaller one.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None) -> NoReturn:
+        """Initializes the storage and the queues of waiting callers.
+
+        Parameters
+        ----------
+        maxsize: int, optional
+            Maximum amount of items. The default value is None, for no
+            limit.
+
+        Raises
+        ------
+        AssertionError:
+            If maxsize is not positive.
+        """
+
+        assert maxsize is None or maxsize > 0, "maxsize must be positive."
+        super().__init__()
+        self.__maxsize = maxsize
+        self.__closed = False
+        self._getters: Deque[Tuple[Future, int]] = deque()
+        self._putters: Deque[Tuple[Future, int]] = deque()
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """Maximum amount of items, None for no limit."""
+
+        return self.__maxsize
+
+    @property
+    def closed(self) -> bool:
+        """True once the structure is closed for new items."""
+
+        return self.__closed
+
+    def _empty_error(self) -> IndexError:
+        return IndexError("Empty " + self.__class__.__name__)
+
+    def _full_error(self) -> OverflowError:
+        return OverflowError("Full " + self.__class__.__name__)
+
+    def _fits(self, n_items: int) -> bool:
+        """True if n_items can be pushed without exceeding maxsize."""
+
+        return (self.__maxsize is None
+                or self.size() + n_items <= self.__maxsize)
+
+    @staticmethod
+    def _wake(waiters: Deque[Tuple[Future, int]],
+              n_waiters: int = 1) -> NoReturn:
+        """Wakes up to n_waiters waiting callers, skipping cancelled ones."""
+
+        while waiters and n_waiters > 0:
+            waiter, _ = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                n_waiters -= 1
+
+    def _wake_putters(self) -> NoReturn:
+        """Wakes up, in order, every waiting push whose items fit.
+
+        The room taken by each woken push is reserved for it, pushes
+        whose items don't fit keep waiting in their place.
+        """
+
+        if self.__maxsize is None:
+            self._wake(self._putters, len(self._putters))
+            return
+        free = self.__maxsize - self.size()
+        waiting = []
+        for waiter, n_items in self._putters:
+            if waiter.done():
+                continue
+            if n_items <= free:
+                waiter.set_result(None)
+                free -= n_items
+            else:
+                waiting.append((waiter, n_items))
+        self._putters.clear()
+        self._putters.extend(waiting)
+
+    async def _wait(self, waiters: Deque[Tuple[Future, int]],
+                    deadline: Optional[float], n_items: int = 1) -> NoReturn:
+        """Suspends the caller until it's woken up.
+
+        Raises
+        ------
+        TimeoutError:
+            When the caller isn't woken up before the deadline.
+        """
+
+        waiter = get_running_loop().create_future()
+        waiters.append((waiter, n_items))
+        try:
+            if deadline is None:
+                await waiter
+            else:
+                await wait_for(waiter, max(0., deadline - monotonic()))
+        except BaseException:
+            waiter.cancel()
+            try:
+                waiters.remove((waiter, n_items))
+            except ValueError:
+                pass
+            if waiter.done() and not waiter.cancelled():
+                # woken up right before giving up, pass it on
+                if waiters is self._putters:
+                    self._wake_putters()
+                else:
+                    self._wake(waiters)
+            raise
+
+    async def _wait_for_space(self, n_items: int,
+                              timeout: Optional[float]) -> NoReturn:
+        """Suspends the caller until n_items fit.
+
+        Raises
+        ------
+        RuntimeError:
+            When the structure is closed.
+
+        OverflowError:
+            When the items don't fit before the timeout.
+        """
+
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            if self.__closed:
+                raise RuntimeError(self.__class__.__name__ + " is closed")
+            if self._fits(n_items):
+                return
+            try:
+                await self._wait(self._putters, deadline, n_items)
+            except TimeoutError:
+                raise self._full_error()
+
+    async def _wait_for_items(self, timeout: Optional[float]) -> NoReturn:
+        """Suspends the caller until there is at least one item.
+
+        Raises
+        ------
+        IndexError:
+            When there are no items before the timeout, or when the
+            structure is closed and empty.
+        """
+
+        deadline = None if timeout is None else monotonic() + timeout
+        while self.size() == 0:
+            if self.__closed:
+                raise self._empty_error()
+            try:
+                await self._wait(self._getters, deadline)
+            except TimeoutError:
+                raise self._empty_error()
+
+    async def push(self, new_item: Any,
+                   timeout: Optional[float] = None) -> NoReturn:
+        """Push a new item, suspending while the structure is full.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push, could be anything.
+
+        timeout: float, optional
+            Maximum time to wait for space, in seconds. The default
+            value is None, to wait without limit.
+
+        Raises
+        ------
+        OverflowError:
+            When the structure is full until the timeout.
+
+        RuntimeError:
+            When the structure is closed.
+        """
+
+        if not self._fits(1) or self.__closed:
+            await self._wait_for_space(1, timeout)
+        super().push(new_item)
+        if self._getters:
+            self._wake(self._getters)
+
+    async def push_many(self, new_items: Iterable[Any],
+                        timeout: Optional[float] = None) -> NoReturn:
+        """Push several items in order, once there is space for all.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push, could be anything.
+
+        timeout: float, optional
+            Maximum time to wait for space, in seconds. The default
+            value is None, to wait without limit.
+
+        Raises
+        ------
+        ValueError:
+            When there are more items than the maximum size.
+
+        OverflowError:
+            When the items don't fit until the timeout.
+
+        RuntimeError:
+            When the structure is closed.
+        """
+
+        new_items = list(new_items)
+        if self.__maxsize is not None and len(new_items) > self.__maxsize:
+            raise ValueError("More items than the maximum size")
+        await self._wait_for_space(len(new_items), timeout)
+        super().push_many(new_items)
+        if self._getters:
+            self._wake(self._getters, len(new_items))
+
+    async def extend(self, new_items: Iterable[Any],
+                     timeout: Optional[float] = None) -> NoReturn:
+        """Alias of push_many."""
+
+        await self.push_many(new_items, timeout)
+
+    async def pop(self, timeout: Optional[float] = None) -> Any:
+        """Removes the next item and returns it, suspending while empty.
+
+        Parameters
+        ----------
+        timeout: float, optional
+            Maximum time to wait for an item, in seconds. The default
+            value is None, to wait without limit.
+
+        Returns
+        -------
+        item: Any
+            The next item, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the structure is empty until the timeout, or when it's
+            closed and empty.
+        """
+
+        if self.size() == 0:
+            await self._wait_for_items(timeout)
+        item = super().pop()
+        if self._putters:
+            self._wake_putters()
+        return item
+
+    async def pop_many(self, n: int,
+                       timeout: Optional[float] = None) -> List[Any]:
+        """Removes up to n next items and returns them.
+
+        Suspends until there is at least one item, then takes as many
+        items as available, up to n.
+
+        Parameters
+        ----------
+        n: int
+            Maximum amount of items to remove, must be positive.
+
+        timeout: float, optional
+            Maximum time to wait for an item, in seconds. The default
+            value is None, to wait without limit.
+
+        Returns
+        -------
+        items: list
+            Between 1 and n items, in the order they would have been
+            popped one by one.
+
+        Raises
+        ------
+        ValueError:
+            When n is not positive.
+
+        IndexError:
+            When the structure is empty until the timeout, or when it's
+            closed and empty.
+        """
+
+        if n <= 0:
+            raise ValueError("n must be a positive integer")
+        if self.size() == 0:
+            await self._wait_for_items(timeout)
+        items = super().pop_many(min(n, self.size()))
+        if self._putters:
+            self._wake_putters()
+        return items
+
+    def drain(self) -> List[Any]:
+        """Removes all items and returns them, without suspending.
+
+        Returns
+        -------
+        items: list
+            All items, in the order they would have been popped one by
+            one.
+        """
+
+        items = super().drain()
+        if self._putters:
+            self._wake_putters()
+        return items
+
+    def iter_drain(self) -> Iterator[Any]:
+        """Removes the items one by one as they are used, without suspending.
+
+        Yields
+        ------
+        item: Any
+            The next item, until the structure is empty.
+        """
+
+        while self.size() > 0:
+            item = super().pop()
+            if self._putters:
+                self._wake_putters()
+            yield item
+
+    def close(self) -> NoReturn:
+        """Closes the structure for new items.
+
+        Items already pushed can still be popped. Callers suspended in
+        push fail with RuntimeError, and callers suspended in pop fail
+        with IndexError once there are no items left.
+        """
+
+        self.__closed = True
+        self._wake(self._getters, len(self._getters))
+        self._wake(self._putters, len(self._putters))
+
+    def __aiter__(self) -> '_AsyncMixin':
+        return self
+
+    async def __anext__(self) -> Any:
+        """Pops the next item, the iteration stops once closed and empty."""
+
+        try:
+            return await self.pop()
+        except IndexError:
+            if self.__closed:
+                raise StopAsyncIteration
+            raise
+
+
+class AsyncStack(_AsyncMixin, Stack):
+    """Stack with awaitable, optionally bounded, push and pop.
+
+    Items are stored and ordered as in a Stack. Pushing suspends the
+    caller while the stack is full, and popping suspends the caller
+    while the stack is empty. Iterating with async for pops items until
+    the stack is closed and empty.
+
+    Properties
+    ----------
+    maxsize: int or None
+        Read-only maximum amount of items, None for no limit.
+
+    closed: bool
+        True once the stack is closed for new items.
+
+    Methods
+    -------
+    push:
+        Push a new item to the top of the stack, awaitable.
+
+    pop:
+        Removes the top item from the stack and returns it, awaitable.
+
+    peak:
+        Returns the top item of the stack without removing it.
+
+    size:
+        Length of the list of items currently in the stack.
+
+    push_many:
+        Push several items to the top of the stack, awaitable.
+
+    pop_many:
+        Removes up to n top items from the stack, awaitable.
+
+    drain:
+        Removes all items from the stack and returns them.
+
+    close:
+        Closes the stack for new items.
+    """
+
+
+class AsyncQueue(_AsyncMixin, Queue):
+    """Queue with awaitable, optionally bounded, push and pop.
+
+    Items are stored and ordered as in a Queue. Pushing suspends the
+    caller while the queue is full, and popping suspends the caller
+    while the queue is empty. Iterating with async for pops items until
+    the queue is closed and empty.
+
+    Properties
+    ----------
+    maxsize: int or None
+        Read-only maximum amount of items, None for no limit.
+
+    closed: bool
+        True once the queue is closed for new items.
+
+    Methods
+    -------
+    push:
+        Push a new item to the right end of the queue, awaitable.
+
+    pop:
+        Removes the left most item from the queue and returns it,
+        awaitable.
+
+    peak:
+        Returns the left most item of the queue without removing it.
+
+    size:
+        Length of the list of items currently in the queue.
+
+    push_many:
+        Push several items to the right end of the queue, awaitable.
+
+    pop_many:
+        Removes up to n left most items from the queue, awaitable.
+
+    drain:
+        Removes all items from the queue and returns them.
+
+    close:
+        Closes the queue for new items.
+    """
@@ -0,0 +1,809 @@
+"""Double-ended data structures.
+
+Classes
+-------
+
+Deque:
+    Double-ended queue stored in linked fixed-size blocks of items.
+"""
+
+__all__ = ['Deque']
+
+from itertools import islice
+from typing import (Any, BinaryIO, Callable, Dict, Iterable, Iterator, List,
+                    NoReturn, Optional)
+from data_structures.elements import _pack_items, _read_packed, _unpack_items
+
+
+class _Block:
+    """Fixed-size block of items, linked to its neighbour blocks."""
+
+    __slots__ = ('items', 'left', 'right')
+
+    def __init__(self, block_size: int, left: Optional['_Block'] = None,
+                 right: Optional['_Block'] = None) -> NoReturn:
+        self.items = [None] * block_size
+        self.left = left
+        self.right = right
+
+
+class Deque:
+    """Double-ended queue stored in linked fixed-size blocks of items.
+
+    Items can be pushed to and popped from both ends in constant time.
+    They are stored in a doubly linked list of blocks, so a push never
+    copies the items already in the deque, and the blocks are released
+    as the deque drains. A bounded deque discards items from the
+    opposite end when a push makes it longer than maxlen.
+
+    push, pop and peak work on the ends a Queue works on: items are
+    pushed to the right end and popped from the left end. Iterating
+    over a deque yields its items from the left to the right without
+    removing them, and repr shows up to repr_limit items.
+
+    Properties
+    ----------
+    block_size: int
+        Read-only amount of items in each block.
+
+    maxlen: int or None
+        Read-only maximum amount of items, None if it's unbounded.
+
+    repr_limit: int or None
+        Maximum amount of items shown by repr, None to show all of
+        them. It can be set on the class or on each deque.
+
+    Methods
+    -------
+    push_right:
+        Push a new item to the right end of the deque.
+
+    push_left:
+        Push a new item to the left end of the deque.
+
+    pop_right:
+        Removes the right most item from the deque and returns it.
+
+    pop_left:
+        Removes the left most item from the deque and returns it.
+
+    peak_right:
+        Returns the right most item without removing it.
+
+    peak_left:
+        Returns the left most item without removing it.
+
+    push:
+        Alias of push_right.
+
+    pop:
+        Alias of pop_left.
+
+    peak:
+        Alias of peak_left.
+
+    size:
+        Amount of items currently in the deque.
+
+    push_many:
+        Push several items to the right end of the deque, in order.
+
+    push_many_left:
+        Push several items to the left end of the deque, in order.
+
+    extend:
+        Alias of push_many.
+
+    extend_left:
+        Alias of push_many_left.
+
+    pop_many:
+        Removes the n left most items and returns them.
+
+    pop_many_right:
+        Removes the n right most items and returns them.
+
+    drain:
+        Removes all items from the deque and returns them.
+
+    peak_many:
+        Returns the n left most items without removing them.
+
+    rotate:
+        Rotates the items n steps to the right.
+
+    clear:
+        Removes all items from the deque.
+
+    to_bytes:
+        Returns the items of the deque packed as bytes.
+
+    from_bytes:
+        Returns a new deque with the items packed in some bytes.
+
+    dump:
+        Writes the items of the deque packed as bytes to a binary file.
+
+    load:
+        Returns a new deque with the items packed in a binary file.
+    """
+
+    repr_limit = 20
+
+    def __init__(self, items: Iterable[Any] = (),
+                 maxlen: Optional[int] = None,
+                 block_size: int = 64) -> NoReturn:
+        """Initializes the deque with a single empty block.
+
+        Parameters
+        ----------
+        items: iterable, optional
+            Items to push to the right end of the deque, in order. The
+            default value is no items.
+
+        maxlen: int or None, optional
+            Maximum amount of items, None for an unbounded deque. The
+            default value is None.
+
+        block_size: int, optional
+            Amount of items in each block. The default value is 64.
+
+        Raises
+        ------
+        AssertionError:
+            If block_size is lower than 2 or maxlen is negative.
+        """
+
+        assert block_size > 1, "block_size must be greater than 1."
+        assert maxlen is None or maxlen >= 0, "maxlen can't be negative."
+        self._block_size = block_size
+        self.__maxlen = maxlen
+        self._reset()
+        self.push_many(items)
+
+    def _reset(self) -> NoReturn:
+        """Empties the deque, keeping a single block."""
+
+        block = _Block(self._block_size)
+        self._left_block = block
+        self._right_block = block
+        self._recenter()
+        self._size = 0
+
+    def _recenter(self) -> NoReturn:
+        """Crosses the indices at the centre of the only block.
+
+        An empty deque has its left index just right of its right
+        index, so the first push to either end has room in the block.
+        """
+
+        self._right_index = (self._block_size - 1) // 2
+        self._left_index = self._right_index + 1
+
+    @property
+    def block_size(self) -> int:
+        """Amount of items in each block."""
+
+        return self._block_size
+
+    @property
+    def maxlen(self) -> Optional[int]:
+        """Maximum amount of items, None if it's unbounded."""
+
+        return self.__maxlen
+
+    def size(self) -> int:
+        """Amount of items currently in the deque."""
+
+        return self._size
+
+    def _add_right_block(self) -> NoReturn:
+        """Links a new empty block to the right of the right block."""
+
+        block = _Block(self._block_size, left=self._right_block)
+        self._right_block.right = block
+        self._right_block = block
+        self._right_index = -1
+
+    def _add_left_block(self) -> NoReturn:
+        """Links a new empty block to the left of the left block."""
+
+        block = _Block(self._block_size, right=self._left_block)
+        self._left_block.left = block
+        self._left_block = block
+        self._left_index = self._block_size
+
+    def _release_right_block(self) -> NoReturn:
+        """Unlinks the emptied right block, or recenters the last one."""
+
+        if self._size:
+            self._right_block = self._right_block.left
+            self._right_block.right = None
+            self._right_index = self._block_size - 1
+        else:
+            self._recenter()
+
+    def _release_left_block(self) -> NoReturn:
+        """Unlinks the emptied left block, or recenters the last one."""
+
+        if self._size:
+            self._left_block = self._left_block.right
+            self._left_block.left = None
+            self._left_index = 0
+        else:
+            self._recenter()
+
+    def push_right(self, new_item: Any) -> NoReturn:
+        """Push a new item to the right end of the deque.
+
+        If the deque is full, its left most item is discarded.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the right end of the deque, could be
+            anything.
+        """
+
+        if self._right_index == self._block_size - 1:
+            self._add_right_block()
+        self._right_index += 1
+        self._right_block.items[self._right_index] = new_item
+        self._size += 1
+        if self.__maxlen is not None and self._size > self.__maxlen:
+            self.pop_left()
+
+    def push_left(self, new_item: Any) -> NoReturn:
+        """Push a new item to the left end of the deque.
+
+        If the deque is full, its right most item is discarded.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the left end of the deque, could be
+            anything.
+        """
+
+        if self._left_index == 0:
+            self._add_left_block()
+        self._left_index -= 1
+        self._left_block.items[self._left_index] = new_item
+        self._size += 1
+        if self.__maxlen is not None and self._size > self.__maxlen:
+            self.pop_right()
+
+    def pop_right(self) -> Any:
+        """Removes the right most item from the deque and returns it.
+
+        Returns
+        -------
+        right_item: Any
+            The right most item of the deque, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the deque is empty.
+        """
+
+        if self._size == 0:
+            raise IndexError("The Deque is empty!")
+        items = self._right_block.items
+        index = self._right_index
+        right_item = items[index]
+        items[index] = None
+        self._size -= 1
+        if index == 0:
+            self._release_right_block()
+        else:
+            self._right_index = index - 1
+        return right_item
+
+    def pop_left(self) -> Any:
+        """Removes the left most item from the deque and returns it.
+
+        Returns
+        -------
+        left_item: Any
+            The left most item of the deque, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the deque is empty.
+        """
+
+        if self._size == 0:
+            raise IndexError("The Deque is empty!")
+        items = self._left_block.items
+        index = self._left_index
+        left_item = items[index]
+        items[index] = None
+        self._size -= 1
+        if index == self._block_size - 1:
+            self._release_left_block()
+        else:
+            self._left_index = index + 1
+        return left_item
+
+    def peak_right(self) -> Any:
+        """Returns the right most item without removing it.
+
+        Returns
+        -------
+        right_item: Any
+            The right most item of the deque.
+
+        Raises
+        ------
+        IndexError:
+            When the deque is empty.
+        """
+
+        if self._size == 0:
+            raise IndexError("The Deque is empty!")
+        return self._right_block.items[self._right_index]
+
+    def peak_left(self) -> Any:
+        """Returns the left most item without removing it.
+
+        Returns
+        -------
+        left_item: Any
+            The left most item of the deque.
+
+        Raises
+        ------
+        IndexError:
+            When the deque is empty.
+        """
+
+        if self._size == 0:
+            raise IndexError("The Deque is empty!")
+        return self._left_block.items[self._left_index]
+
+    def push(self, new_item: Any) -> NoReturn:
+        """Alias of push_right."""
+
+        self.push_right(new_item)
+
+    def pop(self) -> Any:
+        """Alias of pop_left."""
+
+        return self.pop_left()
+
+    def peak(self) -> Any:
+        """Alias of peak_left."""
+
+        return self.peak_left()
+
+    def _keep_last(self, new_items: List[Any]) -> List[Any]:
+        """The new items that fit, emptying the deque if they fill it."""
+
+        maxlen = self.__maxlen
+        if maxlen is not None and len(new_items) >= maxlen:
+            self._reset()
+            return new_items[len(new_items) - maxlen:]
+        return new_items
+
+    def _discard_excess(self,
+                        pop_many: Callable[[int], List[Any]]) -> NoReturn:
+        """Discards items with pop_many until the deque fits in maxlen."""
+
+        if self.__maxlen is not None and self._size > self.__maxlen:
+            pop_many(self._size - self.__maxlen)
+
+    def push_many(self, new_items: Iterable[Any]) -> NoReturn:
+        """Push several items to the right end of the deque, in order.
+
+        The last item of the iterable ends up at the right end, as if
+        the items were pushed one by one. Items are copied into the
+        blocks by slices.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the right end of the deque, could be
+            anything.
+        """
+
+        new_items = self._keep_last(list(new_items))
+        block_size = self._block_size
+        position = 0
+        while position < len(new_items):
+            if self._right_index == block_size - 1:
+                self._add_right_block()
+            start = self._right_index + 1
+            chunk = min(block_size - start, len(new_items) - position)
+            self._right_block.items[start:start + chunk] = (
+                new_items[position:position + chunk])
+            position += chunk
+            self._right_index = start + chunk - 1
+            self._size += chunk
+        self._discard_excess(self.pop_many)
+
+    def push_many_left(self, new_items: Iterable[Any]) -> NoReturn:
+        """Push several items to the left end of the deque, in order.
+
+        The last item of the iterable ends up at the left end, as if
+        the items were pushed one by one, so their order is reversed.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the left end of the deque, could be
+            anything.
+        """
+
+        new_items = self._keep_last(list(new_items))
+        new_items.reverse()
+        position = len(new_items)
+        while position > 0:
+            if self._left_index == 0:
+                self._add_left_block()
+            end = self._left_index
+            chunk = min(end, position)
+            self._left_block.items[end - chunk:end] = (
+                new_items[position - chunk:position])
+            position -= chunk
+            self._left_index = end - chunk
+            self._size += chunk
+        self._discard_excess(self.pop_many_right)
+
+    def extend(self, new_items: Iterable[Any]) -> NoReturn:
+        """Alias of push_many."""
+
+        self.push_many(new_items)
+
+    def extend_left(self, new_items: Iterable[Any]) -> NoReturn:
+        """Alias of push_many_left."""
+
+        self.push_many_left(new_items)
+
+    def _check_amount(self, n: int) -> NoReturn:
+        """Validates an amount of items to pop or peak.
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the deque has less than n items.
+        """
+
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        if n > self._size:
+            raise IndexError("Not enough items in the Deque")
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n left most items and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        left_items: list
+            The n left most items, in the order they would have been
+            popped one by one (the left most item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the deque has less than n items. The deque is left
+            unchanged.
+        """
+
+        self._check_amount(n)
+        block_size = self._block_size
+        left_items = []
+        while len(left_items) < n:
+            items = self._left_block.items
+            start = self._left_index
+            end = min(block_size, start + n - len(left_items))
+            left_items.extend(items[start:end])
+            items[start:end] = [None] * (end - start)
+            self._size -= end - start
+            if end == block_size:
+                self._release_left_block()
+            else:
+                self._left_index = end
+        return left_items
+
+    def pop_many_right(self, n: int) -> List[Any]:
+        """Removes the n right most items and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        right_items: list
+            The n right most items, in the order they would have been
+            popped one by one (the right most item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the deque has less than n items. The deque is left
+            unchanged.
+        """
+
+        self._check_amount(n)
+        right_items = []
+        while len(right_items) < n:
+            items = self._right_block.items
+            end = self._right_index + 1
+            start = max(0, end - (n - len(right_items)))
+            chunk = items[start:end]
+            chunk.reverse()
+            right_items.extend(chunk)
+            items[start:end] = [None] * (end - start)
+            self._size -= end - start
+            if start == 0:
+                self._release_right_block()
+            else:
+                self._right_index = start - 1
+        return right_items
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the deque and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the deque, from the left to the right.
+        """
+
+        items = list(self)
+        self._reset()
+        return items
+
+    def clear(self) -> NoReturn:
+        """Removes all items from the deque."""
+
+        self._reset()
+
+    def peak_many(self, n: int) -> List[Any]:
+        """Returns the n left most items without removing them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to return.
+
+        Returns
+        -------
+        left_items: list
+            The n left most items, the left most item first.
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the deque has less than n items.
+        """
+
+        self._check_amount(n)
+        return list(islice(self, n))
+
+    def _move_right_to_left(self, n: int) -> NoReturn:
+        """Moves the n right most items to the left end, by slices."""
+
+        block_size = self._block_size
+        while n > 0:
+            if self._left_index == 0:
+                self._add_left_block()
+            source = self._right_block.items
+            end = self._right_index + 1
+            chunk = min(n, end, self._left_index)
+            start = self._left_index - chunk
+            self._left_block.items[start:self._left_index] = (
+                source[end - chunk:end])
+            source[end - chunk:end] = [None] * chunk
+            self._left_index = start
+            n -= chunk
+            if chunk == end:
+                # the right block is emptied, but the deque is not
+                self._right_block = self._right_block.left
+                self._right_block.right = None
+                self._right_index = block_size - 1
+            else:
+                self._right_index = end - chunk - 1
+
+    def _move_left_to_right(self, n: int) -> NoReturn:
+        """Moves the n left most items to the right end, by slices."""
+
+        block_size = self._block_size
+        while n > 0:
+            if self._right_index == block_size - 1:
+                self._add_right_block()
+            source = self._left_block.items
+            start = self._left_index
+            chunk = min(n, block_size - start,
+                        block_size - 1 - self._right_index)
+            end = self._right_index + 1
+            self._right_block.items[end:end + chunk] = (
+                source[start:start + chunk])
+            source[start:start + chunk] = [None] * chunk
+            self._right_index = end + chunk - 1
+            n -= chunk
+            if start + chunk == block_size:
+                # the left block is emptied, but the deque is not
+                self._left_block = self._left_block.right
+                self._left_block.left = None
+                self._left_index = 0
+            else:
+                self._left_index = start + chunk
+
+    def rotate(self, n: int = 1) -> NoReturn:
+        """Rotates the items n steps to the right.
+
+        Rotating one step to the right moves the right most item to
+        the left end, a negative n rotates to the left. Items are
+        moved by slices, in the shortest direction, so it takes
+        constant time per step.
+
+        Parameters
+        ----------
+        n: int, optional
+            Amount of steps to rotate. The default value is 1.
+        """
+
+        size = self._size
+        if size <= 1:
+            return
+        n %= size
+        if n > size // 2:
+            self._move_left_to_right(size - n)
+        else:
+            self._move_right_to_left(n)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterates over the items from the left to the right."""
+
+        block = self._left_block
+        start = self._left_index
+        remaining = self._size
+        while remaining > 0:
+            end = min(self._block_size, start + remaining)
+            yield from block.items[start:end]
+            remaining -= end - start
+            block = block.right
+            start = 0
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Iterates over the items from the right to the left."""
+
+        block = self._right_block
+        end = self._right_index + 1
+        remaining = self._size
+        while remaining > 0:
+            start = max(0, end - remaining)
+            yield from reversed(block.items[start:end])
+            remaining -= end - start
+            block = block.left
+            end = self._block_size
+
+    def __repr__(self) -> str:
+        if self._size == 0:
+            return "Empty " + str(self.__class__.__name__)
+        limit = self.repr_limit
+        shown = self._size if limit is None else min(limit, self._size)
+        print_val = ("Deque Elements: "
+                     + "; ".join([str(item) for item in islice(self, shown)]))
+        if shown < self._size:
+            print_val += "; ... (" + str(self._size - shown) + " more)"
+        return print_val
+
+    def to_bytes(self) -> bytes:
+        """Returns the items of the deque packed as bytes.
+
+        Floats, ints and Numbers are packed as fixed-width values when
+        all the items are of the same kind, any other items are
+        pickled.
+
+        Returns
+        -------
+        data: bytes
+            The items from the left to the right, with a short header.
+        """
+
+        return _pack_items(list(self))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, *args: Any, **kwargs: Any) -> 'Deque':
+        """Returns a new deque with the items packed in some bytes.
+
+        Parameters
+        ----------
+        data: bytes
+            Bytes returned by the to_bytes method of a deque.
+
+        *args, **kwargs:
+            Arguments to initialize the new deque with, after its
+            items.
+
+        Raises
+        ------
+        ValueError:
+            If the bytes were not returned by to_bytes, or are
+            truncated.
+        """
+
+        return cls(_unpack_items(data)[0], *args, **kwargs)
+
+    def dump(self, file: BinaryIO) -> NoReturn:
+        """Writes the items of the deque packed as bytes to a binary file.
+
+        Parameters
+        ----------
+        file: binary file
+            File opened for writing, the items are written at its
+            current position.
+        """
+
+        file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, file: BinaryIO, *args: Any, **kwargs: Any) -> 'Deque':
+        """Returns a new deque with the items packed in a binary file.
+
+        Parameters
+        ----------
+        file: binary file
+            File opened for reading, at the position where dump wrote
+            the items.
+
+        *args, **kwargs:
+            Arguments to initialize the new deque with, after its
+            items.
+
+        Raises
+        ------
+        ValueError:
+            If the file doesn't hold packed items at its position.
+        """
+
+        return cls.from_bytes(_read_packed(file), *args, **kwargs)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """State to pickle, with the items packed instead of the blocks.
+
+        Pickling the linked blocks would recurse once per block.
+        """
+
+        state = {name: value for name, value in self.__dict__.items()
+                 if not name.startswith(('_left_', '_right_'))}
+        state['_items'] = _pack_items(list(self))
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> NoReturn:
+        """Restores a pickled state, pushing the items to new blocks."""
+
+        state = dict(state)
+        items = _unpack_items(state.pop('_items'))[0]
+        self.__dict__.update(state)
+        self._reset()
+        self.push_many(items)
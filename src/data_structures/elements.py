@@ -5,18 +5,39 @@ Classes
 
 Number:
     Immutable real numbers.
+
+NumberArray:
+    Columnar array of real numbers, wrapped in Numbers on access.
 """
 
-__all__ = ['Number']
+__all__ = ['Number', 'NumberArray']
+
+import operator
+import pickle
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from itertools import compress, repeat
+from typing import (Any, BinaryIO, Callable, Iterable, Iterator, List,
+                    NoReturn, Optional, Tuple, Union)
+from functools import lru_cache
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-from typing import NoReturn, Union
-from functools import total_ordering
+INTERNING_CACHE_SIZE = 1024
 
 
-@total_ordering
 class Number:
     """Immutable real numbers.
 
+    Instances are hashable, so they can be used as dict keys or set
+    members, and lightweight: they have no instance __dict__.
+
     Properties
     ----------
     number: float or int
@@ -26,8 +47,28 @@ class Number:
     -------
     copy:
         Returns a copy of the instance (a new instance).
+
+    interned:
+        Returns a shared instance for a value, from a bounded cache.
+
+    set_interning_cache_size:
+        Sets the size of the interning cache, emptying it.
+
+    to_bytes:
+        Returns the instance packed as bytes.
+
+    from_bytes:
+        Returns the instance packed in some bytes.
+
+    dump:
+        Writes the instance packed as bytes to a binary file.
+
+    load:
+        Reads an instance packed as bytes from a binary file.
     """
 
+    __slots__ = ('__number', '__hash')
+
     def __init__(self, number: Union[int, float]) -> NoReturn:
         """Creates an instance of the class Number.
 
@@ -43,10 +84,57 @@ class Number:
             with a value that it's not a real number.
         """
 
-        msg = "Number must be float or string"
-        assert isinstance(number, int) or isinstance(number, float), msg
+        if not isinstance(number, (int, float)):
+            raise AssertionError("Number must be float or int")
         self.__number = number
 
+    @staticmethod
+    def interned(number: Union[int, float]) -> 'Number':
+        """Returns a shared instance for a value, from a bounded cache.
+
+        Repeated values share one instance while they remain in the
+        cache, the least recently used values are evicted first. Ints
+        and floats are cached separately, so Number.interned(1) and
+        Number.interned(1.) are different instances.
+
+        Parameters
+        ----------
+        number: int or float
+            The value for the Number instance.
+
+        Raises
+        ------
+        AssertionError:
+            When the value is not a real number.
+        """
+
+        return _interner(number)
+
+    @staticmethod
+    def set_interning_cache_size(maxsize: int) -> NoReturn:
+        """Sets the size of the interning cache, emptying it.
+
+        Parameters
+        ----------
+        maxsize: int
+            Maximum amount of interned instances kept in the cache.
+        """
+
+        global _interner
+        _interner = lru_cache(maxsize=maxsize, typed=True)(Number)
+
+    @staticmethod
+    def _from_values(values: List[Union[int, float]]) -> List['Number']:
+        """Numbers for trusted real values, skipping the validation.
+
+        The instances are created and filled by C loops, without a
+        Python level call for each value.
+        """
+
+        numbers = list(map(Number.__new__, repeat(Number, len(values))))
+        deque(map(Number.__number.__set__, numbers, values), maxlen=0)
+        return numbers
+
     @property
     def number(self) -> Union[int, float]:
         """Number property of the instance, it's immutable real value.
@@ -59,6 +147,15 @@ class Number:
 
         return self.__number
 
+    def __hash__(self) -> int:
+        """Hash of the value, computed once and cached."""
+
+        try:
+            return self.__hash
+        except AttributeError:
+            self.__hash = hash(self.__number)
+            return self.__hash
+
     def __eq__(self, other: 'Number') -> bool:
         """Verify equality of values for two Number instances.
 
@@ -71,7 +168,47 @@ class Number:
         -------
         bool:
             True if instances should be considered equal for ordering,
-            else False.
+            else False. Objects that are not instances of Number are
+            never equal to a Number.
+        """
+
+        if not isinstance(other, Number):
+            return NotImplemented
+        return self.__number == other.__number
+
+    def __ne__(self, other: 'Number') -> bool:
+        """Verify inequality of values for two Number instances.
+
+        Parameters
+        ----------
+        other: Number
+            Another instance of the Number class.
+
+        Returns
+        -------
+        bool:
+            True if instances have different values, else False.
+            Objects that are not instances of Number are always
+            different from a Number.
+        """
+
+        if not isinstance(other, Number):
+            return NotImplemented
+        return self.__number != other.__number
+
+    def __lt__(self, other: 'Number') -> bool:
+        """Verify strict inequality of values for two Number instances.
+
+        Parameters
+        ----------
+        other: Number
+            Another instance of the Number class.
+
+        Returns
+        -------
+        bool:
+            True if this instance, 'self' has a value strictly lower
+            than the value of the 'other' instance.
 
         Raises
         ------
@@ -80,12 +217,12 @@ class Number:
             Number.
         """
 
-        if not isinstance(other, self.__class__):
+        if not isinstance(other, Number):
             raise NotImplementedError
-        return self.number == other.number
+        return self.__number < other.__number
 
-    def __lt__(self, other: 'Number') -> bool:
-        """Verify equality of values for two Number instances.
+    def __le__(self, other: 'Number') -> bool:
+        """Verify inequality of values for two Number instances.
 
         Parameters
         ----------
@@ -95,7 +232,32 @@ class Number:
         Returns
         -------
         bool:
-            True if this instance, 'self' has a value strictly lower
+            True if this instance, 'self' has a value lower than or
+            equal to the value of the 'other' instance.
+
+        Raises
+        ------
+        NotImplementedError:
+            When comparing with an object that is not an instance of
+            Number.
+        """
+
+        if not isinstance(other, Number):
+            raise NotImplementedError
+        return self.__number <= other.__number
+
+    def __gt__(self, other: 'Number') -> bool:
+        """Verify strict inequality of values for two Number instances.
+
+        Parameters
+        ----------
+        other: Number
+            Another instance of the Number class.
+
+        Returns
+        -------
+        bool:
+            True if this instance, 'self' has a value strictly greater
             than the value of the 'other' instance.
 
         Raises
@@ -105,16 +267,767 @@ class Number:
             Number.
         """
 
-        if not isinstance(other, self.__class__):
+        if not isinstance(other, Number):
+            raise NotImplementedError
+        return self.__number > other.__number
+
+    def __ge__(self, other: 'Number') -> bool:
+        """Verify inequality of values for two Number instances.
+
+        Parameters
+        ----------
+        other: Number
+            Another instance of the Number class.
+
+        Returns
+        -------
+        bool:
+            True if this instance, 'self' has a value greater than or
+            equal to the value of the 'other' instance.
+
+        Raises
+        ------
+        NotImplementedError:
+            When comparing with an object that is not an instance of
+            Number.
+        """
+
+        if not isinstance(other, Number):
             raise NotImplementedError
-        return self.number < other.number
+        return self.__number >= other.__number
 
     def __repr__(self) -> str:
         """Prints the number value of the instance."""
 
-        return f"{self.number}"
+        return f"{self.__number}"
 
     def copy(self) -> 'Number':
         """Returns a copy of the instance (a new instance)."""
 
-        return self.__class__(self.number)
+        return self.__class__(self.__number)
+
+    def __reduce__(self) -> Tuple[type, Tuple[Union[int, float]]]:
+        """Pickles the instance as a call with its value."""
+
+        return self.__class__, (self.__number,)
+
+    def to_bytes(self) -> bytes:
+        """Returns the instance packed as bytes.
+
+        Returns
+        -------
+        data: bytes
+            The value packed in a fixed-width format, see _pack_items.
+        """
+
+        return _pack_items([self])
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'Number':
+        """Returns the instance packed in some bytes.
+
+        Parameters
+        ----------
+        data: bytes
+            Bytes returned by Number.to_bytes.
+
+        Raises
+        ------
+        ValueError:
+            If the bytes don't hold a single Number.
+        """
+
+        items, _ = _unpack_items(data)
+        if len(items) != 1 or not isinstance(items[0], Number):
+            raise ValueError("The data doesn't hold a single Number")
+        return items[0]
+
+    def dump(self, file: BinaryIO) -> NoReturn:
+        """Writes the instance packed as bytes to a binary file."""
+
+        file.write(self.to_bytes())
+
+    @staticmethod
+    def load(file: BinaryIO) -> 'Number':
+        """Reads an instance packed as bytes from a binary file.
+
+        Raises
+        ------
+        ValueError:
+            If the file doesn't hold a single Number at its position.
+        """
+
+        return Number.from_bytes(_read_packed(file))
+
+
+_interner = lru_cache(maxsize=INTERNING_CACHE_SIZE, typed=True)(Number)
+
+
+# packed data: magic, code of the format and size of the payload
+_MAGIC = b'DSv1'
+_HEADER = struct.Struct('<4scQ')
+# lowercase codes hold raw values, uppercase codes hold Numbers
+_TYPECODES = {float: 'd', int: 'q'}
+_PICKLED = b'p'
+
+
+def _pack_items(items: List[Any]) -> bytes:
+    """Packs a list of items as bytes.
+
+    Floats, ints in the int64 range and Numbers of either are packed as
+    fixed-width little-endian values, when all the items are of the
+    same kind. Any other items are pickled.
+    """
+
+    item_types = set(map(type, items))
+    wrapped = item_types == {Number}
+    values = items
+    if wrapped:
+        values = list(map(_number_value, items))
+        item_types = set(map(type, values))
+    if len(item_types) == 1:
+        typecode = _TYPECODES.get(item_types.pop())
+        if typecode is not None:
+            try:
+                return _pack_array(array(typecode, values), wrapped)
+            except OverflowError:
+                pass
+    payload = pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL)
+    return b''.join((_HEADER.pack(_MAGIC, _PICKLED, len(payload)), payload))
+
+
+def _pack_array(values: array, wrapped: bool) -> bytes:
+    """Packs an array of doubles or int64 as bytes.
+
+    The values are unpacked as Numbers if wrapped, else as raw values.
+    """
+
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    code = values.typecode.upper() if wrapped else values.typecode
+    return b''.join((_HEADER.pack(_MAGIC, code.encode(),
+                                  len(values) * values.itemsize),
+                     values.tobytes()))
+
+
+def _parse_header(header: bytes) -> Tuple[bytes, int]:
+    """Code of the format and size of the payload of some packed data.
+
+    Raises
+    ------
+    ValueError:
+        If the header was not written by _pack_items.
+    """
+
+    try:
+        magic, code, size = _HEADER.unpack_from(header)
+    except struct.error:
+        raise ValueError("The data is too short to be packed items")
+    if magic != _MAGIC:
+        raise ValueError("The data is not packed items")
+    return code, size
+
+
+def _read_header(data: bytes) -> Tuple[bytes, memoryview]:
+    """Code of the format and payload of some packed data.
+
+    Raises
+    ------
+    ValueError:
+        If the data was not packed by _pack_items, or is truncated.
+    """
+
+    code, size = _parse_header(data)
+    payload = memoryview(data)[_HEADER.size:_HEADER.size + size]
+    if len(payload) != size:
+        raise ValueError("The packed items are truncated")
+    return code, payload
+
+
+def _unpack_values(code: bytes, payload: memoryview) -> array:
+    """Array with the fixed-width values of a payload."""
+
+    values = array(code.lower().decode())
+    values.frombytes(payload)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _unpack_items(data: bytes) -> Tuple[List[Any], Optional[type]]:
+    """Unpacks a list of items packed by _pack_items.
+
+    Returns
+    -------
+    items: list
+        The packed items.
+
+    item_type: type or None
+        The type of every item when they were packed in a fixed-width
+        format, else None.
+
+    Raises
+    ------
+    ValueError:
+        If the data was not packed by _pack_items, or is truncated.
+    """
+
+    code, payload = _read_header(data)
+    if code == _PICKLED:
+        return pickle.loads(payload), None
+    values = _unpack_values(code, payload).tolist()
+    if code.isupper():
+        return Number._from_values(values), Number
+    return values, float if code == b'd' else int
+
+
+def _read_packed(file: BinaryIO) -> bytes:
+    """Reads the packed data at the position of a binary file.
+
+    Raises
+    ------
+    ValueError:
+        If the file doesn't hold packed data at its position.
+    """
+
+    header = file.read(_HEADER.size)
+    _, size = _parse_header(header)
+    return header + file.read(size)
+
+
+_number_value = Number._Number__number.__get__
+
+
+# buffer formats of real numbers, and the typecodes they're stored as
+_BUFFER_TYPECODES = dict.fromkeys('bBhHiIlLqQ', 'q')
+_BUFFER_TYPECODES.update(f='d', d='d')
+_NATIVE_ORDER = '<' if sys.byteorder == 'little' else '>'
+
+
+class _Mask(list):
+    """Flags returned by the comparisons of arrays stored without NumPy.
+
+    As with NumPy masks, the truth value of a mask with other than one
+    flag is ambiguous, so using it in a condition raises ValueError
+    instead of checking that the mask is not empty.
+    """
+
+    __slots__ = ()
+
+    def __bool__(self) -> bool:
+        if len(self) != 1:
+            raise ValueError("The truth value of a mask with other than "
+                             "one flag is ambiguous, use any() or all()")
+        return bool(self[0])
+
+
+class NumberArray:
+    """Columnar array of real numbers, wrapped in Numbers on access.
+
+    Values are stored in a single column, as doubles or as int64 when
+    all of them are ints, in a NumPy array when NumPy is installed and
+    in an array.array otherwise. They're validated once per distinct
+    type instead of once per value, and Number instances are only
+    created when the array is indexed or iterated over.
+
+    Comparisons with a real number or with another array of the same
+    length are vectorized, and return a mask that selects items when
+    used as an index, as do the indices returned by argsort. As with
+    NumPy, the truth value of a mask with other than one flag is
+    ambiguous and raises ValueError.
+
+    Properties
+    ----------
+    typecode: str
+        Read-only 'd' if values are stored as doubles, 'q' if they're
+        stored as int64.
+
+    values: numpy.ndarray or array.array
+        Read-only column with the raw values, shared with the array.
+
+    use_numpy: bool
+        Read-only flag, True if values are stored in a NumPy array.
+
+    repr_limit: int or None
+        Maximum amount of items shown by repr, None to show all of
+        them. It can be set on the class or on each array.
+
+    Methods
+    -------
+    tolist:
+        Returns the raw values in a list.
+
+    numbers:
+        Returns the values as a list of Number instances.
+
+    argsort:
+        Returns the indices that sort the values, keeping ties in
+        order.
+
+    sort:
+        Sorts the values in place.
+
+    searchsorted:
+        Returns where values should be inserted to keep the order.
+
+    sum:
+        Sum of all the values.
+
+    min:
+        Minimum of the values.
+
+    max:
+        Maximum of the values.
+
+    mean:
+        Arithmetic mean of the values.
+
+    to_bytes:
+        Returns the values packed as bytes.
+
+    from_bytes:
+        Returns a new array with the values packed in some bytes.
+    """
+
+    repr_limit = 20
+
+    def __init__(self, values: Iterable[Union[Number, int, float]] = (),
+                 use_numpy: Optional[bool] = None) -> NoReturn:
+        """Validates the values and stores them in a single column.
+
+        Parameters
+        ----------
+        values: iterable or buffer, optional
+            Numbers, ints and floats, or a one dimensional buffer of
+            real numbers (an array.array, a NumPy array, ...). Ints
+            that don't fit in an int64 are stored as doubles. The
+            default value is no values.
+
+        use_numpy: bool, optional
+            If True, values are stored in a NumPy array, if False in an
+            array.array. The default value is None, to use NumPy when
+            it's installed.
+
+        Raises
+        ------
+        ValueError:
+            If any of the values is not a real number.
+
+        ImportError:
+            If use_numpy is True and NumPy is not installed.
+        """
+
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        elif use_numpy and numpy is None:
+            raise ImportError("NumPy is required when use_numpy is True")
+        self.__use_numpy = use_numpy
+        if isinstance(values, NumberArray):
+            values = values._values
+        try:
+            view = memoryview(values)
+        except TypeError:
+            self._values = self._from_items(list(values))
+        else:
+            self._values = self._from_buffer(view)
+
+    @classmethod
+    def _from_column(cls, values: Any, use_numpy: bool) -> 'NumberArray':
+        """Array with values already validated and stored in a column."""
+
+        number_array = cls.__new__(cls)
+        number_array.__use_numpy = use_numpy
+        number_array._values = values
+        return number_array
+
+    def _column(self, values: List[Union[int, float]], typecode: str) -> Any:
+        """Stores the values in a column of typecode, or of doubles."""
+
+        try:
+            if self.__use_numpy:
+                dtype = numpy.int64 if typecode == 'q' else numpy.float64
+                return numpy.array(values, dtype=dtype)
+            return array(typecode, values)
+        except OverflowError:
+            if typecode == 'd':
+                raise
+            return self._column(values, 'd')
+
+    def _from_items(self, items: List[Any]) -> Any:
+        """Validates the items, once per distinct type, and stores them.
+
+        Raises
+        ------
+        ValueError:
+            If any of the items is not a real number.
+        """
+
+        item_types = set(map(type, items))
+        if not item_types <= {int, float}:
+            for item_type in item_types:
+                if not issubclass(item_type, (Number, int, float)):
+                    raise ValueError("values must be real numbers")
+            if item_types == {Number}:
+                items = list(map(_number_value, items))
+            else:
+                items = [item.number if isinstance(item, Number) else item
+                         for item in items]
+            item_types = set(map(type, items))
+        all_ints = bool(item_types) and all(issubclass(item_type, int)
+                                            for item_type in item_types)
+        return self._column(items, 'q' if all_ints else 'd')
+
+    def _from_buffer(self, view: memoryview) -> Any:
+        """Copies a one dimensional buffer of real numbers.
+
+        Raises
+        ------
+        ValueError:
+            If the buffer doesn't hold real numbers, or it has more
+            than one dimension.
+        """
+
+        code = view.format
+        if code[:1] in ('@', '=', _NATIVE_ORDER):
+            code = code[1:]
+        typecode = _BUFFER_TYPECODES.get(code)
+        if typecode is None or view.ndim != 1:
+            raise ValueError("values must be a one dimensional buffer of "
+                             "real numbers")
+        if code == typecode and not self.__use_numpy:
+            values = array(typecode)
+            values.frombytes(view.tobytes())
+            return values
+        if self.__use_numpy:
+            values = numpy.asarray(view)
+            try:
+                return values.astype(numpy.int64 if typecode == 'q'
+                                     else numpy.float64, casting='safe')
+            except TypeError:
+                return values.astype(numpy.float64)
+        return self._column(view.tolist(), typecode)
+
+    @property
+    def typecode(self) -> str:
+        """'d' if values are stored as doubles, 'q' if stored as int64."""
+
+        if self.__use_numpy:
+            return 'q' if self._values.dtype.kind == 'i' else 'd'
+        return self._values.typecode
+
+    @property
+    def values(self) -> Any:
+        """Column with the raw values, shared with the array."""
+
+        return self._values
+
+    @property
+    def use_numpy(self) -> bool:
+        """True if values are stored in a NumPy array."""
+
+        return self.__use_numpy
+
+    def tolist(self) -> List[Union[int, float]]:
+        """Returns the raw values in a list."""
+
+        return self._values.tolist()
+
+    def numbers(self) -> List[Number]:
+        """Returns the values as a list of Number instances."""
+
+        return Number._from_values(self.tolist())
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index: Any) -> Union[Number, 'NumberArray']:
+        """Number at an index, or a new array with the selected values.
+
+        Parameters
+        ----------
+        index: int, slice, mask or indices
+            An int returns a Number. A slice, a mask returned by a
+            comparison, or a sequence of indices (like the ones
+            returned by argsort) return a new NumberArray.
+
+        Raises
+        ------
+        IndexError:
+            When an index is out of range.
+        """
+
+        if isinstance(index, int) or (self.__use_numpy
+                                      and isinstance(index, numpy.integer)):
+            value = self._values[index]
+            return Number(value.item() if self.__use_numpy else value)
+        values = self._values
+        if self.__use_numpy:
+            if not isinstance(index, slice):
+                index = numpy.asarray(index)
+            return self._from_column(values[index].copy(), True)
+        if not isinstance(index, slice):
+            index = list(index)
+            if index and set(map(type, index)) == {bool}:
+                if len(index) != len(values):
+                    raise IndexError("The mask must have one flag per value")
+                return self._from_column(
+                    array(values.typecode, compress(values, index)), False)
+            return self._from_column(
+                array(values.typecode, map(values.__getitem__, index)), False)
+        return self._from_column(values[index], False)
+
+    def __iter__(self) -> Iterator[Number]:
+        """Iterates over the values, wrapping each one in a Number."""
+
+        if self.__use_numpy:
+            return map(Number, self._values.tolist())
+        return map(Number, self._values)
+
+    def _operand(self, other: Any) -> Any:
+        """Raw value of a real number, or column of an array of values.
+
+        Raises
+        ------
+        ValueError:
+            If other is not a real number or an iterable of them.
+        """
+
+        if isinstance(other, Number):
+            return other.number
+        if isinstance(other, (int, float)):
+            return other
+        if not isinstance(other, NumberArray):
+            try:
+                other = NumberArray(other, self.__use_numpy)
+            except TypeError:
+                raise ValueError("values must be real numbers") from None
+        elif other.__use_numpy != self.__use_numpy:
+            other = NumberArray(other.tolist(), self.__use_numpy)
+        return other._values
+
+    def _compare(self, other: Any,
+                 comparison: Callable[[Any, Any], bool]) -> Any:
+        """Mask comparing every value with a number or array of values.
+
+        NotImplemented is returned when other is not a real number or
+        an iterable of them, so Python falls back to its default
+        comparison (identity for == and !=, a TypeError otherwise).
+
+        Raises
+        ------
+        ValueError:
+            If other is an array of a different length.
+        """
+
+        try:
+            other = self._operand(other)
+        except ValueError:
+            return NotImplemented
+        values = self._values
+        scalar = isinstance(other, (int, float))
+        if not scalar and len(other) != len(values):
+            raise ValueError("Compared arrays must have the same length")
+        if self.__use_numpy:
+            return comparison(values, other)
+        return _Mask(map(comparison, values,
+                         repeat(other) if scalar else other))
+
+    def __eq__(self, other: Any) -> Any:
+        """Mask of the values equal to other."""
+
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other: Any) -> Any:
+        """Mask of the values different from other."""
+
+        return self._compare(other, operator.ne)
+
+    def __lt__(self, other: Any) -> Any:
+        """Mask of the values strictly lower than other."""
+
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other: Any) -> Any:
+        """Mask of the values lower than or equal to other."""
+
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other: Any) -> Any:
+        """Mask of the values strictly greater than other."""
+
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other: Any) -> Any:
+        """Mask of the values greater than or equal to other."""
+
+        return self._compare(other, operator.ge)
+
+    __hash__ = None
+
+    def argsort(self) -> Any:
+        """Returns the indices that sort the values, keeping ties in order.
+
+        Returns
+        -------
+        indices: numpy.ndarray or array.array
+            Indices of the values from the lowest to the highest, an
+            array of int64.
+        """
+
+        values = self._values
+        if self.__use_numpy:
+            return numpy.argsort(values, kind='stable')
+        return array('q', sorted(range(len(values)), key=values.__getitem__))
+
+    def sort(self) -> NoReturn:
+        """Sorts the values in place."""
+
+        if self.__use_numpy:
+            self._values.sort(kind='stable')
+        else:
+            self._values = array(self._values.typecode,
+                                 sorted(self._values))
+
+    def searchsorted(self, value: Any, side: str = 'left') -> Any:
+        """Returns where values should be inserted to keep the order.
+
+        The array must be sorted.
+
+        Parameters
+        ----------
+        value: Number, int, float or iterable of them
+            Value, or values, to insert.
+
+        side: str, optional
+            'left' for the first suitable index, 'right' for the last
+            one. The default value is 'left'.
+
+        Returns
+        -------
+        index: int or array of int64
+            The index for value, or the indices for each of the values.
+
+        Raises
+        ------
+        ValueError:
+            If side is not 'left' or 'right', or a value is not a real
+            number.
+        """
+
+        if side not in ('left', 'right'):
+            raise ValueError("side must be 'left' or 'right'")
+        value = self._operand(value)
+        values = self._values
+        scalar = isinstance(value, (int, float))
+        if self.__use_numpy:
+            indices = numpy.searchsorted(values, value, side=side)
+            return int(indices) if scalar else indices
+        bisect = bisect_left if side == 'left' else bisect_right
+        if scalar:
+            return bisect(values, value)
+        return array('q', [bisect(values, item) for item in value])
+
+    def _reduce(self, name: str) -> Union[int, float]:
+        """Applies a reduction (sum, min or max) over all the values.
+
+        Raises
+        ------
+        IndexError:
+            When the array is empty and the reduction is min or max.
+        """
+
+        values = self._values
+        if len(values) == 0 and name != 'sum':
+            raise IndexError("Empty NumberArray")
+        if self.__use_numpy:
+            return getattr(values, name)().item()
+        return {'sum': sum, 'min': min, 'max': max}[name](values)
+
+    def sum(self) -> Number:
+        """Sum of all the values (0 for an empty array).
+
+        With NumPy, the sum of int64 values is computed in int64 and
+        wraps around when it overflows, while array.array values are
+        summed as Python ints, with arbitrary precision.
+        """
+
+        return Number(self._reduce('sum'))
+
+    def min(self) -> Number:
+        """Minimum of the values.
+
+        Raises
+        ------
+        IndexError:
+            When the array is empty.
+        """
+
+        return Number(self._reduce('min'))
+
+    def max(self) -> Number:
+        """Maximum of the values.
+
+        Raises
+        ------
+        IndexError:
+            When the array is empty.
+        """
+
+        return Number(self._reduce('max'))
+
+    def mean(self) -> Number:
+        """Arithmetic mean of the values.
+
+        Raises
+        ------
+        IndexError:
+            When the array is empty.
+        """
+
+        if len(self._values) == 0:
+            raise IndexError("Empty NumberArray")
+        return Number(self._reduce('sum') / len(self._values))
+
+    def to_bytes(self) -> bytes:
+        """Returns the values packed as bytes, to be unpacked as Numbers."""
+
+        values = self._values
+        if self.__use_numpy:
+            column = array(self.typecode)
+            column.frombytes(values.tobytes())
+            values = column
+        return _pack_array(values, True)
+
+    @classmethod
+    def from_bytes(cls, data: bytes,
+                   use_numpy: Optional[bool] = None) -> 'NumberArray':
+        """Returns a new array with the values packed in some bytes.
+
+        Packed fixed-width values are copied directly, without
+        creating an object per value.
+
+        Raises
+        ------
+        ValueError:
+            If the bytes were not packed by a to_bytes method, or they
+            don't hold real numbers.
+        """
+
+        code, payload = _read_header(data)
+        if code == _PICKLED:
+            return cls(_unpack_items(data)[0], use_numpy)
+        return cls(_unpack_values(code, payload), use_numpy)
+
+    def __repr__(self) -> str:
+        size = len(self._values)
+        if size == 0:
+            return "Empty " + str(self.__class__.__name__)
+        limit = self.repr_limit
+        shown = size if limit is None else min(limit, size)
+        print_val = ("NumberArray Elements: "
+                     + "; ".join([str(value) for value
+                                  in self._values[:shown].tolist()]))
+        if shown < size:
+            print_val += "; ... (" + str(size - shown) + " more)"
+        return print_val
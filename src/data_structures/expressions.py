@@ -0,0 +1,511 @@
+"""Arithmetic expressions compiled to programs for a stack machine.
+
+Classes
+-------
+
+Program:
+    Infix arithmetic expression compiled to stack machine op-codes.
+
+Functions
+---------
+
+evaluate:
+    Evaluates an infix expression, compiling it only once.
+"""
+
+__all__ = ['Program', 'evaluate']
+
+import math
+import operator
+import re
+from array import array
+from functools import lru_cache
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Mapping, NoReturn, Optional
+from typing import Tuple, Union
+from data_structures.elements import Number, NumberArray, numpy
+from data_structures.stacks import Stack
+
+COMPILE_CACHE_SIZE = 256
+
+# op-codes of the stack machine, each one with an argument
+_CONSTANT, _VARIABLE, _BINARY, _NEGATE, _CALL = range(5)
+
+# binary operators: precedence, right associativity and operation
+_BINARY_OPERATORS = {'+': (1, False, operator.add),
+                     '-': (1, False, operator.sub),
+                     '*': (2, False, operator.mul),
+                     '/': (2, False, operator.truediv),
+                     '//': (2, False, operator.floordiv),
+                     '%': (2, False, operator.mod),
+                     '**': (4, True, operator.pow)}
+_BINARY_NAMES = list(_BINARY_OPERATORS)
+_BINARY_OPERATIONS = [operation for _, _, operation
+                      in _BINARY_OPERATORS.values()]
+# unary minus binds tighter than * but looser than **, as in Python
+_UNARY_PRECEDENCE = 3
+
+# functions: arity, operation on values and operation on columns
+_FUNCTIONS = {'abs': (1, abs, None),
+              'sqrt': (1, math.sqrt, 'sqrt'),
+              'exp': (1, math.exp, 'exp'),
+              'log': (1, math.log, 'log'),
+              'min': (2, min, 'minimum'),
+              'max': (2, max, 'maximum')}
+_FUNCTION_NAMES = list(_FUNCTIONS)
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<name>[A-Za-z_]\w*)
+    |(?P<operator>\*\*|//|[-+*/%(),])
+    )""", re.VERBOSE)
+
+
+def _tokenize(source: str) -> List[Tuple[str, str, int]]:
+    """Kind, text and position of each token of an expression.
+
+    Raises
+    ------
+    ValueError:
+        If the expression has an invalid character.
+    """
+
+    tokens = []
+    position = 0
+    end = len(source.rstrip())
+    while position < end:
+        match = _TOKEN.match(source, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid expression: unexpected character "
+                             f"at {position} in {source!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind), match.start(kind)))
+        position = match.end()
+    return tokens
+
+
+def _parse_number(text: str) -> Union[int, float]:
+    if '.' in text or 'e' in text or 'E' in text:
+        return float(text)
+    return int(text)
+
+
+class Program:
+    """Infix arithmetic expression compiled to stack machine op-codes.
+
+    The expression is parsed once, with the shunting-yard algorithm,
+    into a compact program in reverse Polish notation: a bytes string
+    of op-codes and an array with the argument of each one, an index
+    in the tables of constants, variables, operators or functions.
+    Programs are evaluated with a Stack, as many times as needed.
+
+    Expressions can have int and float literals, variables, the binary
+    operators + - * / // % ** with Python's precedence, unary minus and
+    plus, parentheses and the functions abs, sqrt, exp, log, min and
+    max.
+
+    Properties
+    ----------
+    source: str
+        Read-only source of the expression.
+
+    variables: tuple of str
+        Read-only names of the variables, in order of appearance.
+
+    depth: int
+        Read-only maximum amount of values on the stack while
+        evaluating.
+
+    Methods
+    -------
+    compiled:
+        Returns the program of an expression, from a bounded cache.
+
+    set_compile_cache_size:
+        Sets the size of the cache of programs, emptying it.
+
+    evaluate:
+        Evaluates the program with the values of its variables.
+
+    evaluate_columns:
+        Evaluates the program over whole columns of values at once.
+    """
+
+    def __init__(self, source: str) -> NoReturn:
+        """Compiles an infix expression.
+
+        Parameters
+        ----------
+        source: str
+            The infix arithmetic expression.
+
+        Raises
+        ------
+        ValueError:
+            If the expression is not valid.
+        """
+
+        self.__source = source
+        self._constants: List[Union[int, float]] = []
+        self._variables: List[str] = []
+        opcodes = bytearray()
+        arguments = array('H')
+        operators = Stack()
+        # amount of arguments of each function call being parsed
+        n_arguments = Stack()
+        depth = max_depth = 0
+
+        def emit(opcode: int, argument: int, change: int) -> NoReturn:
+            nonlocal depth, max_depth
+            opcodes.append(opcode)
+            arguments.append(argument)
+            depth += change
+            max_depth = max(max_depth, depth)
+
+        def emit_operator(token: Tuple[str, Any]) -> NoReturn:
+            kind, value = token
+            if kind == 'binary':
+                emit(_BINARY, value, -1)
+            elif kind == 'negate':
+                emit(_NEGATE, 0, 0)
+            elif kind != 'plus':
+                raise ValueError(f"Invalid expression: unbalanced "
+                                 f"parentheses in {source!r}")
+
+        def invalid(text: str, position: int) -> ValueError:
+            return ValueError(f"Invalid expression: unexpected {text!r} "
+                              f"at {position} in {source!r}")
+
+        tokens = _tokenize(source)
+        expect_operand = True
+        for index, (kind, text, position) in enumerate(tokens):
+            if kind in ('number', 'name') and not expect_operand:
+                raise invalid(text, position)
+            if kind == 'number':
+                emit(_CONSTANT, self._constant(_parse_number(text)), 1)
+                expect_operand = False
+            elif kind == 'name':
+                next_text = tokens[index + 1][1] if index + 1 < len(tokens) \
+                    else None
+                if next_text == '(':
+                    if text not in _FUNCTIONS:
+                        raise ValueError(f"Invalid expression: unknown "
+                                         f"function {text!r} in {source!r}")
+                    operators.push(('function', text))
+                else:
+                    if text not in self._variables:
+                        self._variables.append(text)
+                    emit(_VARIABLE, self._variables.index(text), 1)
+                    expect_operand = False
+            elif text == '(':
+                if not expect_operand:
+                    raise invalid(text, position)
+                calls = operators.size() and \
+                    operators.peak()[0] == 'function'
+                operators.push(('call' if calls else 'group', None))
+                if calls:
+                    n_arguments.push(1)
+            elif text in ',)':
+                if expect_operand:
+                    raise invalid(text, position)
+                while operators.size() and \
+                        operators.peak()[0] not in ('call', 'group'):
+                    emit_operator(operators.pop())
+                if operators.size() == 0:
+                    raise invalid(text, position)
+                if text == ',':
+                    if operators.peak()[0] != 'call':
+                        raise invalid(text, position)
+                    n_arguments.push(n_arguments.pop() + 1)
+                    expect_operand = True
+                    continue
+                if operators.pop()[0] == 'call':
+                    name = operators.pop()[1]
+                    arity = _FUNCTIONS[name][0]
+                    if n_arguments.pop() != arity:
+                        raise ValueError(f"Invalid expression: {name} takes "
+                                         f"{arity} arguments in {source!r}")
+                    emit(_CALL, _FUNCTION_NAMES.index(name), 1 - arity)
+            elif expect_operand:
+                if text not in '+-':
+                    raise invalid(text, position)
+                operators.push(('negate' if text == '-' else 'plus', None))
+            else:
+                precedence, right, _ = _BINARY_OPERATORS[text]
+                while operators.size():
+                    top_kind, top_value = operators.peak()
+                    if top_kind == 'binary':
+                        top_precedence = _BINARY_OPERATORS[
+                            _BINARY_NAMES[top_value]][0]
+                    elif top_kind in ('negate', 'plus'):
+                        top_precedence = _UNARY_PRECEDENCE
+                    else:
+                        break
+                    if top_precedence < precedence or \
+                            (right and top_precedence == precedence):
+                        break
+                    emit_operator(operators.pop())
+                operators.push(('binary', _BINARY_NAMES.index(text)))
+                expect_operand = True
+        if expect_operand:
+            raise ValueError(f"Invalid expression: incomplete {source!r}")
+        while operators.size():
+            emit_operator(operators.pop())
+        self._opcodes = bytes(opcodes)
+        self._arguments = arguments
+        self.__depth = max_depth
+
+    def _constant(self, value: Union[int, float]) -> int:
+        """Index of a constant, added to the table if it's new."""
+
+        for index, constant in enumerate(self._constants):
+            if type(constant) is type(value) and constant == value:
+                return index
+        self._constants.append(value)
+        return len(self._constants) - 1
+
+    @staticmethod
+    def compiled(source: str) -> 'Program':
+        """Returns the program of an expression, from a bounded cache.
+
+        Repeated expressions are only compiled once while they remain
+        in the cache, the least recently used ones are evicted first.
+
+        Parameters
+        ----------
+        source: str
+            The infix arithmetic expression.
+
+        Raises
+        ------
+        ValueError:
+            If the expression is not valid.
+        """
+
+        return _compiler(source)
+
+    @staticmethod
+    def set_compile_cache_size(maxsize: int) -> NoReturn:
+        """Sets the size of the cache of programs, emptying it.
+
+        Parameters
+        ----------
+        maxsize: int
+            Maximum amount of programs kept in the cache.
+        """
+
+        global _compiler
+        _compiler = lru_cache(maxsize=maxsize)(Program)
+
+    @property
+    def source(self) -> str:
+        """Source of the expression."""
+
+        return self.__source
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        """Names of the variables, in order of appearance."""
+
+        return tuple(self._variables)
+
+    @property
+    def depth(self) -> int:
+        """Maximum amount of values on the stack while evaluating."""
+
+        return self.__depth
+
+    def _values(self, bindings: Mapping[str, Any]) -> List[Any]:
+        """Values of the variables, in the order of the table.
+
+        Raises
+        ------
+        ValueError:
+            If a variable has no value.
+        """
+
+        try:
+            return [bindings[name] for name in self._variables]
+        except KeyError as error:
+            raise ValueError(f"Missing value for the variable "
+                             f"{error.args[0]!r}") from None
+
+    def evaluate(self, bindings: Optional[Mapping[str, Any]] = None,
+                 **values: Any) -> Number:
+        """Evaluates the program with the values of its variables.
+
+        Parameters
+        ----------
+        bindings: mapping, optional
+            Value of each variable, a Number, int or float.
+
+        **values:
+            More values of variables, by name.
+
+        Returns
+        -------
+        result: Number
+            The value of the expression.
+
+        Raises
+        ------
+        ValueError:
+            If a variable has no value, or a value or the result is not
+            a real number.
+
+        ZeroDivisionError:
+            When the expression divides by zero.
+        """
+
+        if bindings is not None:
+            values = dict(bindings, **values)
+        variables = self._values(values)
+        for index, value in enumerate(variables):
+            if isinstance(value, Number):
+                variables[index] = value.number
+            elif not isinstance(value, (int, float)):
+                raise ValueError(f"The value of {self._variables[index]!r} "
+                                 f"must be a real number")
+        constants = self._constants
+        stack = Stack()
+        push = stack.push
+        pop = stack.pop
+        for opcode, argument in zip(self._opcodes, self._arguments):
+            if opcode == _CONSTANT:
+                push(constants[argument])
+            elif opcode == _VARIABLE:
+                push(variables[argument])
+            elif opcode == _BINARY:
+                right = pop()
+                push(_BINARY_OPERATIONS[argument](pop(), right))
+            elif opcode == _NEGATE:
+                push(-pop())
+            else:
+                arity, function, _ = _FUNCTIONS[_FUNCTION_NAMES[argument]]
+                push(function(*reversed(stack.pop_many(arity))))
+        result = pop()
+        if not isinstance(result, (int, float)):
+            raise ValueError("The result is not a real number")
+        return Number(result)
+
+    def evaluate_columns(self, columns: Optional[Mapping[str, Any]] = None,
+                         **values: Any) -> NumberArray:
+        """Evaluates the program over whole columns of values at once.
+
+        Each op-code is applied to whole columns in a single pass of
+        the program, with NumPy when it's installed, or with C loops
+        over array.array columns otherwise.
+
+        Parameters
+        ----------
+        columns: mapping, optional
+            Values of each variable: a NumberArray, an iterable or a
+            buffer of real numbers, or a single real number used for
+            every row.
+
+        **values:
+            More values of variables, by name.
+
+        Returns
+        -------
+        results: NumberArray
+            The value of the expression for each row.
+
+        Raises
+        ------
+        ValueError:
+            If a variable has no value, a value is not a real number,
+            or the columns have different lengths.
+
+        ZeroDivisionError:
+            When the expression divides by zero, without NumPy.
+        """
+
+        if columns is not None:
+            values = dict(columns, **values)
+        variables = self._values(values)
+        n_rows = None
+        for index, value in enumerate(variables):
+            if isinstance(value, Number):
+                variables[index] = value.number
+            elif not isinstance(value, (int, float)):
+                column = NumberArray(value).values
+                if n_rows is not None and len(column) != n_rows:
+                    raise ValueError("Columns must have the same length")
+                n_rows = len(column)
+                variables[index] = column
+        if n_rows is None:
+            return NumberArray([self.evaluate(dict(zip(self._variables,
+                                                       variables)))])
+        use_numpy = numpy is not None
+        constants = self._constants
+        stack = Stack()
+        push = stack.push
+        pop = stack.pop
+        for opcode, argument in zip(self._opcodes, self._arguments):
+            if opcode == _CONSTANT:
+                push(constants[argument])
+            elif opcode == _VARIABLE:
+                push(variables[argument])
+            elif opcode == _BINARY:
+                right = pop()
+                push(_apply(_BINARY_OPERATIONS[argument], use_numpy,
+                            pop(), right))
+            elif opcode == _NEGATE:
+                push(_apply(operator.neg, use_numpy, pop()))
+            else:
+                arity, function, ufunc = _FUNCTIONS[_FUNCTION_NAMES[argument]]
+                if use_numpy:
+                    function = getattr(numpy, ufunc) if ufunc else function
+                push(_apply(function, use_numpy,
+                            *reversed(stack.pop_many(arity))))
+        return NumberArray(pop())
+
+    def __repr__(self) -> str:
+        return str(self.__class__.__name__) + "(" + repr(self.__source) + ")"
+
+
+def _apply(function: Callable[..., Any], use_numpy: bool,
+           *operands: Any) -> Any:
+    """Applies a function to operands that can be columns or numbers.
+
+    NumPy columns are passed to the function as they are, array.array
+    columns are mapped over, repeating the single numbers.
+    """
+
+    if use_numpy or all(isinstance(operand, (int, float))
+                        for operand in operands):
+        return function(*operands)
+    return list(map(function, *[repeat(operand)
+                                if isinstance(operand, (int, float))
+                                else operand for operand in operands]))
+
+
+_compiler = lru_cache(maxsize=COMPILE_CACHE_SIZE)(Program)
+
+
+def evaluate(source: str, bindings: Optional[Mapping[str, Any]] = None,
+             **values: Any) -> Number:
+    """Evaluates an infix expression, compiling it only once.
+
+    The program is taken from the bounded cache of Program.compiled.
+
+    Parameters
+    ----------
+    source: str
+        The infix arithmetic expression.
+
+    bindings: mapping, optional
+        Value of each variable, a Number, int or float.
+
+    **values:
+        More values of variables, by name.
+
+    Raises
+    ------
+    ValueError:
+        If the expression is not valid, a variable has no value, or a
+        value or the result is not a real number.
+    """
+
+    return _compiler(source).evaluate(bindings, **values)
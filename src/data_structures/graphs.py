@@ -0,0 +1,572 @@
+"""Graphs stored in compact arrays, with iterative traversals.
+
+Classes
+-------
+
+Graph:
+    Directed graph stored in compressed sparse row arrays.
+"""
+
+__all__ = ['Graph']
+
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, islice, repeat
+from operator import itemgetter, le
+from typing import Iterable, Iterator, List, NoReturn, Optional, Tuple
+from data_structures.queues import Queue
+from data_structures.stacks import Stack
+
+
+def _node_typecode(n_nodes: int) -> str:
+    """Typecode of the smallest array that can hold every node."""
+
+    return 'i' if n_nodes <= 2 ** 31 else 'q'
+
+
+def _group(n_nodes: int, sources: array, targets: array
+           ) -> Tuple[array, array]:
+    """Offsets and targets of edges grouped by source, keeping order.
+
+    A counting sort of the edges, in linear time.
+    """
+
+    counts = array('q', bytes(8 * (n_nodes + 1)))
+    for source in sources:
+        counts[source + 1] += 1
+    offsets = array('q', accumulate(counts))
+    positions = offsets[:-1]
+    grouped = array(targets.typecode, bytes(targets.itemsize * len(targets)))
+    for source, target in zip(sources, targets):
+        grouped[positions[source]] = target
+        positions[source] += 1
+    return offsets, grouped
+
+
+class Graph:
+    """Directed graph stored in compressed sparse row arrays.
+
+    Nodes are the ints from 0 to n_nodes - 1. The targets of the edges
+    are stored in a single array, grouped by source node in order, and
+    offsets[node] is where the edges of a node start, so the
+    successors of a node are targets[offsets[node]:offsets[node + 1]].
+    There are no objects or dictionaries per node or per edge.
+
+    Traversals are iterative, with a Stack or a Queue of nodes instead
+    of recursion, so they work on graphs of any depth, and nodes are
+    marked as visited in a bytearray. They are generators, so callers
+    can stop them early.
+
+    Properties
+    ----------
+    n_nodes: int
+        Read-only amount of nodes.
+
+    n_edges: int
+        Read-only amount of edges.
+
+    offsets: array.array
+        Read-only position of the first edge of each node, and the
+        amount of edges at the end.
+
+    targets: array.array
+        Read-only target of each edge, grouped by source node.
+
+    Methods
+    -------
+    from_csr:
+        Returns a graph with already built compressed sparse rows.
+
+    successors:
+        Returns the targets of the edges of a node.
+
+    out_degree:
+        Amount of edges that start at a node.
+
+    edges:
+        Iterates over the edges as (source, target) pairs.
+
+    reversed:
+        Returns the graph with every edge reversed.
+
+    dfs:
+        Iterates over the nodes in depth-first preorder.
+
+    bfs:
+        Iterates over the nodes in breadth-first order.
+
+    postorder:
+        Iterates over the nodes in depth-first postorder.
+
+    topological_sort:
+        Iterates over the nodes so that every edge goes forward.
+
+    strongly_connected_components:
+        Iterates over the strongly connected components.
+
+    connected_components:
+        Iterates over the weakly connected components.
+    """
+
+    def __init__(self, n_nodes: int,
+                 edges: Iterable[Tuple[int, int]] = ()) -> NoReturn:
+        """Builds the compressed sparse rows of the edges.
+
+        The edges of each node keep the order they are given in.
+
+        Parameters
+        ----------
+        n_nodes: int
+            Amount of nodes.
+
+        edges: iterable of pairs of ints, optional
+            (source, target) pairs, one for each edge. The default
+            value is no edges.
+
+        Raises
+        ------
+        AssertionError:
+            If n_nodes is negative.
+
+        ValueError:
+            If an edge has a node out of range.
+        """
+
+        assert n_nodes >= 0, "n_nodes must be non-negative."
+        edges = edges if isinstance(edges, list) else list(edges)
+        typecode = _node_typecode(n_nodes)
+        try:
+            sources = array(typecode, map(itemgetter(0), edges))
+            targets = array(typecode, map(itemgetter(1), edges))
+        except OverflowError:
+            raise ValueError("Edge with a node out of range") from None
+        del edges
+        for nodes in (sources, targets):
+            if nodes and (min(nodes) < 0 or max(nodes) >= n_nodes):
+                raise ValueError("Edge with a node out of range")
+        if all(map(le, sources, islice(sources, 1, None))):
+            # already grouped by source node, only the offsets are needed
+            offsets = array('q', [bisect_left(sources, node)
+                                  for node in range(n_nodes + 1)])
+        else:
+            offsets, targets = _group(n_nodes, sources, targets)
+        self._offsets = offsets
+        self._targets = targets
+
+    @classmethod
+    def from_csr(cls, offsets: Iterable[int], targets: Iterable[int]
+                 ) -> 'Graph':
+        """Returns a graph with already built compressed sparse rows.
+
+        Parameters
+        ----------
+        offsets: iterable of ints
+            Position of the first edge of each node, and the amount of
+            edges at the end.
+
+        targets: iterable of ints
+            Target of each edge, grouped by source node.
+
+        Raises
+        ------
+        ValueError:
+            If the offsets are not a non-decreasing sequence from 0 to
+            the amount of targets, or a target is out of range.
+        """
+
+        try:
+            offsets = array('q', offsets)
+        except OverflowError:
+            raise ValueError("offsets must increase from 0 to the amount "
+                             "of targets") from None
+        n_nodes = len(offsets) - 1
+        if n_nodes < 0:
+            raise ValueError("offsets must have an item for each node, "
+                             "and the amount of edges")
+        try:
+            targets = array(_node_typecode(n_nodes), targets)
+        except OverflowError:
+            raise ValueError("Edge with a node out of range") from None
+        if offsets[0] != 0 or offsets[-1] != len(targets) or \
+                not all(map(le, offsets, islice(offsets, 1, None))):
+            raise ValueError("offsets must increase from 0 to the amount "
+                             "of targets")
+        if targets and (min(targets) < 0 or max(targets) >= n_nodes):
+            raise ValueError("Edge with a node out of range")
+        graph = cls.__new__(cls)
+        graph._offsets = offsets
+        graph._targets = targets
+        return graph
+
+    @property
+    def n_nodes(self) -> int:
+        """Amount of nodes."""
+
+        return len(self._offsets) - 1
+
+    @property
+    def n_edges(self) -> int:
+        """Amount of edges."""
+
+        return len(self._targets)
+
+    @property
+    def offsets(self) -> array:
+        """Position of the first edge of each node."""
+
+        return self._offsets
+
+    @property
+    def targets(self) -> array:
+        """Target of each edge, grouped by source node."""
+
+        return self._targets
+
+    def successors(self, node: int) -> array:
+        """Returns the targets of the edges of a node.
+
+        Raises
+        ------
+        IndexError:
+            If the node is out of range.
+        """
+
+        if not 0 <= node < self.n_nodes:
+            raise IndexError("Node out of range")
+        return self._targets[self._offsets[node]:self._offsets[node + 1]]
+
+    def out_degree(self, node: int) -> int:
+        """Amount of edges that start at a node.
+
+        Raises
+        ------
+        IndexError:
+            If the node is out of range.
+        """
+
+        if not 0 <= node < self.n_nodes:
+            raise IndexError("Node out of range")
+        return self._offsets[node + 1] - self._offsets[node]
+
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        """Iterates over the edges as (source, target) pairs."""
+
+        offsets = self._offsets
+        targets = self._targets
+        for source in range(self.n_nodes):
+            for position in range(offsets[source], offsets[source + 1]):
+                yield source, targets[position]
+
+    def reversed(self) -> 'Graph':
+        """Returns the graph with every edge reversed."""
+
+        offsets = self._offsets
+        sources = array(self._targets.typecode)
+        for source in range(self.n_nodes):
+            sources.extend(repeat(source, offsets[source + 1]
+                                  - offsets[source]))
+        reversed_offsets, reversed_targets = _group(
+            self.n_nodes, self._targets, sources)
+        graph = self.__class__.__new__(self.__class__)
+        graph._offsets = reversed_offsets
+        graph._targets = reversed_targets
+        return graph
+
+    def _roots(self, start: Optional[int]) -> Iterable[int]:
+        """The start node, or every node if it's None.
+
+        Raises
+        ------
+        IndexError:
+            If the start node is out of range.
+        """
+
+        if start is None:
+            return range(self.n_nodes)
+        if not 0 <= start < self.n_nodes:
+            raise IndexError("Node out of range")
+        return (start,)
+
+    def dfs(self, start: Optional[int] = None) -> Iterator[int]:
+        """Iterates over the nodes in depth-first preorder.
+
+        Nodes are visited in the same order as a recursive traversal
+        that follows the edges of each node in order.
+
+        Parameters
+        ----------
+        start: int, optional
+            Node to start from, only the nodes reachable from it are
+            visited. The default value is None, to visit every node,
+            starting from each unvisited node in order.
+
+        Yields
+        ------
+        node: int
+            Each visited node, before its successors.
+
+        Raises
+        ------
+        IndexError:
+            If the start node is out of range.
+        """
+
+        offsets = self._offsets
+        targets = self._targets
+        visited = bytearray(self.n_nodes)
+        stack = Stack()
+        push_many = stack.push_many
+        pop = stack.pop
+        for root in self._roots(start):
+            if visited[root]:
+                continue
+            stack.push(root)
+            while stack.size():
+                node = pop()
+                if visited[node]:
+                    continue
+                visited[node] = 1
+                yield node
+                # pushed in reverse, so the first successor is on top
+                successors = targets[offsets[node]:offsets[node + 1]]
+                successors.reverse()
+                push_many(successors)
+
+    def bfs(self, start: Optional[int] = None) -> Iterator[int]:
+        """Iterates over the nodes in breadth-first order.
+
+        Parameters
+        ----------
+        start: int, optional
+            Node to start from, only the nodes reachable from it are
+            visited. The default value is None, to visit every node,
+            starting from each unvisited node in order.
+
+        Yields
+        ------
+        node: int
+            Each visited node, closer nodes first.
+
+        Raises
+        ------
+        IndexError:
+            If the start node is out of range.
+        """
+
+        offsets = self._offsets
+        targets = self._targets
+        visited = bytearray(self.n_nodes)
+        queue = Queue()
+        push = queue.push
+        pop = queue.pop
+        for root in self._roots(start):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            push(root)
+            while queue.size():
+                node = pop()
+                yield node
+                for position in range(offsets[node], offsets[node + 1]):
+                    target = targets[position]
+                    if not visited[target]:
+                        visited[target] = 1
+                        push(target)
+
+    def postorder(self, start: Optional[int] = None) -> Iterator[int]:
+        """Iterates over the nodes in depth-first postorder.
+
+        Parameters
+        ----------
+        start: int, optional
+            Node to start from, only the nodes reachable from it are
+            visited. The default value is None, to visit every node,
+            starting from each unvisited node in order.
+
+        Yields
+        ------
+        node: int
+            Each visited node, after its successors.
+
+        Raises
+        ------
+        IndexError:
+            If the start node is out of range.
+        """
+
+        offsets = self._offsets
+        targets = self._targets
+        visited = bytearray(self.n_nodes)
+        # the path from the root, with the next edge of each node
+        nodes = Stack()
+        positions = Stack()
+        for root in self._roots(start):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            nodes.push(root)
+            positions.push(offsets[root])
+            while nodes.size():
+                node = nodes.peak()
+                position = positions.pop()
+                end = offsets[node + 1]
+                while position < end and visited[targets[position]]:
+                    position += 1
+                if position < end:
+                    target = targets[position]
+                    visited[target] = 1
+                    positions.push(position + 1)
+                    nodes.push(target)
+                    positions.push(offsets[target])
+                else:
+                    yield nodes.pop()
+
+    def topological_sort(self) -> Iterator[int]:
+        """Iterates over the nodes so that every edge goes forward.
+
+        Nodes without pending incoming edges are kept in a Queue, so
+        the nodes are yielded as soon as they are known to be ready.
+
+        Yields
+        ------
+        node: int
+            Each node, after the sources of all its incoming edges.
+
+        Raises
+        ------
+        ValueError:
+            When the graph has a cycle, once the nodes outside of
+            cycles have been yielded.
+        """
+
+        offsets = self._offsets
+        targets = self._targets
+        in_degrees = array('q', bytes(8 * self.n_nodes))
+        for target in targets:
+            in_degrees[target] += 1
+        queue = Queue()
+        queue.push_many([node for node in range(self.n_nodes)
+                         if not in_degrees[node]])
+        push = queue.push
+        pop = queue.pop
+        n_sorted = 0
+        while queue.size():
+            node = pop()
+            n_sorted += 1
+            yield node
+            for position in range(offsets[node], offsets[node + 1]):
+                target = targets[position]
+                in_degrees[target] -= 1
+                if not in_degrees[target]:
+                    push(target)
+        if n_sorted < self.n_nodes:
+            raise ValueError("The graph has a cycle")
+
+    def strongly_connected_components(self) -> Iterator[List[int]]:
+        """Iterates over the strongly connected components.
+
+        Tarjan's algorithm, with Stacks instead of recursion.
+        Components are yielded as soon as they are complete, in reverse
+        topological order: no edge goes from a component to a later
+        one.
+
+        Yields
+        ------
+        component: list of ints
+            The nodes of a component, the first one visited last.
+        """
+
+        n_nodes = self.n_nodes
+        offsets = self._offsets
+        targets = self._targets
+        # order in which nodes are visited, -1 for unvisited nodes
+        order = array('q', [-1]) * n_nodes
+        lowest = array('q', bytes(8 * n_nodes))
+        on_stack = bytearray(n_nodes)
+        component_stack = Stack()
+        nodes = Stack()
+        positions = Stack()
+        counter = 0
+        for root in range(n_nodes):
+            if order[root] != -1:
+                continue
+            order[root] = lowest[root] = counter
+            counter += 1
+            component_stack.push(root)
+            on_stack[root] = 1
+            nodes.push(root)
+            positions.push(offsets[root])
+            while nodes.size():
+                node = nodes.peak()
+                position = positions.pop()
+                end = offsets[node + 1]
+                while position < end:
+                    target = targets[position]
+                    position += 1
+                    if order[target] == -1:
+                        break
+                    if on_stack[target] and order[target] < lowest[node]:
+                        lowest[node] = order[target]
+                else:
+                    nodes.pop()
+                    if nodes.size():
+                        parent = nodes.peak()
+                        if lowest[node] < lowest[parent]:
+                            lowest[parent] = lowest[node]
+                    if lowest[node] == order[node]:
+                        component = []
+                        member = -1
+                        while member != node:
+                            member = component_stack.pop()
+                            on_stack[member] = 0
+                            component.append(member)
+                        yield component
+                    continue
+                positions.push(position)
+                order[target] = lowest[target] = counter
+                counter += 1
+                component_stack.push(target)
+                on_stack[target] = 1
+                nodes.push(target)
+                positions.push(offsets[target])
+
+    def connected_components(self) -> Iterator[List[int]]:
+        """Iterates over the weakly connected components.
+
+        Edges are followed in both directions, with a breadth-first
+        traversal of the graph and its reversed graph.
+
+        Yields
+        ------
+        component: list of ints
+            The nodes of a component, in breadth-first order from its
+            lowest node.
+        """
+
+        reversed_graph = self.reversed()
+        graphs = ((self._offsets, self._targets),
+                  (reversed_graph._offsets, reversed_graph._targets))
+        visited = bytearray(self.n_nodes)
+        queue = Queue()
+        push = queue.push
+        pop = queue.pop
+        for root in range(self.n_nodes):
+            if visited[root]:
+                continue
+            visited[root] = 1
+            push(root)
+            component = []
+            while queue.size():
+                node = pop()
+                component.append(node)
+                for offsets, targets in graphs:
+                    for position in range(offsets[node], offsets[node + 1]):
+                        target = targets[position]
+                        if not visited[target]:
+                            visited[target] = 1
+                            push(target)
+            yield component
+
+    def __repr__(self) -> str:
+        return (str(self.__class__.__name__) + " with " + str(self.n_nodes)
+                + " nodes and " + str(self.n_edges) + " edges")
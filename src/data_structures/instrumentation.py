@@ -0,0 +1,533 @@
+"""Opt-in instrumentation of stacks and queues.
+
+Instrumented structures are subclasses that record their operations
+in a Metrics object, so plain structures pay nothing for it. A plain
+structure can also be instrumented, and uninstrumented, in place.
+
+Classes
+-------
+
+Metrics:
+    Operation counters, size high-water mark, flushes and latencies.
+
+PrometheusTextFile:
+    Sink that writes metrics in the Prometheus text format.
+
+InstrumentedStack:
+    Stack that records its operations.
+
+InstrumentedTypeRestrictedStack:
+    Type restricted stack that records its operations and failures.
+
+InstrumentedQueue:
+    Queue that records its operations and flushes.
+
+Functions
+---------
+
+instrument:
+    Turns a plain structure into its instrumented subclass.
+
+uninstrument:
+    Turns an instrumented structure back into its plain class.
+"""
+
+__all__ = ['Metrics', 'PrometheusTextFile', 'InstrumentedStack',
+           'InstrumentedTypeRestrictedStack', 'InstrumentedQueue',
+           'instrument', 'uninstrument']
+
+import os
+from bisect import bisect_left
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterable, List, NoReturn, Optional
+from data_structures.queues import Queue
+from data_structures.stacks import Stack, TypeRestrictedStack
+
+# upper bounds of the latency buckets, in nanoseconds
+LATENCY_BUCKETS = (250, 500, 1000, 2500, 5000, 10000, 25000, 100000,
+                   1000000)
+
+
+def _escape_label(value: Any) -> str:
+    """Escapes a label value as the Prometheus text format requires."""
+
+    return (str(value).replace("\\", "\\\\").replace('"', '\\"')
+            .replace("\n", "\\n"))
+
+
+class Metrics:
+    """Operation counters, size high-water mark, flushes and latencies.
+
+    Every operation is counted, and one out of sample_every operations
+    of each kind is timed into a latency histogram. Hooks are called
+    with each flush and validation failure as they happen, and sinks
+    are called with a snapshot of the metrics when they're published.
+
+    Properties
+    ----------
+    sample_every: int
+        Read-only amount of operations of a kind per timed operation.
+
+    Methods
+    -------
+    subscribe:
+        Adds a hook called with every flush and validation failure.
+
+    add_sink:
+        Adds a sink called with a snapshot on every publish.
+
+    snapshot:
+        Dictionary with the current value of every metric.
+
+    publish:
+        Calls every sink with a snapshot of the metrics.
+    """
+
+    def __init__(self, sample_every: int = 64,
+                 buckets: Iterable[int] = LATENCY_BUCKETS) -> NoReturn:
+        """Initializes every metric to zero.
+
+        Parameters
+        ----------
+        sample_every: int, optional
+            Amount of operations of a kind per timed operation, 1 to
+            time every operation. The default value is 64.
+
+        buckets: iterable of int, optional
+            Increasing upper bounds of the latency buckets, in
+            nanoseconds. The default value is LATENCY_BUCKETS.
+
+        Raises
+        ------
+        AssertionError:
+            If sample_every is not positive.
+        """
+
+        assert sample_every > 0, "sample_every must be positive."
+        self.__sample_every = sample_every
+        self._buckets = tuple(buckets)
+        self._operations: Dict[str, int] = {}
+        self._latencies: Dict[str, List[int]] = {}
+        self._latency_sums: Dict[str, int] = {}
+        self._high_water = 0
+        self._flushes = 0
+        self._items_moved = 0
+        self._validation_failures = 0
+        self._hooks: List[Callable[[str, Any], Any]] = []
+        self._sinks: List[Callable[[Dict[str, Any]], Any]] = []
+
+    @property
+    def sample_every(self) -> int:
+        """Amount of operations of a kind per timed operation."""
+
+        return self.__sample_every
+
+    def _count(self, operation: str) -> bool:
+        """Counts an operation, True if it must be timed."""
+
+        count = self._operations.get(operation, 0) + 1
+        self._operations[operation] = count
+        return count % self.__sample_every == 0
+
+    def _observe(self, operation: str, nanoseconds: int) -> NoReturn:
+        """Adds a timed operation to its latency histogram."""
+
+        try:
+            counts = self._latencies[operation]
+        except KeyError:
+            counts = self._latencies[operation] = \
+                [0] * (len(self._buckets) + 1)
+            self._latency_sums[operation] = 0
+        counts[bisect_left(self._buckets, nanoseconds)] += 1
+        self._latency_sums[operation] += nanoseconds
+
+    def _observe_size(self, size: int) -> NoReturn:
+        if size > self._high_water:
+            self._high_water = size
+
+    def _emit(self, event: str, value: Any) -> NoReturn:
+        for hook in self._hooks:
+            hook(event, value)
+
+    def _record_flush(self, n_items: int) -> NoReturn:
+        if not n_items:
+            return
+        self._flushes += 1
+        self._items_moved += n_items
+        if self._hooks:
+            self._emit('flush', n_items)
+
+    def _record_validation_failure(self, item: Any) -> NoReturn:
+        self._validation_failures += 1
+        if self._hooks:
+            self._emit('validation_failure', item)
+
+    def subscribe(self, hook: Callable[[str, Any], Any]) -> NoReturn:
+        """Adds a hook called with every flush and validation failure.
+
+        Parameters
+        ----------
+        hook: callable
+            Called with the event name and its value: 'flush' with the
+            amount of items moved, or 'validation_failure' with the
+            rejected item.
+        """
+
+        self._hooks.append(hook)
+
+    def add_sink(self, sink: Callable[[Dict[str, Any]], Any]) -> NoReturn:
+        """Adds a sink called with a snapshot on every publish.
+
+        Parameters
+        ----------
+        sink: callable
+            Called with the dictionary returned by snapshot.
+        """
+
+        self._sinks.append(sink)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Dictionary with the current value of every metric.
+
+        Returns
+        -------
+        metrics: dict
+            'operations' maps each operation to its count, and
+            'latency' maps each timed operation to its histogram:
+            'buckets' with the upper bound in nanoseconds and the
+            cumulative count of each bucket, 'count' and 'sum_ns'.
+            'high_water', 'flushes', 'items_moved' and
+            'validation_failures' are totals.
+        """
+
+        latency = {}
+        bounds = self._buckets + (float('inf'),)
+        for operation, counts in self._latencies.items():
+            cumulative = 0
+            buckets = []
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                buckets.append((bound, cumulative))
+            latency[operation] = {'buckets': buckets,
+                                  'count': cumulative,
+                                  'sum_ns': self._latency_sums[operation]}
+        return {'operations': dict(self._operations),
+                'high_water': self._high_water,
+                'flushes': self._flushes,
+                'items_moved': self._items_moved,
+                'validation_failures': self._validation_failures,
+                'latency': latency}
+
+    def publish(self) -> NoReturn:
+        """Calls every sink with a snapshot of the metrics."""
+
+        if self._sinks:
+            snapshot = self.snapshot()
+            for sink in self._sinks:
+                sink(snapshot)
+
+
+class PrometheusTextFile:
+    """Sink that writes metrics in the Prometheus text format.
+
+    The file is replaced atomically on every publish, so it can be
+    read by the textfile collector of the node exporter at any time.
+
+    Properties
+    ----------
+    path: str
+        Read-only path of the file.
+    """
+
+    def __init__(self, path: str, prefix: str = 'data_structures',
+                 labels: Optional[Dict[str, str]] = None) -> NoReturn:
+        """Initializes the sink.
+
+        Parameters
+        ----------
+        path: str
+            Path of the file, usually ending with '.prom'.
+
+        prefix: str, optional
+            Prefix of every metric name. The default value is
+            'data_structures'.
+
+        labels: dict, optional
+            Labels added to every metric, e.g. the name of the
+            structure. The default value is no labels.
+        """
+
+        self.__path = path
+        self._prefix = prefix
+        self._labels = dict(labels or {})
+
+    @property
+    def path(self) -> str:
+        """Path of the file."""
+
+        return self.__path
+
+    def _labelled(self, name: str, value: Any, **labels: str) -> str:
+        labels = {**self._labels, **labels}
+        if labels:
+            name += "{" + ",".join(f'{key}="{_escape_label(label)}"'
+                                   for key, label in labels.items()) + "}"
+        return f"{self._prefix}_{name} {value}"
+
+    def format(self, snapshot: Dict[str, Any]) -> str:
+        """The snapshot of some metrics in the Prometheus text format."""
+
+        lines = [f"# TYPE {self._prefix}_operations_total counter"]
+        for operation, count in sorted(snapshot['operations'].items()):
+            lines.append(self._labelled('operations_total', count,
+                                        operation=operation))
+        for name, kind in (('high_water', 'gauge'),
+                           ('flushes', 'counter'),
+                           ('items_moved', 'counter'),
+                           ('validation_failures', 'counter')):
+            metric = name if kind == 'gauge' else name + '_total'
+            lines.append(f"# TYPE {self._prefix}_{metric} {kind}")
+            lines.append(self._labelled(metric, snapshot[name]))
+        lines.append(f"# TYPE {self._prefix}_latency_seconds histogram")
+        for operation, histogram in sorted(snapshot['latency'].items()):
+            for bound, count in histogram['buckets']:
+                bound = "+Inf" if bound == float('inf') else repr(bound / 1e9)
+                lines.append(self._labelled('latency_seconds_bucket', count,
+                                            operation=operation, le=bound))
+            lines.append(self._labelled('latency_seconds_sum',
+                                        repr(histogram['sum_ns'] / 1e9),
+                                        operation=operation))
+            lines.append(self._labelled('latency_seconds_count',
+                                        histogram['count'],
+                                        operation=operation))
+        return "\n".join(lines) + "\n"
+
+    def __call__(self, snapshot: Dict[str, Any]) -> NoReturn:
+        """Writes the snapshot to the file, replacing it atomically."""
+
+        with open(self.__path + ".tmp", 'w') as file:
+            file.write(self.format(snapshot))
+        os.replace(self.__path + ".tmp", self.__path)
+
+
+class _InstrumentedMixin:
+    """Records the operations of a data structure in a Metrics object.
+
+    The base data structure (Stack, TypeRestrictedStack or Queue) does
+    the work, this class only counts and times its operations.
+    """
+
+    def __init__(self, *args: Any, metrics: Optional[Metrics] = None,
+                 **kwargs: Any) -> NoReturn:
+        super().__init__(*args, **kwargs)
+        self._metrics = metrics or Metrics()
+
+    @property
+    def metrics(self) -> Metrics:
+        """The metrics where the operations are recorded."""
+
+        return self._metrics
+
+    def _timed(self, operation: str, method: Callable, *args: Any) -> Any:
+        """Counts an operation and calls it, timing it if sampled."""
+
+        if self._metrics._count(operation):
+            start = perf_counter_ns()
+            try:
+                return method(*args)
+            finally:
+                self._metrics._observe(operation,
+                                       perf_counter_ns() - start)
+        return method(*args)
+
+    def push(self, new_item: Any) -> NoReturn:
+        self._timed('push', super().push, new_item)
+        self._metrics._observe_size(self.size())
+
+    def pop(self) -> Any:
+        return self._timed('pop', super().pop)
+
+    def peak(self) -> Any:
+        return self._timed('peak', super().peak)
+
+    def push_many(self, new_items: Iterable[Any]) -> NoReturn:
+        self._timed('push_many', super().push_many, new_items)
+        self._metrics._observe_size(self.size())
+
+    def pop_many(self, n: int) -> List[Any]:
+        return self._timed('pop_many', super().pop_many, n)
+
+    def drain(self) -> List[Any]:
+        return self._timed('drain', super().drain)
+
+
+class InstrumentedStack(_InstrumentedMixin, Stack):
+    """Stack that records its operations.
+
+    Every operation is counted in the metrics, the sampled ones are
+    timed, and the size high-water mark is updated after pushes.
+
+    Properties
+    ----------
+    metrics: Metrics
+        Read-only metrics where the operations are recorded.
+
+    Methods
+    -------
+    push:
+        Push a new item to the top of the stack.
+
+    pop:
+        Removes the top item from the stack and returns it.
+
+    peak:
+        Returns the top item of the stack without removing it.
+
+    size:
+        Length of the list of items currently in the stack.
+    """
+
+
+class InstrumentedTypeRestrictedStack(_InstrumentedMixin,
+                                      TypeRestrictedStack):
+    """Type restricted stack that records its operations and failures.
+
+    As InstrumentedStack, and items rejected by the type verification
+    are counted as validation failures.
+
+    Properties
+    ----------
+    metrics: Metrics
+        Read-only metrics where the operations are recorded.
+
+    acceptable_class: any class
+        This is an immutable property, any new item pushed to the stack
+        must be an instance of the acceptable class.
+
+    validation: str
+        Read-only validation mode, "strict", "exact" or "trusted".
+
+    Methods
+    -------
+    push:
+        Push a new item to the top of the stack, must be an instance of
+        the acceptable class.
+
+    pop:
+        Removes the top item from the stack and returns it.
+
+    peak:
+        Returns the top item of the stack without removing it.
+
+    size:
+        Length of the list of items currently in the stack.
+
+    type_verification:
+        Checks that an item is an instance of the acceptable class.
+
+    verify_types:
+        Verifies that all items in the stack are valid.
+    """
+
+    def type_verification(self, item: Any) -> NoReturn:
+        try:
+            super().type_verification(item)
+        except ValueError:
+            self._metrics._record_validation_failure(item)
+            raise
+
+
+class InstrumentedQueue(_InstrumentedMixin, Queue):
+    """Queue that records its operations and flushes.
+
+    As InstrumentedStack, and every flush of the input stack to the
+    output stack is counted with the amount of items it moves.
+
+    Properties
+    ----------
+    metrics: Metrics
+        Read-only metrics where the operations are recorded.
+
+    Methods
+    -------
+    push:
+        Push a new item to the right end of the queue.
+
+    pop:
+        Removes the left most item from the queue and returns it.
+
+    peak:
+        Returns the left most item of the queue without removing it.
+
+    size:
+        Length of the list of items currently in the queue.
+    """
+
+    def _flush_inputs_to_outputs(self) -> NoReturn:
+        n_items = self._input_stack.size()
+        super()._flush_inputs_to_outputs()
+        self._metrics._record_flush(n_items)
+
+
+_INSTRUMENTED = {Stack: InstrumentedStack,
+                 TypeRestrictedStack: InstrumentedTypeRestrictedStack,
+                 Queue: InstrumentedQueue}
+_PLAIN = {instrumented: plain for plain, instrumented in _INSTRUMENTED.items()}
+
+
+def instrument(structure: Any, metrics: Optional[Metrics] = None) -> Metrics:
+    """Turns a plain structure into its instrumented subclass, in place.
+
+    Parameters
+    ----------
+    structure: Stack, TypeRestrictedStack or Queue
+        A structure of exactly one of these classes, subclasses aren't
+        supported since they may store their items differently.
+
+    metrics: Metrics, optional
+        Where the operations are recorded. The default value is new
+        Metrics.
+
+    Returns
+    -------
+    metrics: Metrics
+        The metrics of the structure.
+
+    Raises
+    ------
+    TypeError:
+        If the structure is not a Stack, a TypeRestrictedStack or a
+        Queue.
+    """
+
+    try:
+        structure.__class__ = _INSTRUMENTED[type(structure)]
+    except KeyError:
+        raise TypeError("Can't instrument a "
+                        + type(structure).__name__) from None
+    structure._metrics = metrics or Metrics()
+    structure._metrics._observe_size(structure.size())
+    return structure._metrics
+
+
+def uninstrument(structure: Any) -> NoReturn:
+    """Turns an instrumented structure back into its plain class.
+
+    Parameters
+    ----------
+    structure: instrumented structure
+        A structure created by one of the instrumented classes, or
+        instrumented with instrument.
+
+    Raises
+    ------
+    TypeError:
+        If the structure is not instrumented.
+    """
+
+    try:
+        structure.__class__ = _PLAIN[type(structure)]
+    except KeyError:
+        raise TypeError(type(structure).__name__
+                        + " is not instrumented") from None
+    del structure._metrics
@@ -0,0 +1,367 @@
+"""Immutable data structures that share structure between versions.
+
+Classes
+-------
+
+PersistentStack:
+    Immutable stack where push and pop return new versions.
+
+PersistentQueue:
+    Immutable queue made of two persistent stacks.
+"""
+
+__all__ = ['PersistentStack', 'PersistentQueue']
+
+from typing import Any, Iterable, List, NoReturn, Optional
+from data_structures.queues import Queue
+from data_structures.stacks import Stack
+
+
+class _Node:
+    """Cell of a persistent stack, shared by all the versions using it."""
+
+    __slots__ = ('item', 'next', 'size')
+
+    def __init__(self, item: Any, next_node: Optional['_Node']) -> NoReturn:
+        self.item = item
+        self.next = next_node
+        self.size = 1 if next_node is None else next_node.size + 1
+
+
+def _top_items(node: Optional[_Node]) -> List[Any]:
+    """Items from node to the bottom, top item first."""
+
+    items = []
+    append = items.append
+    while node is not None:
+        append(node.item)
+        node = node.next
+    return items
+
+
+def _push_items(node: Optional[_Node],
+                new_items: Iterable[Any]) -> Optional[_Node]:
+    """Top node after pushing new_items on top of node."""
+
+    for item in new_items:
+        node = _Node(item, node)
+    return node
+
+
+class PersistentStack:
+    """Immutable stack where push and pop return new versions.
+
+    Items are stored in linked cells, and each version only holds the
+    top cell. Pushing links a new cell on top of the current one, and
+    popping returns the version below it, so both are O(1) and leave
+    the current version unchanged. Keeping a version is an O(1)
+    snapshot, useful for backtracking searches.
+
+    Methods
+    -------
+    push:
+        Returns a new version with an item on top.
+
+    pop:
+        Returns a new version without the top item.
+
+    peak:
+        Returns the top item of the stack without removing it.
+
+    size:
+        Amount of items in the stack.
+
+    push_many:
+        Returns a new version with several items on top.
+
+    to_stack:
+        Returns a mutable Stack with the same items.
+    """
+
+    __slots__ = ('_top',)
+
+    def __init__(self, items: Iterable[Any] = ()) -> NoReturn:
+        """Initializes the stack, pushing the items in order.
+
+        Parameters
+        ----------
+        items: iterable, optional
+            Items pushed to the stack, the last one ends on top. The
+            default value is no items.
+        """
+
+        self._top = _push_items(None, items)
+
+    @classmethod
+    def _from_node(cls, node: Optional[_Node]) -> 'PersistentStack':
+        stack = cls.__new__(cls)
+        stack._top = node
+        return stack
+
+    def push(self, new_item: Any) -> 'PersistentStack':
+        """Returns a new version with an item on top, in O(1).
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the stack, could be anything.
+
+        Returns
+        -------
+        new_stack: PersistentStack
+            The stack with new_item on top, this one is unchanged.
+        """
+
+        return self._from_node(_Node(new_item, self._top))
+
+    def pop(self) -> 'PersistentStack':
+        """Returns a new version without the top item, in O(1).
+
+        The top item is returned by peak.
+
+        Returns
+        -------
+        new_stack: PersistentStack
+            The stack without its top item, this one is unchanged.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        if self._top is None:
+            raise IndexError("Empty Stack")
+        return self._from_node(self._top.next)
+
+    def peak(self) -> Any:
+        """Returns the top item of the stack without removing it.
+
+        Returns
+        -------
+        top_item: Any
+            The top item of the stack.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        if self._top is None:
+            raise IndexError("Empty Stack")
+        return self._top.item
+
+    def size(self) -> int:
+        """Amount of items in the stack, in O(1)."""
+
+        return 0 if self._top is None else self._top.size
+
+    def push_many(self, new_items: Iterable[Any]) -> 'PersistentStack':
+        """Returns a new version with several items on top.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the stack, the last one ends on top.
+
+        Returns
+        -------
+        new_stack: PersistentStack
+            The stack with the new items on top, this one is unchanged.
+        """
+
+        return self._from_node(_push_items(self._top, new_items))
+
+    def to_stack(self) -> Stack:
+        """Returns a mutable Stack with the same items, in O(n).
+
+        Returns
+        -------
+        stack: Stack
+            A new Stack with the same items and the same top item.
+        """
+
+        items = _top_items(self._top)
+        items.reverse()
+        stack = Stack()
+        stack.push_many(items)
+        return stack
+
+    def __repr__(self) -> str:
+        if self._top is None:
+            return "Empty " + str(self.__class__.__name__)
+        items = _top_items(self._top)
+        items.reverse()
+        return (self.__class__.__name__ + " elements: "
+                + "; ".join([str(item) for item in items]))
+
+
+class PersistentQueue:
+    """Immutable queue made of two persistent stacks.
+
+    As in Queue, new items are pushed to an input stack and popped from
+    an output stack, and the input stack is reversed into the output
+    stack when the output stack runs out of items. The output stack is
+    only empty when the whole queue is empty, so peak is O(1). Push and
+    pop return new versions and share the stacks of this version.
+
+    Popping repeatedly from the same old version may reverse the same
+    input stack several times, so pop is amortized O(1) only when each
+    version is popped at most once.
+
+    Methods
+    -------
+    push:
+        Returns a new version with an item at the right end.
+
+    pop:
+        Returns a new version without the left most item.
+
+    peak:
+        Returns the left most item of the queue without removing it.
+
+    size:
+        Amount of items in the queue.
+
+    push_many:
+        Returns a new version with several items at the right end.
+
+    to_queue:
+        Returns a mutable Queue with the same items.
+    """
+
+    __slots__ = ('_input_stack', '_output_stack')
+
+    def __init__(self, items: Iterable[Any] = ()) -> NoReturn:
+        """Initializes the queue, pushing the items in order.
+
+        Parameters
+        ----------
+        items: iterable, optional
+            Items pushed to the queue, the first one ends at the left
+            end. The default value is no items.
+        """
+
+        self._input_stack = PersistentStack()
+        self._output_stack = PersistentStack(reversed(list(items)))
+
+    @classmethod
+    def _from_stacks(cls, input_stack: PersistentStack,
+                     output_stack: PersistentStack) -> 'PersistentQueue':
+        if output_stack.size() == 0 and input_stack.size() > 0:
+            output_stack = PersistentStack(_top_items(input_stack._top))
+            input_stack = PersistentStack()
+        queue = cls.__new__(cls)
+        queue._input_stack = input_stack
+        queue._output_stack = output_stack
+        return queue
+
+    def push(self, new_item: Any) -> 'PersistentQueue':
+        """Returns a new version with an item at the right end.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the queue, could be anything.
+
+        Returns
+        -------
+        new_queue: PersistentQueue
+            The queue with new_item at the right end, this one is
+            unchanged.
+        """
+
+        return self._from_stacks(self._input_stack.push(new_item),
+                                 self._output_stack)
+
+    def pop(self) -> 'PersistentQueue':
+        """Returns a new version without the left most item.
+
+        The left most item is returned by peak.
+
+        Returns
+        -------
+        new_queue: PersistentQueue
+            The queue without its left most item, this one is
+            unchanged.
+
+        Raises
+        ------
+        IndexError:
+            When the queue is empty.
+        """
+
+        if self._output_stack.size() == 0:
+            raise IndexError("The Queue is empty!")
+        return self._from_stacks(self._input_stack,
+                                 self._output_stack.pop())
+
+    def peak(self) -> Any:
+        """Returns the left most item of the queue without removing it.
+
+        Returns
+        -------
+        left_most_item: Any
+            The left most item of the queue.
+
+        Raises
+        ------
+        IndexError:
+            When the queue is empty.
+        """
+
+        if self._output_stack.size() == 0:
+            raise IndexError("The Queue is empty!")
+        return self._output_stack.peak()
+
+    def size(self) -> int:
+        """Amount of items in the queue, in O(1)."""
+
+        return self._input_stack.size() + self._output_stack.size()
+
+    def push_many(self, new_items: Iterable[Any]) -> 'PersistentQueue':
+        """Returns a new version with several items at the right end.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the queue, the first one is popped first.
+
+        Returns
+        -------
+        new_queue: PersistentQueue
+            The queue with the new items at the right end, this one is
+            unchanged.
+        """
+
+        return self._from_stacks(self._input_stack.push_many(new_items),
+                                 self._output_stack)
+
+    def _ordered_items(self) -> List[Any]:
+        """All items, from the left most to the right most."""
+
+        items = _top_items(self._output_stack._top)
+        input_items = _top_items(self._input_stack._top)
+        input_items.reverse()
+        items.extend(input_items)
+        return items
+
+    def to_queue(self) -> Queue:
+        """Returns a mutable Queue with the same items, in O(n).
+
+        Returns
+        -------
+        queue: Queue
+            A new Queue with the same items in the same order.
+        """
+
+        queue = Queue()
+        queue.push_many(self._ordered_items())
+        return queue
+
+    def __repr__(self) -> str:
+        if self.size() == 0:
+            return "Empty " + str(self.__class__.__name__)
+        return (self.__class__.__name__ + " elements: "
+                + "; ".join([str(item) for item in self._ordered_items()]))
@@ -0,0 +1,537 @@
+"""Streaming pipelines of stages connected by bounded queues.
+
+Classes
+-------
+
+Stage:
+    Function applied to every item of a pipeline by its own workers.
+
+Pipeline:
+    Stages that process a stream of items concurrently, in sequence.
+"""
+
+__all__ = ['Stage', 'Pipeline']
+
+from threading import Lock, Semaphore, Thread
+from time import perf_counter
+from types import GeneratorType
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, NoReturn,
+                    Optional, Sequence, Tuple, Union)
+from data_structures.queues import ConcurrentQueue
+from data_structures.work_stealing import ProcessAdapter
+
+# default maximum amount of items in each queue between stages
+MAXSIZE = 64
+
+# seconds a blocked worker waits before checking if the pipeline stops
+POLL_INTERVAL = 0.05
+
+_EXECUTORS = ("thread", "process")
+
+# marker pushed after the last item of a stream
+_END = object()
+
+
+def _outputs(function: Callable[[Any], Any], item: Any) -> List[Any]:
+    """Outputs of a function for an item, all those yielded if any."""
+
+    result = function(item)
+    if isinstance(result, GeneratorType):
+        return list(result)
+    return [result]
+
+
+class Stage:
+    """Function applied to every item of a pipeline by its own workers.
+
+    Functions return one output per item, while generator functions
+    yield zero or more outputs per item, to split or filter the items.
+    Stages with the "process" executor call the function in a pool of
+    processes, so the function, the items and the outputs must be
+    picklable.
+
+    Properties
+    ----------
+    function: callable
+        Read-only function applied to each item.
+
+    workers: int
+        Read-only amount of items processed at the same time.
+
+    executor: str
+        Read-only kind of workers, "thread" or "process".
+
+    ordered: bool
+        Read-only flag, True if the outputs keep the order of the
+        items.
+
+    name: str
+        Read-only name of the stage in the stats.
+    """
+
+    def __init__(self, function: Callable[[Any], Any], workers: int = 1,
+                 executor: str = "thread", ordered: bool = True,
+                 name: Optional[str] = None) -> NoReturn:
+        """Declares a stage.
+
+        Parameters
+        ----------
+        function: callable
+            Function applied to each item, a generator function to
+            yield any amount of outputs per item.
+
+        workers: int, optional
+            Amount of items processed at the same time, by threads or
+            by processes. The default value is 1.
+
+        executor: str, optional
+            "thread" to call the function in threads, "process" to call
+            it in a pool of processes. The default value is "thread".
+
+        ordered: bool, optional
+            If True, the outputs keep the order of the items, else
+            they are passed on as soon as they are ready. The default
+            value is True.
+
+        name: str, optional
+            Name of the stage in the stats. The default value is None,
+            for the name of the function.
+
+        Raises
+        ------
+        AssertionError:
+            If workers is not positive, or the executor is unknown.
+        """
+
+        assert workers > 0, "workers must be positive."
+        msg = "executor should be one of " + ", ".join(_EXECUTORS)
+        assert executor in _EXECUTORS, msg
+        self.__function = function
+        self.__workers = workers
+        self.__executor = executor
+        self.__ordered = ordered
+        if name is None:
+            name = getattr(function, '__name__', repr(function))
+        self.__name = name
+
+    @property
+    def function(self) -> Callable[[Any], Any]:
+        """Function applied to each item."""
+
+        return self.__function
+
+    @property
+    def workers(self) -> int:
+        """Amount of items processed at the same time."""
+
+        return self.__workers
+
+    @property
+    def executor(self) -> str:
+        """Kind of workers, "thread" or "process"."""
+
+        return self.__executor
+
+    @property
+    def ordered(self) -> bool:
+        """True if the outputs keep the order of the items."""
+
+        return self.__ordered
+
+    @property
+    def name(self) -> str:
+        """Name of the stage in the stats."""
+
+        return self.__name
+
+    def __repr__(self) -> str:
+        return (str(self.__class__.__name__) + " " + self.__name + " ("
+                + str(self.__workers) + " " + self.__executor + " workers)")
+
+
+class _WorkerStats:
+    """Counters of a stage worker, only updated by the worker's thread."""
+
+    __slots__ = ('processed', 'emitted', 'busy_seconds', 'max_queued')
+
+    def __init__(self) -> NoReturn:
+        self.processed = 0
+        self.emitted = 0
+        self.busy_seconds = 0.
+        self.max_queued = 0
+
+
+class _StageRun:
+    """State of a stage while a pipeline runs."""
+
+    def __init__(self, stage: Stage, inputs: ConcurrentQueue,
+                 outputs: ConcurrentQueue, maxsize: int) -> NoReturn:
+        self.stage = stage
+        self.inputs = inputs
+        self.outputs = outputs
+        self.stats = [_WorkerStats() for _ in range(stage.workers)]
+        self.lock = Lock()
+        self.active = stage.workers
+        self.next_output = 0
+        # outputs of the items that finished before the preceding ones,
+        # bounded by the amount of items allowed in the window
+        self.reordered: Dict[int, List[Any]] = {}
+        self.next_input = 0
+        # set when the end marker is pushed to the inputs, so it's not
+        # counted as a queued item
+        self.inputs_ended = False
+        self.window = Semaphore(max(maxsize, stage.workers)) \
+            if stage.ordered else None
+        self.adapter = ProcessAdapter(stage.workers) \
+            if stage.executor == "process" else None
+
+    def call(self, item: Any) -> List[Any]:
+        """Outputs of the function of the stage for an item."""
+
+        if self.adapter is None:
+            return _outputs(self.stage.function, item)
+        return self.adapter(_outputs, self.stage.function, item)
+
+
+class Pipeline:
+    """Stages that process a stream of items concurrently, in sequence.
+
+    Each stage has its own workers, threads or processes, that take
+    items from a bounded ConcurrentQueue and push their outputs to the
+    queue of the next stage. When a stage is slower than the previous
+    one its queue fills up, and the previous stage waits for room, so
+    memory stays bounded. Ordered stages pass on the outputs in the
+    order of the items, keeping at most maxsize items in flight.
+
+    The first exception raised by a function, or by the iteration of
+    the items, stops every stage and is raised by the iteration of the
+    results. Stages also stop when the results are no longer iterated.
+
+    Properties
+    ----------
+    stages: tuple of Stage
+        Read-only stages of the pipeline, in order.
+
+    maxsize: int
+        Read-only maximum amount of items in each queue.
+
+    Methods
+    -------
+    run:
+        Iterates over the outputs of the last stage for some items.
+
+    stats:
+        Dictionary with the throughput and queue depth of each stage.
+    """
+
+    def __init__(self, stages: Sequence[Union[Stage, Callable[[Any], Any]]],
+                 maxsize: int = MAXSIZE) -> NoReturn:
+        """Initializes the stages.
+
+        Parameters
+        ----------
+        stages: sequence
+            Stages of the pipeline, in order, functions are run as
+            stages with a single thread.
+
+        maxsize: int, optional
+            Maximum amount of items in each queue. The default value is
+            MAXSIZE.
+
+        Raises
+        ------
+        AssertionError:
+            If there are no stages, or maxsize is not positive.
+        """
+
+        assert len(stages) > 0, "A pipeline needs at least one stage."
+        assert maxsize > 0, "maxsize must be positive."
+        self.__stages = tuple(stage if isinstance(stage, Stage)
+                              else Stage(stage) for stage in stages)
+        self.__maxsize = maxsize
+        self._lock = Lock()
+        self._running = False
+        self._runs: List[_StageRun] = []
+        self._results: Optional[ConcurrentQueue] = None
+        self._threads: List[Thread] = []
+        self._stopping = False
+        self._error: Optional[BaseException] = None
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    @property
+    def stages(self) -> Tuple[Stage, ...]:
+        """Stages of the pipeline, in order."""
+
+        return self.__stages
+
+    @property
+    def maxsize(self) -> int:
+        """Maximum amount of items in each queue."""
+
+        return self.__maxsize
+
+    def _fail(self, error: BaseException) -> NoReturn:
+        """Keeps the first error and stops every stage."""
+
+        with self._lock:
+            if self._error is None:
+                self._error = error
+            self._stopping = True
+
+    def _push(self, queue: ConcurrentQueue, entry: Any) -> bool:
+        """Pushes an entry, waiting for room until the pipeline stops.
+
+        Returns
+        -------
+        pushed: bool
+            False if the pipeline stopped before there was room.
+        """
+
+        while not self._stopping:
+            try:
+                queue.push(entry, timeout=POLL_INTERVAL)
+                return True
+            except OverflowError:
+                pass
+        return False
+
+    def _pop(self, queue: ConcurrentQueue) -> Any:
+        """Pops an entry, waiting for one until the pipeline stops.
+
+        Returns
+        -------
+        entry: Any
+            The entry, or None if the pipeline stopped before there was
+            one.
+        """
+
+        while not self._stopping:
+            try:
+                return queue.pop(timeout=POLL_INTERVAL)
+            except IndexError:
+                pass
+        return None
+
+    def _acquire(self, window: Semaphore) -> bool:
+        """Acquires a place in the window until the pipeline stops."""
+
+        while not self._stopping:
+            if window.acquire(timeout=POLL_INTERVAL):
+                return True
+        return False
+
+    def _feed(self, items: Iterable[Any], queue: ConcurrentQueue
+              ) -> NoReturn:
+        """Pushes the items, numbered in order, to the first queue."""
+
+        try:
+            for entry in enumerate(items):
+                if not self._push(queue, entry):
+                    return
+        except BaseException as error:
+            self._fail(error)
+            return
+        self._end(queue)
+
+    def _end(self, queue: ConcurrentQueue) -> NoReturn:
+        """Pushes the end marker after the last item of a queue."""
+
+        for run in self._runs:
+            if run.inputs is queue:
+                run.inputs_ended = True
+        self._push(queue, _END)
+
+    def _emit(self, run: _StageRun, number: int, outputs: List[Any]
+              ) -> bool:
+        """Pushes the outputs of an item to the next queue.
+
+        The outputs are numbered again in the order they are pushed, so
+        the next stage can restore it. Ordered stages keep the outputs
+        of an item until the outputs of the preceding items are
+        pushed.
+
+        Returns
+        -------
+        pushed: bool
+            False if the pipeline stopped before the outputs were
+            pushed.
+        """
+
+        with run.lock:
+            if run.window is None:
+                ready = [outputs]
+            else:
+                run.reordered[number] = outputs
+                ready = []
+                while run.next_input in run.reordered:
+                    ready.append(run.reordered.pop(run.next_input))
+                    run.next_input += 1
+            for item_outputs in ready:
+                for output in item_outputs:
+                    if not self._push(run.outputs, (run.next_output, output)):
+                        return False
+                    run.next_output += 1
+                if run.window is not None:
+                    run.window.release()
+        return True
+
+    def _work(self, run: _StageRun, index: int) -> NoReturn:
+        """Processes items of a stage until the end of the stream."""
+
+        stats = run.stats[index]
+        while True:
+            if run.window is not None and not self._acquire(run.window):
+                return
+            entry = self._pop(run.inputs)
+            if entry is None:
+                return
+            if entry is _END:
+                # the other workers of the stage must see the end too
+                self._push(run.inputs, _END)
+                if run.window is not None:
+                    run.window.release()
+                break
+            # the popped item is counted, the end marker is not
+            queued = run.inputs.size() + 1 - run.inputs_ended
+            stats.max_queued = max(stats.max_queued, queued)
+            number, item = entry
+            start = perf_counter()
+            try:
+                outputs = run.call(item)
+            except BaseException as error:
+                self._fail(error)
+                return
+            stats.busy_seconds += perf_counter() - start
+            stats.processed += 1
+            stats.emitted += len(outputs)
+            if not self._emit(run, number, outputs):
+                return
+        with run.lock:
+            run.active -= 1
+            last = run.active == 0
+        if last:
+            # removes the end marker the workers left for each other
+            run.inputs.try_pop()
+            self._end(run.outputs)
+
+    def _start(self, items: Iterable[Any]) -> NoReturn:
+        """Creates the queues and the stages and starts their threads."""
+
+        self._stopping = False
+        self._error = None
+        self._started = perf_counter()
+        self._finished = None
+        queues = [ConcurrentQueue(self.__maxsize)
+                  for _ in range(len(self.__stages) + 1)]
+        self._runs = [_StageRun(stage, inputs, outputs, self.__maxsize)
+                      for stage, inputs, outputs
+                      in zip(self.__stages, queues, queues[1:])]
+        self._results = queues[-1]
+        self._threads = [Thread(target=self._feed, args=(items, queues[0]),
+                                name="Pipeline-feed", daemon=True)]
+        for run in self._runs:
+            self._threads.extend(
+                Thread(target=self._work, args=(run, index),
+                       name="Pipeline-" + run.stage.name + "-" + str(index),
+                       daemon=True)
+                for index in range(run.stage.workers))
+        for thread in self._threads:
+            thread.start()
+
+    def _stop(self) -> NoReturn:
+        """Stops the stages and waits for their threads and processes."""
+
+        self._stopping = True
+        for thread in self._threads:
+            thread.join()
+        for run in self._runs:
+            if run.adapter is not None:
+                run.adapter.shutdown()
+        self._finished = perf_counter()
+        with self._lock:
+            self._running = False
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Iterates over the outputs of the last stage for some items.
+
+        The stages start when the iteration starts, and the items are
+        iterated over in a thread of their own. A pipeline runs once at
+        a time.
+
+        Parameters
+        ----------
+        items: iterable
+            Items processed by the first stage.
+
+        Yields
+        ------
+        output: Any
+            Outputs of the last stage, in the order of the items if
+            every stage is ordered.
+
+        Raises
+        ------
+        RuntimeError:
+            If the pipeline is already running.
+
+        Exception:
+            The first exception raised by a function of a stage, or by
+            the iteration of the items.
+        """
+
+        with self._lock:
+            if self._running:
+                raise RuntimeError("The Pipeline is already running")
+            self._running = True
+        try:
+            self._start(items)
+            while True:
+                entry = self._pop(self._results)
+                if entry is None or entry is _END:
+                    break
+                yield entry[1]
+        finally:
+            self._stop()
+        if self._error is not None:
+            raise self._error
+
+    def stats(self) -> Dict[str, Any]:
+        """Dictionary with the throughput and queue depth of each stage.
+
+        Returns
+        -------
+        metrics: dict
+            'elapsed' seconds of the last run, until now if it's still
+            running, and 'stages' with a dictionary for each stage: its
+            'name' and 'workers', the items it 'processed' and the
+            outputs it 'emitted', its 'busy_seconds', its 'throughput'
+            in items per second, and the items 'queued' for it now and
+            at most ('max_queued'). 'results_queued' is the amount of
+            outputs not iterated over yet.
+        """
+
+        if self._started is None:
+            elapsed = 0.
+        else:
+            elapsed = (self._finished or perf_counter()) - self._started
+        stages = []
+        for run in self._runs:
+            processed = sum(stats.processed for stats in run.stats)
+            stages.append({
+                'name': run.stage.name,
+                'workers': run.stage.workers,
+                'processed': processed,
+                'emitted': sum(stats.emitted for stats in run.stats),
+                'busy_seconds': sum(stats.busy_seconds
+                                    for stats in run.stats),
+                'throughput': processed / elapsed if elapsed else 0.,
+                'queued': run.inputs.size(),
+                'max_queued': max(stats.max_queued for stats in run.stats)})
+        results_queued = 0 if self._results is None else self._results.size()
+        return {'elapsed': elapsed, 'stages': stages,
+                'results_queued': results_queued}
+
+    def __repr__(self) -> str:
+        return (str(self.__class__.__name__) + ": "
+                + " -> ".join(stage.name for stage in self.__stages))
@@ -0,0 +1,539 @@
+"""Priority-ordered data structures.
+
+Classes
+-------
+
+PriorityQueue:
+    Min-priority queue implemented as a d-ary heap.
+
+IndexedPriorityQueue:
+    Priority queue with handles to update or remove pushed items.
+"""
+
+__all__ = ['PriorityQueue', 'IndexedPriorityQueue']
+
+from typing import Any, Callable, Iterable, List, NoReturn, Optional
+from data_structures.elements import Number
+
+
+def _number_key(item: Any) -> Any:
+    """Raw value of Number items, other items are their own key."""
+
+    if isinstance(item, Number):
+        return item.number
+    return item
+
+
+class PriorityQueue:
+    """Min-priority queue implemented as a d-ary heap.
+
+    Items are kept in a flat list ordered as a heap where each node has
+    up to 'arity' children. The keys of the items are computed once on
+    push and stored in a parallel list, so the heap compares raw keys:
+    Number items are ordered by their raw values, other items are
+    ordered by themselves unless a key function is given.
+
+    Properties
+    ----------
+    arity: int
+        Read-only amount of children of each node of the heap.
+
+    Methods
+    -------
+    push:
+        Push a new item to the queue.
+
+    pop:
+        Removes the item with the lowest key and returns it.
+
+    peak:
+        Returns the item with the lowest key without removing it.
+
+    size:
+        Length of the list of items currently in the queue.
+
+    push_many:
+        Push several items to the queue.
+
+    pop_many:
+        Removes the n items with the lowest keys and returns them.
+
+    drain:
+        Removes all items from the queue and returns them in order.
+    """
+
+    _tracks_positions = False
+
+    def __init__(self, items: Iterable[Any] = (), arity: int = 2,
+                 key: Optional[Callable[[Any], Any]] = None) -> NoReturn:
+        """Initializes the heap, heapifying the initial items in O(n).
+
+        Parameters
+        ----------
+        items: iterable, optional
+            Initial items of the queue. The default value is no items.
+
+        arity: int, optional
+            Amount of children of each node of the heap, at least 2.
+            The default value is 2, for a binary heap.
+
+        key: callable, optional
+            Function that returns the key of an item. The default value
+            uses the raw value of Number items, and the items themselves
+            otherwise.
+
+        Raises
+        ------
+        AssertionError:
+            If arity is lower than 2.
+        """
+
+        assert arity >= 2, "The arity of the heap must be at least 2."
+        self.__arity = arity
+        self._key = key or _number_key
+        self._keys = []
+        self._items = []
+        self.push_many(items)
+
+    @property
+    def arity(self) -> int:
+        """Amount of children of each node of the heap."""
+
+        return self.__arity
+
+    def _entry(self, item: Any) -> Any:
+        """What the heap stores for an item."""
+
+        return item
+
+    def _item(self, entry: Any) -> Any:
+        """The item stored in a heap entry."""
+
+        return entry
+
+    def _sift_up(self, position: int) -> NoReturn:
+        """Moves the entry at position up until its parent is lower."""
+
+        keys = self._keys
+        entries = self._items
+        key = keys[position]
+        entry = entries[position]
+        arity = self.__arity
+        tracks_positions = self._tracks_positions
+        while position > 0:
+            parent = (position - 1) // arity
+            if not key < keys[parent]:
+                break
+            keys[position] = keys[parent]
+            entries[position] = entries[parent]
+            if tracks_positions:
+                entries[position].position = position
+            position = parent
+        keys[position] = key
+        entries[position] = entry
+        if tracks_positions:
+            entry.position = position
+
+    def _sift_down(self, position: int) -> NoReturn:
+        """Moves the entry at position down until its children are higher."""
+
+        keys = self._keys
+        entries = self._items
+        key = keys[position]
+        entry = entries[position]
+        arity = self.__arity
+        tracks_positions = self._tracks_positions
+        n_entries = len(keys)
+        while True:
+            first_child = position * arity + 1
+            if first_child >= n_entries:
+                break
+            child = first_child
+            child_key = keys[first_child]
+            for other in range(first_child + 1,
+                               min(first_child + arity, n_entries)):
+                if keys[other] < child_key:
+                    child = other
+                    child_key = keys[other]
+            if not child_key < key:
+                break
+            keys[position] = child_key
+            entries[position] = entries[child]
+            if tracks_positions:
+                entries[position].position = position
+            position = child
+        keys[position] = key
+        entries[position] = entry
+        if tracks_positions:
+            entry.position = position
+
+    def _heapify(self) -> NoReturn:
+        """Orders all the entries as a heap, in O(n)."""
+
+        for position in reversed(range((len(self._keys) - 2)
+                                       // self.__arity + 1)):
+            self._sift_down(position)
+
+    def _push_entry(self, item: Any) -> Any:
+        """Appends the entry for an item and sifts it up."""
+
+        entry = self._entry(item)
+        self._keys.append(self._key(item))
+        self._items.append(entry)
+        self._sift_up(len(self._keys) - 1)
+        return entry
+
+    def _remove_at(self, position: int) -> Any:
+        """Removes the entry at position and returns it."""
+
+        keys = self._keys
+        entries = self._items
+        last_key = keys.pop()
+        last_entry = entries.pop()
+        if position == len(keys):
+            if self._tracks_positions:
+                last_entry.position = -1
+            return last_entry
+        entry = entries[position]
+        keys[position] = last_key
+        entries[position] = last_entry
+        if self._tracks_positions:
+            entry.position = -1
+            last_entry.position = position
+        if position > 0 and last_key < keys[(position - 1) // self.__arity]:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+        return entry
+
+    def push(self, new_item: Any) -> NoReturn:
+        """Push a new item to the queue, in O(log n).
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the queue, its key must be comparable
+            with the keys of the other items.
+        """
+
+        self._push_entry(new_item)
+
+    def pop(self) -> Any:
+        """Removes the item with the lowest key and returns it.
+
+        Returns
+        -------
+        lowest_item: Any
+            The item with the lowest key, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the queue is empty.
+        """
+
+        if not self._keys:
+            raise IndexError("The PriorityQueue is empty!")
+        return self._item(self._remove_at(0))
+
+    def peak(self) -> Any:
+        """Returns the item with the lowest key without removing it.
+
+        Returns
+        -------
+        lowest_item: Any
+            The item with the lowest key.
+
+        Raises
+        ------
+        IndexError:
+            When the queue is empty.
+        """
+
+        try:
+            return self._item(self._items[0])
+        except IndexError:
+            raise IndexError("The PriorityQueue is empty!")
+
+    def size(self) -> int:
+        """Length of the list of items currently in the queue."""
+
+        return len(self._keys)
+
+    def push_many(self, new_items: Iterable[Any]) -> NoReturn:
+        """Push several items to the queue.
+
+        When there are more new items than items in the queue, the
+        whole heap is rebuilt in O(n), else they are pushed one by one.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the queue, their keys must be comparable
+            with the keys of the other items.
+        """
+
+        self._push_entries(new_items)
+
+    def _push_entries(self, new_items: Iterable[Any]) -> List[Any]:
+        """Pushes several items and returns their entries, in order."""
+
+        new_items = list(new_items)
+        if len(new_items) <= len(self._keys):
+            return [self._push_entry(item) for item in new_items]
+        key = self._key
+        new_entries = [self._entry(item) for item in new_items]
+        self._keys.extend([key(item) for item in new_items])
+        self._items.extend(new_entries)
+        if self._tracks_positions:
+            for position, entry in enumerate(self._items):
+                entry.position = position
+        self._heapify()
+        return new_entries
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n items with the lowest keys and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        lowest_items: list
+            The n items with the lowest keys, in the order they would
+            have been popped one by one.
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the queue has less than n items. The queue is left
+            unchanged.
+        """
+
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        if n > len(self._keys):
+            raise IndexError("Not enough items in the PriorityQueue")
+        return [self._item(self._remove_at(0)) for _ in range(n)]
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the queue and returns them in order."""
+
+        return self.pop_many(len(self._keys))
+
+    def __repr__(self) -> str:
+        if self.size() == 0:
+            return "Empty " + str(self.__class__.__name__)
+        return (self.__class__.__name__ + " elements: "
+                + "; ".join([str(self._item(entry))
+                             for entry in self._items]))
+
+
+class _Handle:
+    """Reference to an item pushed to an IndexedPriorityQueue."""
+
+    __slots__ = ('item', 'position')
+
+    def __init__(self, item: Any) -> NoReturn:
+        self.item = item
+        self.position = -1
+
+    def __repr__(self) -> str:
+        return f"Handle({self.item!r})"
+
+
+class IndexedPriorityQueue(PriorityQueue):
+    """Priority queue with handles to update or remove pushed items.
+
+    Pushing an item returns a handle, which tracks the position of the
+    item in the heap. Handles allow changing the key of an item or
+    removing it in O(log n), as needed by Dijkstra-like searches and
+    schedulers.
+
+    No handles are returned for the items passed to the constructor,
+    so they can only be popped. Items pushed with push_many keep their
+    handles.
+
+    Properties
+    ----------
+    arity: int
+        Read-only amount of children of each node of the heap.
+
+    Methods
+    -------
+    push:
+        Push a new item to the queue and returns its handle.
+
+    push_many:
+        Push several items to the queue and returns their handles.
+
+    pop:
+        Removes the item with the lowest key and returns it.
+
+    peak:
+        Returns the item with the lowest key without removing it.
+
+    size:
+        Length of the list of items currently in the queue.
+
+    update:
+        Replaces the item of a handle, with any new key.
+
+    decrease_key:
+        Replaces the item of a handle, with a key that is not higher.
+
+    remove:
+        Removes the item of a handle and returns it.
+
+    contains:
+        Checks if the item of a handle is in the queue.
+    """
+
+    _tracks_positions = True
+
+    def _entry(self, item: Any) -> _Handle:
+        return _Handle(item)
+
+    def _item(self, entry: _Handle) -> Any:
+        return entry.item
+
+    def _position(self, handle: _Handle) -> int:
+        """Position of a handle in the heap.
+
+        Raises
+        ------
+        ValueError:
+            When the item of the handle is not in the queue.
+        """
+
+        position = handle.position
+        if (position < 0 or position >= len(self._items)
+                or self._items[position] is not handle):
+            raise ValueError("The handle is not in the PriorityQueue")
+        return position
+
+    def push(self, new_item: Any) -> _Handle:
+        """Push a new item to the queue and returns its handle.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the queue, its key must be comparable
+            with the keys of the other items.
+
+        Returns
+        -------
+        handle: Handle
+            Reference to the item, to update or remove it later.
+        """
+
+        return self._push_entry(new_item)
+
+    def push_many(self, new_items: Iterable[Any]) -> List[_Handle]:
+        """Push several items to the queue and returns their handles.
+
+        When there are more new items than items in the queue, the
+        whole heap is rebuilt in O(n), else they are pushed one by one.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the queue, their keys must be comparable
+            with the keys of the other items.
+
+        Returns
+        -------
+        handles: list of Handles
+            Reference to each item, in the order of the new items.
+        """
+
+        return self._push_entries(new_items)
+
+    def contains(self, handle: _Handle) -> bool:
+        """Checks if the item of a handle is in the queue."""
+
+        try:
+            self._position(handle)
+        except ValueError:
+            return False
+        return True
+
+    def update(self, handle: _Handle, new_item: Any) -> NoReturn:
+        """Replaces the item of a handle, with any new key, in O(log n).
+
+        Parameters
+        ----------
+        handle: Handle
+            Handle returned when the item was pushed.
+
+        new_item: any
+            The item that replaces the item of the handle.
+
+        Raises
+        ------
+        ValueError:
+            When the item of the handle is not in the queue.
+        """
+
+        position = self._position(handle)
+        new_key = self._key(new_item)
+        old_key = self._keys[position]
+        handle.item = new_item
+        self._keys[position] = new_key
+        if new_key < old_key:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def decrease_key(self, handle: _Handle, new_item: Any) -> NoReturn:
+        """Replaces the item of a handle, with a key that is not higher.
+
+        Parameters
+        ----------
+        handle: Handle
+            Handle returned when the item was pushed.
+
+        new_item: any
+            The item that replaces the item of the handle, its key
+            can't be higher than the key of the current item.
+
+        Raises
+        ------
+        ValueError:
+            When the item of the handle is not in the queue, or when
+            the new key is higher than the current key.
+        """
+
+        position = self._position(handle)
+        new_key = self._key(new_item)
+        if self._keys[position] < new_key:
+            raise ValueError("The new key is higher than the current key")
+        handle.item = new_item
+        self._keys[position] = new_key
+        self._sift_up(position)
+
+    def remove(self, handle: _Handle) -> Any:
+        """Removes the item of a handle and returns it, in O(log n).
+
+        Parameters
+        ----------
+        handle: Handle
+            Handle returned when the item was pushed.
+
+        Returns
+        -------
+        item: Any
+            The item of the handle, prior to removal.
+
+        Raises
+        ------
+        ValueError:
+            When the item of the handle is not in the queue.
+        """
+
+        return self._item(self._remove_at(self._position(handle)))
@@ -5,12 +5,42 @@ Classes
 
 Queue:
     Basic queue data structure.
+
+AggregatingQueue:
+    Queue that keeps a running aggregate of its items.
+
+SlidingWindow:
+    Aggregating queue that evicts items by count or by age.
+
+ConcurrentQueue:
+    Thread-safe, optionally bounded, blocking queue.
+
+SharedNumberQueue:
+    Inter-process ring queue of real numbers in shared memory.
+
+SegmentedQueue:
+    Queue stored in fixed-size blocks of items.
+
+RingQueue:
+    Fixed-capacity queue stored in a preallocated circular buffer.
 """
 
-__all__ = ['Queue']
+__all__ = ['Queue', 'AggregatingQueue', 'SlidingWindow', 'ConcurrentQueue',
+           'SharedNumberQueue', 'SegmentedQueue', 'RingQueue']
 
-from data_structures.stacks import Stack
-from typing import Any, NoReturn
+import multiprocessing
+from array import array
+from functools import partial
+from itertools import chain, islice
+from multiprocessing import shared_memory
+from threading import Condition, Lock
+from time import monotonic
+from data_structures.elements import (Number, _pack_items, _read_packed,
+                                      _unpack_items)
+from data_structures.stacks import (Stack, AggregateStack, NumericStack,
+                                    SegmentedStack)
+from typing import (Any, NoReturn, Iterable, Iterator, List, Callable,
+                    Optional, Tuple, Union, BinaryIO, Dict)
 
 
 class Queue:
@@ -22,8 +52,20 @@ class Queue:
       - items can only be removed from the queue from the "left".
 
     Queues in this class are implemented via 2 stacks, an input stack
-    and an output stack. When popping from an output stack, the input
-    stack must be flushed to the output stack.
+    and an output stack. When popping from an empty output stack, the
+    input stack must be flushed to the output stack. Every item is
+    moved between the stacks at most once, so push, pop and peak run
+    in amortized O(1) time.
+
+    Iterating over a queue yields its items from the left most to the
+    right most without removing them, and repr shows up to repr_limit
+    items of each stack.
+
+    Properties
+    ----------
+    repr_limit: int or None
+        Maximum amount of items of each stack shown by repr, None to
+        show all of them. It can be set on the class or on each queue.
 
     Methods
     -------
@@ -38,8 +80,40 @@ class Queue:
 
     size:
         Length of the list of items currently in the queue.
+
+    push_many:
+        Push several items to the right end of the queue, in order.
+
+    extend:
+        Alias of push_many.
+
+    pop_many:
+        Removes the n left most items from the queue and returns them.
+
+    drain:
+        Removes all items from the queue and returns them.
+
+    peak_many:
+        Returns the n left most items without removing them.
+
+    iter_drain:
+        Removes the items from the queue one by one as they are used.
+
+    to_bytes:
+        Returns the items of the queue packed as bytes.
+
+    from_bytes:
+        Returns a new queue with the items packed in some bytes.
+
+    dump:
+        Writes the items of the queue packed as bytes to a binary file.
+
+    load:
+        Returns a new queue with the items packed in a binary file.
     """
 
+    repr_limit = 20
+
     def __init__(self) -> NoReturn:
         """Iinitializes the input and output stacks."""
 
@@ -61,14 +135,26 @@ class Queue:
     def _flush_inputs_to_outputs(self) -> NoReturn:
         """Pushes all items in the input stack to the output stack.
 
-        This function leaves the input stack empty, popping each and
-        every element from the input stack and pushing it to the output
-        stack.
+        This function leaves the input stack empty, moving each and
+        every element from the input stack to the output stack in
+        reversed order, as if they were popped and pushed one by one.
+        The items are moved with a single batch operation instead of
+        a pop/push pair per item.
+        """
+
+        self._output_stack.push_many(self._input_stack.drain())
+
+    def _prepare_outputs(self) -> NoReturn:
+        """Flushes the input stack only when the output stack is empty.
+
+        Items already in the output stack are older than every item in
+        the input stack, so they must be served first. Flushing only
+        when the output stack runs out keeps the FIFO order and moves
+        each item at most once.
         """
 
-        size_of_input_stack = self._input_stack.size()
-        for _ in range(size_of_input_stack):
-            self._output_stack.push(self._input_stack.pop())
+        if self._output_stack.size() == 0:
+            self._flush_inputs_to_outputs()
 
     def peak(self) -> Any:
         """Returns the left most item of the queue without removing it.
@@ -84,7 +170,7 @@ class Queue:
             When the queue is empty.
         """
 
-        self._flush_inputs_to_outputs()
+        self._prepare_outputs()
         try:
             return self._output_stack.peak()
         except IndexError:
@@ -104,7 +190,7 @@ class Queue:
             When the queue is empty.
         """
 
-        self._flush_inputs_to_outputs()
+        self._prepare_outputs()
         try:
             return self._output_stack.pop()
         except IndexError:
@@ -115,12 +201,1917 @@ class Queue:
 
         return self._input_stack.size() + self._output_stack.size()
 
+    def push_many(self, new_items: Iterable[Any]) -> NoReturn:
+        """Push several items to the right end of the queue, in order.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the right end of the queue, could be
+            anything.
+        """
+
+        self._input_stack.push_many(new_items)
+
+    def extend(self, new_items: Iterable[Any]) -> NoReturn:
+        """Alias of push_many."""
+
+        self.push_many(new_items)
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n left most items from the queue and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        left_items: list
+            The n left most items, in the order they would have been
+            popped one by one (the left most item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the queue has less than n items. The queue is left
+            unchanged.
+        """
+
+        if n > self.size():
+            raise IndexError("Not enough items in the Queue")
+        left_items = self._output_stack.pop_many(
+            min(n, self._output_stack.size()))
+        if len(left_items) < n:
+            self._flush_inputs_to_outputs()
+            missing = n - len(left_items)
+            left_items.extend(self._output_stack.pop_many(missing))
+        return left_items
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the queue and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the queue, in the order they would have been
+            popped one by one (the left most item first).
+        """
+
+        items = self._output_stack.drain()
+        input_items = self._input_stack.drain()
+        input_items.reverse()
+        items.extend(input_items)
+        return items
+
+    def peak_many(self, n: int) -> List[Any]:
+        """Returns the n left most items without removing them.
+
+        The items are read from both stacks, without flushing the input
+        stack to the output stack.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to return.
+
+        Returns
+        -------
+        left_items: list
+            The n left most items, in the order they would have been
+            popped one by one (the left most item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the queue has less than n items.
+        """
+
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        if n > self.size():
+            raise IndexError("Not enough items in the Queue")
+        return list(islice(self, n))
+
+    def iter_drain(self) -> Iterator[Any]:
+        """Removes the items from the queue one by one as they are used.
+
+        Unlike drain, the items are popped lazily, so the items that
+        are not used yet stay in the queue.
+
+        Yields
+        ------
+        left_item: Any
+            The left most item of the queue, until the queue is empty.
+        """
+
+        while self.size() > 0:
+            yield self.pop()
+
+    def __len__(self) -> int:
+        return self.size()
+
+    def __bool__(self) -> bool:
+        return self.size() > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterates over the items from the left most to the right most.
+
+        The items are read from both stacks, without flushing the input
+        stack to the output stack.
+        """
+
+        return chain(self._output_stack, reversed(self._input_stack))
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Iterates over the items from the right most to the left most."""
+
+        return chain(self._input_stack, reversed(self._output_stack))
+
     def __repr__(self) -> str:
         if self.size() == 0:
             return "Empty " + str(self.__class__.__name__)
         print_val = ("Queue elements:\n"
                      + "\tInput stack:\n\t\t"
-                     + str(self._input_stack)
+                     + self._input_stack._repr_items(self.repr_limit)
                      + "\n\tOutput stack:\n\t\t"
-                     + str(self._output_stack))
+                     + self._output_stack._repr_items(self.repr_limit))
         return print_val
+
+    def to_bytes(self) -> bytes:
+        """Returns the items of the queue packed as bytes.
+
+        Floats, ints and Numbers are packed as fixed-width values when
+        all the items are of the same kind, any other items are
+        pickled. The queue is left unchanged.
+
+        Returns
+        -------
+        data: bytes
+            The items from the left to the right, with a short header.
+        """
+
+        return _pack_items(list(self))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, *args: Any, **kwargs: Any) -> 'Queue':
+        """Returns a new queue with the items packed in some bytes.
+
+        Parameters
+        ----------
+        data: bytes
+            Bytes returned by the to_bytes method of a queue.
+
+        *args, **kwargs:
+            Arguments to initialize the new queue with.
+
+        Raises
+        ------
+        ValueError:
+            If the bytes were not returned by to_bytes, or are
+            truncated.
+        """
+
+        queue = cls(*args, **kwargs)
+        queue.push_many(_unpack_items(data)[0])
+        return queue
+
+    def dump(self, file: BinaryIO) -> NoReturn:
+        """Writes the items of the queue packed as bytes to a binary file.
+
+        Parameters
+        ----------
+        file: binary file
+            File opened for writing, the items are written at its
+            current position.
+        """
+
+        file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, file: BinaryIO, *args: Any, **kwargs: Any) -> 'Queue':
+        """Returns a new queue with the items packed in a binary file.
+
+        Parameters
+        ----------
+        file: binary file
+            File opened for reading, at the position where dump wrote
+            the items.
+
+        *args, **kwargs:
+            Arguments to initialize the new queue with.
+
+        Raises
+        ------
+        ValueError:
+            If the file doesn't hold packed items at its position.
+        """
+
+        return cls.from_bytes(_read_packed(file), *args, **kwargs)
+
+
+def _apply_flipped(operation: Callable[[Any, Any], Any], left: Any,
+                   right: Any) -> Any:
+    """Applies the operation with its operands swapped."""
+
+    return operation(right, left)
+
+
+def _flipped(operation: Callable[[Any, Any], Any]
+             ) -> Callable[[Any, Any], Any]:
+    """Returns the operation with its operands swapped.
+
+    It's a partial of a module level function, so it can be pickled
+    along with the queue when the operation can.
+    """
+
+    return partial(_apply_flipped, operation)
+
+
+class AggregatingQueue(Queue):
+    """Queue that keeps a running aggregate of its items.
+
+    Both internal stacks are aggregate stacks: the input stack
+    aggregates from the oldest to the newest item, and the output stack
+    aggregates from its top (the left most item) to its bottom. The
+    aggregate of the whole queue combines both, in amortized constant
+    time. The operation must be associative, e.g. addition, min or
+    max, but it doesn't need to be commutative.
+
+    Properties
+    ----------
+    operation: callable
+        Read-only binary operation used to aggregate the items.
+
+    Methods
+    -------
+    push:
+        Push a new item to the right end of the queue.
+
+    pop:
+        Removes the left most item from the queue and returns it.
+
+    peak:
+        Returns the left most item of the queue without removing it.
+
+    size:
+        Length of the list of items currently in the queue.
+
+    aggregate:
+        Aggregate of all the items currently in the queue.
+    """
+
+    def __init__(self, operation: Callable[[Any, Any], Any]) -> NoReturn:
+        """Initializes the input and output aggregate stacks.
+
+        Parameters
+        ----------
+        operation: callable
+            Associative binary operation, it takes the aggregate of
+            the older items and a newer item, and returns the new
+            aggregate.
+        """
+
+        super().__init__()
+        self.__operation = operation
+        self._input_stack = AggregateStack(operation)
+        self._output_stack = AggregateStack(_flipped(operation))
+
+    @property
+    def operation(self) -> Callable[[Any, Any], Any]:
+        """Binary operation used to aggregate the items."""
+
+        return self.__operation
+
+    def aggregate(self) -> Any:
+        """Aggregate of all the items currently in the queue.
+
+        Returns
+        -------
+        aggregate: Any
+            The result of applying the operation from the left most
+            item to the right most item.
+
+        Raises
+        ------
+        IndexError:
+            When the queue is empty.
+        """
+
+        if self._input_stack.size() == 0:
+            try:
+                return self._output_stack.aggregate()
+            except IndexError:
+                raise IndexError("The Queue is empty!")
+        if self._output_stack.size() == 0:
+            return self._input_stack.aggregate()
+        return self.__operation(self._output_stack.aggregate(),
+                                self._input_stack.aggregate())
+
+
+class SlidingWindow(AggregatingQueue):
+    """Aggregating queue that evicts items by count or by age.
+
+    Count-based windows keep only the max_items most recent items.
+    Time-based windows keep only the items pushed less than max_age
+    time units ago, the age is measured with a clock (time.monotonic
+    by default) or with explicit timestamps. Both limits can be used
+    together.
+
+    Properties
+    ----------
+    max_items: int or None
+        Read-only maximum amount of items in the window.
+
+    max_age: float or None
+        Read-only maximum age of the items in the window.
+
+    Methods
+    -------
+    push:
+        Push a new item to the right end of the window, evicting the
+        items outside the window.
+
+    pop:
+        Removes the left most item from the window and returns it.
+
+    peak:
+        Returns the left most item of the window without removing it.
+
+    size:
+        Length of the list of items currently in the window.
+
+    evict:
+        Removes the items that are outside the window.
+
+    aggregate:
+        Aggregate of all the items currently in the window.
+    """
+
+    def __init__(self, operation: Callable[[Any, Any], Any],
+                 max_items: Optional[int] = None,
+                 max_age: Optional[float] = None,
+                 clock: Callable[[], float] = monotonic) -> NoReturn:
+        """Initializes an empty sliding window.
+
+        Parameters
+        ----------
+        operation: callable
+            Associative binary operation, it takes the aggregate of
+            the older items and a newer item, and returns the new
+            aggregate.
+
+        max_items: int, optional
+            Maximum amount of items in the window. The default value
+            is None, for no limit.
+
+        max_age: float, optional
+            Maximum age of the items in the window, in the units of
+            the clock. The default value is None, for no limit.
+
+        clock: callable, optional
+            Function that returns the current time. The default value
+            is time.monotonic.
+
+        Raises
+        ------
+        AssertionError:
+            If max_items or max_age are not positive.
+        """
+
+        msg = "Sliding window limits must be positive."
+        assert max_items is None or max_items > 0, msg
+        assert max_age is None or max_age > 0, msg
+        super().__init__(operation)
+        self.__max_items = max_items
+        self.__max_age = max_age
+        self._clock = clock
+        self._timestamps = Queue() if max_age is not None else None
+
+    @property
+    def max_items(self) -> Optional[int]:
+        """Maximum amount of items in the window."""
+
+        return self.__max_items
+
+    @property
+    def max_age(self) -> Optional[float]:
+        """Maximum age of the items in the window."""
+
+        return self.__max_age
+
+    def push(self, new_item: Any,
+             timestamp: Optional[float] = None) -> NoReturn:
+        """Push a new item to the right end of the window.
+
+        Items outside the window are evicted after the push.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the right end of the window, it must be
+            a valid operand of the operation.
+
+        timestamp: float, optional
+            Time of the push, the default value is the current time of
+            the clock. Only used by time-based windows.
+        """
+
+        super().push(new_item)
+        if self._timestamps is not None:
+            if timestamp is None:
+                timestamp = self._clock()
+            self._timestamps.push(timestamp)
+        self.evict(timestamp)
+
+    def push_many(self, new_items: Iterable[Any],
+                  timestamp: Optional[float] = None) -> NoReturn:
+        """Push several items to the right end of the window, in order.
+
+        Items outside the window are evicted after the push.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the right end of the window, they must be
+            valid operands of the operation.
+
+        timestamp: float, optional
+            Time of the push for all the items, the default value is
+            the current time of the clock. Only used by time-based
+            windows.
+        """
+
+        new_items = list(new_items)
+        super().push_many(new_items)
+        if self._timestamps is not None:
+            if timestamp is None:
+                timestamp = self._clock()
+            self._timestamps.push_many([timestamp] * len(new_items))
+        self.evict(timestamp)
+
+    def pop(self) -> Any:
+        """Removes the left most item from the window and returns it.
+
+        Returns
+        -------
+        left_item: Any
+            The left most item of the window, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the window is empty.
+        """
+
+        left_item = super().pop()
+        if self._timestamps is not None:
+            self._timestamps.pop()
+        return left_item
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n left most items from the window and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        left_items: list
+            The n left most items, in the order they would have been
+            popped one by one (the left most item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the window has less than n items. The window is left
+            unchanged.
+        """
+
+        left_items = super().pop_many(n)
+        if self._timestamps is not None:
+            self._timestamps.pop_many(n)
+        return left_items
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the window and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the window, in the order they would have been
+            popped one by one (the left most item first).
+        """
+
+        if self._timestamps is not None:
+            self._timestamps.drain()
+        return super().drain()
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Removes the items that are outside the window.
+
+        Parameters
+        ----------
+        now: float, optional
+            Current time, the default value is the current time of the
+            clock. Only used by time-based windows.
+
+        Returns
+        -------
+        evicted: int
+            Amount of items removed from the window.
+        """
+
+        evicted = 0
+        if self.__max_items is not None:
+            excess = self.size() - self.__max_items
+            if excess > 0:
+                self.pop_many(excess)
+                evicted += excess
+        if self._timestamps is not None:
+            if now is None:
+                now = self._clock()
+            limit = now - self.__max_age
+            timestamps = self._timestamps
+            while timestamps.size() > 0 and timestamps.peak() <= limit:
+                self.pop()
+                evicted += 1
+        return evicted
+
+    def aggregate(self, now: Optional[float] = None) -> Any:
+        """Aggregate of all the items currently in the window.
+
+        Time-based windows evict the expired items first.
+
+        Parameters
+        ----------
+        now: float, optional
+            Current time, the default value is the current time of the
+            clock. Only used by time-based windows.
+
+        Returns
+        -------
+        aggregate: Any
+            The result of applying the operation from the left most
+            item to the right most item.
+
+        Raises
+        ------
+        IndexError:
+            When the window is empty.
+        """
+
+        if self._timestamps is not None:
+            self.evict(now)
+        return super().aggregate()
+
+
+def _deadline(timeout: Optional[float]) -> Optional[float]:
+    """Returns the monotonic time after a timeout, None for no timeout."""
+
+    return None if timeout is None else monotonic() + timeout
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    """Returns the time left until a deadline, None for no deadline."""
+
+    return None if deadline is None else max(0., deadline - monotonic())
+
+
+def _acquire(lock: Lock, deadline: Optional[float]) -> bool:
+    """Acquires a lock, waiting at most until the deadline."""
+
+    if deadline is None:
+        return lock.acquire()
+    return lock.acquire(timeout=_remaining(deadline))
+
+
+class ConcurrentQueue(Queue):
+    """Thread-safe, optionally bounded, blocking queue.
+
+    Producers and consumers use separate locks, following the split of
+    the input and output stacks: producers only lock the input stack,
+    and consumers lock the output stack, locking the input stack only
+    when the output stack runs out and must be refilled. Consumers
+    wait for items without holding the output lock, so a consumer
+    waiting on an empty queue never blocks try_pop, peak, drain or
+    iteration in other threads. Waiting threads are only notified
+    when there are threads waiting.
+
+    Properties
+    ----------
+    maxsize: int or None
+        Read-only maximum amount of items in the queue, None for an
+        unbounded queue.
+
+    Methods
+    -------
+    push:
+        Push a new item to the right end of the queue, waiting for
+        space if the queue is full.
+
+    pop:
+        Removes the left most item from the queue and returns it,
+        waiting for an item if the queue is empty.
+
+    peak:
+        Returns the left most item of the queue without removing it.
+
+    size:
+        Length of the list of items currently in the queue.
+
+    try_push:
+        Push a new item only if there is space, without waiting.
+
+    try_pop:
+        Removes and returns the left most item only if there is one,
+        without waiting.
+
+    push_many:
+        Push several items to the right end of the queue, in order.
+
+    pop_many:
+        Removes up to n left most items from the queue and returns
+        them, waiting for at least one.
+
+    drain:
+        Removes all items from the queue and returns them.
+
+    iter_drain:
+        Removes the items from the queue one by one as they are used,
+        until the queue is empty.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None) -> NoReturn:
+        """Initializes the stacks, the locks and the conditions.
+
+        Parameters
+        ----------
+        maxsize: int, optional
+            Maximum amount of items in the queue. The default value is
+            None, for an unbounded queue.
+
+        Raises
+        ------
+        AssertionError:
+            If maxsize is not positive.
+        """
+
+        assert maxsize is None or maxsize > 0, "maxsize must be positive."
+        super().__init__()
+        self.__maxsize = maxsize
+        self._input_lock = Lock()
+        self._output_lock = Lock()
+        self._not_empty = Condition(self._input_lock)
+        self._not_full = Condition(self._input_lock)
+        self._waiting_consumers = 0
+        self._waiting_producers = 0
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """Maximum amount of items in the queue."""
+
+        return self.__maxsize
+
+    def _wait_for_space(self, n_items: int, block: bool,
+                        deadline: Optional[float]) -> NoReturn:
+        """Waits until n_items fit in the queue, with the input lock held.
+
+        The waiting counter is increased before checking the size, so
+        a consumer that pops an item either sees the waiting producer
+        or the producer sees the popped item.
+
+        Raises
+        ------
+        OverflowError:
+            When the items don't fit before the deadline, or right away
+            if block is False.
+        """
+
+        self._waiting_producers += 1
+        try:
+            while self.size() + n_items > self.__maxsize:
+                remaining = _remaining(deadline)
+                if not block or remaining == 0:
+                    raise OverflowError("The Queue is full!")
+                self._not_full.wait(remaining)
+        finally:
+            self._waiting_producers -= 1
+
+    def _notify_producers(self) -> NoReturn:
+        """Wakes up the producers waiting for space, if any."""
+
+        if self._waiting_producers:
+            with self._input_lock:
+                self._not_full.notify_all()
+
+    def _refill(self) -> bool:
+        """Flushes the input stack, with the output lock held.
+
+        Returns
+        -------
+        refilled: bool
+            False if the input stack was empty.
+        """
+
+        with self._input_lock:
+            if self._input_stack.size() == 0:
+                return False
+            self._flush_inputs_to_outputs()
+        return True
+
+    def _wait_for_items(self, block: bool,
+                        deadline: Optional[float]) -> NoReturn:
+        """Waits until the queue has items, without the output lock.
+
+        The output lock is not held while waiting, so other consumers
+        can still pop, peak or drain without waiting.
+
+        Raises
+        ------
+        IndexError:
+            When there are no items before the deadline, or right away
+            if block is False.
+        """
+
+        with self._input_lock:
+            self._waiting_consumers += 1
+            try:
+                while self.size() == 0:
+                    remaining = _remaining(deadline)
+                    if not block or remaining == 0:
+                        raise IndexError("The Queue is empty!")
+                    self._not_empty.wait(remaining)
+            finally:
+                self._waiting_consumers -= 1
+
+    def _take(self, n: Optional[int], block: bool,
+              timeout: Optional[float]) -> Any:
+        """Removes the left most item, or up to n left most items.
+
+        The output lock is only held while items are taken, consumers
+        wait for items without it.
+
+        Raises
+        ------
+        IndexError:
+            When the queue is empty until the timeout, or when it's
+            empty and block is False.
+        """
+
+        deadline = _deadline(timeout)
+        output_stack = self._output_stack
+        while True:
+            if not _acquire(self._output_lock, deadline):
+                raise IndexError("The Queue is empty!")
+            try:
+                if output_stack.size() or self._refill():
+                    if n is None:
+                        taken = output_stack.pop()
+                    else:
+                        taken = output_stack.pop_many(
+                            min(n, output_stack.size()))
+                        if len(taken) < n and self._refill():
+                            missing = min(n - len(taken),
+                                          output_stack.size())
+                            taken.extend(output_stack.pop_many(missing))
+                    break
+            finally:
+                self._output_lock.release()
+            self._wait_for_items(block, deadline)
+        self._notify_producers()
+        return taken
+
+    def push(self, new_item: Any, block: bool = True,
+             timeout: Optional[float] = None) -> NoReturn:
+        """Push a new item to the right end of the queue.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the right end of the queue, could be
+            anything.
+
+        block: bool, optional
+            If False, fails right away when the queue is full. The
+            default value is True.
+
+        timeout: float, optional
+            Maximum time to wait for space, in seconds. The default
+            value is None, to wait without limit.
+
+        Raises
+        ------
+        OverflowError:
+            When the queue is full until the timeout, or when it's full
+            and block is False.
+        """
+
+        deadline = _deadline(timeout)
+        if not _acquire(self._input_lock, deadline):
+            raise OverflowError("The Queue is full!")
+        try:
+            if self.__maxsize is not None:
+                self._wait_for_space(1, block, deadline)
+            self._input_stack.push(new_item)
+            if self._waiting_consumers:
+                self._not_empty.notify()
+        finally:
+            self._input_lock.release()
+
+    def push_many(self, new_items: Iterable[Any], block: bool = True,
+                  timeout: Optional[float] = None) -> NoReturn:
+        """Push several items to the right end of the queue, in order.
+
+        The items are pushed all together, once there is space for all
+        of them.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the right end of the queue, could be
+            anything.
+
+        block: bool, optional
+            If False, fails right away when the items don't fit. The
+            default value is True.
+
+        timeout: float, optional
+            Maximum time to wait for space, in seconds. The default
+            value is None, to wait without limit.
+
+        Raises
+        ------
+        ValueError:
+            When there are more items than the maximum size.
+
+        OverflowError:
+            When the items don't fit until the timeout, or when they
+            don't fit and block is False.
+        """
+
+        new_items = list(new_items)
+        if self.__maxsize is not None and len(new_items) > self.__maxsize:
+            raise ValueError("More items than the maximum size")
+        deadline = _deadline(timeout)
+        if not _acquire(self._input_lock, deadline):
+            raise OverflowError("The Queue is full!")
+        try:
+            if self.__maxsize is not None:
+                self._wait_for_space(len(new_items), block, deadline)
+            self._input_stack.push_many(new_items)
+            if self._waiting_consumers:
+                # each new item may satisfy a waiting consumer
+                self._not_empty.notify(len(new_items))
+        finally:
+            self._input_lock.release()
+
+    def pop(self, block: bool = True,
+            timeout: Optional[float] = None) -> Any:
+        """Removes the left most item from the queue and returns it.
+
+        Parameters
+        ----------
+        block: bool, optional
+            If False, fails right away when the queue is empty. The
+            default value is True.
+
+        timeout: float, optional
+            Maximum time to wait for an item, in seconds. The default
+            value is None, to wait without limit.
+
+        Returns
+        -------
+        left_item: Any
+            The left most item of the queue, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the queue is empty until the timeout, or when it's
+            empty and block is False.
+        """
+
+        return self._take(None, block, timeout)
+
+    def pop_many(self, n: int, block: bool = True,
+                 timeout: Optional[float] = None) -> List[Any]:
+        """Removes up to n left most items from the queue.
+
+        Waits until there is at least one item, then takes as many
+        items as available, up to n.
+
+        Parameters
+        ----------
+        n: int
+            Maximum amount of items to remove, must be positive.
+
+        block: bool, optional
+            If False, fails right away when the queue is empty. The
+            default value is True.
+
+        timeout: float, optional
+            Maximum time to wait for an item, in seconds. The default
+            value is None, to wait without limit.
+
+        Returns
+        -------
+        left_items: list
+            Between 1 and n left most items, in the order they would
+            have been popped one by one (the left most item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is not positive.
+
+        IndexError:
+            When the queue is empty until the timeout, or when it's
+            empty and block is False.
+        """
+
+        if n <= 0:
+            raise ValueError("n must be a positive integer")
+        return self._take(n, block, timeout)
+
+    def try_push(self, new_item: Any) -> bool:
+        """Push a new item only if there is space, without waiting.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the right end of the queue, could be
+            anything.
+
+        Returns
+        -------
+        pushed: bool
+            True if the item was pushed, False if the queue was full.
+        """
+
+        try:
+            self.push(new_item, block=False)
+        except OverflowError:
+            return False
+        return True
+
+    def try_pop(self, default: Any = None) -> Any:
+        """Removes and returns the left most item, without waiting.
+
+        Parameters
+        ----------
+        default: any, optional
+            Value returned when the queue is empty. The default value
+            is None.
+
+        Returns
+        -------
+        left_item: Any
+            The left most item of the queue prior to removal, or the
+            default value if the queue was empty.
+        """
+
+        try:
+            return self.pop(block=False)
+        except IndexError:
+            return default
+
+    def peak(self) -> Any:
+        """Returns the left most item of the queue without removing it.
+
+        Returns
+        -------
+        left_item: Any
+            The left most item of the queue.
+
+        Raises
+        ------
+        IndexError:
+            When the queue is empty.
+        """
+
+        with self._output_lock:
+            if self._output_stack.size() == 0 and not self._refill():
+                raise IndexError("The Queue is empty!")
+            return self._output_stack.peak()
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the queue and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the queue, in the order they would have been
+            popped one by one (the left most item first).
+        """
+
+        with self._output_lock:
+            with self._input_lock:
+                items = super().drain()
+                self._not_full.notify_all()
+        return items
+
+    def iter_drain(self) -> Iterator[Any]:
+        """Removes the items from the queue one by one as they are used.
+
+        Stops as soon as the queue is empty, without waiting for new
+        items.
+
+        Yields
+        ------
+        left_item: Any
+            The left most item of the queue, until the queue is empty.
+        """
+
+        while True:
+            try:
+                yield self.pop(block=False)
+            except IndexError:
+                return
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterates over a snapshot of the items, from the left most.
+
+        The items are copied while holding both locks, which consumers
+        waiting for items release, so the iteration never waits for new
+        items.
+        """
+
+        with self._output_lock:
+            with self._input_lock:
+                items = list(super().__iter__())
+        return iter(items)
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Iterates over a snapshot of the items, from the right most."""
+
+        with self._output_lock:
+            with self._input_lock:
+                items = list(super().__reversed__())
+        return iter(items)
+
+
+_CAPACITY, _HEAD, _TAIL = range(3)
+_HEADER_SIZE = 3 * 8
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attaches to an existing shared memory block, without tracking it.
+
+    Only the process that created the block should unlink it, so it's
+    not registered with the resource tracker when possible.
+    """
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedNumberQueue:
+    """Inter-process ring queue of real numbers in shared memory.
+
+    Items are stored as doubles in a fixed-capacity ring buffer, in a
+    multiprocessing.shared_memory block, so they are copied between
+    processes without pickling. One process pushes items and one or
+    more processes pop them, consumers are synchronized with a lock.
+    Instances can be passed to other processes when starting them,
+    they attach to the same shared memory block.
+
+    Instances of Number, int and float can be pushed, and they are
+    handed back as Number instances (or as raw floats, if the queue is
+    created with raw=True). Operations don't wait: pushing to a full
+    queue raises OverflowError and popping from an empty queue raises
+    IndexError.
+
+    Properties
+    ----------
+    capacity: int
+        Read-only maximum amount of items in the queue.
+
+    name: str
+        Read-only name of the shared memory block.
+
+    raw: bool
+        Read-only flag, if True raw floats are returned instead of
+        Number instances.
+
+    Methods
+    -------
+    push:
+        Push a new real number to the right end of the queue.
+
+    pop:
+        Removes the left most item from the queue and returns it.
+
+    peak:
+        Returns the left most item of the queue without removing it.
+
+    size:
+        Length of the list of items currently in the queue.
+
+    push_many:
+        Push several real numbers to the right end of the queue.
+
+    pop_many:
+        Removes up to n left most items from the queue.
+
+    drain:
+        Removes all items from the queue and returns them.
+
+    close:
+        Detaches this process from the shared memory block.
+
+    unlink:
+        Destroys the shared memory block, only for the creator.
+    """
+
+    def __init__(self, capacity: int, raw: bool = False) -> NoReturn:
+        """Creates a shared memory block for the queue.
+
+        Parameters
+        ----------
+        capacity: int
+            Maximum amount of items in the queue.
+
+        raw: bool, optional
+            If True, items are returned as raw floats instead of
+            Number instances. The default value is False.
+
+        Raises
+        ------
+        AssertionError:
+            If capacity is not positive.
+        """
+
+        assert capacity > 0, "capacity must be positive."
+        memory = shared_memory.SharedMemory(
+            create=True, size=_HEADER_SIZE + 8 * capacity)
+        header = memory.buf[:_HEADER_SIZE].cast('q')
+        header[_CAPACITY] = capacity
+        header[_HEAD] = 0
+        header[_TAIL] = 0
+        header.release()
+        self._setup(memory, raw, multiprocessing.Lock(), owner=True)
+
+    def _setup(self, memory: shared_memory.SharedMemory, raw: bool,
+               lock: Any, owner: bool) -> NoReturn:
+        """Maps the header and the ring buffer of the memory block."""
+
+        self._memory = memory
+        self._header = memory.buf[:_HEADER_SIZE].cast('q')
+        self._capacity = self._header[_CAPACITY]
+        self._buffer = memory.buf[
+            _HEADER_SIZE:_HEADER_SIZE + 8 * self._capacity].cast('d')
+        self._lock = lock
+        self._owner = owner
+        self.__raw = raw
+
+    @classmethod
+    def _attach(cls, name: str, raw: bool,
+                lock: Any) -> 'SharedNumberQueue':
+        """Attaches to the shared memory block of another instance."""
+
+        queue = cls.__new__(cls)
+        queue._setup(_attach_shared_memory(name), raw, lock, owner=False)
+        return queue
+
+    def __reduce__(self) -> Tuple[Callable, Tuple[str, bool, Any]]:
+        return self._attach, (self.name, self.__raw, self._lock)
+
+    @property
+    def capacity(self) -> int:
+        """Maximum amount of items in the queue."""
+
+        return self._capacity
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+
+        return self._memory.name
+
+    @property
+    def raw(self) -> bool:
+        """If True raw floats are returned instead of Number instances."""
+
+        return self.__raw
+
+    def size(self) -> int:
+        """Length of the list of items currently in the queue."""
+
+        return self._header[_TAIL] - self._header[_HEAD]
+
+    def push(self, new_item: Union[Number, int, float]) -> NoReturn:
+        """Push a new real number to the right end of the queue.
+
+        Only one process should push items to the queue.
+
+        Parameters
+        ----------
+        new_item: Number, int or float
+            A real number to push to the right end of the queue.
+
+        Raises
+        ------
+        ValueError:
+            If the new_item is not a Number, int or float.
+
+        OverflowError:
+            When the queue is full.
+        """
+
+        value = NumericStack._to_value(new_item)
+        header = self._header
+        tail = header[_TAIL]
+        if tail - header[_HEAD] >= self._capacity:
+            raise OverflowError("The Queue is full!")
+        self._buffer[tail % self._capacity] = value
+        header[_TAIL] = tail + 1
+
+    def push_many(self,
+                  new_items: Iterable[Union[Number, int, float]]
+                  ) -> NoReturn:
+        """Push several real numbers to the right end of the queue.
+
+        The items are copied in at most two contiguous slices. Arrays
+        of doubles are copied directly. Only one process should push
+        items to the queue.
+
+        Parameters
+        ----------
+        new_items: iterable of Number, int or float
+            Real numbers to push to the right end of the queue.
+
+        Raises
+        ------
+        ValueError:
+            If any of the new items is not a Number, int or float.
+
+        OverflowError:
+            When there is no space for all the items. The queue is left
+            unchanged.
+        """
+
+        if not (isinstance(new_items, array) and new_items.typecode == 'd'):
+            new_items = array(
+                'd', [NumericStack._to_value(item) for item in new_items])
+        n_items = len(new_items)
+        header = self._header
+        capacity = self._capacity
+        tail = header[_TAIL]
+        if tail - header[_HEAD] + n_items > capacity:
+            raise OverflowError("The Queue is full!")
+        values = memoryview(new_items)
+        start = tail % capacity
+        first = min(n_items, capacity - start)
+        self._buffer[start:start + first] = values[:first]
+        if first < n_items:
+            self._buffer[:n_items - first] = values[first:]
+        header[_TAIL] = tail + n_items
+
+    def _take(self, n: int, remove: bool) -> array:
+        """Copies up to n left most values, with the lock held."""
+
+        header = self._header
+        capacity = self._capacity
+        head = header[_HEAD]
+        n = min(n, header[_TAIL] - head)
+        if n <= 0:
+            raise IndexError("The Queue is empty!")
+        values = array('d', bytes(8 * n))
+        start = head % capacity
+        first = min(n, capacity - start)
+        target = memoryview(values)
+        target[:first] = self._buffer[start:start + first]
+        if first < n:
+            target[first:] = self._buffer[:n - first]
+        if remove:
+            header[_HEAD] = head + n
+        return values
+
+    def _to_items(self, values: array) -> List[Union[Number, float]]:
+        """Converts raw values to Number instances, unless the queue is raw."""
+
+        values = values.tolist()
+        if self.__raw:
+            return values
+        return [Number(value) for value in values]
+
+    def pop(self) -> Union[Number, float]:
+        """Removes the left most item from the queue and returns it.
+
+        Returns
+        -------
+        left_item: Number or float
+            The left most item of the queue, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the queue is empty.
+        """
+
+        with self._lock:
+            return self._to_items(self._take(1, True))[0]
+
+    def peak(self) -> Union[Number, float]:
+        """Returns the left most item of the queue without removing it.
+
+        Returns
+        -------
+        left_item: Number or float
+            The left most item of the queue.
+
+        Raises
+        ------
+        IndexError:
+            When the queue is empty.
+        """
+
+        with self._lock:
+            return self._to_items(self._take(1, False))[0]
+
+    def pop_many(self, n: int) -> List[Union[Number, float]]:
+        """Removes up to n left most items from the queue.
+
+        The items are copied in at most two contiguous slices.
+
+        Parameters
+        ----------
+        n: int
+            Maximum amount of items to remove, must be positive.
+
+        Returns
+        -------
+        left_items: list
+            Between 1 and n left most items, in the order they would
+            have been popped one by one (the left most item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is not positive.
+
+        IndexError:
+            When the queue is empty.
+        """
+
+        if n <= 0:
+            raise ValueError("n must be a positive integer")
+        with self._lock:
+            return self._to_items(self._take(n, True))
+
+    def drain(self) -> List[Union[Number, float]]:
+        """Removes all items from the queue and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the queue, in the order they would have been
+            popped one by one (the left most item first).
+        """
+
+        with self._lock:
+            try:
+                return self._to_items(self._take(self._capacity, True))
+            except IndexError:
+                return []
+
+    def close(self) -> NoReturn:
+        """Detaches this process from the shared memory block."""
+
+        self._header.release()
+        self._buffer.release()
+        self._memory.close()
+
+    def unlink(self) -> NoReturn:
+        """Destroys the shared memory block, only for the creator.
+
+        Raises
+        ------
+        RuntimeError:
+            When called from an instance that attached to the block.
+        """
+
+        if not self._owner:
+            raise RuntimeError("Only the creator can unlink the Queue")
+        self._memory.unlink()
+
+    def __enter__(self) -> 'SharedNumberQueue':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> NoReturn:
+        """Closes the queue, and destroys it if this is the creator."""
+
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(capacity={self._capacity}, "
+                f"size={self.size()})")
+
+
+class SegmentedQueue(Queue):
+    """Queue stored in fixed-size blocks of items.
+
+    Both internal stacks are segmented stacks, so pushes never copy
+    the items already in the queue, and memory is released as the
+    queue drains. Flushing the input stack moves one block at a time.
+
+    Properties
+    ----------
+    block_size: int
+        Read-only amount of items in each block.
+
+    Methods
+    -------
+    push:
+        Push a new item to the right end of the queue.
+
+    pop:
+        Removes the left most item from the queue and returns it.
+
+    peak:
+        Returns the left most item of the queue without removing it.
+
+    size:
+        Length of the list of items currently in the queue.
+    """
+
+    def __init__(self, block_size: int = 1024,
+                 max_spare_blocks: int = 1) -> NoReturn:
+        """Initializes the input and output segmented stacks.
+
+        Parameters
+        ----------
+        block_size: int, optional
+            Amount of items in each block. The default value is 1024.
+
+        max_spare_blocks: int, optional
+            Amount of empty blocks kept for reuse by each stack. The
+            default value is 1.
+        """
+
+        super().__init__()
+        self._input_stack = SegmentedStack(block_size, max_spare_blocks)
+        self._output_stack = SegmentedStack(block_size, max_spare_blocks)
+
+    @property
+    def block_size(self) -> int:
+        """Amount of items in each block."""
+
+        return self._input_stack.block_size
+
+    def _flush_inputs_to_outputs(self) -> NoReturn:
+        """Pushes all items in the input stack to the output stack.
+
+        Items are moved one block at a time, so no list with all the
+        items is built.
+        """
+
+        input_stack = self._input_stack
+        output_stack = self._output_stack
+        while input_stack.size() > 0:
+            output_stack.push_many(input_stack.pop_block())
+
+
+_OVERFLOW_POLICIES = ("raise", "drop_newest", "overwrite_oldest", "block")
+
+
+class RingQueue(Queue):
+    """Fixed-capacity queue stored in a preallocated circular buffer.
+
+    Items are kept in a list of capacity slots allocated once, so the
+    memory of the queue never grows, and push, pop and peak run in O(1)
+    time without allocating. Popped slots are cleared, so popped items
+    are not kept alive by the buffer. Operations are thread-safe.
+
+    The overflow policy sets what happens when pushing to a full queue:
+      - "raise": the push fails with OverflowError,
+      - "drop_newest": the new items are discarded,
+      - "overwrite_oldest": the left most items are discarded to make
+        room for the new ones,
+      - "block": the push waits until consumers make room.
+    Discarded items are counted in dropped or overwritten.
+
+    Properties
+    ----------
+    capacity: int
+        Read-only maximum amount of items in the queue.
+
+    policy: str
+        Read-only overflow policy, "raise", "drop_newest",
+        "overwrite_oldest" or "block".
+
+    dropped: int
+        Read-only amount of new items discarded by the "drop_newest"
+        policy.
+
+    overwritten: int
+        Read-only amount of items discarded by the "overwrite_oldest"
+        policy.
+
+    Methods
+    -------
+    push:
+        Push a new item to the right end of the queue, applying the
+        overflow policy if the queue is full.
+
+    pop:
+        Removes the left most item from the queue and returns it.
+
+    peak:
+        Returns the left most item of the queue without removing it.
+
+    size:
+        Length of the list of items currently in the queue.
+
+    push_many:
+        Push several items to the right end of the queue, in order.
+
+    pop_many:
+        Removes the n left most items from the queue and returns them.
+
+    drain:
+        Removes all items from the queue and returns them.
+    """
+
+    def __init__(self, capacity: int, policy: str = "raise") -> NoReturn:
+        """Preallocates the circular buffer.
+
+        Parameters
+        ----------
+        capacity: int
+            Maximum amount of items in the queue.
+
+        policy: str, optional
+            Overflow policy, "raise", "drop_newest", "overwrite_oldest"
+            or "block". The default value is "raise".
+
+        Raises
+        ------
+        AssertionError:
+            If capacity is not positive, or if the policy is unknown.
+        """
+
+        assert capacity > 0, "capacity must be positive."
+        msg = "policy should be one of " + ", ".join(_OVERFLOW_POLICIES)
+        assert policy in _OVERFLOW_POLICIES, msg
+        self.__capacity = capacity
+        self.__policy = policy
+        self._buffer = [None] * capacity
+        self._head = 0
+        self._size = 0
+        self._dropped = 0
+        self._overwritten = 0
+        self._lock = Lock()
+        self._not_full = Condition(self._lock)
+        self._waiting_producers = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum amount of items in the queue."""
+
+        return self.__capacity
+
+    @property
+    def policy(self) -> str:
+        """Overflow policy of the queue."""
+
+        return self.__policy
+
+    @property
+    def dropped(self) -> int:
+        """Amount of new items discarded because the queue was full."""
+
+        return self._dropped
+
+    @property
+    def overwritten(self) -> int:
+        """Amount of items discarded to make room for new items."""
+
+        return self._overwritten
+
+    def _make_room(self, n_items: int, deadline: Optional[float]) -> int:
+        """Applies the overflow policy, with the lock held.
+
+        Parameters
+        ----------
+        n_items: int
+            Amount of new items, at most the capacity.
+
+        deadline: float or None
+            Monotonic time to stop waiting for room, for the "block"
+            policy.
+
+        Returns
+        -------
+        n_kept: int
+            Amount of the new items that fit in the queue.
+
+        Raises
+        ------
+        OverflowError:
+            When the items don't fit with the "raise" policy, or don't
+            fit before the deadline with the "block" policy.
+        """
+
+        free = self.__capacity - self._size
+        if n_items <= free:
+            return n_items
+        policy = self.__policy
+        if policy == "drop_newest":
+            self._dropped += n_items - free
+            return free
+        if policy == "overwrite_oldest":
+            self._remove(n_items - free)
+            self._overwritten += n_items - free
+            return n_items
+        if policy == "raise":
+            raise OverflowError("The Queue is full!")
+        self._waiting_producers += 1
+        try:
+            while self.__capacity - self._size < n_items:
+                remaining = _remaining(deadline)
+                if remaining == 0:
+                    raise OverflowError("The Queue is full!")
+                self._not_full.wait(remaining)
+        finally:
+            self._waiting_producers -= 1
+        return n_items
+
+    def _write(self, items: List[Any]) -> NoReturn:
+        """Writes items after the right most one, with the lock held."""
+
+        capacity = self.__capacity
+        tail = (self._head + self._size) % capacity
+        first = min(len(items), capacity - tail)
+        self._buffer[tail:tail + first] = items[:first]
+        self._buffer[:len(items) - first] = items[first:]
+        self._size += len(items)
+
+    def _read(self, n: int) -> List[Any]:
+        """Returns the n left most items, with the lock held."""
+
+        head = self._head
+        first = min(n, self.__capacity - head)
+        return self._buffer[head:head + first] + self._buffer[:n - first]
+
+    def _remove(self, n: int) -> NoReturn:
+        """Clears the slots of the n left most items, with the lock held."""
+
+        head = self._head
+        first = min(n, self.__capacity - head)
+        self._buffer[head:head + first] = [None] * first
+        self._buffer[:n - first] = [None] * (n - first)
+        self._head = (head + n) % self.__capacity
+        self._size -= n
+
+    def _notify_producers(self) -> NoReturn:
+        """Wakes up the producers waiting for room, with the lock held."""
+
+        if self._waiting_producers:
+            self._not_full.notify_all()
+
+    def push(self, new_item: Any, timeout: Optional[float] = None
+             ) -> NoReturn:
+        """Push a new item to the right end of the queue.
+
+        When the queue is full the overflow policy is applied.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the right end of the queue, could be
+            anything.
+
+        timeout: float, optional
+            Maximum time to wait for room with the "block" policy, in
+            seconds. The default value is None, to wait without limit.
+
+        Raises
+        ------
+        OverflowError:
+            When the queue is full with the "raise" policy, or until
+            the timeout with the "block" policy.
+        """
+
+        with self._lock:
+            if self._size == self.__capacity and \
+                    self._make_room(1, _deadline(timeout)) == 0:
+                return
+            tail = self._head + self._size
+            if tail >= self.__capacity:
+                tail -= self.__capacity
+            self._buffer[tail] = new_item
+            self._size += 1
+
+    def push_many(self, new_items: Iterable[Any],
+                  timeout: Optional[float] = None) -> NoReturn:
+        """Push several items to the right end of the queue, in order.
+
+        The overflow policy is applied to the items that don't fit:
+        they are all rejected with the "raise" policy, only those that
+        don't fit are dropped with "drop_newest", and with "block" the
+        items are pushed all together once there is room for all of
+        them.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the right end of the queue, could be
+            anything.
+
+        timeout: float, optional
+            Maximum time to wait for room with the "block" policy, in
+            seconds. The default value is None, to wait without limit.
+
+        Raises
+        ------
+        ValueError:
+            When there are more items than the capacity with the
+            "block" policy.
+
+        OverflowError:
+            When the items don't fit with the "raise" policy, or until
+            the timeout with the "block" policy.
+        """
+
+        new_items = list(new_items)
+        capacity = self.__capacity
+        with self._lock:
+            if len(new_items) > capacity:
+                if self.__policy == "block":
+                    raise ValueError("More items than the capacity")
+                if self.__policy == "overwrite_oldest":
+                    self._overwritten += len(new_items) - capacity
+                    new_items = new_items[-capacity:]
+                elif self.__policy == "drop_newest":
+                    self._dropped += len(new_items) - capacity
+                    new_items = new_items[:capacity]
+            n_kept = self._make_room(len(new_items), _deadline(timeout))
+            self._write(new_items[:n_kept] if n_kept < len(new_items)
+                        else new_items)
+
+    def pop(self) -> Any:
+        """Removes the left most item from the queue and returns it.
+
+        Returns
+        -------
+        left_item: Any
+            The left most item of the queue, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the queue is empty.
+        """
+
+        with self._lock:
+            if self._size == 0:
+                raise IndexError("The Queue is empty!")
+            head = self._head
+            left_item = self._buffer[head]
+            self._buffer[head] = None
+            head += 1
+            self._head = 0 if head == self.__capacity else head
+            self._size -= 1
+            self._notify_producers()
+        return left_item
+
+    def peak(self) -> Any:
+        """Returns the left most item of the queue without removing it.
+
+        Returns
+        -------
+        left_item: Any
+            The left most item of the queue.
+
+        Raises
+        ------
+        IndexError:
+            When the queue is empty.
+        """
+
+        with self._lock:
+            if self._size == 0:
+                raise IndexError("The Queue is empty!")
+            return self._buffer[self._head]
+
+    def size(self) -> int:
+        """Length of the list of items currently in the queue."""
+
+        return self._size
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n left most items from the queue and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        left_items: list
+            The n left most items, in the order they would have been
+            popped one by one (the left most item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the queue has less than n items. The queue is left
+            unchanged.
+        """
+
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        with self._lock:
+            if n > self._size:
+                raise IndexError("Not enough items in the Queue")
+            left_items = self._read(n)
+            self._remove(n)
+            self._notify_producers()
+        return left_items
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the queue and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the queue, in the order they would have been
+            popped one by one (the left most item first).
+        """
+
+        with self._lock:
+            items = self._read(self._size)
+            self._remove(self._size)
+            self._notify_producers()
+        return items
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterates over a snapshot of the items, from the left most."""
+
+        with self._lock:
+            items = self._read(self._size)
+        return iter(items)
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Iterates over a snapshot of the items, from the right most."""
+
+        with self._lock:
+            items = self._read(self._size)
+        return reversed(items)
+
+    def __repr__(self) -> str:
+        if self._size == 0:
+            return "Empty " + str(self.__class__.__name__)
+        limit = self.repr_limit
+        shown = self._size if limit is None else min(limit, self._size)
+        print_val = ("RingQueue Elements: "
+                     + "; ".join([str(item) for item in islice(self, shown)]))
+        if shown < self._size:
+            print_val += "; ... (" + str(self._size - shown) + " more)"
+        return print_val
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """State to pickle, with the items packed instead of the buffer.
+
+        The lock and the condition can't be pickled.
+        """
+
+        with self._lock:
+            state = {name: value for name, value in self.__dict__.items()
+                     if name not in ('_buffer', '_lock', '_not_full')}
+            state['_buffer'] = _pack_items(self._read(self._size))
+        state['_head'] = 0
+        state['_waiting_producers'] = 0
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> NoReturn:
+        """Restores a pickled state, in a new buffer and a new lock."""
+
+        state = dict(state)
+        items = _unpack_items(state.pop('_buffer'))[0]
+        self.__dict__.update(state)
+        self._buffer = items + [None] * (self.__capacity - len(items))
+        self._lock = Lock()
+        self._not_full = Condition(self._lock)
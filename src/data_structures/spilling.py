@@ -0,0 +1,615 @@
+"""Data structures that spill items to disk.
+
+Classes
+-------
+
+PickleSerializer:
+    Serializes segments of any picklable items.
+
+NumberSerializer:
+    Serializes segments of real numbers as packed doubles.
+
+SpillingStack:
+    Stack that keeps its top in memory and spills the rest to disk.
+
+SpillingQueue:
+    Queue that keeps its ends in memory and spills the rest to disk.
+"""
+
+__all__ = ['PickleSerializer', 'NumberSerializer', 'SpillingStack',
+           'SpillingQueue']
+
+import mmap
+import os
+import pickle
+import re
+from array import array
+from typing import Any, Iterable, Iterator, List, NoReturn, Tuple, Union
+from data_structures.elements import Number
+from data_structures.queues import Queue
+from data_structures.stacks import Stack
+
+_SEGMENT_NAME = re.compile(r"^segment_(-?\d+)_(\d+)\.seg$")
+
+
+class PickleSerializer:
+    """Serializes segments of any picklable items.
+
+    Methods
+    -------
+    dumps:
+        Serializes a list of items to bytes.
+
+    loads:
+        Deserializes a list of items from a buffer.
+    """
+
+    def dumps(self, items: List[Any]) -> bytes:
+        """Serializes a list of items to bytes."""
+
+        return pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, buffer: Any) -> List[Any]:
+        """Deserializes a list of items from a buffer."""
+
+        return pickle.loads(buffer)
+
+
+class NumberSerializer:
+    """Serializes segments of real numbers as packed doubles.
+
+    Each item takes 8 bytes. Items are loaded as Number instances (or
+    as raw floats, if the serializer is created with raw=True), int
+    values are loaded as floats.
+
+    Methods
+    -------
+    dumps:
+        Serializes a list of real numbers to bytes.
+
+    loads:
+        Deserializes a list of real numbers from a buffer.
+    """
+
+    def __init__(self, raw: bool = False) -> NoReturn:
+        """Creates a serializer of real numbers.
+
+        Parameters
+        ----------
+        raw: bool, optional
+            If True, items are loaded as raw floats instead of Number
+            instances. The default value is False.
+        """
+
+        self.raw = raw
+
+    def dumps(self, items: List[Union[Number, int, float]]) -> bytes:
+        """Serializes a list of real numbers to bytes."""
+
+        return array('d', [item.number if isinstance(item, Number) else item
+                           for item in items]).tobytes()
+
+    def loads(self, buffer: Any) -> List[Union[Number, float]]:
+        """Deserializes a list of real numbers from a buffer."""
+
+        values = array('d')
+        values.frombytes(buffer)
+        if self.raw:
+            return values.tolist()
+        return [Number(value) for value in values]
+
+
+class _SpillingMixin:
+    """Segment files shared by the spilling data structures.
+
+    Segments are files named after their position and their amount of
+    items. They are read back through a read-only memory map and
+    deleted once loaded, so disk space is reclaimed as the structure
+    drains.
+    """
+
+    def _open_directory(self, directory: str, segment_size: int,
+                        serializer: Any) -> NoReturn:
+        """Initializes the segments, reopening the ones in the directory.
+
+        Raises
+        ------
+        AssertionError:
+            If segment_size is not positive.
+        """
+
+        assert segment_size > 0, "segment_size must be positive."
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+        self.__segment_size = segment_size
+        self._serializer = serializer
+        self._segments: List[Tuple[int, int]] = []
+        for name in os.listdir(directory):
+            match = _SEGMENT_NAME.match(name)
+            if match:
+                self._segments.append((int(match.group(1)),
+                                       int(match.group(2))))
+        self._segments.sort()
+        self._spilled = sum(count for _, count in self._segments)
+
+    @property
+    def directory(self) -> str:
+        """Directory where the segments are stored."""
+
+        return self.__directory
+
+    @property
+    def segment_size(self) -> int:
+        """Amount of items in each spilled segment."""
+
+        return self.__segment_size
+
+    def _segment_path(self, index: int, count: int) -> str:
+        return os.path.join(self.__directory,
+                            f"segment_{index}_{count}.seg")
+
+    def _write_segment(self, index: int,
+                       items: List[Any]) -> Tuple[int, int]:
+        """Writes a segment file, replacing it atomically."""
+
+        path = self._segment_path(index, len(items))
+        with open(path + ".tmp", 'wb') as file:
+            file.write(self._serializer.dumps(items))
+        os.replace(path + ".tmp", path)
+        self._spilled += len(items)
+        return index, len(items)
+
+    def _load_segment(self, segment: Tuple[int, int]) -> List[Any]:
+        """Reads a segment file through a memory map, keeping it."""
+
+        with open(self._segment_path(*segment), 'rb') as file:
+            with mmap.mmap(file.fileno(), 0,
+                           access=mmap.ACCESS_READ) as mapped:
+                return self._serializer.loads(mapped)
+
+    def _read_segment(self, segment: Tuple[int, int]) -> List[Any]:
+        """Reads a segment file through a memory map and deletes it."""
+
+        items = self._load_segment(segment)
+        os.remove(self._segment_path(*segment))
+        self._spilled -= segment[1]
+        return items
+
+    def _spill_limit(self) -> int:
+        """Amount of items in memory that triggers a spill."""
+
+        return 2 * self.__segment_size
+
+    def size(self) -> int:
+        """Length of the list of items, in memory and on disk."""
+
+        return super().size() + self._spilled
+
+    def spilled(self) -> int:
+        """Amount of items currently stored on disk."""
+
+        return self._spilled
+
+
+class SpillingStack(_SpillingMixin, Stack):
+    """Stack that keeps its top in memory and spills the rest to disk.
+
+    When there are more than two segments worth of items in memory,
+    the bottom segment is written to a file in the directory. When the
+    items in memory run out, the top segment on disk is loaded back.
+    Calling persist writes every item to disk, so a new SpillingStack
+    over the same directory reopens the stack.
+
+    Properties
+    ----------
+    directory: str
+        Read-only directory where the segments are stored.
+
+    segment_size: int
+        Read-only amount of items in each spilled segment.
+
+    Methods
+    -------
+    push:
+        Push a new item to the top of the stack.
+
+    pop:
+        Removes the top item from the stack and returns it.
+
+    peak:
+        Returns the top item of the stack without removing it.
+
+    size:
+        Length of the list of items, in memory and on disk.
+
+    spilled:
+        Amount of items currently stored on disk.
+
+    persist:
+        Writes the items in memory to disk.
+    """
+
+    def __init__(self, directory: str, segment_size: int = 65536,
+                 serializer: Any = None) -> NoReturn:
+        """Opens a spilling stack over a directory.
+
+        Parameters
+        ----------
+        directory: str
+            Directory for the segment files, it's created if needed.
+            Segments already in it are reopened.
+
+        segment_size: int, optional
+            Amount of items in each spilled segment. The default value
+            is 65536.
+
+        serializer: serializer, optional
+            Object with dumps and loads methods for lists of items. The
+            default value is a PickleSerializer.
+
+        Raises
+        ------
+        AssertionError:
+            If segment_size is not positive.
+        """
+
+        super().__init__()
+        self._open_directory(directory, segment_size,
+                             serializer or PickleSerializer())
+
+    def _spill(self) -> NoReturn:
+        """Writes the bottom segments in memory to disk, if there are many."""
+
+        while len(self._items) > self._spill_limit():
+            next_index = self._segments[-1][0] + 1 if self._segments else 0
+            bottom = self._items[:self.segment_size]
+            self._segments.append(self._write_segment(next_index, bottom))
+            del self._items[:self.segment_size]
+
+    def _load(self, n_items: int = 1) -> NoReturn:
+        """Loads segments under the items in memory, up to n_items."""
+
+        while len(self._items) < n_items and self._segments:
+            self._items[:0] = self._read_segment(self._segments.pop())
+
+    def push(self, new_item: Any) -> NoReturn:
+        """Push a new item to the top of the stack.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the top to the stack, it must be
+            serializable.
+        """
+
+        super().push(new_item)
+        self._spill()
+
+    def push_many(self, new_items: Iterable[Any]) -> NoReturn:
+        """Push several items to the top of the stack, in order.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the top of the stack, they must be
+            serializable.
+        """
+
+        super().push_many(new_items)
+        self._spill()
+
+    def pop(self) -> Any:
+        """Removes the top item from the stack and returns it.
+
+        Returns
+        -------
+        top_item: Any
+            The item at the top of the stack, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        self._load()
+        return super().pop()
+
+    def peak(self) -> Any:
+        """Returns the top item of the stack without removing it.
+
+        Returns
+        -------
+        top_item: Any
+            The item at the top of the stack.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        self._load()
+        return super().peak()
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n top items from the stack and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        top_items: list
+            The n top items, in the order they would have been popped
+            one by one (the top item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the stack has less than n items. The stack is left
+            unchanged.
+        """
+
+        if 0 <= n <= self.size():
+            self._load(n)
+        return super().pop_many(n)
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the stack and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the stack, in the order they would have been
+            popped one by one (the top item first).
+        """
+
+        self._load(self.size())
+        return super().drain()
+
+    def persist(self) -> NoReturn:
+        """Writes the items in memory to disk, as the top segment.
+
+        The stack stays usable, and a new SpillingStack over the same
+        directory reopens it with the same items.
+        """
+
+        if self._items:
+            next_index = self._segments[-1][0] + 1 if self._segments else 0
+            self._segments.append(self._write_segment(next_index,
+                                                      self._items))
+            self._items = []
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterates over the items from the top to the bottom.
+
+        Segments on disk are loaded one at a time, without deleting
+        them, as the iteration reaches them.
+        """
+
+        yield from reversed(self._items)
+        for segment in reversed(list(self._segments)):
+            yield from reversed(self._load_segment(segment))
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Iterates over the items from the bottom to the top."""
+
+        for segment in list(self._segments):
+            yield from self._load_segment(segment)
+        yield from self._items
+
+
+class SpillingQueue(_SpillingMixin, Queue):
+    """Queue that keeps its ends in memory and spills the rest to disk.
+
+    New items are pushed to the input stack, when there are more than
+    two segments worth of items in it, its oldest segment is written to
+    a file in the directory. When the output stack runs out, the oldest
+    segment on disk is loaded into it, and only when there are no
+    segments the input stack is flushed. Calling persist writes every
+    item to disk, so a new SpillingQueue over the same directory
+    reopens the queue.
+
+    Properties
+    ----------
+    directory: str
+        Read-only directory where the segments are stored.
+
+    segment_size: int
+        Read-only amount of items in each spilled segment.
+
+    Methods
+    -------
+    push:
+        Push a new item to the right end of the queue.
+
+    pop:
+        Removes the left most item from the queue and returns it.
+
+    peak:
+        Returns the left most item of the queue without removing it.
+
+    size:
+        Length of the list of items, in memory and on disk.
+
+    spilled:
+        Amount of items currently stored on disk.
+
+    persist:
+        Writes the items in memory to disk.
+    """
+
+    def __init__(self, directory: str, segment_size: int = 65536,
+                 serializer: Any = None) -> NoReturn:
+        """Opens a spilling queue over a directory.
+
+        Parameters
+        ----------
+        directory: str
+            Directory for the segment files, it's created if needed.
+            Segments already in it are reopened.
+
+        segment_size: int, optional
+            Amount of items in each spilled segment. The default value
+            is 65536.
+
+        serializer: serializer, optional
+            Object with dumps and loads methods for lists of items. The
+            default value is a PickleSerializer.
+
+        Raises
+        ------
+        AssertionError:
+            If segment_size is not positive.
+        """
+
+        super().__init__()
+        self._open_directory(directory, segment_size,
+                             serializer or PickleSerializer())
+
+    def _spill(self) -> NoReturn:
+        """Writes the oldest segments of the input stack to disk."""
+
+        input_items = self._input_stack._items
+        while len(input_items) > self._spill_limit():
+            next_index = self._segments[-1][0] + 1 if self._segments else 0
+            oldest = input_items[:self.segment_size]
+            self._segments.append(self._write_segment(next_index, oldest))
+            del input_items[:self.segment_size]
+
+    def _flush_inputs_to_outputs(self) -> NoReturn:
+        """Refills the output stack with the oldest items.
+
+        The oldest segment on disk is loaded if there is any, else the
+        input stack is flushed to the output stack.
+        """
+
+        if self._segments:
+            oldest = self._read_segment(self._segments.pop(0))
+            oldest.reverse()
+            self._output_stack.push_many(oldest)
+        else:
+            super()._flush_inputs_to_outputs()
+
+    def push(self, new_item: Any) -> NoReturn:
+        """Push a new item to the right end of the queue.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the right end of the queue, it must be
+            serializable.
+        """
+
+        super().push(new_item)
+        self._spill()
+
+    def push_many(self, new_items: Iterable[Any]) -> NoReturn:
+        """Push several items to the right end of the queue, in order.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the right end of the queue, they must be
+            serializable.
+        """
+
+        super().push_many(new_items)
+        self._spill()
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n left most items from the queue and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        left_items: list
+            The n left most items, in the order they would have been
+            popped one by one (the left most item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the queue has less than n items. The queue is left
+            unchanged.
+        """
+
+        if n > self.size():
+            raise IndexError("Not enough items in the Queue")
+        output_stack = self._output_stack
+        left_items = output_stack.pop_many(min(n, output_stack.size()))
+        while len(left_items) < n:
+            self._flush_inputs_to_outputs()
+            missing = min(n - len(left_items), output_stack.size())
+            left_items.extend(output_stack.pop_many(missing))
+        return left_items
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the queue and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the queue, in the order they would have been
+            popped one by one (the left most item first).
+        """
+
+        items = self._output_stack.drain()
+        while self._segments:
+            items.extend(self._read_segment(self._segments.pop(0)))
+        input_items = self._input_stack.drain()
+        input_items.reverse()
+        items.extend(input_items)
+        return items
+
+    def persist(self) -> NoReturn:
+        """Writes the items in memory to disk, around the segments.
+
+        The output stack is written before the first segment and the
+        input stack after the last one. The queue stays usable, and a
+        new SpillingQueue over the same directory reopens it with the
+        same items.
+        """
+
+        if self._output_stack.size():
+            first_index = self._segments[0][0] - 1 if self._segments else 0
+            head = self._output_stack.drain()
+            self._segments.insert(0, self._write_segment(first_index, head))
+        if self._input_stack.size():
+            next_index = self._segments[-1][0] + 1 if self._segments else 0
+            tail = self._input_stack.drain()
+            tail.reverse()
+            self._segments.append(self._write_segment(next_index, tail))
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterates over the items from the left most to the right most.
+
+        Segments on disk are loaded one at a time, without deleting
+        them, as the iteration reaches them.
+        """
+
+        yield from self._output_stack
+        for segment in list(self._segments):
+            yield from self._load_segment(segment)
+        yield from reversed(self._input_stack)
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Iterates over the items from the right most to the left most."""
+
+        yield from self._input_stack
+        for segment in reversed(list(self._segments)):
+            yield from reversed(self._load_segment(segment))
+        yield from reversed(self._output_stack)
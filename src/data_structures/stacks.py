@@ -9,13 +9,40 @@ Stack:
 TypeRestrictedStack:
     Stack that only allow instances of a certain class to be
     pushed.
+
+NumericStack:
+    Compact stack of real numbers, stored as raw doubles.
+
+AggregateStack:
+    Stack that keeps a running aggregate of its items.
+
+MinMaxStack:
+    Type restricted stack with constant time minimum and maximum.
+
+SegmentedStack:
+    Stack stored in fixed-size blocks of items.
 """
 
-__all__ = ['Stack', 'TypeRestrictedStack']
+__all__ = ['Stack', 'TypeRestrictedStack', 'NumericStack', 'AggregateStack',
+           'MinMaxStack', 'SegmentedStack']
 
 import inspect
-from typing import NoReturn, Any, Type, Optional
-from data_structures.elements import Number
+from array import array
+from heapq import nlargest, nsmallest
+from itertools import accumulate, chain, islice
+from operator import attrgetter
+from typing import (NoReturn, Any, Type, Optional, Iterable, Iterator, List,
+                    Union, Callable, BinaryIO, Dict)
+from data_structures.elements import (Number, _pack_array, _pack_items,
+                                      _read_header, _read_packed,
+                                      _unpack_items, _unpack_values)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_VALIDATION_MODES = ("strict", "exact", "trusted")
 
 
 class Stack:
@@ -26,6 +53,15 @@ class Stack:
       - items can only be added to the stack from the "top"
       - items can only be removed from the stack from the "top"
 
+    Iterating over a stack yields its items from the top to the bottom
+    without removing them, and repr shows up to repr_limit items.
+
+    Properties
+    ----------
+    repr_limit: int or None
+        Maximum amount of items shown by repr, None to show all of
+        them. It can be set on the class or on each stack.
+
     Methods
     -------
     push:
@@ -39,8 +75,40 @@ class Stack:
 
     size:
         Length of the list of items currently in the stack.
+
+    push_many:
+        Push several items to the top of the stack, in order.
+
+    extend:
+        Alias of push_many.
+
+    pop_many:
+        Removes the n top items from the stack and returns them.
+
+    drain:
+        Removes all items from the stack and returns them.
+
+    peak_many:
+        Returns the n top items of the stack without removing them.
+
+    iter_drain:
+        Removes the items from the stack one by one as they are used.
+
+    to_bytes:
+        Returns the items of the stack packed as bytes.
+
+    from_bytes:
+        Returns a new stack with the items packed in some bytes.
+
+    dump:
+        Writes the items of the stack packed as bytes to a binary file.
+
+    load:
+        Returns a new stack with the items packed in a binary file.
     """
 
+    repr_limit = 20
+
     def __init__(self) -> NoReturn:
         """Initializes an empty items list for the stack."""
 
@@ -102,23 +170,274 @@ class Stack:
 
         return len(self._items)
 
-    def __repr__(self) -> str:
-        if self.size() == 0:
+    def push_many(self, new_items: Iterable[Any]) -> NoReturn:
+        """Push several items to the top of the stack, in order.
+
+        The last item of the iterable ends up at the top of the stack,
+        as if the items were pushed one by one.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the top of the stack, could be anything.
+        """
+
+        self._items.extend(new_items)
+
+    def extend(self, new_items: Iterable[Any]) -> NoReturn:
+        """Alias of push_many."""
+
+        self.push_many(new_items)
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n top items from the stack and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        top_items: list
+            The n top items, in the order they would have been popped
+            one by one (the top item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the stack has less than n items. The stack is left
+            unchanged.
+        """
+
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        if n > len(self._items):
+            raise IndexError("Not enough items in the Stack")
+        if n == 0:
+            return []
+        top_items = self._items[-n:]
+        del self._items[-n:]
+        top_items.reverse()
+        return top_items
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the stack and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the stack, in the order they would have been
+            popped one by one (the top item first).
+        """
+
+        items = self._items
+        self._items = []
+        items.reverse()
+        return items
+
+    def peak_many(self, n: int) -> List[Any]:
+        """Returns the n top items of the stack without removing them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to return.
+
+        Returns
+        -------
+        top_items: list
+            The n top items, in the order they would have been popped
+            one by one (the top item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the stack has less than n items.
+        """
+
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        if n > self.size():
+            raise IndexError("Not enough items in the Stack")
+        return list(islice(self, n))
+
+    def iter_drain(self) -> Iterator[Any]:
+        """Removes the items from the stack one by one as they are used.
+
+        Unlike drain, the items are popped lazily, so the items that
+        are not used yet stay in the stack.
+
+        Yields
+        ------
+        top_item: Any
+            The item at the top of the stack, until the stack is empty.
+        """
+
+        while self.size() > 0:
+            yield self.pop()
+
+    def __len__(self) -> int:
+        return self.size()
+
+    def __bool__(self) -> bool:
+        return self.size() > 0
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterates over the items from the top to the bottom."""
+
+        return reversed(self._items)
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Iterates over the items from the bottom to the top."""
+
+        return iter(self._items)
+
+    def _repr_items(self, limit: Optional[int]) -> str:
+        """Items from the bottom to the top, up to limit of them."""
+
+        size = self.size()
+        if size == 0:
             return "Empty " + str(self.__class__.__name__)
+        shown = size if limit is None else min(limit, size)
         print_val = ("Stack Elements: "
-                     + "; ".join([str(item) for item in self._items]))
+                     + "; ".join([str(item)
+                                  for item in islice(reversed(self),
+                                                     shown)]))
+        if shown < size:
+            print_val += "; ... (" + str(size - shown) + " more)"
         return print_val
 
+    def __repr__(self) -> str:
+        return self._repr_items(self.repr_limit)
+
+    def to_bytes(self) -> bytes:
+        """Returns the items of the stack packed as bytes.
+
+        Floats, ints and Numbers are packed as fixed-width values when
+        all the items are of the same kind, any other items are
+        pickled.
+
+        Returns
+        -------
+        data: bytes
+            The items from the bottom to the top, with a short header.
+        """
+
+        items = self._items
+        if type(items) is not list or len(items) != self.size():
+            items = list(reversed(self))
+        return _pack_items(items)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, *args: Any, **kwargs: Any) -> 'Stack':
+        """Returns a new stack with the items packed in some bytes.
+
+        Parameters
+        ----------
+        data: bytes
+            Bytes returned by the to_bytes method of a stack.
+
+        *args, **kwargs:
+            Arguments to initialize the new stack with.
+
+        Raises
+        ------
+        ValueError:
+            If the bytes were not returned by to_bytes, or are
+            truncated.
+        """
+
+        items, item_type = _unpack_items(data)
+        stack = cls(*args, **kwargs)
+        stack._push_unpacked(items, item_type)
+        return stack
+
+    def _push_unpacked(self, items: List[Any],
+                       item_type: Optional[type]) -> NoReturn:
+        """Pushes unpacked items, all of item_type if it's not None."""
+
+        self.push_many(items)
+
+    def dump(self, file: BinaryIO) -> NoReturn:
+        """Writes the items of the stack packed as bytes to a binary file.
+
+        Parameters
+        ----------
+        file: binary file
+            File opened for writing, the items are written at its
+            current position.
+        """
+
+        file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, file: BinaryIO, *args: Any, **kwargs: Any) -> 'Stack':
+        """Returns a new stack with the items packed in a binary file.
+
+        Parameters
+        ----------
+        file: binary file
+            File opened for reading, at the position where dump wrote
+            the items.
+
+        *args, **kwargs:
+            Arguments to initialize the new stack with.
+
+        Raises
+        ------
+        ValueError:
+            If the file doesn't hold packed items at its position.
+        """
+
+        return cls.from_bytes(_read_packed(file), *args, **kwargs)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """State to pickle, with a list of items packed as bytes."""
+
+        state = self.__dict__.copy()
+        if type(state.get('_items')) is list:
+            state['_items'] = _pack_items(state['_items'])
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> NoReturn:
+        """Restores a pickled state, unpacking the items if needed."""
+
+        if isinstance(state.get('_items'), bytes):
+            state = dict(state, _items=_unpack_items(state['_items'])[0])
+        self.__dict__.update(state)
+
 
 class TypeRestrictedStack(Stack):
     """Stack that only allow instances of a certain class to be pushed.
 
+    The validation mode sets how the items are checked:
+      - "strict": every pushed item is checked with isinstance.
+      - "exact": the exact types of the accepted items are cached, so
+        only items of new types are checked with isinstance. This
+        assumes that being an instance of the acceptable class only
+        depends on the type of the item.
+      - "trusted": pushed items are not checked, verify_types only
+        checks the items pushed since the last verification.
+    Batches pushed with push_many in the "exact" mode, and the items
+    checked by verify_types in the "exact" and "trusted" modes, are
+    checked once per distinct type rather than once per item.
+
     Properties
     ----------
     acceptable_class: any class
         This is an immutable property, any new item pushed to the stack
         must be an instance of the acceptable class.
 
+    validation: str
+        Read-only validation mode, "strict", "exact" or "trusted".
+
     Methods
     -------
     push:
@@ -139,10 +458,21 @@ class TypeRestrictedStack(Stack):
 
     verify_types:
         Verifies that all items in the stack are valid.
+
+    push_many:
+        Push several items to the top of the stack, all of them must
+        be instances of the acceptable class.
+
+    pop_many:
+        Removes the n top items from the stack and returns them.
+
+    drain:
+        Removes all items from the stack and returns them.
     """
 
     def __init__(self,
-                 acceptable_class: Optional[Type[Any]] = Number) -> NoReturn:
+                 acceptable_class: Optional[Type[Any]] = Number,
+                 validation: str = "strict") -> NoReturn:
         """A stack that only allows items of a certain class.
 
         Parameters
@@ -153,17 +483,28 @@ class TypeRestrictedStack(Stack):
             that class. The default value is the class Number from the
             data_structures.elements module.
 
+        validation: str, optional
+            How the items are checked, "strict", "exact" or "trusted".
+            The default value is "strict".
+
         Raises
         ------
         AssertionError:
             If the value of the acceptable_class parameter is not a
-            class.
+            class, or if the validation mode is unknown.
         """
 
         msg = "TypeRestrictedStacks should be restricted with a class."
         assert inspect.isclass(acceptable_class), msg
+        msg = "validation should be one of " + ", ".join(_VALIDATION_MODES)
+        assert validation in _VALIDATION_MODES, msg
         super().__init__()
         self.__acceptable_class = acceptable_class
+        self.__validation = validation
+        self._checks_pushes = validation != "trusted"
+        self._caches_types = validation != "strict"
+        self._accepted_types = set()
+        self._verified = 0
 
     @property
     def acceptable_class(self) -> Type[Any]:
@@ -171,6 +512,12 @@ class TypeRestrictedStack(Stack):
 
         return self.__acceptable_class
 
+    @property
+    def validation(self) -> str:
+        """The validation mode, "strict", "exact" or "trusted"."""
+
+        return self.__validation
+
     def type_verification(self, item: Any) -> NoReturn:
         """Checks that an item is an instance of the acceptable class
 
@@ -185,13 +532,34 @@ class TypeRestrictedStack(Stack):
             If item is not an instance of the acceptable class.
         """
 
-        if not isinstance(item, self.acceptable_class):
+        if not isinstance(item, self.__acceptable_class):
             raise ValueError("items in the stack must be an instance of "
-                             + self.acceptable_class.__name__)
+                             + self.__acceptable_class.__name__)
+
+    def _admit(self, item: Any) -> NoReturn:
+        """Checks an item, caching its type if the mode allows it."""
+
+        self.type_verification(item)
+        item_type = type(item)
+        if (self._caches_types
+                and issubclass(item_type, self.__acceptable_class)):
+            self._accepted_types.add(item_type)
+
+    def _verify_batch(self, items: List[Any]) -> NoReturn:
+        """Checks a batch of items, once per type not cached yet."""
+
+        for item_type in set(map(type, items)) - self._accepted_types:
+            for item in items:
+                if type(item) is item_type:
+                    self._admit(item)
+                    break
 
     def verify_types(self) -> NoReturn:
         """Verifies that all items in the stack are valid.
 
+        In the "trusted" mode, only the items pushed since the last
+        verification are checked.
+
         Raises
         ------
         ValueError:
@@ -199,8 +567,14 @@ class TypeRestrictedStack(Stack):
             acceptable class.
         """
 
-        for item in self._items:
-            self.type_verification(item)
+        if not self._caches_types:
+            for item in self._items:
+                self.type_verification(item)
+        elif self._checks_pushes:
+            self._verify_batch(self._items)
+        else:
+            self._verify_batch(self._items[self._verified:])
+            self._verified = len(self._items)
 
     def push(self, new_item: Any) -> NoReturn:
         """Push a new item to the top of the stack.
@@ -217,5 +591,1205 @@ class TypeRestrictedStack(Stack):
             If the new_item is not an instance of the acceptable class.
         """
 
-        self.type_verification(new_item)
+        if (self._checks_pushes
+                and type(new_item) not in self._accepted_types):
+            self._admit(new_item)
         super().push(new_item)
+
+    def pop(self) -> Any:
+        """Removes the top item from the stack and returns it.
+
+        Returns
+        -------
+        top_item: Any
+            The item at the top of the stack, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        top_item = super().pop()
+        if self._verified > len(self._items):
+            self._verified = len(self._items)
+        return top_item
+
+    def push_many(self, new_items: Iterable[Any]) -> NoReturn:
+        """Push several items to the top of the stack, in order.
+
+        The whole batch is validated before any item is pushed, so the
+        stack is left unchanged when any of the items is invalid.
+
+        Parameters
+        ----------
+        new_items: iterable of instances of the acceptable class
+            Items to push to the top of the stack, all of them must be
+            instances of the acceptable class.
+
+        Raises
+        ------
+        ValueError:
+            If any of the new items is not an instance of the
+            acceptable class.
+        """
+
+        new_items = list(new_items)
+        self._verify_new_items(new_items)
+        super().push_many(new_items)
+
+    def _verify_new_items(self, new_items: List[Any]) -> NoReturn:
+        """Validates a batch of items as the validation mode requires."""
+
+        if self._caches_types:
+            if self._checks_pushes:
+                self._verify_batch(new_items)
+        else:
+            acceptable_class = self.__acceptable_class
+            for item in new_items:
+                if not isinstance(item, acceptable_class):
+                    self.type_verification(item)
+
+    def _push_unpacked(self, items: List[Any],
+                       item_type: Optional[type]) -> NoReturn:
+        """Pushes unpacked items, validating them only if needed.
+
+        Items unpacked from a fixed-width format are all of item_type,
+        so there's nothing to validate when it's acceptable.
+        """
+
+        if (item_type is None
+                or not issubclass(item_type, self.__acceptable_class)):
+            self._verify_new_items(items)
+        Stack.push_many(self, items)
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n top items from the stack and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        top_items: list
+            The n top items, in the order they would have been popped
+            one by one (the top item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the stack has less than n items. The stack is left
+            unchanged.
+        """
+
+        top_items = super().pop_many(n)
+        if self._verified > len(self._items):
+            self._verified = len(self._items)
+        return top_items
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the stack and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the stack, in the order they would have been
+            popped one by one (the top item first).
+        """
+
+        self._verified = 0
+        return super().drain()
+
+
+class NumericStack(Stack):
+    """Compact stack of real numbers, stored as raw doubles.
+
+    Items are stored in an array.array of doubles instead of a list of
+    objects, taking 8 bytes per item. Instances of Number, int and
+    float can be pushed, and they are handed back as Number instances
+    (or as raw floats, if the stack is created with raw=True).
+
+    Properties
+    ----------
+    raw: bool
+        Read-only flag, if True raw floats are returned instead of
+        Number instances.
+
+    Methods
+    -------
+    push:
+        Push a new real number to the top of the stack.
+
+    pop:
+        Removes the top item from the stack and returns it.
+
+    peak:
+        Returns the top item of the stack without removing it.
+
+    size:
+        Length of the list of items currently in the stack.
+
+    push_many:
+        Push several real numbers to the top of the stack, in order.
+
+    pop_many:
+        Removes the n top items from the stack and returns them.
+
+    drain:
+        Removes all items from the stack and returns them.
+
+    sum:
+        Sum of all the items in the stack.
+
+    min:
+        Minimum of the items in the stack.
+
+    max:
+        Maximum of the items in the stack.
+
+    mean:
+        Arithmetic mean of the items in the stack.
+
+    to_bytes:
+        Returns the items of the stack packed as bytes.
+
+    from_bytes:
+        Returns a new stack with the items packed in some bytes.
+    """
+
+    def __init__(self, raw: bool = False,
+                 use_numpy: bool = False) -> NoReturn:
+        """Initializes an empty array of doubles for the stack.
+
+        Parameters
+        ----------
+        raw: bool, optional
+            If True, items are returned as raw floats instead of
+            Number instances. The default value is False.
+
+        use_numpy: bool, optional
+            If True, reductions (sum, min, max and mean) are computed
+            with NumPy over the array buffer, without copying it. The
+            default value is False.
+
+        Raises
+        ------
+        ImportError:
+            If use_numpy is True and NumPy is not installed.
+        """
+
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy is required when use_numpy is True")
+        super().__init__()
+        self._items = array('d')
+        self.__raw = raw
+        self._use_numpy = use_numpy
+
+    @property
+    def raw(self) -> bool:
+        """If True raw floats are returned instead of Number instances."""
+
+        return self.__raw
+
+    @staticmethod
+    def _to_value(item: Union[Number, int, float]) -> float:
+        """Returns the raw value of a real number, as a double.
+
+        Raises
+        ------
+        ValueError:
+            If item is not a Number, int or float (bools are not real
+            numbers), or it doesn't fit in a double.
+        """
+
+        if isinstance(item, Number):
+            item = item.number
+        elif isinstance(item, bool) or not isinstance(item, (int, float)):
+            raise ValueError("items in the stack must be real numbers")
+        try:
+            return float(item)
+        except OverflowError:
+            raise ValueError("items in the stack must fit in a "
+                             "double") from None
+
+    def _to_item(self, value: float) -> Union[Number, float]:
+        """Wraps a raw value in a Number, unless the stack is raw."""
+
+        return value if self.__raw else Number(value)
+
+    def push(self, new_item: Union[Number, int, float]) -> NoReturn:
+        """Push a new real number to the top of the stack.
+
+        Parameters
+        ----------
+        new_item: Number, int or float
+            A real number to push to the top to the stack.
+
+        Raises
+        ------
+        ValueError:
+            If the new_item is not a Number, int or float.
+        """
+
+        self._items.append(self._to_value(new_item))
+
+    def pop(self) -> Union[Number, float]:
+        """Removes the top item from the stack and returns it.
+
+        Returns
+        -------
+        top_item: Number or float
+            The item at the top of the stack, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        return self._to_item(super().pop())
+
+    def peak(self) -> Union[Number, float]:
+        """Returns the top item of the stack without removing it.
+
+        Returns
+        -------
+        top_item: Number or float
+            The item at the top of the stack.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        return self._to_item(super().peak())
+
+    def push_many(self,
+                  new_items: Iterable[Union[Number, int, float]]
+                  ) -> NoReturn:
+        """Push several real numbers to the top of the stack, in order.
+
+        The whole batch is converted before any item is pushed, so the
+        stack is left unchanged when any of the items is invalid.
+        Arrays of doubles are copied directly.
+
+        Parameters
+        ----------
+        new_items: iterable of Number, int or float
+            Real numbers to push to the top of the stack.
+
+        Raises
+        ------
+        ValueError:
+            If any of the new items is not a Number, int or float.
+        """
+
+        if isinstance(new_items, array) and new_items.typecode == 'd':
+            self._items.extend(new_items)
+            return
+        values = array('d', [self._to_value(item) for item in new_items])
+        self._items.extend(values)
+
+    def pop_many(self, n: int) -> List[Union[Number, float]]:
+        """Removes the n top items from the stack and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        top_items: list
+            The n top items, in the order they would have been popped
+            one by one (the top item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the stack has less than n items. The stack is left
+            unchanged.
+        """
+
+        values = super().pop_many(n)
+        if self.__raw:
+            return list(values)
+        return [Number(value) for value in values]
+
+    def drain(self) -> List[Union[Number, float]]:
+        """Removes all items from the stack and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the stack, in the order they would have been
+            popped one by one (the top item first).
+        """
+
+        values = self._items
+        self._items = array('d')
+        values.reverse()
+        if self.__raw:
+            return list(values)
+        return [Number(value) for value in values]
+
+    def __iter__(self) -> Iterator[Union[Number, float]]:
+        """Iterates over the items from the top to the bottom."""
+
+        return map(self._to_item, reversed(self._items))
+
+    def __reversed__(self) -> Iterator[Union[Number, float]]:
+        """Iterates over the items from the bottom to the top."""
+
+        return map(self._to_item, self._items)
+
+    def to_bytes(self) -> bytes:
+        """Returns the items of the stack packed as bytes.
+
+        The array of doubles is packed as is, to be unpacked as Number
+        instances, or as raw floats if the stack is raw.
+        """
+
+        return _pack_array(self._items, not self.__raw)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, *args: Any,
+                   **kwargs: Any) -> 'NumericStack':
+        """Returns a new stack with the items packed in some bytes.
+
+        Packed doubles are copied directly to the array of the stack,
+        without creating an object per item.
+
+        Raises
+        ------
+        ValueError:
+            If the bytes were not returned by to_bytes, or are
+            truncated, or hold items that are not real numbers.
+        """
+
+        code, payload = _read_header(data)
+        if code not in (b'd', b'D'):
+            return super().from_bytes(data, *args, **kwargs)
+        stack = cls(*args, **kwargs)
+        stack.push_many(_unpack_values(code, payload))
+        return stack
+
+    def _reduce(self, name: str) -> float:
+        """Applies a reduction (sum, min or max) over all the items.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty and the reduction is min or max.
+        """
+
+        if not self._items and name != 'sum':
+            raise IndexError("Empty Stack")
+        if self._use_numpy:
+            values = numpy.frombuffer(self._items, dtype=numpy.float64)
+            return float(getattr(values, name)())
+        return {'sum': sum, 'min': min, 'max': max}[name](self._items)
+
+    def sum(self) -> Union[Number, float]:
+        """Sum of all the items in the stack (0 for an empty stack)."""
+
+        return self._to_item(float(self._reduce('sum')))
+
+    def min(self) -> Union[Number, float]:
+        """Minimum of the items in the stack.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        return self._to_item(self._reduce('min'))
+
+    def max(self) -> Union[Number, float]:
+        """Maximum of the items in the stack.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        return self._to_item(self._reduce('max'))
+
+    def mean(self) -> Union[Number, float]:
+        """Arithmetic mean of the items in the stack.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        if not self._items:
+            raise IndexError("Empty Stack")
+        return self._to_item(self._reduce('sum') / len(self._items))
+
+
+class AggregateStack(Stack):
+    """Stack that keeps a running aggregate of its items.
+
+    The aggregate of all the items in the stack is kept alongside each
+    push, so it's available in constant time and stays correct after
+    pops. The operation must be associative, e.g. addition, gcd, min
+    or max.
+
+    Properties
+    ----------
+    operation: callable
+        Read-only binary operation used to aggregate the items.
+
+    Methods
+    -------
+    push:
+        Push a new item to the top of the stack.
+
+    pop:
+        Removes the top item from the stack and returns it.
+
+    peak:
+        Returns the top item of the stack without removing it.
+
+    size:
+        Length of the list of items currently in the stack.
+
+    aggregate:
+        Aggregate of all the items currently in the stack.
+    """
+
+    def __init__(self, operation: Callable[[Any, Any], Any]) -> NoReturn:
+        """Initializes an empty stack aggregated with an operation.
+
+        Parameters
+        ----------
+        operation: callable
+            Associative binary operation, it takes the aggregate of
+            the items below and a new item, and returns the new
+            aggregate.
+        """
+
+        super().__init__()
+        self.__operation = operation
+        self._aggregates = []
+
+    @property
+    def operation(self) -> Callable[[Any, Any], Any]:
+        """Binary operation used to aggregate the items."""
+
+        return self.__operation
+
+    def push(self, new_item: Any) -> NoReturn:
+        """Push a new item to the top of the stack.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the top to the stack, it must be a
+            valid operand of the operation.
+        """
+
+        if self._aggregates:
+            aggregate = self.__operation(self._aggregates[-1], new_item)
+        else:
+            aggregate = new_item
+        super().push(new_item)
+        self._aggregates.append(aggregate)
+
+    def pop(self) -> Any:
+        """Removes the top item from the stack and returns it.
+
+        Returns
+        -------
+        top_item: Any
+            The item at the top of the stack, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        top_item = super().pop()
+        self._aggregates.pop()
+        return top_item
+
+    def push_many(self, new_items: Iterable[Any]) -> NoReturn:
+        """Push several items to the top of the stack, in order.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the top of the stack, they must be valid
+            operands of the operation.
+        """
+
+        new_items = list(new_items)
+        if self._aggregates:
+            aggregates = islice(
+                accumulate(chain([self._aggregates[-1]], new_items),
+                           self.__operation), 1, None)
+        else:
+            aggregates = accumulate(new_items, self.__operation)
+        aggregates = list(aggregates)
+        super().push_many(new_items)
+        self._aggregates.extend(aggregates)
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n top items from the stack and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        top_items: list
+            The n top items, in the order they would have been popped
+            one by one (the top item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the stack has less than n items. The stack is left
+            unchanged.
+        """
+
+        top_items = super().pop_many(n)
+        del self._aggregates[len(self._items):]
+        return top_items
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the stack and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the stack, in the order they would have been
+            popped one by one (the top item first).
+        """
+
+        self._aggregates = []
+        return super().drain()
+
+    def aggregate(self) -> Any:
+        """Aggregate of all the items currently in the stack.
+
+        Returns
+        -------
+        aggregate: Any
+            The result of applying the operation from the bottom item
+            to the top item.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        try:
+            return self._aggregates[-1]
+        except IndexError:
+            raise IndexError("Empty Stack")
+
+
+def _identity(item: Any) -> Any:
+    """Returns the item itself, used as a comparison key."""
+
+    return item
+
+
+class MinMaxStack(TypeRestrictedStack):
+    """Type restricted stack with constant time minimum and maximum.
+
+    The minimum and maximum items below each position are kept
+    alongside each push, so they are available in constant time and
+    stay correct after pops. Number items are compared by their raw
+    values, other items are compared directly.
+
+    Properties
+    ----------
+    acceptable_class: any class
+        This is an immutable property, any new item pushed to the stack
+        must be an instance of the acceptable class.
+
+    validation: str
+        Read-only validation mode, "strict", "exact" or "trusted".
+
+    Methods
+    -------
+    push:
+        Push a new item to the top of the stack, must be an instance of
+        the acceptable class.
+
+    pop:
+        Removes the top item from the stack and returns it.
+
+    peak:
+        Returns the top item of the stack without removing it.
+
+    size:
+        Length of the list of items currently in the stack.
+
+    min:
+        Minimum item currently in the stack.
+
+    max:
+        Maximum item currently in the stack.
+
+    smallest:
+        The k smallest items currently in the stack.
+
+    largest:
+        The k largest items currently in the stack.
+    """
+
+    def __init__(self,
+                 acceptable_class: Optional[Type[Any]] = Number,
+                 validation: str = "strict") -> NoReturn:
+        """A stack with constant time minimum and maximum.
+
+        Parameters
+        ----------
+        acceptable_class: any class, optional
+            Any class with ordered instances, this will be an immutable
+            property. The default value is the class Number from the
+            data_structures.elements module.
+
+        validation: str, optional
+            How the items are checked, "strict", "exact" or "trusted".
+            The default value is "strict".
+
+        Raises
+        ------
+        AssertionError:
+            If the value of the acceptable_class parameter is not a
+            class, or if the validation mode is unknown.
+        """
+
+        super().__init__(acceptable_class, validation)
+        if issubclass(acceptable_class, Number):
+            self._key = attrgetter('number')
+        else:
+            self._key = _identity
+        self._minima = []
+        self._maxima = []
+
+    def _track(self, new_items: Iterable[Any]) -> NoReturn:
+        """Appends the minimum and maximum for each new item.
+
+        Nothing is appended when any of the items can't be compared,
+        which may happen in the "trusted" mode since pushed items are
+        not checked.
+        """
+
+        key = self._key
+        minima = self._minima
+        maxima = self._maxima
+        size = len(minima)
+        try:
+            for item in new_items:
+                if minima:
+                    low = minima[-1]
+                    high = maxima[-1]
+                    item_key = key(item)
+                    minima.append(item if item_key < key(low) else low)
+                    maxima.append(item if item_key > key(high) else high)
+                else:
+                    minima.append(item)
+                    maxima.append(item)
+        except BaseException:
+            self._untrack(size)
+            raise
+
+    def _untrack(self, size: int) -> NoReturn:
+        """Drops the minima and maxima tracked above size items."""
+
+        del self._minima[size:]
+        del self._maxima[size:]
+
+    def push(self, new_item: Any) -> NoReturn:
+        """Push a new item to the top of the stack.
+
+        Parameters
+        ----------
+        new_item: instance of the acceptable class
+            An item to push to the top to the stack, it must be an
+            instance of the acceptable class.
+
+        Raises
+        ------
+        ValueError:
+            If the new_item is not an instance of the acceptable class.
+        """
+
+        super().push(new_item)
+        try:
+            self._track((new_item,))
+        except BaseException:
+            super().pop()
+            raise
+
+    def pop(self) -> Any:
+        """Removes the top item from the stack and returns it.
+
+        Returns
+        -------
+        top_item: Any
+            The item at the top of the stack, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        top_item = super().pop()
+        self._minima.pop()
+        self._maxima.pop()
+        return top_item
+
+    def push_many(self, new_items: Iterable[Any]) -> NoReturn:
+        """Push several items to the top of the stack, in order.
+
+        The whole batch is validated before any item is pushed, so the
+        stack is left unchanged when any of the items is invalid.
+
+        Parameters
+        ----------
+        new_items: iterable of instances of the acceptable class
+            Items to push to the top of the stack, all of them must be
+            instances of the acceptable class.
+
+        Raises
+        ------
+        ValueError:
+            If any of the new items is not an instance of the
+            acceptable class.
+        """
+
+        new_items = list(new_items)
+        super().push_many(new_items)
+        try:
+            self._track(new_items)
+        except BaseException:
+            super().pop_many(len(new_items))
+            raise
+
+    def _push_unpacked(self, items: List[Any],
+                       item_type: Optional[type]) -> NoReturn:
+        super()._push_unpacked(items, item_type)
+        try:
+            self._track(items)
+        except BaseException:
+            super().pop_many(len(items))
+            raise
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n top items from the stack and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        top_items: list
+            The n top items, in the order they would have been popped
+            one by one (the top item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the stack has less than n items. The stack is left
+            unchanged.
+        """
+
+        top_items = super().pop_many(n)
+        self._untrack(len(self._items))
+        return top_items
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the stack and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the stack, in the order they would have been
+            popped one by one (the top item first).
+        """
+
+        self._minima = []
+        self._maxima = []
+        return super().drain()
+
+    def min(self) -> Any:
+        """Minimum item currently in the stack.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        try:
+            return self._minima[-1]
+        except IndexError:
+            raise IndexError("Empty Stack")
+
+    def max(self) -> Any:
+        """Maximum item currently in the stack.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        try:
+            return self._maxima[-1]
+        except IndexError:
+            raise IndexError("Empty Stack")
+
+    def smallest(self, k: int) -> List[Any]:
+        """The k smallest items currently in the stack, in O(n log k).
+
+        Parameters
+        ----------
+        k: int
+            Amount of items to return.
+
+        Returns
+        -------
+        items: list
+            Up to k items, sorted from the smallest.
+        """
+
+        return nsmallest(k, self._items, key=self._key)
+
+    def largest(self, k: int) -> List[Any]:
+        """The k largest items currently in the stack, in O(n log k).
+
+        Parameters
+        ----------
+        k: int
+            Amount of items to return.
+
+        Returns
+        -------
+        items: list
+            Up to k items, sorted from the largest.
+        """
+
+        return nlargest(k, self._items, key=self._key)
+
+
+class SegmentedStack(Stack):
+    """Stack stored in fixed-size blocks of items.
+
+    Items are stored in preallocated blocks instead of one list, so a
+    push never copies the items already in the stack, and the blocks
+    are released as the stack drains. Up to max_spare_blocks empty
+    blocks are kept for reuse, so pushing and popping around the edge
+    of a block doesn't allocate and release a block every time.
+
+    Properties
+    ----------
+    block_size: int
+        Read-only amount of items in each block.
+
+    max_spare_blocks: int
+        Read-only amount of empty blocks kept for reuse.
+
+    Methods
+    -------
+    push:
+        Push a new item to the top of the stack.
+
+    pop:
+        Removes the top item from the stack and returns it.
+
+    peak:
+        Returns the top item of the stack without removing it.
+
+    size:
+        Length of the list of items currently in the stack.
+
+    pop_block:
+        Removes the items of the top block and returns them.
+    """
+
+    def __init__(self, block_size: int = 1024,
+                 max_spare_blocks: int = 1) -> NoReturn:
+        """Initializes an empty list of blocks for the stack.
+
+        Parameters
+        ----------
+        block_size: int, optional
+            Amount of items in each block. The default value is 1024.
+
+        max_spare_blocks: int, optional
+            Amount of empty blocks kept for reuse. The default value
+            is 1.
+
+        Raises
+        ------
+        AssertionError:
+            If block_size is not positive or max_spare_blocks is
+            negative.
+        """
+
+        assert block_size > 0, "block_size must be positive."
+        assert max_spare_blocks >= 0, "max_spare_blocks can't be negative."
+        self._block_size = block_size
+        self.__max_spare_blocks = max_spare_blocks
+        self._spare_blocks = []
+        # the items are kept in the blocks, there's no list of items
+        self._reset()
+
+    def _reset(self) -> NoReturn:
+        """Empties the stack, dropping all the blocks in use."""
+
+        self._blocks = []
+        self._top_block = None
+        self._offset = self._block_size
+        self._size = 0
+
+    @property
+    def block_size(self) -> int:
+        """Amount of items in each block."""
+
+        return self._block_size
+
+    @property
+    def max_spare_blocks(self) -> int:
+        """Amount of empty blocks kept for reuse."""
+
+        return self.__max_spare_blocks
+
+    def _add_block(self) -> NoReturn:
+        """Adds a block on top, reusing a spare block if there is any."""
+
+        if self._spare_blocks:
+            block = self._spare_blocks.pop()
+        else:
+            block = [None] * self._block_size
+        self._blocks.append(block)
+        self._top_block = block
+        self._offset = 0
+
+    def _release_block(self) -> NoReturn:
+        """Removes the top block, keeping it as a spare if there's room."""
+
+        block = self._blocks.pop()
+        if len(self._spare_blocks) < self.__max_spare_blocks:
+            self._spare_blocks.append(block)
+        # every block below the top block is full
+        self._top_block = self._blocks[-1] if self._blocks else None
+        self._offset = self._block_size
+
+    def size(self) -> int:
+        """Length of the list of items currently in the stack."""
+
+        return self._size
+
+    def push(self, new_item: Any) -> NoReturn:
+        """Push a new item to the top of the stack.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the top to the stack, could be anything.
+        """
+
+        if self._offset == self._block_size:
+            self._add_block()
+        offset = self._offset
+        self._top_block[offset] = new_item
+        self._offset = offset + 1
+        self._size += 1
+
+    def pop(self) -> Any:
+        """Removes the top item from the stack and returns it.
+
+        Returns
+        -------
+        top_item: Any
+            The item at the top of the stack, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        if self._size == 0:
+            raise IndexError("Empty Stack")
+        offset = self._offset - 1
+        top_block = self._top_block
+        top_item = top_block[offset]
+        top_block[offset] = None
+        self._size -= 1
+        if offset == 0:
+            self._release_block()
+        else:
+            self._offset = offset
+        return top_item
+
+    def peak(self) -> Any:
+        """Returns the top item of the stack without removing it.
+
+        Returns
+        -------
+        top_item: Any
+            The item at the top of the stack.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        if self._size == 0:
+            raise IndexError("Empty Stack")
+        return self._top_block[self._offset - 1]
+
+    def push_many(self, new_items: Iterable[Any]) -> NoReturn:
+        """Push several items to the top of the stack, in order.
+
+        Items are copied into the blocks by slices.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the top of the stack, could be anything.
+        """
+
+        new_items = list(new_items)
+        position = 0
+        while position < len(new_items):
+            if self._offset == self._block_size:
+                self._add_block()
+            offset = self._offset
+            chunk = min(self._block_size - offset, len(new_items) - position)
+            self._top_block[offset:offset + chunk] = (
+                new_items[position:position + chunk])
+            position += chunk
+            self._offset = offset + chunk
+            self._size += chunk
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n top items from the stack and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        top_items: list
+            The n top items, in the order they would have been popped
+            one by one (the top item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the stack has less than n items. The stack is left
+            unchanged.
+        """
+
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        if n > self._size:
+            raise IndexError("Not enough items in the Stack")
+        top_items = []
+        while len(top_items) < n:
+            end = self._offset
+            start = max(0, end - (n - len(top_items)))
+            chunk = self._top_block[start:end]
+            chunk.reverse()
+            top_items.extend(chunk)
+            self._top_block[start:end] = [None] * (end - start)
+            self._size -= end - start
+            if start == 0:
+                self._release_block()
+            else:
+                self._offset = start
+        return top_items
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the stack and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the stack, in the order they would have been
+            popped one by one (the top item first).
+        """
+
+        items = list(self)
+        self._reset()
+        return items
+
+    def pop_block(self) -> List[Any]:
+        """Removes the items of the top block and returns them.
+
+        Returns
+        -------
+        top_items: list
+            The items of the top block, in the order they would have
+            been popped one by one (the top item first), or no items
+            when the stack is empty.
+        """
+
+        return self.pop_many(self._offset if self._size else 0)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterates over the items from the top to the bottom."""
+
+        blocks = self._blocks
+        if blocks:
+            yield from reversed(self._top_block[:self._offset])
+            for index in range(len(blocks) - 2, -1, -1):
+                yield from reversed(blocks[index])
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Iterates over the items from the bottom to the top."""
+
+        return islice(chain.from_iterable(self._blocks), self._size)
+
+    def to_bytes(self) -> bytes:
+        """Returns the items of the stack packed as bytes.
+
+        Returns
+        -------
+        data: bytes
+            The items from the bottom to the top, with a short header.
+        """
+
+        return _pack_items(list(reversed(self)))
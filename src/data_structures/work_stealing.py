@@ -0,0 +1,765 @@
+"""Work-stealing data structures for parallel task execution.
+
+Classes
+-------
+
+WorkStealingDeque:
+    Stack whose owner works at the top while thieves steal the bottom.
+
+Task:
+    Handle of a task spawned in a WorkStealingExecutor.
+
+WorkStealingExecutor:
+    Pool of worker threads that balance their tasks by stealing.
+
+ProcessAdapter:
+    Runs functions in a pool of processes, for CPU-bound tasks.
+"""
+
+__all__ = ['WorkStealingDeque', 'Task', 'WorkStealingExecutor',
+           'ProcessAdapter']
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from random import randrange
+from threading import Condition, Lock, Thread, local
+from time import monotonic, perf_counter
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, NoReturn,
+                    Optional)
+from data_structures.deques import Deque
+from data_structures.elements import _pack_items, _unpack_items
+from data_structures.queues import _remaining
+from data_structures.stacks import Stack
+
+# seconds an idle worker waits before looking for tasks again, in case
+# a wake up is missed
+IDLE_TIMEOUT = 0.1
+
+
+class WorkStealingDeque(Stack):
+    """Stack whose owner works at the top while thieves steal the bottom.
+
+    The owner thread pushes and pops items at the top, in LIFO order,
+    so it works on its most recent (and usually smallest) tasks, while
+    other threads steal from the bottom, in FIFO order, the oldest (and
+    usually largest) tasks. Items are stored in a Deque, so both ends
+    take constant time, and every deque has its own lock, so threads
+    only contend when they work on the same deque.
+
+    Methods
+    -------
+    push:
+        Push a new item to the top of the stack.
+
+    pop:
+        Removes the top item from the stack and returns it.
+
+    peak:
+        Returns the top item of the stack without removing it.
+
+    size:
+        Length of the list of items currently in the stack.
+
+    push_many:
+        Push several items to the top of the stack, in order.
+
+    pop_many:
+        Removes the n top items from the stack and returns them.
+
+    drain:
+        Removes all items from the stack and returns them.
+
+    steal:
+        Removes the bottom item from the stack and returns it.
+
+    steal_many:
+        Removes up to n bottom items from the stack and returns them.
+    """
+
+    def __init__(self) -> NoReturn:
+        """Initializes the lock and an empty deque of items."""
+
+        # the items are kept in the deque, there's no list of items
+        self._lock = Lock()
+        self._deque = Deque()
+
+    def size(self) -> int:
+        """Length of the list of items currently in the stack."""
+
+        return self._deque.size()
+
+    def push(self, new_item: Any) -> NoReturn:
+        """Push a new item to the top of the stack.
+
+        Parameters
+        ----------
+        new_item: any
+            An item to push to the top to the stack, could be anything.
+        """
+
+        with self._lock:
+            self._deque.push_right(new_item)
+
+    def pop(self) -> Any:
+        """Removes the top item from the stack and returns it.
+
+        Returns
+        -------
+        top_item: Any
+            The item at the top of the stack, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        with self._lock:
+            if self._deque.size() == 0:
+                raise IndexError("Empty Stack")
+            return self._deque.pop_right()
+
+    def peak(self) -> Any:
+        """Returns the top item of the stack without removing it.
+
+        Returns
+        -------
+        top_item: Any
+            The item at the top of the stack.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        with self._lock:
+            if self._deque.size() == 0:
+                raise IndexError("Empty Stack")
+            return self._deque.peak_right()
+
+    def push_many(self, new_items: Iterable[Any]) -> NoReturn:
+        """Push several items to the top of the stack, in order.
+
+        Parameters
+        ----------
+        new_items: iterable
+            Items to push to the top of the stack, could be anything.
+        """
+
+        new_items = list(new_items)
+        with self._lock:
+            self._deque.push_many(new_items)
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Removes the n top items from the stack and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Amount of items to remove.
+
+        Returns
+        -------
+        top_items: list
+            The n top items, in the order they would have been popped
+            one by one (the top item first).
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+
+        IndexError:
+            When the stack has less than n items. The stack is left
+            unchanged.
+        """
+
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        with self._lock:
+            if n > self._deque.size():
+                raise IndexError("Not enough items in the Stack")
+            return self._deque.pop_many_right(n)
+
+    def drain(self) -> List[Any]:
+        """Removes all items from the stack and returns them.
+
+        Returns
+        -------
+        items: list
+            All items of the stack, in the order they would have been
+            popped one by one (the top item first).
+        """
+
+        with self._lock:
+            return self._deque.pop_many_right(self._deque.size())
+
+    def steal(self) -> Any:
+        """Removes the bottom item from the stack and returns it.
+
+        Returns
+        -------
+        bottom_item: Any
+            The item at the bottom of the stack, prior to removal.
+
+        Raises
+        ------
+        IndexError:
+            When the stack is empty.
+        """
+
+        with self._lock:
+            if self._deque.size() == 0:
+                raise IndexError("Empty Stack")
+            return self._deque.pop_left()
+
+    def steal_many(self, n: int) -> List[Any]:
+        """Removes up to n bottom items from the stack and returns them.
+
+        Parameters
+        ----------
+        n: int
+            Maximum amount of items to remove.
+
+        Returns
+        -------
+        bottom_items: list
+            Up to n bottom items, the bottom item first. It's empty
+            when the stack is empty.
+
+        Raises
+        ------
+        ValueError:
+            When n is negative.
+        """
+
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        with self._lock:
+            return self._deque.pop_many(min(n, self._deque.size()))
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterates over a snapshot of the items, from the top down."""
+
+        with self._lock:
+            return iter(list(reversed(self._deque)))
+
+    def __reversed__(self) -> Iterator[Any]:
+        """Iterates over a snapshot of the items, from the bottom up."""
+
+        with self._lock:
+            return iter(list(self._deque))
+
+    def to_bytes(self) -> bytes:
+        """Returns a snapshot of the items packed as bytes.
+
+        Returns
+        -------
+        data: bytes
+            The items from the bottom to the top, with a short header.
+        """
+
+        with self._lock:
+            items = list(self._deque)
+        return _pack_items(items)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """State to pickle, a snapshot of the items packed as bytes."""
+
+        return {'_items': self.to_bytes()}
+
+    def __setstate__(self, state: Dict[str, Any]) -> NoReturn:
+        """Restores a pickled state, with a new lock."""
+
+        self._lock = Lock()
+        self._deque = Deque(_unpack_items(state['_items'])[0])
+
+
+class Task:
+    """Handle of a task spawned in a WorkStealingExecutor.
+
+    Methods
+    -------
+    done:
+        True if the task has finished, with a result or an exception.
+
+    join:
+        Waits for the task to finish and returns its result.
+    """
+
+    __slots__ = ('_executor', '_function', '_args', '_kwargs', '_done',
+                 '_result', '_exception')
+
+    def __init__(self, executor: 'WorkStealingExecutor',
+                 function: Callable[..., Any], args: tuple,
+                 kwargs: Dict[str, Any]) -> NoReturn:
+        self._executor = executor
+        self._function = function
+        self._args = args
+        self._kwargs = kwargs
+        self._done = False
+        self._result = None
+        self._exception = None
+
+    def _run(self) -> NoReturn:
+        """Calls the function, keeping its result or its exception.
+
+        Every exception is kept, SystemExit and KeyboardInterrupt too,
+        so the worker thread keeps running and the task is always done.
+        """
+
+        try:
+            self._result = self._function(*self._args, **self._kwargs)
+        except BaseException as error:
+            self._exception = error
+        self._function = self._args = self._kwargs = None
+        self._done = True
+
+    def _cancel(self) -> NoReturn:
+        """Finishes the task without running it, as it's shut down."""
+
+        self._exception = RuntimeError("The executor is shut down")
+        self._function = self._args = self._kwargs = None
+        self._done = True
+
+    def done(self) -> bool:
+        """True if the task has finished, with a result or an exception."""
+
+        return self._done
+
+    def join(self, timeout: Optional[float] = None) -> Any:
+        """Waits for the task to finish and returns its result.
+
+        A worker of the executor that joins a task runs other tasks
+        while it waits, its own tasks first, so workers never block
+        waiting for their subtasks.
+
+        Parameters
+        ----------
+        timeout: float, optional
+            Maximum amount of seconds to wait. The default value is
+            None, to wait until the task finishes.
+
+        Returns
+        -------
+        result: Any
+            The value returned by the function of the task.
+
+        Raises
+        ------
+        TimeoutError:
+            When the task doesn't finish before the timeout.
+
+        Exception:
+            The exception raised by the function of the task, if any.
+        """
+
+        if not self._done:
+            self._executor._wait_for_task(self, timeout)
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def __repr__(self) -> str:
+        state = "done" if self._done else "pending"
+        return str(self.__class__.__name__) + " (" + state + ")"
+
+
+class _WorkerStats:
+    """Counters of a worker, only updated by the worker's thread."""
+
+    __slots__ = ('spawned', 'executed', 'steals', 'steal_attempts',
+                 'idle_seconds')
+
+    def __init__(self) -> NoReturn:
+        self.spawned = 0
+        self.executed = 0
+        self.steals = 0
+        self.steal_attempts = 0
+        self.idle_seconds = 0.
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class WorkStealingExecutor:
+    """Pool of worker threads that balance their tasks by stealing.
+
+    Every worker owns a WorkStealingDeque of pending tasks: tasks
+    spawned by a worker are pushed to the top of its own deque, and it
+    runs them in LIFO order. A worker without tasks steals the oldest
+    task of a random victim, so the large tasks at the bottom of busy
+    deques are spread out, without a global queue shared by every
+    worker. Tasks spawned from other threads are spread over the
+    deques in turn.
+
+    Workers are threads, so CPU-bound tasks should compute their
+    leaves through a ProcessAdapter.
+
+    Properties
+    ----------
+    n_workers: int
+        Read-only amount of worker threads.
+
+    Methods
+    -------
+    spawn:
+        Schedules a call to a function and returns its Task.
+
+    pending:
+        Amount of spawned tasks that haven't finished yet.
+
+    stats:
+        Dictionary with the spawn, steal and idle metrics.
+
+    shutdown:
+        Stops the workers, after the pending tasks finish if wait.
+    """
+
+    def __init__(self, n_workers: Optional[int] = None,
+                 idle_timeout: float = IDLE_TIMEOUT) -> NoReturn:
+        """Initializes the deques and starts the worker threads.
+
+        Parameters
+        ----------
+        n_workers: int, optional
+            Amount of worker threads. The default value is None, for
+            one worker per CPU.
+
+        idle_timeout: float, optional
+            Maximum amount of seconds an idle worker waits before
+            looking for tasks again. The default value is
+            IDLE_TIMEOUT.
+
+        Raises
+        ------
+        AssertionError:
+            If n_workers or idle_timeout is not positive.
+        """
+
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        assert n_workers > 0, "n_workers must be positive."
+        assert idle_timeout > 0, "idle_timeout must be positive."
+        self.__n_workers = n_workers
+        self._idle_timeout = idle_timeout
+        self._deques = [WorkStealingDeque() for _ in range(n_workers)]
+        self._stats = [_WorkerStats() for _ in range(n_workers)]
+        self._worker = local()
+        self._lock = Lock()
+        self._changed = Condition(self._lock)
+        self._waiting = 0
+        self._joining = 0
+        self._submitted = 0
+        self._cancelled = 0
+        self._closed = False
+        self._stopped = False
+        self._threads = [Thread(target=self._work, args=(index,),
+                                name="WorkStealingExecutor-" + str(index),
+                                daemon=True)
+                         for index in range(n_workers)]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def n_workers(self) -> int:
+        """Amount of worker threads."""
+
+        return self.__n_workers
+
+    def spawn(self, function: Callable[..., Any], *args: Any,
+              **kwargs: Any) -> Task:
+        """Schedules a call to a function and returns its Task.
+
+        Parameters
+        ----------
+        function: callable
+            Function to call with the rest of the arguments. It can
+            spawn and join more tasks.
+
+        Returns
+        -------
+        task: Task
+            Handle to join the task and get its result.
+
+        Raises
+        ------
+        RuntimeError:
+            When the executor is shut down, and the task is not spawned
+            by another task.
+        """
+
+        index = getattr(self._worker, 'index', None)
+        if index is None:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("The executor is shut down")
+                index = self._submitted % self.__n_workers
+                self._submitted += 1
+        else:
+            self._stats[index].spawned += 1
+        task = Task(self, function, args, kwargs)
+        self._deques[index].push(task)
+        self._notify(self._waiting)
+        return task
+
+    def _notify(self, n_waiting: int) -> NoReturn:
+        """Wakes up the waiting threads, if there are any.
+
+        Waiting threads increase their counters before checking what
+        they wait for, so either they see the change or the change
+        sees them.
+        """
+
+        if n_waiting:
+            with self._lock:
+                self._changed.notify_all()
+
+    def _wait_for(self, ready: Callable[[], bool], timeout: Optional[float],
+                  joining: bool = False) -> NoReturn:
+        """Waits until notified or timeout, unless ready is True.
+
+        Every waiting thread is notified of new tasks, joining threads
+        are also notified of finished tasks.
+        """
+
+        with self._lock:
+            self._waiting += 1
+            self._joining += joining
+            try:
+                if not ready():
+                    self._changed.wait(timeout)
+            finally:
+                self._waiting -= 1
+                self._joining -= joining
+
+    def _has_tasks(self) -> bool:
+        return any(deque.size() for deque in self._deques)
+
+    def _find_task(self, index: int) -> Optional[Task]:
+        """Pops a task of the worker, or steals one from a victim."""
+
+        try:
+            return self._deques[index].pop()
+        except IndexError:
+            pass
+        stats = self._stats[index]
+        start = randrange(self.__n_workers)
+        for victim in chain(range(start, self.__n_workers), range(start)):
+            deque = self._deques[victim]
+            if victim == index or deque.size() == 0:
+                continue
+            stats.steal_attempts += 1
+            try:
+                task = deque.steal()
+            except IndexError:
+                continue
+            stats.steals += 1
+            return task
+        return None
+
+    def _run(self, task: Task, stats: _WorkerStats) -> NoReturn:
+        task._run()
+        stats.executed += 1
+        self._notify(self._joining)
+
+    def _idle(self, index: int, ready: Callable[[], bool],
+              timeout: Optional[float], joining: bool = False) -> NoReturn:
+        """Waits for a change, accounting the time as idle."""
+
+        start = perf_counter()
+        self._wait_for(ready, timeout, joining)
+        self._stats[index].idle_seconds += perf_counter() - start
+
+    def _work(self, index: int) -> NoReturn:
+        """Loop of a worker thread, until the executor is stopped."""
+
+        def ready() -> bool:
+            return self._stopped or self._has_tasks()
+
+        self._worker.index = index
+        stats = self._stats[index]
+        while not self._stopped:
+            task = self._find_task(index)
+            if task is None:
+                self._idle(index, ready, self._idle_timeout)
+            else:
+                self._run(task, stats)
+        # tasks spawned by the last task run, after the shutdown
+        self._cancel_queued(self._deques[index])
+
+    def _cancel_queued(self, deque: WorkStealingDeque) -> NoReturn:
+        """Cancels the tasks of a deque, waking up the joining threads."""
+
+        tasks = deque.drain()
+        if not tasks:
+            return
+        for task in tasks:
+            task._cancel()
+        with self._lock:
+            self._cancelled += len(tasks)
+            self._changed.notify_all()
+
+    def _wait_for_task(self, task: Task,
+                       timeout: Optional[float]) -> NoReturn:
+        """Waits for a task, running other tasks if called by a worker.
+
+        Raises
+        ------
+        TimeoutError:
+            When the task doesn't finish before the timeout.
+        """
+
+        def ready() -> bool:
+            return task._done or (index is not None and self._has_tasks())
+
+        deadline = None if timeout is None else monotonic() + timeout
+        index = getattr(self._worker, 'index', None)
+        while not task._done:
+            if index is not None:
+                found = self._find_task(index)
+                if found is not None:
+                    self._run(found, self._stats[index])
+                    continue
+            remaining = _remaining(deadline)
+            if remaining == 0:
+                raise TimeoutError("The task didn't finish in time")
+            if index is None:
+                self._wait_for(ready, remaining, joining=True)
+            else:
+                if remaining is None or remaining > self._idle_timeout:
+                    remaining = self._idle_timeout
+                self._idle(index, ready, remaining, joining=True)
+
+    def pending(self) -> int:
+        """Amount of spawned tasks that haven't finished yet."""
+
+        spawned = self._submitted
+        executed = self._cancelled
+        for stats in self._stats:
+            spawned += stats.spawned
+            executed += stats.executed
+        return spawned - executed
+
+    def stats(self) -> Dict[str, Any]:
+        """Dictionary with the spawn, steal and idle metrics.
+
+        Returns
+        -------
+        metrics: dict
+            'workers' has a dictionary for each worker, with the
+            amount of tasks it 'spawned' and 'executed', its 'steals'
+            and 'steal_attempts' (victims it tried to steal from),
+            its 'idle_seconds' and the tasks 'queued' in its deque.
+            The same metrics are summed over the workers, along with
+            the tasks 'submitted' from other threads, the tasks
+            'cancelled' by a shutdown without waiting and the
+            'pending' tasks.
+        """
+
+        workers = []
+        for stats, deque in zip(self._stats, self._deques):
+            worker = stats.as_dict()
+            worker['queued'] = deque.size()
+            workers.append(worker)
+        totals = {name: sum(worker[name] for worker in workers)
+                  for name in workers[0]}
+        totals.update(workers=workers, submitted=self._submitted,
+                      cancelled=self._cancelled, pending=self.pending())
+        return totals
+
+    def shutdown(self, wait: bool = True) -> NoReturn:
+        """Stops the workers, after the pending tasks finish if wait.
+
+        No more tasks can be spawned from other threads once it's
+        called, but the pending tasks can still spawn tasks. It must
+        not be called from a task.
+
+        Parameters
+        ----------
+        wait: bool, optional
+            If True, waits for the pending tasks to finish and for the
+            workers to stop. Else, the tasks that haven't started are
+            never run: they are cancelled, and joining them raises
+            RuntimeError. The default value is True.
+        """
+
+        def finished() -> bool:
+            return not self.pending()
+
+        with self._lock:
+            self._closed = True
+        if wait:
+            while self.pending():
+                self._wait_for(finished, self._idle_timeout, joining=True)
+        with self._lock:
+            self._stopped = True
+            self._changed.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        else:
+            for deque in self._deques:
+                self._cancel_queued(deque)
+
+    def __enter__(self) -> 'WorkStealingExecutor':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> NoReturn:
+        self.shutdown()
+
+
+class ProcessAdapter:
+    """Runs functions in a pool of processes, for CPU-bound tasks.
+
+    Worker threads share the interpreter lock, so only one of them
+    computes at a time. Spawning executor.spawn(adapter, function,
+    *args) runs the function in a process of the pool instead, while
+    its worker thread waits for the result without holding the lock.
+    The functions and their arguments must be picklable, and they
+    can't spawn tasks: divide in the threads and compute the leaves in
+    the processes.
+
+    Methods
+    -------
+    shutdown:
+        Stops the processes of the pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> NoReturn:
+        """Initializes the pool of processes.
+
+        Parameters
+        ----------
+        max_workers: int, optional
+            Amount of processes. The default value is None, for one
+            process per CPU.
+        """
+
+        self._pool = ProcessPoolExecutor(max_workers)
+
+    def __call__(self, function: Callable[..., Any], *args: Any,
+                 **kwargs: Any) -> Any:
+        """Calls the function in a process and returns its result."""
+
+        return self._pool.submit(function, *args, **kwargs).result()
+
+    def shutdown(self, wait: bool = True) -> NoReturn:
+        """Stops the processes of the pool.
+
+        Parameters
+        ----------
+        wait: bool, optional
+            If True, waits for the running calls to finish. The
+            default value is True.
+        """
+
+        self._pool.shutdown(wait)
+
+    def __enter__(self) -> 'ProcessAdapter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> NoReturn:
+        self.shutdown()
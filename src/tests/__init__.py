@@ -8,6 +8,11 @@ Modules
         -------
             TestNumber: Tests for the Number class.
 
+            TestNumberArray: Tests for the NumberArray class.
+
+            TestNumpyNumberArray: Tests for the NumberArray class, with
+            the values in NumPy arrays.
+
     test_stacks:
         Classes
         -------
@@ -16,8 +21,104 @@ Modules
             TestTypeRestrictedStack: Tests for the TypeRestrictedStack
             class.
 
+            TestNumericStack: Tests for the NumericStack class.
+
+            TestAggregateStack: Tests for the AggregateStack class.
+
+            TestMinMaxStack: Tests for the MinMaxStack class.
+
+            TestSegmentedStack: Tests for the SegmentedStack class.
+
     test_queues:
         Classes
         -------
             TestQueue: Tests for the Queue class.
+
+            TestAggregatingQueue: Tests for the AggregatingQueue class.
+
+            TestSlidingWindow: Tests for the SlidingWindow class.
+
+            TestConcurrentQueue: Tests for the ConcurrentQueue class.
+
+            TestSharedNumberQueue: Tests for the SharedNumberQueue
+            class.
+
+            TestSegmentedQueue: Tests for the SegmentedQueue class.
+
+            TestRingQueue: Tests for the RingQueue class.
+
+    test_asynchronous:
+        Classes
+        -------
+            TestAsyncStack: Tests for the AsyncStack class.
+
+            TestAsyncQueue: Tests for the AsyncQueue class.
+
+    test_spilling:
+        Classes
+        -------
+            TestSerializers: Tests for the segment serializers.
+
+            TestSpillingStack: Tests for the SpillingStack class.
+
+            TestSpillingQueue: Tests for the SpillingQueue class.
+
+    test_deques:
+        Classes
+        -------
+            TestDeque: Tests for the Deque class.
+
+    test_priority_queues:
+        Classes
+        -------
+            TestPriorityQueue: Tests for the PriorityQueue class.
+
+            TestIndexedPriorityQueue: Tests for the IndexedPriorityQueue
+            class.
+
+    test_persistent:
+        Classes
+        -------
+            TestPersistentStack: Tests for the PersistentStack class.
+
+            TestPersistentQueue: Tests for the PersistentQueue class.
+
+    test_instrumentation:
+        Classes
+        -------
+            TestMetrics: Tests for the Metrics and PrometheusTextFile
+            classes.
+
+            TestInstrumentedStructures: Tests for the instrumented
+            structures and the instrument function.
+
+    test_work_stealing:
+        Classes
+        -------
+            TestWorkStealingDeque: Tests for the WorkStealingDeque class.
+
+            TestWorkStealingExecutor: Tests for the WorkStealingExecutor
+            and ProcessAdapter classes.
+
+    test_expressions:
+        Classes
+        -------
+            TestProgram: Tests for the Program class and the evaluate
+            function.
+
+    test_pipeline:
+        Classes
+        -------
+            TestPipeline: Tests for the Stage and Pipeline classes.
+
+    test_graphs:
+        Classes
+        -------
+            TestGraph: Tests for the Graph class.
+
+    test_benchmarks:
+        Classes
+        -------
+            TestResults: Tests for the storage and comparison of
+            benchmark results.
 """
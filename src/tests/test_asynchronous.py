@@ -0,0 +1,185 @@
+"""Test for the data_structures.asynchronous module.
+
+TestAsyncStack:
+    Tests for the AsyncStack class.
+
+TestAsyncQueue:
+    Tests for the AsyncQueue class.
+"""
+
+import asyncio
+import unittest
+from data_structures.asynchronous import AsyncStack, AsyncQueue
+
+
+class TestAsyncStack(unittest.IsolatedAsyncioTestCase):
+    """Tests for the AsyncStack class.
+
+    Methods
+    -------
+    test_lifo:
+        Awaited pushes and pops must follow the stack order.
+
+    test_pop_waits:
+        Pop must suspend until an item is pushed.
+    """
+
+    async def test_lifo(self):
+        """Awaited pushes and pops must follow the stack order."""
+
+        stack = AsyncStack()
+        await stack.push(1)
+        await stack.push_many([2, 3])
+        self.assertEqual(stack.peak(), 3)
+        self.assertEqual(await stack.pop(), 3)
+        self.assertEqual(await stack.pop_many(5), [2, 1])
+        self.assertEqual(stack.size(), 0)
+
+    async def test_pop_waits(self):
+        """Pop must suspend until an item is pushed."""
+
+        stack = AsyncStack()
+        consumer = asyncio.create_task(stack.pop())
+        await asyncio.sleep(0)
+        self.assertFalse(consumer.done())
+        await stack.push("asd")
+        self.assertEqual(await consumer, "asd")
+
+
+class TestAsyncQueue(unittest.IsolatedAsyncioTestCase):
+    """Tests for the AsyncQueue class.
+
+    Methods
+    -------
+    test_fifo:
+        Awaited pushes and pops must follow the queue order.
+
+    test_backpressure:
+        Push must suspend while the queue is full.
+
+    test_mixed_waiting_pushes:
+        A push that fits must not wait behind a larger one.
+
+    test_iter_drain:
+        Iter drain must pop without suspending and wake up producers.
+
+    test_timeouts:
+        Pops and pushes must fail after the timeout.
+
+    test_async_iteration:
+        Async iteration must pop items until closed and empty.
+
+    test_producers_consumers:
+        Every item must be popped once, in order.
+    """
+
+    async def test_fifo(self):
+        """Awaited pushes and pops must follow the queue order."""
+
+        queue = AsyncQueue()
+        await queue.push_many(range(5))
+        await queue.extend([5])
+        self.assertEqual(queue.peak(), 0)
+        self.assertEqual(await queue.pop(), 0)
+        self.assertEqual(await queue.pop_many(3), [1, 2, 3])
+        self.assertEqual(queue.drain(), [4, 5])
+        with self.assertRaises(ValueError):
+            await queue.pop_many(0)
+
+    async def test_backpressure(self):
+        """Push must suspend while the queue is full."""
+
+        queue = AsyncQueue(maxsize=2)
+        self.assertEqual(queue.maxsize, 2)
+        await queue.push_many([1, 2])
+        producer = asyncio.create_task(queue.push(3))
+        await asyncio.sleep(0)
+        self.assertFalse(producer.done())
+        self.assertEqual(queue.size(), 2)
+        self.assertEqual(await queue.pop(), 1)
+        await producer
+        self.assertEqual(queue.drain(), [2, 3])
+        with self.assertRaises(ValueError):
+            await queue.push_many([1, 2, 3])
+
+    async def test_mixed_waiting_pushes(self):
+        """A push that fits must not wait behind a larger one."""
+
+        queue = AsyncQueue(maxsize=3)
+        await queue.push_many([1, 2, 3])
+        large = asyncio.create_task(queue.push_many([10, 11, 12]))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(queue.push(20))
+        await asyncio.sleep(0)
+        self.assertEqual(await queue.pop(), 1)
+        await asyncio.wait_for(small, 1)
+        self.assertFalse(large.done())
+        self.assertEqual(list(queue), [2, 3, 20])
+        self.assertEqual(await queue.pop_many(3), [2, 3, 20])
+        await asyncio.wait_for(large, 1)
+        self.assertEqual(queue.drain(), [10, 11, 12])
+
+    async def test_iter_drain(self):
+        """Iter drain must pop without suspending, waking up producers."""
+
+        queue = AsyncQueue(maxsize=2)
+        await queue.push_many([1, 2])
+        producer = asyncio.create_task(queue.push(3))
+        await asyncio.sleep(0)
+        self.assertEqual(list(queue.iter_drain()), [1, 2])
+        await producer
+        self.assertEqual(list(queue), [3])
+        self.assertEqual(len(queue), 1)
+
+    async def test_timeouts(self):
+        """Pops and pushes must fail after the timeout."""
+
+        queue = AsyncQueue(maxsize=1)
+        with self.assertRaises(IndexError):
+            await queue.pop(timeout=0.01)
+        with self.assertRaises(IndexError):
+            await queue.pop_many(10, timeout=0.01)
+        await queue.push(1)
+        with self.assertRaises(OverflowError):
+            await queue.push(2, timeout=0.01)
+        self.assertEqual(len(queue._putters), 0)
+        self.assertEqual(await queue.pop_many(10, timeout=0.01), [1])
+
+    async def test_async_iteration(self):
+        """Async iteration must pop items until closed and empty."""
+
+        queue = AsyncQueue()
+
+        async def collect():
+            return [item async for item in queue]
+
+        consumer = asyncio.create_task(collect())
+        await queue.push_many([1, 2])
+        await asyncio.sleep(0)
+        await queue.push(3)
+        queue.close()
+        self.assertTrue(queue.closed)
+        self.assertEqual(await consumer, [1, 2, 3])
+        with self.assertRaises(RuntimeError):
+            await queue.push(4)
+
+    async def test_producers_consumers(self):
+        """Every item must be popped once, in order."""
+
+        queue = AsyncQueue(maxsize=8)
+        n_items = 1000
+        popped = []
+
+        async def produce():
+            for index in range(n_items):
+                await queue.push(index)
+
+        async def consume():
+            async for item in queue:
+                popped.append(item)
+
+        consumers = [asyncio.create_task(consume()) for _ in range(3)]
+        await produce()
+        queue.close()
+        await asyncio.gather(*consumers)
+        self.assertEqual(popped, list(range(n_items)))
@@ -0,0 +1,66 @@
+"""Test for the benchmarks.results and benchmarks.bench_suite modules.
+
+TestResults:
+    Tests for the storage and comparison of benchmark results.
+"""
+
+import io
+import os
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from tempfile import TemporaryDirectory
+from benchmarks import bench_suite, results
+
+
+class TestResults(unittest.TestCase):
+    """Tests for the storage and comparison of benchmark results.
+
+    Methods
+    -------
+    test_save_load:
+        Saved results must be loaded back without the metadata.
+
+    test_compare:
+        Metrics slower than the threshold must be flagged.
+
+    test_suite_sizes:
+        The suite must reject --full together with --sizes.
+    """
+
+    def test_save_load(self):
+        """Saved results must be loaded back without the metadata."""
+
+        measured = {'push': {'1000': 52.5, '10000': 51.}}
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.json')
+            results.save(path, measured, results.metadata())
+            self.assertEqual(results.load(path), measured)
+
+    def test_compare(self):
+        """Metrics slower than the threshold must be flagged."""
+
+        baseline = {'push': {'1000': 100., '10000': 100.},
+                    'pop': {'1000': 50.},
+                    'removed': {'1000': 10.}}
+        current = {'push': {'1000': 105., '10000': 120.},
+                   'pop': {'1000': 40., '10000': 45.},
+                   'added': {'1000': 10.}}
+        # only the metrics and amounts of items measured in both runs
+        self.assertEqual(results.compare(baseline, current),
+                         [('pop', '1000', 50., 40., False),
+                          ('push', '1000', 100., 105., False),
+                          ('push', '10000', 100., 120., True)])
+        rows = results.compare(baseline, current, threshold=0.01)
+        self.assertEqual([row[-1] for row in rows], [False, True, True])
+        self.assertEqual(results.compare(baseline, {}), [])
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(results.report(rows), 2)
+        self.assertEqual(output.getvalue().count("REGRESSION"), 2)
+
+    def test_suite_sizes(self):
+        """The suite must reject --full together with --sizes."""
+
+        with redirect_stderr(io.StringIO()) as error:
+            self.assertRaises(SystemExit, bench_suite.main,
+                              ['--full', '--sizes', '1000'])
+        self.assertIn("not allowed with argument", error.getvalue())
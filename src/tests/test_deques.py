@@ -0,0 +1,195 @@
+"""Test for the data_structures.deques module.
+
+TestDeque:
+    Tests for the Deque class.
+"""
+
+import io
+import pickle
+import unittest
+from collections import deque
+from random import Random
+from data_structures.deques import Deque
+
+
+class TestDeque(unittest.TestCase):
+    """Tests for the Deque class.
+
+    Methods
+    -------
+    test_init:
+        Initialization must validate the block size and maxlen.
+
+    test_both_ends:
+        Pushes and pops must work at both ends across blocks.
+
+    test_empty:
+        Popping or peaking an empty deque must raise IndexError.
+
+    test_batches:
+        Batch operations must keep the order of both ends.
+
+    test_maxlen:
+        Bounded deques must discard items from the opposite end.
+
+    test_rotate:
+        Rotations must move the items between the ends.
+
+    test_against_deque:
+        Random operations must match collections.deque.
+
+    test_serialization:
+        Packed and pickled deques must keep their items and maxlen.
+    """
+
+    def test_init(self):
+        """Initialization must validate the block size and maxlen."""
+
+        self.assertRaises(AssertionError, Deque, block_size=1)
+        self.assertRaises(AssertionError, Deque, maxlen=-1)
+        items = Deque(range(5), maxlen=10, block_size=4)
+        self.assertEqual(list(items), list(range(5)))
+        self.assertEqual((items.maxlen, items.block_size), (10, 4))
+        self.assertIsNone(Deque().maxlen)
+
+    def test_both_ends(self):
+        """Pushes and pops must work at both ends across blocks."""
+
+        items = Deque(block_size=2)
+        for value in range(5):
+            items.push_right(value)
+            items.push_left(-value - 1)
+        self.assertEqual(list(items), list(range(-5, 5)))
+        self.assertEqual(list(reversed(items)), list(range(4, -6, -1)))
+        self.assertEqual((items.peak_left(), items.peak_right()), (-5, 4))
+        self.assertEqual(items.size(), 10)
+        self.assertEqual(items.pop_right(), 4)
+        self.assertEqual(items.pop_left(), -5)
+        items.push(9)
+        self.assertEqual(items.peak(), -4)
+        self.assertEqual(items.pop(), -4)
+        self.assertEqual(items.peak_right(), 9)
+        self.assertEqual(len(items), 8)
+
+    def test_empty(self):
+        """Popping or peaking an empty deque must raise IndexError."""
+
+        items = Deque()
+        self.assertFalse(items)
+        for method in (items.pop_left, items.pop_right, items.peak_left,
+                       items.peak_right, items.pop, items.peak):
+            self.assertRaises(IndexError, method)
+        items.push_left(1)
+        self.assertTrue(items)
+        self.assertEqual(items.pop_right(), 1)
+        self.assertRaises(IndexError, items.pop_left)
+        self.assertEqual(repr(items), "Empty Deque")
+
+    def test_batches(self):
+        """Batch operations must keep the order of both ends."""
+
+        items = Deque(block_size=3)
+        items.push_many(range(5))
+        items.extend([5, 6])
+        items.push_many_left([-1, -2])
+        items.extend_left([-3])
+        self.assertEqual(list(items), list(range(-3, 7)))
+        self.assertEqual(items.peak_many(2), [-3, -2])
+        self.assertEqual(items.pop_many(4), [-3, -2, -1, 0])
+        self.assertEqual(items.pop_many_right(2), [6, 5])
+        self.assertRaises(IndexError, items.pop_many, 5)
+        self.assertRaises(ValueError, items.pop_many_right, -1)
+        self.assertEqual(items.drain(), [1, 2, 3, 4])
+        self.assertEqual(items.size(), 0)
+        items.push_many(range(3))
+        items.clear()
+        self.assertEqual(list(items), [])
+
+    def test_maxlen(self):
+        """Bounded deques must discard items from the opposite end."""
+
+        items = Deque(range(3), maxlen=3, block_size=2)
+        items.push_right(3)
+        self.assertEqual(list(items), [1, 2, 3])
+        items.push_left(0)
+        self.assertEqual(list(items), [0, 1, 2])
+        items.push_many(range(10, 12))
+        self.assertEqual(list(items), [2, 10, 11])
+        items.push_many_left(range(20, 30))
+        self.assertEqual(list(items), [29, 28, 27])
+        empty = Deque(maxlen=0)
+        empty.push(1)
+        empty.push_many([1, 2])
+        self.assertEqual(empty.size(), 0)
+
+    def test_rotate(self):
+        """Rotations must move the items between the ends."""
+
+        items = Deque(range(10), block_size=3)
+        items.rotate()
+        self.assertEqual(list(items), [9] + list(range(9)))
+        items.rotate(-3)
+        self.assertEqual(list(items), list(range(2, 10)) + [0, 1])
+        items.rotate(22)
+        self.assertEqual(list(items), list(range(10)))
+        single = Deque([1])
+        single.rotate(5)
+        self.assertEqual(list(single), [1])
+
+    def test_against_deque(self):
+        """Random operations must match collections.deque."""
+
+        random = Random(0)
+        for maxlen in (None, 7):
+            items = Deque(maxlen=maxlen, block_size=4)
+            expected = deque(maxlen=maxlen)
+            for step in range(2000):
+                operation = random.randrange(8)
+                if operation == 0:
+                    items.push_right(step)
+                    expected.append(step)
+                elif operation == 1:
+                    items.push_left(step)
+                    expected.appendleft(step)
+                elif operation == 2 and expected:
+                    self.assertEqual(items.pop_right(), expected.pop())
+                elif operation == 3 and expected:
+                    self.assertEqual(items.pop_left(), expected.popleft())
+                elif operation == 4:
+                    new_items = range(random.randrange(10))
+                    items.push_many(new_items)
+                    expected.extend(new_items)
+                elif operation == 5:
+                    new_items = range(random.randrange(10))
+                    items.push_many_left(new_items)
+                    expected.extendleft(new_items)
+                elif operation == 6:
+                    n = random.randrange(-20, 20)
+                    items.rotate(n)
+                    expected.rotate(n)
+                elif operation == 7:
+                    n = random.randrange(len(expected) + 1)
+                    self.assertEqual(items.pop_many(n),
+                                     [expected.popleft() for _ in range(n)])
+                self.assertEqual(list(items), list(expected))
+                self.assertEqual(items.size(), len(expected))
+
+    def test_serialization(self):
+        """Packed and pickled deques must keep their items and maxlen."""
+
+        items = Deque(range(100), maxlen=200, block_size=8)
+        items.rotate(5)
+        copy = pickle.loads(pickle.dumps(items))
+        self.assertEqual(list(copy), list(items))
+        self.assertEqual((copy.maxlen, copy.block_size), (200, 8))
+        copy.push_left(-1)
+        self.assertEqual(copy.peak_left(), -1)
+        self.assertEqual(list(Deque.from_bytes(items.to_bytes(), 3)),
+                         [92, 93, 94])
+        file = io.BytesIO()
+        items.dump(file)
+        file.seek(0)
+        self.assertEqual(list(Deque.load(file)), list(items))
+        deep = Deque(range(10**5), block_size=2)
+        self.assertEqual(pickle.loads(pickle.dumps(deep)).size(), 10**5)
+
@@ -2,12 +2,27 @@
 
 TestNumber:
     Tests for the Number class.
+
+TestNumberArray:
+    Tests for the NumberArray class.
+
+TestNumpyNumberArray:
+    Tests for the NumberArray class, with the values in NumPy arrays.
 """
 
+import io
+import operator
+import pickle
 import unittest
-from data_structures.elements import Number
+from array import array
+from data_structures.elements import Number, NumberArray, INTERNING_CACHE_SIZE
 from random import uniform
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class TestNumber(unittest.TestCase):
     """Tests for the Number class.
@@ -31,6 +46,15 @@ class TestNumber(unittest.TestCase):
 
     test_numbers_immutability:
         Number instances should be immutable.
+
+    test_numbers_hashing:
+        Equal Number instances must have equal hashes.
+
+    test_numbers_interning:
+        Interned Number instances must be shared while cached.
+
+    test_numbers_serialization:
+        Packed and pickled Number instances must keep their value.
     """
 
     def test_numbers_copying(self):
@@ -78,7 +102,226 @@ class TestNumber(unittest.TestCase):
             y.number = x
 
         self.assertRaises(AttributeError, evil_assignment, 3)
-        y.__number = 3
-        y._number = 3
+
+        def new_attribute(x):
+            nonlocal y
+            y._number = x
+
+        # Number instances have no __dict__, new attributes are rejected
+        self.assertRaises(AttributeError, new_attribute, 3)
         self.assertNotEqual(y.number, 3)
         self.assertEqual(y.number, 3.14)
+
+    def test_numbers_hashing(self):
+        """Equal Number instances must have equal hashes."""
+
+        self.assertEqual(hash(Number(3)), hash(Number(3.)))
+        self.assertEqual(hash(Number(2.5)), hash(Number(2.5)))
+        numbers = {Number(1), Number(1.), Number(2)}
+        self.assertEqual(len(numbers), 2)
+        counts = {Number(1): "one", 1: "int"}
+        self.assertEqual(counts[Number(1.)], "one")
+        self.assertEqual(counts[1], "int")
+        self.assertNotEqual(Number(1), 1)
+
+    def test_numbers_interning(self):
+        """Interned Number instances must be shared while cached."""
+
+        Number.set_interning_cache_size(2)
+        try:
+            x = Number.interned(7)
+            self.assertIs(Number.interned(7), x)
+            self.assertIsNot(Number.interned(7.), x)
+            self.assertEqual(Number.interned(7.), x)
+            # 7. was used last, so 7 is the least recently used
+            Number.interned(8)
+            self.assertIsNot(Number.interned(7), x)
+            self.assertRaises(AssertionError, Number.interned, "asd")
+        finally:
+            Number.set_interning_cache_size(INTERNING_CACHE_SIZE)
+
+    def test_numbers_serialization(self):
+        """Packed and pickled Number instances must keep their value."""
+
+        for value in (3, 2.5, -7, 2**70):
+            x = Number(value)
+            y = Number.from_bytes(x.to_bytes())
+            self.assertEqual(y, x)
+            self.assertIs(type(y.number), type(value))
+            self.assertEqual(pickle.loads(pickle.dumps(x)), x)
+        self.assertLess(len(Number(3.5).to_bytes()),
+                        len(pickle.dumps(Number(3.5))))
+        file = io.BytesIO()
+        Number(1).dump(file)
+        Number(2.).dump(file)
+        file.seek(0)
+        self.assertEqual(Number.load(file), Number(1))
+        self.assertEqual(Number.load(file).number, 2.)
+        self.assertRaises(ValueError, Number.from_bytes, b"DS")
+        self.assertRaises(ValueError, Number.from_bytes, b"x" * 20)
+        self.assertRaises(ValueError, Number.from_bytes,
+                          Number(1).to_bytes()[:-1])
+
+
+class TestNumberArray(unittest.TestCase):
+    """Tests for the NumberArray class.
+
+    The tests store the values in an array.array, TestNumpyNumberArray
+    runs them again with the values in a NumPy array.
+
+    Methods
+    -------
+    number_array:
+        Creates a NumberArray with the backend under test.
+
+    test_construction:
+        Values must be validated and stored in a single column.
+
+    test_indexing:
+        Indexing must create Numbers, slices and masks new arrays.
+
+    test_comparisons:
+        Comparisons must return a mask with a flag per value.
+
+    test_sorting:
+        Sorting and searching must follow the order of the values.
+
+    test_reductions:
+        Reductions must be computed over all the values.
+
+    test_serialization:
+        Packed arrays must keep their values and typecode.
+    """
+
+    use_numpy = False
+
+    def number_array(self, values=()):
+        """Creates a NumberArray with the backend under test."""
+
+        return NumberArray(values, self.use_numpy)
+
+    def test_construction(self):
+        """Values must be validated and stored in a single column."""
+
+        self.assertEqual(self.number_array([1, 2]).typecode, 'q')
+        self.assertEqual(self.number_array([1, 2.5]).typecode, 'd')
+        self.assertEqual(self.number_array([Number(1), 2.5]).tolist(),
+                         [1., 2.5])
+        self.assertEqual(
+            self.number_array([Number(1), Number(2)]).tolist(), [1, 2])
+        self.assertEqual(self.number_array([2**70]).typecode, 'd')
+        self.assertEqual(
+            self.number_array(array('f', [0.5, 1.5])).tolist(), [0.5, 1.5])
+        self.assertEqual(self.number_array(array('i', [3, 4])).typecode,
+                         'q')
+        self.assertEqual(
+            self.number_array(x / 2 for x in range(3)).tolist(),
+            [0., 0.5, 1.])
+        self.assertEqual(len(self.number_array()), 0)
+        self.assertEqual(self.number_array().use_numpy, self.use_numpy)
+        self.assertRaises(ValueError, self.number_array, [1, "2"])
+        self.assertRaises(ValueError, self.number_array, [Number(1), None])
+        self.assertRaises(ValueError, self.number_array, "12")
+        copy = self.number_array(self.number_array([1, 2]))
+        self.assertEqual(copy.tolist(), [1, 2])
+
+    def test_indexing(self):
+        """Indexing must create Numbers, slices and masks new arrays."""
+
+        values = self.number_array([4, 1.5, 3])
+        self.assertEqual(values[0], Number(4))
+        self.assertEqual(values[-1], Number(3))
+        self.assertRaises(IndexError, values.__getitem__, 3)
+        self.assertEqual(values[1:].tolist(), [1.5, 3])
+        self.assertEqual(values[[2, 0]].tolist(), [3, 4])
+        self.assertEqual(list(values),
+                         [Number(4), Number(1.5), Number(3)])
+        self.assertEqual(values.numbers(), list(values))
+        self.assertEqual(repr(values), "NumberArray Elements: 4.0; 1.5; 3.0")
+        values.repr_limit = 1
+        self.assertEqual(repr(values),
+                         "NumberArray Elements: 4.0; ... (2 more)")
+
+    def test_comparisons(self):
+        """Comparisons must return a mask with a flag per value."""
+
+        values = self.number_array([1, 5, 3])
+        self.assertEqual(list(values < 3), [True, False, False])
+        self.assertEqual(list(values <= Number(3)), [True, False, True])
+        self.assertEqual(list(values > 1), [False, True, True])
+        self.assertEqual(list(values >= 5.), [False, True, False])
+        self.assertEqual(list(values == 3), [False, False, True])
+        self.assertEqual(list(values != 3), [True, True, False])
+        self.assertEqual(list(values < self.number_array([2, 2, 2])),
+                         [True, False, False])
+        self.assertEqual(list(values == [1, 0, 3]), [True, False, True])
+        self.assertEqual(values[values > 2].tolist(), [5, 3])
+        self.assertRaises(ValueError, values.__lt__, [1, 2])
+        self.assertRaises(TypeError, operator.lt, values, "a")
+        self.assertRaises(TypeError, operator.ge, values, None)
+        self.assertFalse(operator.eq(values, None))
+        self.assertTrue(values != "x")
+        self.assertNotIn(None, [values])
+        self.assertNotIn(values, [None, "x"])
+        # the truth value of a mask is ambiguous, on both backends
+        self.assertRaises(ValueError, bool, values == values)
+        self.assertRaises(ValueError, self.assertEqual, values,
+                          self.number_array([3, 4, 5]))
+        self.assertNotIn(self.number_array([1]), [self.number_array([9])])
+        self.assertIn(self.number_array([9]), [self.number_array([9])])
+        self.assertRaises(TypeError, hash, values)
+
+    def test_sorting(self):
+        """Sorting and searching must follow the order of the values."""
+
+        values = self.number_array([3., 1., 2., 1.])
+        self.assertEqual(list(values.argsort()), [1, 3, 2, 0])
+        self.assertEqual(values[values.argsort()].tolist(), [1., 1., 2., 3.])
+        values.sort()
+        self.assertEqual(values.tolist(), [1., 1., 2., 3.])
+        self.assertEqual(values.searchsorted(1), 0)
+        self.assertEqual(values.searchsorted(Number(1), side='right'), 2)
+        self.assertEqual(list(values.searchsorted([0, 2.5, 4])), [0, 3, 4])
+        self.assertRaises(ValueError, values.searchsorted, 1, 'middle')
+
+    def test_reductions(self):
+        """Reductions must be computed over all the values."""
+
+        values = self.number_array([2, 4, 9])
+        self.assertEqual(values.sum(), Number(15))
+        self.assertEqual(values.min(), Number(2))
+        self.assertEqual(values.max(), Number(9))
+        self.assertEqual(values.mean(), Number(5))
+        empty = self.number_array()
+        self.assertEqual(empty.sum(), Number(0))
+        self.assertRaises(IndexError, empty.min)
+        self.assertRaises(IndexError, empty.max)
+        self.assertRaises(IndexError, empty.mean)
+        # int64 sums wrap around in NumPy, array.array sums Python ints
+        large = self.number_array([2**62, 2**62])
+        self.assertEqual(large.sum(),
+                         Number(-2**63 if self.use_numpy else 2**63))
+
+    def test_serialization(self):
+        """Packed arrays must keep their values and typecode."""
+
+        for values in ([1, 2, 3], [0.5, 2.], []):
+            packed = self.number_array(values).to_bytes()
+            copy = NumberArray.from_bytes(packed, self.use_numpy)
+            self.assertEqual(copy.tolist(), values)
+        packed = self.number_array([7]).to_bytes()
+        self.assertEqual(Number.load(io.BytesIO(packed)), Number(7))
+        self.assertEqual(NumberArray.from_bytes(
+            self.number_array([1, 2]).to_bytes(), self.use_numpy).typecode,
+            'q')
+        self.assertRaises(ValueError, NumberArray.from_bytes, b"bad")
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestNumpyNumberArray(TestNumberArray):
+    """Tests for the NumberArray class, with the values in NumPy arrays.
+
+    Runs every test of TestNumberArray with the NumPy backend.
+    """
+
+    use_numpy = True
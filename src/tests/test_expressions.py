@@ -0,0 +1,114 @@
+"""Test for the data_structures.expressions module.
+
+TestProgram:
+    Tests for the Program class and the evaluate function.
+"""
+
+import math
+import unittest
+from array import array
+from data_structures.elements import Number, NumberArray
+from data_structures.expressions import Program, evaluate
+
+
+class TestProgram(unittest.TestCase):
+    """Tests for the Program class and the evaluate function.
+
+    Methods
+    -------
+    test_precedence:
+        Operators must follow Python's precedence and associativity.
+
+    test_functions_and_variables:
+        Functions and variables must be evaluated with their bindings.
+
+    test_invalid:
+        Invalid expressions and bindings must raise ValueError.
+
+    test_cache:
+        Compiled programs must be reused from a bounded cache.
+
+    test_columns:
+        Batch evaluation must match evaluating each row.
+    """
+
+    def test_precedence(self):
+        """Operators must follow Python's precedence and associativity."""
+
+        for source in ['1 + 2 * 3', '(1 + 2) * 3', '-2 ** 2', '2 ** -1',
+                       '2 ** 3 ** 2', '7 // 2 + 7 % 3 - 8 / 5', '-(-3)',
+                       '+4 - -4', '10 - 4 - 3', '1.5e1 / .5', '2 * -3 ** 2']:
+            result = Program(source).evaluate()
+            self.assertIsInstance(result, Number)
+            self.assertEqual(result.number, eval(source))
+            self.assertEqual(type(result.number), type(eval(source)))
+
+    def test_functions_and_variables(self):
+        """Functions and variables must be evaluated with their bindings."""
+
+        program = Program('max(x, y) - min(x, sqrt(y)) * abs(-z) + log(1)')
+        self.assertEqual(program.variables, ('x', 'y', 'z'))
+        self.assertEqual(program.evaluate({'x': 3, 'y': 16}, z=Number(2)),
+                         Number(16 - 3 * 2))
+        self.assertEqual(program.evaluate(x=1, y=4, z=-1).number,
+                         4 - 1 * 1.0)
+        self.assertAlmostEqual(evaluate('exp(x) * 2', x=1).number,
+                               math.e * 2)
+        self.assertEqual(Program('x * x + x').depth, 2)
+        self.assertEqual(repr(Program('x + 1')), "Program('x + 1')")
+        with self.assertRaises(ZeroDivisionError):
+            evaluate('1 / (x - x)', x=2)
+
+    def test_invalid(self):
+        """Invalid expressions and bindings must raise ValueError."""
+
+        for source in ['', '1 +', '* 1', '1 2', 'x y', '(1', '1)', '()',
+                       '1, 2', 'f(1)', 'min(1)', 'abs(1, 2)', 'max(1,)',
+                       'a $ b', '2 (3)']:
+            with self.assertRaises(ValueError, msg=source):
+                Program(source)
+        with self.assertRaises(ValueError):
+            evaluate('x + y', x=1)
+        with self.assertRaises(ValueError):
+            evaluate('x + 1', x='1')
+        with self.assertRaises(ValueError):
+            evaluate('(-1) ** 0.5')
+
+    def test_cache(self):
+        """Compiled programs must be reused from a bounded cache."""
+
+        Program.set_compile_cache_size(2)
+        try:
+            first = Program.compiled('x + 1')
+            self.assertIs(Program.compiled('x + 1'), first)
+            Program.compiled('x + 2')
+            Program.compiled('x + 3')
+            self.assertIsNot(Program.compiled('x + 1'), first)
+        finally:
+            Program.set_compile_cache_size(256)
+
+    def test_columns(self):
+        """Batch evaluation must match evaluating each row."""
+
+        program = Program('a * x ** 2 + b * max(x, 2) - c / 4')
+        xs = [x / 3 for x in range(-20, 20)]
+        bs = list(range(40))
+        columns = {'x': xs, 'a': Number(2), 'b': array('q', bs),
+                   'c': NumberArray(bs)}
+        results = program.evaluate_columns(columns)
+        self.assertIsInstance(results, NumberArray)
+        self.assertEqual(len(results), len(xs))
+        for row, result in enumerate(results):
+            expected = program.evaluate(x=xs[row], a=2, b=bs[row],
+                                        c=bs[row])
+            self.assertAlmostEqual(result.number, expected.number)
+        self.assertEqual(program.evaluate_columns(
+            x=1, a=2, b=3, c=4).tolist(), [program.evaluate(
+                x=1, a=2, b=3, c=4).number])
+        self.assertEqual(Program('x - 1').evaluate_columns(
+            x=[1, 2], y=[1]).tolist(), [0, 1])
+        self.assertEqual(Program('x').evaluate_columns(x=[]).tolist(), [])
+        with self.assertRaises(ValueError):
+            program.evaluate_columns(x=[1, 2], a=[1], b=1, c=1)
+        with self.assertRaises(ValueError):
+            program.evaluate_columns(x=['1'], a=1, b=1, c=1)
@@ -0,0 +1,143 @@
+"""Test for the data_structures.graphs module.
+
+TestGraph:
+    Tests for the Graph class.
+"""
+
+import sys
+import unittest
+from array import array
+from random import Random
+from data_structures.graphs import Graph
+
+
+class TestGraph(unittest.TestCase):
+    """Tests for the Graph class.
+
+    Methods
+    -------
+    test_init:
+        Edges must be grouped by source node, keeping their order.
+
+    test_from_csr:
+        Compressed sparse rows must be validated.
+
+    test_dfs_bfs:
+        Traversals must visit the nodes in order, lazily.
+
+    test_topological_sort:
+        Every edge must go forward, and cycles must raise ValueError.
+
+    test_components:
+        Strongly and weakly connected components must be found.
+
+    test_deep_graph:
+        Traversals must work deeper than the recursion limit.
+    """
+
+    def setUp(self):
+        # 0 -> 1 -> 3, 0 -> 2 -> 3, 3 -> 4 -> 5 -> 3, 6 isolated
+        self.edges = [(3, 4), (0, 1), (0, 2), (1, 3), (2, 3), (4, 5),
+                      (5, 3)]
+        self.graph = Graph(7, self.edges)
+
+    def test_init(self):
+        """Edges must be grouped by source node, keeping their order."""
+
+        graph = self.graph
+        self.assertEqual((graph.n_nodes, graph.n_edges), (7, 7))
+        self.assertEqual(list(graph.offsets), [0, 2, 3, 4, 5, 6, 7, 7])
+        self.assertEqual(list(graph.targets), [1, 2, 3, 3, 4, 5, 3])
+        self.assertEqual(list(graph.successors(0)), [1, 2])
+        self.assertEqual(graph.out_degree(6), 0)
+        self.assertRaises(IndexError, graph.successors, 7)
+        self.assertEqual(sorted(graph.edges()), sorted(self.edges))
+        self.assertEqual(sorted(graph.reversed().edges()),
+                         sorted((target, source)
+                                for source, target in self.edges))
+        self.assertEqual(repr(graph), "Graph with 7 nodes and 7 edges")
+        self.assertEqual(list(Graph(3, self.edges[1:3]).offsets),
+                         [0, 2, 2, 2])
+        self.assertEqual(Graph(0).n_nodes, 0)
+        self.assertRaises(ValueError, Graph, 3, [(0, 3)])
+        self.assertRaises(ValueError, Graph, 3, [(-1, 0)])
+        self.assertRaises(AssertionError, Graph, -1)
+
+    def test_from_csr(self):
+        """Compressed sparse rows must be validated."""
+
+        graph = Graph.from_csr(self.graph.offsets, self.graph.targets)
+        self.assertEqual(list(graph.edges()), list(self.graph.edges()))
+        self.assertRaises(ValueError, Graph.from_csr, [], [])
+        self.assertRaises(ValueError, Graph.from_csr, [0, 2, 1], [0, 1])
+        self.assertRaises(ValueError, Graph.from_csr, [0, 1, 3], [0, 1])
+        self.assertRaises(ValueError, Graph.from_csr, [0, 1, 2], [0, 2])
+        self.assertRaises(ValueError, Graph.from_csr, [0, 1, 2], [0, -1])
+        self.assertRaises(ValueError, Graph.from_csr, [0, 1, 2], [0, 2**70])
+        self.assertRaises(ValueError, Graph.from_csr, [0, 2**70], [0])
+
+    def test_dfs_bfs(self):
+        """Traversals must visit the nodes in order, lazily."""
+
+        graph = self.graph
+        self.assertEqual(list(graph.dfs()), [0, 1, 3, 4, 5, 2, 6])
+        self.assertEqual(list(graph.dfs(2)), [2, 3, 4, 5])
+        self.assertEqual(list(graph.postorder()), [5, 4, 3, 1, 2, 0, 6])
+        self.assertEqual(list(graph.postorder(4)), [3, 5, 4])
+        self.assertEqual(list(graph.bfs()), [0, 1, 2, 3, 4, 5, 6])
+        self.assertEqual(list(graph.bfs(4)), [4, 5, 3])
+        self.assertRaises(IndexError, list, graph.bfs(-1))
+        traversal = graph.dfs()
+        self.assertEqual(next(traversal), 0)
+        self.assertEqual(next(traversal), 1)
+
+    def test_topological_sort(self):
+        """Every edge must go forward, and cycles must raise ValueError."""
+
+        random = Random(0)
+        edges = [tuple(sorted(random.sample(range(50), 2)))
+                 for _ in range(200)]
+        order = list(Graph(50, edges).topological_sort())
+        positions = {node: index for index, node in enumerate(order)}
+        self.assertEqual(sorted(order), list(range(50)))
+        for source, target in edges:
+            self.assertLess(positions[source], positions[target])
+        sorted_nodes = []
+        with self.assertRaises(ValueError):
+            for node in self.graph.topological_sort():
+                sorted_nodes.append(node)
+        self.assertEqual(sorted(sorted_nodes), [0, 1, 2, 6])
+
+    def test_components(self):
+        """Strongly and weakly connected components must be found."""
+
+        components = list(self.graph.strongly_connected_components())
+        self.assertEqual([sorted(component) for component in components],
+                         [[3, 4, 5], [1], [2], [0], [6]])
+        self.assertEqual(sorted(map(sorted,
+                                    self.graph.connected_components())),
+                         [[0, 1, 2, 3, 4, 5], [6]])
+        graph = Graph(4, [(0, 0), (1, 2), (2, 1), (2, 1)])
+        self.assertEqual(sorted(map(sorted,
+                                    graph.strongly_connected_components())),
+                         [[0], [1, 2], [3]])
+
+    def test_deep_graph(self):
+        """Traversals must work deeper than the recursion limit."""
+
+        n_nodes = sys.getrecursionlimit() * 10
+        path = [(node + 1, node) for node in range(n_nodes - 1)]
+        path.append((0, n_nodes - 1))
+        graph = Graph(n_nodes, path)
+        self.assertIsInstance(graph.targets, array)
+        self.assertEqual(len(list(graph.dfs(0))), n_nodes)
+        self.assertEqual(next(graph.postorder(0)), 1)
+        components = list(graph.strongly_connected_components())
+        self.assertEqual(len(components), 1)
+        self.assertEqual(len(components[0]), n_nodes)
+        self.assertRaises(ValueError, list, graph.topological_sort())
+        chain = Graph.from_csr(list(range(n_nodes)) + [n_nodes - 1],
+                               range(1, n_nodes))
+        self.assertEqual(list(chain.topological_sort()),
+                         list(range(n_nodes)))
+        self.assertEqual(list(chain.postorder()), list(range(n_nodes))[::-1])
@@ -0,0 +1,164 @@
+"""Test for the data_structures.instrumentation module.
+
+TestMetrics:
+    Tests for the Metrics and PrometheusTextFile classes.
+
+TestInstrumentedStructures:
+    Tests for the instrumented structures and the instrument function.
+"""
+
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from data_structures.elements import Number
+from data_structures.instrumentation import (Metrics, PrometheusTextFile,
+                                             InstrumentedStack,
+                                             InstrumentedTypeRestrictedStack,
+                                             InstrumentedQueue, instrument,
+                                             uninstrument)
+from data_structures.queues import Queue
+from data_structures.stacks import Stack, NumericStack
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests for the Metrics and PrometheusTextFile classes.
+
+    Methods
+    -------
+    test_sampling:
+        One out of sample_every operations must be timed.
+
+    test_sinks:
+        Publishing must call every sink with a snapshot.
+
+    test_prometheus:
+        The Prometheus file must hold every metric.
+    """
+
+    def test_sampling(self):
+        """One out of sample_every operations must be timed."""
+
+        metrics = Metrics(sample_every=4, buckets=(10, 100))
+        self.assertRaises(AssertionError, Metrics, sample_every=0)
+        stack = InstrumentedStack(metrics=metrics)
+        for index in range(10):
+            stack.push(index)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['operations'], {'push': 10})
+        histogram = snapshot['latency']['push']
+        self.assertEqual(histogram['count'], 2)
+        self.assertEqual(histogram['buckets'][-1], (float('inf'), 2))
+        self.assertEqual(len(histogram['buckets']), 3)
+
+    def test_sinks(self):
+        """Publishing must call every sink with a snapshot."""
+
+        metrics = Metrics()
+        snapshots = []
+        metrics.publish()
+        metrics.add_sink(snapshots.append)
+        stack = InstrumentedStack(metrics=metrics)
+        stack.push_many(range(5))
+        stack.pop()
+        metrics.publish()
+        self.assertEqual(len(snapshots), 1)
+        self.assertEqual(snapshots[0]['operations'],
+                         {'push_many': 1, 'pop': 1})
+        self.assertEqual(snapshots[0]['high_water'], 5)
+
+    def test_prometheus(self):
+        """The Prometheus file must hold every metric."""
+
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'queue.prom')
+            sink = PrometheusTextFile(path, labels={'name': 'jobs'})
+            self.assertEqual(sink.path, path)
+            metrics = Metrics(sample_every=1)
+            metrics.add_sink(sink)
+            queue = InstrumentedQueue(metrics=metrics)
+            queue.push_many(range(3))
+            queue.pop()
+            metrics.publish()
+            with open(path) as file:
+                text = file.read()
+            self.assertEqual(os.listdir(directory), ['queue.prom'])
+        self.assertIn('data_structures_operations_total'
+                      '{name="jobs",operation="pop"} 1', text)
+        self.assertIn('data_structures_items_moved_total{name="jobs"} 3',
+                      text)
+        self.assertIn('# TYPE data_structures_latency_seconds histogram',
+                      text)
+        self.assertIn('data_structures_latency_seconds_bucket'
+                      '{name="jobs",operation="pop",le="+Inf"} 1', text)
+        sink = PrometheusTextFile(path, labels={'name': 'a\\b "c"\nd'})
+        self.assertIn('data_structures_high_water'
+                      '{name="a\\\\b \\"c\\"\\nd"} 0',
+                      sink.format(Metrics().snapshot()))
+
+
+class TestInstrumentedStructures(unittest.TestCase):
+    """Tests for the instrumented structures and the instrument function.
+
+    Methods
+    -------
+    test_queue_flushes:
+        Flushes must be counted with the items they move.
+
+    test_validation_failures:
+        Rejected items must be counted and passed to the hooks.
+
+    test_instrument:
+        Plain structures must be instrumented and restored in place.
+    """
+
+    def test_queue_flushes(self):
+        """Flushes must be counted with the items they move."""
+
+        queue = InstrumentedQueue()
+        events = []
+        queue.metrics.subscribe(lambda event, value: events.append(value))
+        queue.push_many(range(4))
+        self.assertEqual(queue.pop(), 0)
+        queue.push(4)
+        self.assertEqual(queue.pop_many(4), [1, 2, 3, 4])
+        snapshot = queue.metrics.snapshot()
+        self.assertEqual(snapshot['flushes'], 2)
+        self.assertEqual(snapshot['items_moved'], 5)
+        self.assertEqual(events, [4, 1])
+        # nothing to move, so popping an empty queue is not a flush
+        self.assertRaises(IndexError, queue.pop)
+        self.assertEqual(queue.metrics.snapshot()['flushes'], 2)
+        self.assertEqual(events, [4, 1])
+
+    def test_validation_failures(self):
+        """Rejected items must be counted and passed to the hooks."""
+
+        stack = InstrumentedTypeRestrictedStack(Number, validation="exact")
+        events = []
+        stack.metrics.subscribe(lambda *event: events.append(event))
+        stack.push(Number(1))
+        self.assertRaises(ValueError, stack.push, 2)
+        self.assertRaises(ValueError, stack.push_many, [Number(3), "4"])
+        self.assertEqual(stack.size(), 1)
+        self.assertEqual(stack.metrics.snapshot()['validation_failures'], 2)
+        self.assertEqual(events, [('validation_failure', 2),
+                                  ('validation_failure', "4")])
+
+    def test_instrument(self):
+        """Plain structures must be instrumented and restored in place."""
+
+        queue = Queue()
+        queue.push_many(range(3))
+        metrics = instrument(queue)
+        self.assertIsInstance(queue, InstrumentedQueue)
+        self.assertEqual(metrics.snapshot()['high_water'], 3)
+        queue.pop()
+        uninstrument(queue)
+        self.assertIs(type(queue), Queue)
+        self.assertEqual(queue.pop(), 1)
+        self.assertEqual(metrics.snapshot()['operations'], {'pop': 1})
+        self.assertRaises(TypeError, uninstrument, queue)
+        self.assertRaises(TypeError, instrument, NumericStack())
+        stack = Stack()
+        instrument(stack, metrics)
+        self.assertIs(stack.metrics, metrics)
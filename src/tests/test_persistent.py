@@ -0,0 +1,116 @@
+"""Test for the data_structures.persistent module.
+
+TestPersistentStack:
+    Tests for the PersistentStack class.
+
+TestPersistentQueue:
+    Tests for the PersistentQueue class.
+"""
+
+import unittest
+from data_structures.elements import Number
+from data_structures.persistent import PersistentStack, PersistentQueue
+
+
+class TestPersistentStack(unittest.TestCase):
+    """Tests for the PersistentStack class.
+
+    Methods
+    -------
+    test_push_pop:
+        Push and pop must return new versions in stack order.
+
+    test_snapshots:
+        Older versions must be unchanged by newer ones.
+
+    test_to_stack:
+        The mutable Stack must have the same items and order.
+    """
+
+    def test_push_pop(self):
+        """Push and pop must return new versions in stack order."""
+
+        stack = PersistentStack()
+        self.assertRaises(IndexError, stack.pop)
+        self.assertRaises(IndexError, stack.peak)
+        for value in range(5):
+            stack = stack.push(Number(value))
+        self.assertEqual(stack.size(), 5)
+        popped = []
+        while stack.size() > 0:
+            popped.append(stack.peak())
+            stack = stack.pop()
+        self.assertEqual(popped, [Number(value) for value in range(4, -1, -1)])
+
+    def test_snapshots(self):
+        """Older versions must be unchanged by newer ones."""
+
+        base = PersistentStack([1, 2, 3])
+        left = base.push(4)
+        right = base.pop().push_many([5, 6])
+        self.assertEqual(base.size(), 3)
+        self.assertEqual(base.peak(), 3)
+        self.assertEqual(left.peak(), 4)
+        self.assertEqual(right.peak(), 6)
+        self.assertIs(left.pop()._top, base._top)
+        self.assertEqual(repr(right), "PersistentStack elements: 1; 2; 5; 6")
+
+    def test_to_stack(self):
+        """The mutable Stack must have the same items and order."""
+
+        stack = PersistentStack(range(10)).to_stack()
+        self.assertEqual(stack.size(), 10)
+        self.assertEqual(stack.drain(), list(range(9, -1, -1)))
+
+
+class TestPersistentQueue(unittest.TestCase):
+    """Tests for the PersistentQueue class.
+
+    Methods
+    -------
+    test_push_pop:
+        Push and pop must return new versions in queue order.
+
+    test_snapshots:
+        Older versions must be unchanged by newer ones.
+
+    test_to_queue:
+        The mutable Queue must have the same items and order.
+    """
+
+    def test_push_pop(self):
+        """Push and pop must return new versions in queue order."""
+
+        queue = PersistentQueue()
+        self.assertRaises(IndexError, queue.pop)
+        self.assertRaises(IndexError, queue.peak)
+        popped = []
+        for value in range(10):
+            queue = queue.push(value)
+            if value % 3 == 0:
+                popped.append(queue.peak())
+                queue = queue.pop()
+        while queue.size() > 0:
+            popped.append(queue.peak())
+            queue = queue.pop()
+        self.assertEqual(popped, list(range(10)))
+
+    def test_snapshots(self):
+        """Older versions must be unchanged by newer ones."""
+
+        base = PersistentQueue([1, 2]).push_many([3, 4])
+        popped = base.pop()
+        pushed = base.push(5)
+        self.assertEqual(base.size(), 4)
+        self.assertEqual(base.peak(), 1)
+        self.assertEqual(popped.peak(), 2)
+        self.assertEqual(pushed.size(), 5)
+        self.assertEqual(repr(pushed),
+                         "PersistentQueue elements: 1; 2; 3; 4; 5")
+        self.assertEqual(repr(PersistentQueue()), "Empty PersistentQueue")
+
+    def test_to_queue(self):
+        """The mutable Queue must have the same items and order."""
+
+        queue = PersistentQueue([0, 1]).push_many(range(2, 6)).to_queue()
+        self.assertEqual(queue.drain(), list(range(6)))
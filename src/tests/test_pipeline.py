@@ -0,0 +1,194 @@
+"""Test for the data_structures.pipeline module.
+
+TestPipeline:
+    Tests for the Stage and Pipeline classes.
+"""
+
+import unittest
+from random import Random
+from threading import Event
+from time import sleep
+from data_structures.pipeline import Pipeline, Stage
+
+
+def _square(x):
+    return x * x
+
+
+def _split(x):
+    if x % 3:
+        yield x
+        yield -x
+
+
+def _sleep_randomly(x):
+    sleep(Random(x).random() / 500)
+    return x
+
+
+class TestPipeline(unittest.TestCase):
+    """Tests for the Stage and Pipeline classes.
+
+    Methods
+    -------
+    test_stages:
+        Stages must validate and expose their declaration.
+
+    test_ordered:
+        Ordered stages must keep the order of the items.
+
+    test_unordered:
+        Unordered stages must output every item.
+
+    test_processes:
+        Stages must be able to run in a pool of processes.
+
+    test_backpressure:
+        Queues must stay bounded when a later stage is slow.
+
+    test_max_queued:
+        The end of the stream must not be counted as a queued item.
+
+    test_errors:
+        Errors must stop the pipeline and be raised by the iteration.
+
+    test_stop:
+        Stages must stop when the results are no longer iterated.
+    """
+
+    def test_stages(self):
+        """Stages must validate and expose their declaration."""
+
+        stage = Stage(_square, workers=3, executor="process",
+                      ordered=False)
+        self.assertEqual((stage.function, stage.workers, stage.executor,
+                          stage.ordered, stage.name),
+                         (_square, 3, "process", False, "_square"))
+        self.assertEqual(repr(stage), "Stage _square (3 process workers)")
+        self.assertRaises(AssertionError, Stage, _square, 0)
+        self.assertRaises(AssertionError, Stage, _square, 1, "fiber")
+        self.assertRaises(AssertionError, Pipeline, [])
+        self.assertRaises(AssertionError, Pipeline, [_square], 0)
+        pipeline = Pipeline([_square, Stage(_split, name="split")])
+        self.assertEqual(repr(pipeline), "Pipeline: _square -> split")
+        self.assertEqual(pipeline.stats()['stages'], [])
+
+    def test_ordered(self):
+        """Ordered stages must keep the order of the items."""
+
+        pipeline = Pipeline([Stage(_sleep_randomly, workers=4),
+                             Stage(_split, workers=3), _square],
+                            maxsize=4)
+        results = list(pipeline.run(range(300)))
+        self.assertEqual(results, [y * y for x in range(300)
+                                   for y in _split(x)])
+        stats = pipeline.stats()
+        self.assertEqual([(stage['processed'], stage['emitted'])
+                          for stage in stats['stages']],
+                         [(300, 300), (300, 400), (400, 400)])
+        for stage in stats['stages']:
+            self.assertEqual(stage['queued'], 0)
+            self.assertLessEqual(stage['max_queued'], 4)
+            self.assertGreater(stage['throughput'], 0)
+        self.assertEqual(list(pipeline.run([3])), [])
+
+    def test_unordered(self):
+        """Unordered stages must output every item."""
+
+        pipeline = Pipeline([Stage(_sleep_randomly, workers=4,
+                                   ordered=False),
+                             Stage(_square, workers=2, ordered=False)])
+        results = list(pipeline.run(range(200)))
+        self.assertEqual(sorted(results), [x * x for x in range(200)])
+
+    def test_processes(self):
+        """Stages must be able to run in a pool of processes."""
+
+        pipeline = Pipeline([Stage(_square, workers=2, executor="process"),
+                             Stage(_split, workers=2, executor="process")])
+        self.assertEqual(list(pipeline.run(range(50))),
+                         [y for x in range(50) for y in _split(x * x)])
+
+    def test_backpressure(self):
+        """Queues must stay bounded when a later stage is slow."""
+
+        fed = []
+
+        def items():
+            for item in range(100):
+                fed.append(item)
+                yield item
+
+        pipeline = Pipeline([_square, _sleep_randomly], maxsize=2)
+        results = pipeline.run(items())
+        self.assertEqual(next(results), 0)
+        sleep(0.05)
+        # at most 2 items in each of the 3 queues, and 1 in each stage
+        self.assertLessEqual(len(fed), 1 + 3 * 2 + 2 + 1)
+        self.assertEqual(list(results), [x * x for x in range(1, 100)])
+
+    def test_max_queued(self):
+        """The end of the stream must not be counted as a queued item."""
+
+        started = Event()
+
+        def items():
+            yield 0
+            # the other items are queued once the first one is popped
+            started.wait()
+            yield 1
+            yield 2
+
+        def wait_for_end(x):
+            if x == 0:
+                started.set()
+                # items 1 and 2, and the end of the stream
+                while pipeline._runs[0].inputs.size() < 3:
+                    sleep(0.001)
+            return x
+
+        pipeline = Pipeline([wait_for_end])
+        self.assertEqual(list(pipeline.run(items())), [0, 1, 2])
+        self.assertEqual(pipeline.stats()['stages'][0]['max_queued'], 2)
+
+    def test_errors(self):
+        """Errors must stop the pipeline and be raised by the iteration."""
+
+        def fail(x):
+            if x == 20:
+                raise KeyError(x)
+            return x
+
+        def items():
+            yield 1
+            raise ValueError("bad source")
+
+        pipeline = Pipeline([Stage(fail, workers=2), _square])
+        with self.assertRaises(KeyError):
+            list(pipeline.run(range(10 ** 6)))
+        self.assertLess(pipeline.stats()['stages'][0]['processed'], 10 ** 6)
+        with self.assertRaises(ValueError):
+            list(pipeline.run(items()))
+        self.assertEqual(list(pipeline.run(range(3))), [0, 1, 4])
+
+    def test_stop(self):
+        """Stages must stop when the results are no longer iterated."""
+
+        started = Event()
+
+        def mark(x):
+            started.set()
+            return x
+
+        pipeline = Pipeline([mark, Stage(_square, workers=2)])
+        results = pipeline.run(range(10 ** 6))
+        self.assertEqual(next(results), 0)
+        self.assertRaises(RuntimeError, next, pipeline.run([1]))
+        results.close()
+        self.assertTrue(started.is_set())
+        processed = pipeline.stats()['stages'][0]['processed']
+        self.assertLess(processed, 10 ** 6)
+        sleep(0.05)
+        self.assertEqual(pipeline.stats()['stages'][0]['processed'],
+                         processed)
+        self.assertEqual(list(pipeline.run([5])), [25])
@@ -0,0 +1,151 @@
+"""Test for the data_structures.priority_queues module.
+
+TestPriorityQueue:
+    Tests for the PriorityQueue class.
+
+TestIndexedPriorityQueue:
+    Tests for the IndexedPriorityQueue class.
+"""
+
+import unittest
+from data_structures.elements import Number
+from data_structures.priority_queues import (PriorityQueue,
+                                             IndexedPriorityQueue)
+from random import random, shuffle
+
+
+class TestPriorityQueue(unittest.TestCase):
+    """Tests for the PriorityQueue class.
+
+    Methods
+    -------
+    test_pop_order:
+        Pop must remove the items from the lowest to the highest key.
+
+    test_heapify:
+        Initial and batch items must be ordered as a heap.
+
+    test_arity:
+        Heaps of any arity must keep the same order.
+
+    test_key:
+        A key function must define the order of the items.
+    """
+
+    def test_pop_order(self):
+        """Pop must remove the items from the lowest to the highest key."""
+
+        queue = PriorityQueue()
+        self.assertRaises(IndexError, queue.pop)
+        self.assertRaises(IndexError, queue.peak)
+        numbers = [Number(random()) for _ in range(100)]
+        for number in numbers:
+            queue.push(number)
+        self.assertEqual(queue.size(), 100)
+        popped = []
+        while queue.size() > 0:
+            peak = queue.peak()
+            popped.append(queue.pop())
+            self.assertIs(peak, popped[-1])
+        self.assertEqual(popped, sorted(numbers))
+
+    def test_heapify(self):
+        """Initial and batch items must be ordered as a heap."""
+
+        values = list(range(50))
+        shuffle(values)
+        queue = PriorityQueue(values[:30])
+        queue.push_many(values[30:])
+        self.assertEqual(queue.pop_many(5), [0, 1, 2, 3, 4])
+        self.assertRaises(IndexError, queue.pop_many, 46)
+        self.assertRaises(ValueError, queue.pop_many, -1)
+        self.assertEqual(queue.drain(), list(range(5, 50)))
+
+    def test_arity(self):
+        """Heaps of any arity must keep the same order."""
+
+        values = [random() for _ in range(200)]
+        for arity in (2, 3, 4, 8):
+            queue = PriorityQueue(values, arity=arity)
+            self.assertEqual(queue.arity, arity)
+            self.assertEqual(queue.drain(), sorted(values))
+        self.assertRaises(AssertionError, PriorityQueue, arity=1)
+
+    def test_key(self):
+        """A key function must define the order of the items."""
+
+        queue = PriorityQueue(["ccc", "a", "bb"], key=len)
+        self.assertEqual(queue.drain(), ["a", "bb", "ccc"])
+
+
+class TestIndexedPriorityQueue(unittest.TestCase):
+    """Tests for the IndexedPriorityQueue class.
+
+    Methods
+    -------
+    test_decrease_key:
+        Decreasing a key must move the item towards the front.
+
+    test_update:
+        Updated items must be ordered by their new keys.
+
+    test_remove:
+        Removed items must not be popped.
+
+    test_heapify_handles:
+        Handles of heapified items must stay valid.
+    """
+
+    def test_decrease_key(self):
+        """Decreasing a key must move the item towards the front."""
+
+        queue = IndexedPriorityQueue()
+        handles = [queue.push(Number(value)) for value in range(10, 20)]
+        queue.decrease_key(handles[5], Number(1))
+        self.assertEqual(queue.peak(), Number(1))
+        self.assertRaises(ValueError, queue.decrease_key, handles[0],
+                          Number(30))
+        self.assertEqual(queue.pop(), Number(1))
+        self.assertFalse(queue.contains(handles[5]))
+        self.assertRaises(ValueError, queue.decrease_key, handles[5],
+                          Number(0))
+
+    def test_update(self):
+        """Updated items must be ordered by their new keys."""
+
+        queue = IndexedPriorityQueue(arity=3)
+        values = [random() for _ in range(100)]
+        handles = [queue.push(value) for value in values]
+        for index in range(0, 100, 7):
+            values[index] = random()
+            queue.update(handles[index], values[index])
+        self.assertTrue(all(queue.contains(handle) for handle in handles))
+        self.assertEqual(queue.drain(), sorted(values))
+
+    def test_remove(self):
+        """Removed items must not be popped."""
+
+        queue = IndexedPriorityQueue()
+        handles = {value: queue.push(value) for value in range(30)}
+        for value in range(0, 30, 3):
+            self.assertEqual(queue.remove(handles[value]), value)
+        self.assertRaises(ValueError, queue.remove, handles[0])
+        self.assertEqual(queue.drain(),
+                         [value for value in range(30) if value % 3])
+
+    def test_heapify_handles(self):
+        """Handles of heapified items must stay valid."""
+
+        queue = IndexedPriorityQueue()
+        queue.push(5)
+        handles = queue.push_many([9, 1, 7])
+        self.assertEqual([handle.item for handle in handles], [9, 1, 7])
+        handle = queue.push(8)
+        queue.decrease_key(handle, 0)
+        queue.update(handles[0], 6)
+        self.assertEqual(queue.remove(handles[2]), 7)
+        # pushed one by one when the queue is larger than the batch
+        handles = queue.push_many([4, 2])
+        self.assertEqual(queue.remove(handles[1]), 2)
+        self.assertTrue(queue.contains(handles[0]))
+        self.assertEqual(queue.drain(), [0, 1, 4, 5, 6])
@@ -2,10 +2,38 @@
 
 TestQueue:
     Tests for the Queue class.
+
+TestAggregatingQueue:
+    Tests for the AggregatingQueue class.
+
+TestSlidingWindow:
+    Tests for the SlidingWindow class.
+
+TestConcurrentQueue:
+    Tests for the ConcurrentQueue class.
+
+TestSharedNumberQueue:
+    Tests for the SharedNumberQueue class.
+
+TestSegmentedQueue:
+    Tests for the SegmentedQueue class.
+
+TestRingQueue:
+    Tests for the RingQueue class.
 """
 
+import io
+import pickle
 import unittest
-from data_structures.queues import Queue
+from array import array
+from multiprocessing import Process
+from operator import add
+from threading import Thread
+from time import monotonic, sleep
+from data_structures.elements import Number
+from data_structures.queues import (Queue, AggregatingQueue, SlidingWindow,
+                                    ConcurrentQueue, SharedNumberQueue,
+                                    SegmentedQueue, RingQueue)
 from random import random
 
 
@@ -30,6 +58,33 @@ class TestQueue(unittest.TestCase):
 
     test_size:
         Size must return the amount of items in the queue.
+
+    test_interleaved_order:
+        Interleaved pushes and pops must keep the FIFO order.
+
+    test_flush_only_when_empty:
+        Items must be moved to the output stack only when it's empty.
+
+    test_push_many:
+        Push many must add the items to the right end of the queue.
+
+    test_pop_many:
+        Pop many must remove the n left most elements from the queue.
+
+    test_drain:
+        Drain must remove and return every element of the queue.
+
+    test_iteration:
+        Iterating must not remove or move the items, in FIFO order.
+
+    test_iter_drain:
+        Iter drain must remove the items only as they are used.
+
+    test_repr_limit:
+        Repr must show up to repr_limit items of each stack.
+
+    test_serialization:
+        Packed and pickled queues must keep their items in FIFO order.
     """
 
     def test_push(self):
@@ -108,3 +163,783 @@ class TestQueue(unittest.TestCase):
         self.assertEqual(queue.size(), num_elements - 1)
         queue.pop()
         self.assertEqual(queue.size(), num_elements - 2)
+
+    def test_interleaved_order(self):
+        """Interleaved pushes and pops must keep the FIFO order."""
+
+        queue = Queue()
+        expected = []
+        popped = []
+        for index in range(300):
+            queue.push(index)
+            expected.append(index)
+            if index % 3 == 0:
+                popped.append(queue.pop())
+            if index % 7 == 0 and queue.size() > 0:
+                self.assertEqual(queue.peak(), expected[len(popped)])
+
+        while queue.size() > 0:
+            popped.append(queue.pop())
+
+        self.assertEqual(popped, expected)
+
+    def test_flush_only_when_empty(self):
+        """Items must be moved to the output stack only when it's empty."""
+
+        queue = Queue()
+        for index in range(10):
+            queue.push(index)
+
+        self.assertEqual(queue.pop(), 0)
+        self.assertEqual(queue._output_stack.size(), 9)
+        queue.push(10)
+        queue.push(11)
+        self.assertEqual(queue.peak(), 1)
+        self.assertEqual(queue.pop(), 1)
+        # new items stay in the input stack while outputs remain
+        self.assertEqual(queue._input_stack._items, [10, 11])
+        self.assertEqual(queue._output_stack.size(), 8)
+
+    def test_push_many(self):
+        """Push many must add the items to the right end of the queue."""
+
+        queue = Queue()
+        queue.push("first")
+        items = [random() for _ in range(10)]
+        queue.push_many(iter(items))
+        queue.extend(["asd", 1 + 1j])
+        self.assertEqual(queue.size(), 13)
+        self.assertEqual(queue.pop(), "first")
+        for item in items + ["asd", 1 + 1j]:
+            self.assertEqual(queue.pop(), item)
+
+    def test_pop_many(self):
+        """Pop many must remove the n left most elements from the queue."""
+
+        queue = Queue()
+        items = list(range(20))
+        queue.push_many(items[:10])
+        self.assertEqual(queue.pop_many(0), [])
+        self.assertEqual(queue.pop_many(4), items[:4])
+        queue.push_many(items[10:])
+        # takes from the output stack and from the flushed inputs
+        self.assertEqual(queue.pop_many(8), items[4:12])
+        # not enough items, the queue must be left unchanged
+        self.assertRaises(IndexError, queue.pop_many, 9)
+        self.assertRaises(ValueError, queue.pop_many, -1)
+        self.assertEqual(queue.size(), 8)
+        self.assertEqual(queue.pop_many(8), items[12:])
+        self.assertRaises(IndexError, queue.pop)
+
+    def test_drain(self):
+        """Drain must remove and return every element of the queue."""
+
+        queue = Queue()
+        self.assertEqual(queue.drain(), [])
+        queue.push_many(range(5))
+        queue.pop()
+        queue.push_many(range(5, 10))
+        self.assertEqual(queue.drain(), list(range(1, 10)))
+        self.assertEqual(queue.size(), 0)
+        queue.push("asd")
+        self.assertEqual(queue.pop(), "asd")
+
+    def test_iteration(self):
+        """Iterating must not remove or move the items, in FIFO order."""
+
+        queue = Queue()
+        self.assertFalse(queue)
+        queue.push_many(range(5))
+        queue.pop()
+        queue.push_many(range(5, 10))
+        self.assertTrue(queue)
+        self.assertEqual(len(queue), 9)
+        self.assertEqual(list(queue), list(range(1, 10)))
+        self.assertEqual(list(reversed(queue)), list(range(9, 0, -1)))
+        self.assertEqual(queue.peak_many(6), list(range(1, 7)))
+        self.assertRaises(IndexError, queue.peak_many, 10)
+        # the input stack isn't flushed by the iteration
+        self.assertEqual(queue._input_stack.size(), 5)
+        self.assertEqual(queue._output_stack.size(), 4)
+
+    def test_iter_drain(self):
+        """Iter drain must remove the items only as they are used."""
+
+        queue = Queue()
+        queue.push_many(range(5))
+        drained = queue.iter_drain()
+        self.assertEqual(next(drained), 0)
+        self.assertEqual(queue.size(), 4)
+        queue.push(5)
+        self.assertEqual(list(drained), list(range(1, 6)))
+        self.assertEqual(queue.size(), 0)
+
+    def test_repr_limit(self):
+        """Repr must show up to repr_limit items of each stack."""
+
+        queue = Queue()
+        queue.push_many(range(10))
+        queue.pop()
+        queue.push_many(range(10, 40))
+        queue.repr_limit = 2
+        self.assertEqual(repr(queue),
+                         "Queue elements:\n"
+                         "\tInput stack:\n"
+                         "\t\tStack Elements: 10; 11; ... (28 more)\n"
+                         "\tOutput stack:\n"
+                         "\t\tStack Elements: 9; 8; ... (7 more)")
+
+    def test_serialization(self):
+        """Packed and pickled queues must keep their items in FIFO order."""
+
+        queue = Queue()
+        queue.push_many(Number(x + .5) for x in range(5))
+        queue.pop()
+        queue.push(Number(9))
+        expected = list(queue)
+        self.assertEqual(Queue.from_bytes(queue.to_bytes()).drain(),
+                         expected)
+        self.assertEqual(pickle.loads(pickle.dumps(queue)).drain(),
+                         expected)
+        self.assertEqual(list(queue), expected)
+        file = io.BytesIO()
+        queue.dump(file)
+        mixed = Queue()
+        mixed.push_many([1, "two", (3,)])
+        mixed.dump(file)
+        file.seek(0)
+        self.assertEqual(Queue.load(file).drain(), expected)
+        self.assertEqual(Queue.load(file).drain(), [1, "two", (3,)])
+        self.assertRaises(ValueError, Queue.from_bytes, b"not packed")
+
+
+class TestAggregatingQueue(unittest.TestCase):
+    """Tests for the AggregatingQueue class.
+
+    Methods
+    -------
+    test_aggregate:
+        The aggregate must cover all the items in the queue.
+
+    test_non_commutative:
+        The aggregate must follow the order of the queue.
+
+    test_pickle:
+        Pickled queues must keep their items and aggregate.
+    """
+
+    def test_aggregate(self):
+        """The aggregate must cover all the items in the queue."""
+
+        queue = AggregatingQueue(max)
+        self.assertRaises(IndexError, queue.aggregate)
+        values = [random() for _ in range(100)]
+        popped = 0
+        for index, value in enumerate(values):
+            queue.push(value)
+            if index % 3 == 0:
+                self.assertEqual(queue.pop(), values[popped])
+                popped += 1
+            if queue.size() > 0:
+                self.assertEqual(queue.aggregate(),
+                                 max(values[popped:index+1]))
+
+        queue.pop_many(queue.size() - 1)
+        self.assertEqual(queue.aggregate(), values[-1])
+        queue.drain()
+        self.assertRaises(IndexError, queue.aggregate)
+
+    def test_non_commutative(self):
+        """The aggregate must follow the order of the queue."""
+
+        queue = AggregatingQueue(add)
+        queue.push_many("abc")
+        self.assertEqual(queue.aggregate(), "abc")
+        self.assertEqual(queue.pop(), "a")
+        queue.push_many("de")
+        # "bc" are in the output stack and "de" in the input stack
+        self.assertEqual(queue.aggregate(), "bcde")
+        self.assertEqual(queue.pop_many(3), ["b", "c", "d"])
+        self.assertEqual(queue.aggregate(), "e")
+
+    def test_pickle(self):
+        """Pickled queues must keep their items and aggregate."""
+
+        queue = AggregatingQueue(add)
+        queue.push_many("abc")
+        queue.pop()
+        queue.push("d")
+        # "bc" are in the output stack and "d" in the input stack
+        copy = pickle.loads(pickle.dumps(queue))
+        self.assertEqual(copy.aggregate(), "bcd")
+        copy.push("e")
+        self.assertEqual(copy.pop(), "b")
+        self.assertEqual(copy.aggregate(), "cde")
+
+
+class TestSlidingWindow(unittest.TestCase):
+    """Tests for the SlidingWindow class.
+
+    Methods
+    -------
+    test_init:
+        Sliding window limits must be positive.
+
+    test_count_window:
+        Count-based windows must keep the most recent items.
+
+    test_time_window:
+        Time-based windows must evict the expired items.
+
+    test_pickle:
+        Pickled windows must keep their items and limits.
+    """
+
+    def test_init(self):
+        """Sliding window limits must be positive."""
+
+        self.assertRaises(AssertionError, SlidingWindow, add, max_items=0)
+        self.assertRaises(AssertionError, SlidingWindow, add, max_age=-1)
+
+    def test_count_window(self):
+        """Count-based windows must keep the most recent items."""
+
+        window = SlidingWindow(add, max_items=3)
+        values = list(range(10))
+        for index, value in enumerate(values):
+            window.push(value)
+            self.assertEqual(window.aggregate(),
+                             sum(values[max(0, index-2):index+1]))
+            self.assertLessEqual(window.size(), 3)
+
+        window.push_many([100, 200])
+        self.assertEqual(window.drain(), [9, 100, 200])
+
+    def test_time_window(self):
+        """Time-based windows must evict the expired items."""
+
+        now = 0.
+        window = SlidingWindow(add, max_age=10., clock=lambda: now)
+        window.push(1)
+        now = 5.
+        window.push(2)
+        window.push_many([3, 4], timestamp=8.)
+        self.assertEqual(window.aggregate(), 10)
+        now = 12.
+        self.assertEqual(window.aggregate(), 9)
+        self.assertEqual(window.aggregate(now=16.), 7)
+        self.assertEqual(window.evict(now=18.), 2)
+        self.assertRaises(IndexError, window.aggregate)
+        self.assertEqual(window._timestamps.size(), 0)
+
+    def test_pickle(self):
+        """Pickled windows must keep their items and limits."""
+
+        window = SlidingWindow(add, max_items=3, max_age=10.)
+        window.push_many([1, 2], timestamp=0.)
+        window.pop()
+        window.push_many([3, 4], timestamp=5.)
+        copy = pickle.loads(pickle.dumps(window))
+        self.assertEqual(copy.aggregate(now=6.), 9)
+        copy.push(5, timestamp=12.)
+        self.assertEqual(copy.aggregate(now=12.), 12)
+        self.assertEqual(copy.max_items, 3)
+
+
+class TestConcurrentQueue(unittest.TestCase):
+    """Tests for the ConcurrentQueue class.
+
+    Methods
+    -------
+    test_fifo:
+        A single thread must see the FIFO order of a Queue.
+
+    test_non_blocking:
+        Non-blocking operations must fail right away.
+
+    test_timeouts:
+        Blocking operations must fail after the timeout.
+
+    test_blocking_pop:
+        Pop must wait until an item is pushed.
+
+    test_waiting_consumer:
+        A consumer waiting for items must not block other consumers.
+
+    test_waiting_iteration:
+        A consumer waiting for items must not block the iterations.
+
+    test_waiting_consumers:
+        A batch push must wake a waiting consumer for each item.
+
+    test_producers_consumers:
+        Every item must be popped once, in the order of each producer.
+
+    test_iteration:
+        Iterating must return a snapshot, and iter drain must not wait.
+    """
+
+    def test_fifo(self):
+        """A single thread must see the FIFO order of a Queue."""
+
+        queue = ConcurrentQueue()
+        queue.push_many(range(5))
+        queue.push(5)
+        self.assertEqual(queue.peak(), 0)
+        self.assertEqual(queue.pop(), 0)
+        self.assertEqual(queue.pop_many(3), [1, 2, 3])
+        queue.push(6)
+        # takes from the output stack and from the input stack
+        self.assertEqual(queue.pop_many(10), [4, 5, 6])
+        queue.push_many([7, 8])
+        self.assertEqual(queue.drain(), [7, 8])
+        self.assertRaises(ValueError, queue.pop_many, 0)
+
+    def test_iteration(self):
+        """Iterating must return a snapshot, iter drain must not wait."""
+
+        queue = ConcurrentQueue()
+        queue.push_many(range(3))
+        queue.pop()
+        queue.push(3)
+        snapshot = iter(queue)
+        queue.push(4)
+        self.assertEqual(list(snapshot), [1, 2, 3])
+        self.assertEqual(list(reversed(queue)), [4, 3, 2, 1])
+        self.assertEqual(list(queue.iter_drain()), [1, 2, 3, 4])
+        self.assertEqual(len(queue), 0)
+
+    def test_non_blocking(self):
+        """Non-blocking operations must fail right away."""
+
+        queue = ConcurrentQueue(maxsize=2)
+        self.assertEqual(queue.maxsize, 2)
+        self.assertIsNone(queue.try_pop())
+        self.assertEqual(queue.try_pop("empty"), "empty")
+        self.assertRaises(IndexError, queue.peak)
+        self.assertTrue(queue.try_push(1))
+        self.assertTrue(queue.try_push(2))
+        self.assertFalse(queue.try_push(3))
+        self.assertRaises(OverflowError, queue.push_many, [3], block=False)
+        self.assertRaises(ValueError, queue.push_many, [1, 2, 3])
+        self.assertEqual(queue.try_pop(), 1)
+        self.assertTrue(queue.try_push(3))
+        self.assertEqual(queue.size(), 2)
+        self.assertRaises(AssertionError, ConcurrentQueue, 0)
+
+    def test_timeouts(self):
+        """Blocking operations must fail after the timeout."""
+
+        queue = ConcurrentQueue(maxsize=1)
+        self.assertRaises(IndexError, queue.pop, timeout=0.01)
+        self.assertRaises(IndexError, queue.pop_many, 2, timeout=0.01)
+        queue.push(1)
+        self.assertRaises(OverflowError, queue.push, 2, timeout=0.01)
+        self.assertEqual(queue.pop(timeout=0.01), 1)
+
+    def test_blocking_pop(self):
+        """Pop must wait until an item is pushed."""
+
+        queue = ConcurrentQueue(maxsize=1)
+        popped = []
+        consumer = Thread(target=lambda: popped.append(queue.pop()))
+        consumer.start()
+        queue.push("asd")
+        consumer.join(timeout=5)
+        self.assertEqual(popped, ["asd"])
+
+    def test_waiting_consumer(self):
+        """A consumer waiting for items must not block other consumers."""
+
+        queue = ConcurrentQueue()
+        popped = []
+        consumer = Thread(target=lambda: popped.append(queue.pop()))
+        consumer.start()
+        while not queue._waiting_consumers:
+            sleep(0.001)
+        start = monotonic()
+        self.assertEqual(queue.try_pop("empty"), "empty")
+        self.assertRaises(IndexError, queue.pop, block=False)
+        self.assertRaises(IndexError, queue.pop_many, 2, timeout=0.01)
+        self.assertRaises(IndexError, queue.peak)
+        self.assertEqual(queue.drain(), [])
+        self.assertLess(monotonic() - start, 1)
+        queue.push(1)
+        consumer.join(timeout=5)
+        self.assertEqual(popped, [1])
+
+    def test_waiting_iteration(self):
+        """A consumer waiting for items must not block the iterations."""
+
+        queue = ConcurrentQueue()
+        popped = []
+        consumer = Thread(target=lambda: popped.append(queue.pop()))
+        consumer.start()
+        while not queue._waiting_consumers:
+            sleep(0.001)
+        start = monotonic()
+        self.assertEqual(list(queue), [])
+        self.assertEqual(list(reversed(queue)), [])
+        self.assertEqual(list(queue.iter_drain()), [])
+        self.assertLess(monotonic() - start, 1)
+        queue.push(1)
+        consumer.join(timeout=5)
+        self.assertEqual(popped, [1])
+
+    def test_waiting_consumers(self):
+        """A batch push must wake a waiting consumer for each item."""
+
+        queue = ConcurrentQueue()
+        popped = []
+        consumers = [Thread(target=lambda: popped.append(queue.pop(timeout=5)),
+                            daemon=True)
+                     for _ in range(3)]
+        for consumer in consumers:
+            consumer.start()
+        while queue._waiting_consumers < 3:
+            sleep(0.001)
+        start = monotonic()
+        queue.push_many([1, 2, 3])
+        for consumer in consumers:
+            consumer.join(timeout=5)
+        self.assertLess(monotonic() - start, 1)
+        self.assertEqual(sorted(popped), [1, 2, 3])
+        self.assertEqual(queue.size(), 0)
+
+    def test_producers_consumers(self):
+        """Every item must be popped once, in the order of each producer."""
+
+        queue = ConcurrentQueue(maxsize=16)
+        n_producers = 4
+        n_consumers = 4
+        n_items = 2000
+        popped = [[] for _ in range(n_consumers)]
+
+        def produce(producer):
+            for index in range(n_items):
+                if index % 10 == 0:
+                    queue.push_many([(producer, index)])
+                else:
+                    queue.push((producer, index))
+
+        def consume(consumer):
+            while True:
+                items = queue.pop_many(8)
+                popped[consumer].extend(items)
+                if None in items:
+                    # gives back the stop signals of other consumers
+                    for _ in range(items.count(None) - 1):
+                        queue.push(None)
+                    return
+
+        threads = [Thread(target=produce, args=(producer,))
+                   for producer in range(n_producers)]
+        threads += [Thread(target=consume, args=(consumer,))
+                    for consumer in range(n_consumers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads[:n_producers]:
+            thread.join()
+        for _ in range(n_consumers):
+            queue.push(None)
+        for thread in threads[n_producers:]:
+            thread.join()
+
+        items = [item for items in popped for item in items if item]
+        self.assertEqual(sorted(items),
+                         [(producer, index) for producer in range(n_producers)
+                          for index in range(n_items)])
+        for items in popped:
+            for producer in range(n_producers):
+                indexes = [index for source, index in filter(None, items)
+                           if source == producer]
+                self.assertEqual(indexes, sorted(indexes))
+
+
+def _produce_numbers(queue, n_items):
+    """Pushes n_items numbers to a shared queue, from another process."""
+
+    index = 0
+    while index < n_items:
+        batch = array('d', range(index, min(index + 7, n_items)))
+        try:
+            queue.push_many(batch)
+        except OverflowError:
+            continue
+        index += len(batch)
+    queue.close()
+
+
+class TestSharedNumberQueue(unittest.TestCase):
+    """Tests for the SharedNumberQueue class.
+
+    Methods
+    -------
+    test_fifo:
+        Pushes and pops must follow the queue order.
+
+    test_wrap_around:
+        Batches must be copied across the end of the ring buffer.
+
+    test_bounds:
+        The queue must not exceed its capacity.
+
+    test_processes:
+        Items pushed by another process must be popped in order.
+    """
+
+    def test_fifo(self):
+        """Pushes and pops must follow the queue order."""
+
+        with SharedNumberQueue(10) as queue:
+            self.assertEqual(queue.capacity, 10)
+            self.assertRaises(IndexError, queue.pop)
+            self.assertRaises(IndexError, queue.peak)
+            queue.push(Number(1))
+            queue.push(2.5)
+            queue.push_many([3, Number(4)])
+            self.assertEqual(queue.size(), 4)
+            self.assertEqual(queue.peak(), Number(1))
+            self.assertEqual(queue.pop(), Number(1))
+            self.assertEqual(queue.pop_many(2), [Number(2.5), Number(3)])
+            self.assertIsInstance(queue.pop(), Number)
+            self.assertRaises(ValueError, queue.push, "asd")
+            self.assertRaises(ValueError, queue.pop_many, 0)
+
+    def test_wrap_around(self):
+        """Batches must be copied across the end of the ring buffer."""
+
+        with SharedNumberQueue(5, raw=True) as queue:
+            self.assertTrue(queue.raw)
+            queue.push_many([0, 1, 2, 3])
+            self.assertEqual(queue.pop_many(3), [0., 1., 2.])
+            queue.push_many(array('d', [4, 5, 6, 7]))
+            self.assertEqual(queue.pop_many(10), [3., 4., 5., 6., 7.])
+            queue.push_many([8, 9, 10])
+            self.assertEqual(queue.drain(), [8., 9., 10.])
+            self.assertEqual(queue.drain(), [])
+
+    def test_bounds(self):
+        """The queue must not exceed its capacity."""
+
+        with SharedNumberQueue(3) as queue:
+            queue.push_many([1, 2])
+            self.assertRaises(OverflowError, queue.push_many, [3, 4])
+            queue.push(3)
+            self.assertRaises(OverflowError, queue.push, 4)
+            self.assertEqual(queue.size(), 3)
+
+    def test_processes(self):
+        """Items pushed by another process must be popped in order."""
+
+        n_items = 1000
+        with SharedNumberQueue(16, raw=True) as queue:
+            producer = Process(target=_produce_numbers,
+                               args=(queue, n_items))
+            producer.start()
+            popped = []
+            while len(popped) < n_items:
+                try:
+                    popped.extend(queue.pop_many(5))
+                except IndexError:
+                    pass
+            producer.join()
+            self.assertEqual(popped, [float(index)
+                                      for index in range(n_items)])
+
+
+class TestSegmentedQueue(unittest.TestCase):
+    """Tests for the SegmentedQueue class.
+
+    Methods
+    -------
+    test_interleaved_order:
+        Interleaved pushes and pops must keep the FIFO order.
+
+    test_batches:
+        Batch operations must keep the FIFO order.
+    """
+
+    def test_interleaved_order(self):
+        """Interleaved pushes and pops must keep the FIFO order."""
+
+        queue = SegmentedQueue(block_size=4)
+        self.assertEqual(queue.block_size, 4)
+        self.assertRaises(IndexError, queue.pop)
+        popped = []
+        for index in range(100):
+            queue.push(index)
+            if index % 3 == 0:
+                self.assertEqual(queue.peak(), len(popped))
+                popped.append(queue.pop())
+        while queue.size() > 0:
+            popped.append(queue.pop())
+        self.assertEqual(popped, list(range(100)))
+
+    def test_batches(self):
+        """Batch operations must keep the FIFO order."""
+
+        queue = SegmentedQueue(block_size=3)
+        queue.push_many(range(10))
+        self.assertEqual(queue.pop_many(4), [0, 1, 2, 3])
+        queue.push_many(range(10, 20))
+        self.assertEqual(queue.pop_many(10), list(range(4, 14)))
+        self.assertEqual(queue.drain(), list(range(14, 20)))
+
+
+class TestRingQueue(unittest.TestCase):
+    """Tests for the RingQueue class.
+
+    Methods
+    -------
+    test_wraparound:
+        Interleaved operations must keep the FIFO order around the ring.
+
+    test_raise:
+        Pushing to a full queue must fail, leaving it unchanged.
+
+    test_drop_newest:
+        New items that don't fit must be dropped and counted.
+
+    test_overwrite_oldest:
+        The oldest items must be overwritten and counted.
+
+    test_block:
+        Producers must wait until consumers make room.
+
+    test_block_mixed_producers:
+        A push that fits must not wait behind a larger push_many.
+
+    test_serialization:
+        Pickling and packing must keep the items and the counters.
+    """
+
+    def test_wraparound(self):
+        """Interleaved operations must keep the FIFO order around the ring."""
+
+        queue = RingQueue(5)
+        self.assertEqual((queue.capacity, queue.policy), (5, "raise"))
+        self.assertRaises(IndexError, queue.pop)
+        self.assertRaises(IndexError, queue.peak)
+        self.assertRaises(AssertionError, RingQueue, 0)
+        self.assertRaises(AssertionError, RingQueue, 3, "grow")
+        reference = Queue()
+        for index in range(50):
+            for item in range(index % 4):
+                if queue.size() < queue.capacity:
+                    queue.push((index, item))
+                    reference.push((index, item))
+            if index % 3 == 0:
+                n = min(queue.size(), 2)
+                self.assertEqual(queue.pop_many(n), reference.pop_many(n))
+            elif queue.size():
+                self.assertEqual(queue.peak(), reference.peak())
+                self.assertEqual(queue.pop(), reference.pop())
+            self.assertEqual(list(queue), list(reference))
+            self.assertEqual(list(reversed(queue)), list(reversed(reference)))
+        self.assertEqual(queue.drain(), reference.drain())
+        self.assertEqual(queue._buffer, [None] * 5)
+        self.assertEqual(repr(queue), "Empty RingQueue")
+
+    def test_raise(self):
+        """Pushing to a full queue must fail, leaving it unchanged."""
+
+        queue = RingQueue(3)
+        queue.push_many([1, 2])
+        self.assertRaises(OverflowError, queue.push_many, [3, 4])
+        queue.push(3)
+        self.assertRaises(OverflowError, queue.push, 4)
+        self.assertEqual(list(queue), [1, 2, 3])
+        self.assertEqual((queue.dropped, queue.overwritten), (0, 0))
+        self.assertRaises(IndexError, queue.pop_many, 4)
+        self.assertRaises(ValueError, queue.pop_many, -1)
+
+    def test_drop_newest(self):
+        """New items that don't fit must be dropped and counted."""
+
+        queue = RingQueue(4, "drop_newest")
+        queue.push_many(range(3))
+        queue.push_many(range(3, 9))
+        queue.push(9)
+        self.assertEqual(list(queue), [0, 1, 2, 3])
+        self.assertEqual((queue.dropped, queue.overwritten), (6, 0))
+        self.assertEqual(queue.pop(), 0)
+        queue.push(10)
+        self.assertEqual(queue.drain(), [1, 2, 3, 10])
+
+    def test_overwrite_oldest(self):
+        """The oldest items must be overwritten and counted."""
+
+        queue = RingQueue(4, "overwrite_oldest")
+        queue.push_many(range(3))
+        queue.push(3)
+        queue.push(4)
+        self.assertEqual(list(queue), [1, 2, 3, 4])
+        queue.push_many(range(5, 7))
+        self.assertEqual(list(queue), [3, 4, 5, 6])
+        queue.push_many(range(7, 17))
+        self.assertEqual(list(queue), [13, 14, 15, 16])
+        self.assertEqual((queue.dropped, queue.overwritten), (0, 13))
+        self.assertEqual(repr(queue), "RingQueue Elements: 13; 14; 15; 16")
+
+    def test_block(self):
+        """Producers must wait until consumers make room."""
+
+        queue = RingQueue(2, "block")
+        queue.push_many([0, 1])
+        self.assertRaises(OverflowError, queue.push, 2, timeout=0.01)
+        self.assertRaises(ValueError, queue.push_many, range(3))
+
+        def produce():
+            for item in range(2, 100):
+                queue.push(item)
+
+        producer = Thread(target=produce)
+        producer.start()
+        popped = []
+        while len(popped) < 100:
+            try:
+                popped.append(queue.pop())
+            except IndexError:
+                pass
+        producer.join()
+        self.assertEqual(popped, list(range(100)))
+
+    def test_block_mixed_producers(self):
+        """A push that fits must not wait behind a larger push_many."""
+
+        queue = RingQueue(3, "block")
+        queue.push_many([1, 2, 3])
+        large = Thread(target=queue.push_many, args=([10, 11, 12],),
+                       daemon=True)
+        large.start()
+        while not queue._waiting_producers:
+            sleep(0.001)
+        small = Thread(target=queue.push, args=(20,), daemon=True)
+        small.start()
+        while queue._waiting_producers < 2:
+            sleep(0.001)
+        self.assertEqual(queue.pop(), 1)
+        small.join(timeout=5)
+        self.assertFalse(small.is_alive())
+        self.assertEqual(list(queue), [2, 3, 20])
+        self.assertEqual(queue.pop_many(3), [2, 3, 20])
+        large.join(timeout=5)
+        self.assertEqual(queue.drain(), [10, 11, 12])
+
+    def test_serialization(self):
+        """Pickling and packing must keep the items and the counters."""
+
+        queue = RingQueue(3, "drop_newest")
+        queue.push_many([Number(1), Number(2)])
+        queue.pop()
+        queue.push_many([Number(3), Number(4), Number(5)])
+        copy = pickle.loads(pickle.dumps(queue))
+        self.assertEqual(list(copy), [Number(2), Number(3), Number(4)])
+        self.assertEqual((copy.capacity, copy.dropped), (3, 1))
+        copy.pop()
+        copy.push(Number(6))
+        self.assertEqual(list(copy), [Number(3), Number(4), Number(6)])
+        restored = RingQueue.from_bytes(queue.to_bytes(), 4)
+        self.assertEqual(list(restored), list(queue))
+        self.assertEqual(restored.capacity, 4)
@@ -0,0 +1,208 @@
+"""Test for the data_structures.spilling module.
+
+TestSerializers:
+    Tests for the segment serializers.
+
+TestSpillingStack:
+    Tests for the SpillingStack class.
+
+TestSpillingQueue:
+    Tests for the SpillingQueue class.
+"""
+
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from data_structures.elements import Number
+from data_structures.spilling import (PickleSerializer, NumberSerializer,
+                                      SpillingStack, SpillingQueue)
+
+
+class TestSerializers(unittest.TestCase):
+    """Tests for the segment serializers.
+
+    Methods
+    -------
+    test_pickle_serializer:
+        Any picklable items must be serialized back and forth.
+
+    test_number_serializer:
+        Real numbers must be packed as doubles.
+    """
+
+    def test_pickle_serializer(self):
+        """Any picklable items must be serialized back and forth."""
+
+        serializer = PickleSerializer()
+        items = [1, "asd", (2, 3.5), None]
+        self.assertEqual(serializer.loads(serializer.dumps(items)), items)
+
+    def test_number_serializer(self):
+        """Real numbers must be packed as doubles."""
+
+        serializer = NumberSerializer()
+        data = serializer.dumps([Number(1), Number(2.5), 3])
+        self.assertEqual(len(data), 24)
+        self.assertEqual(serializer.loads(data),
+                         [Number(1.), Number(2.5), Number(3.)])
+        self.assertEqual(NumberSerializer(raw=True).loads(data),
+                         [1., 2.5, 3.])
+
+
+class TestSpillingStack(unittest.TestCase):
+    """Tests for the SpillingStack class.
+
+    Methods
+    -------
+    test_spill_and_load:
+        Items spilled to disk must be popped in the stack order.
+
+    test_batches:
+        Batch operations must load the spilled segments.
+
+    test_reopen:
+        Persisted stacks must reopen with the same items.
+
+    test_iteration:
+        Iterating must read the spilled segments without removing them.
+    """
+
+    def test_spill_and_load(self):
+        """Items spilled to disk must be popped in the stack order."""
+
+        with TemporaryDirectory() as directory:
+            stack = SpillingStack(directory, segment_size=4)
+            self.assertRaises(IndexError, stack.pop)
+            for index in range(20):
+                stack.push(index)
+            self.assertEqual(stack.size(), 20)
+            self.assertGreater(stack.spilled(), 0)
+            self.assertLessEqual(len(stack._items), 8)
+            self.assertEqual(len(os.listdir(directory)),
+                             stack.spilled() // 4)
+            for index in reversed(range(20)):
+                self.assertEqual(stack.peak(), index)
+                self.assertEqual(stack.pop(), index)
+            # segments are reclaimed once loaded
+            self.assertEqual(os.listdir(directory), [])
+            self.assertEqual(stack.size(), 0)
+
+    def test_batches(self):
+        """Batch operations must load the spilled segments."""
+
+        with TemporaryDirectory() as directory:
+            stack = SpillingStack(directory, segment_size=3)
+            stack.push_many(range(20))
+            self.assertEqual(stack.spilled(), 15)
+            self.assertEqual(stack.pop_many(10), list(range(19, 9, -1)))
+            self.assertRaises(IndexError, stack.pop_many, 11)
+            self.assertEqual(stack.drain(), list(range(9, -1, -1)))
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_reopen(self):
+        """Persisted stacks must reopen with the same items."""
+
+        with TemporaryDirectory() as directory:
+            stack = SpillingStack(directory, segment_size=4,
+                                  serializer=NumberSerializer())
+            stack.push_many(Number(index) for index in range(10))
+            stack.persist()
+            self.assertEqual(stack.spilled(), 10)
+            reopened = SpillingStack(directory, segment_size=4,
+                                     serializer=NumberSerializer())
+            self.assertEqual(reopened.size(), 10)
+            self.assertEqual(reopened.drain(),
+                             [Number(index) for index in range(9, -1, -1)])
+
+    def test_iteration(self):
+        """Iterating must read the spilled segments, keeping them."""
+
+        with TemporaryDirectory() as directory:
+            stack = SpillingStack(directory, segment_size=3)
+            stack.push_many(range(20))
+            self.assertEqual(list(stack), list(range(19, -1, -1)))
+            self.assertEqual(list(reversed(stack)), list(range(20)))
+            self.assertEqual(stack.spilled(), 15)
+            self.assertEqual(len(os.listdir(directory)), 5)
+            self.assertEqual(stack.peak_many(10), list(range(19, 9, -1)))
+            self.assertEqual(list(stack.iter_drain()),
+                             list(range(19, -1, -1)))
+
+
+class TestSpillingQueue(unittest.TestCase):
+    """Tests for the SpillingQueue class.
+
+    Methods
+    -------
+    test_spill_and_load:
+        Items spilled to disk must be popped in the queue order.
+
+    test_batches:
+        Batch operations must load the spilled segments in order.
+
+    test_reopen:
+        Persisted queues must reopen with the same items.
+
+    test_iteration:
+        Iterating must read the spilled segments without removing them.
+    """
+
+    def test_spill_and_load(self):
+        """Items spilled to disk must be popped in the queue order."""
+
+        with TemporaryDirectory() as directory:
+            queue = SpillingQueue(directory, segment_size=4)
+            self.assertRaises(IndexError, queue.pop)
+            popped = []
+            for index in range(50):
+                queue.push(index)
+                if index % 3 == 0:
+                    popped.append(queue.pop())
+            self.assertGreater(queue.spilled(), 0)
+            self.assertEqual(queue.size(), 50 - len(popped))
+            while queue.size() > 0:
+                self.assertEqual(queue.peak(), len(popped))
+                popped.append(queue.pop())
+            self.assertEqual(popped, list(range(50)))
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_batches(self):
+        """Batch operations must load the spilled segments in order."""
+
+        with TemporaryDirectory() as directory:
+            queue = SpillingQueue(directory, segment_size=3)
+            queue.push_many(range(20))
+            self.assertEqual(queue.pop_many(2), [0, 1])
+            queue.push_many(range(20, 30))
+            self.assertEqual(queue.pop_many(15), list(range(2, 17)))
+            self.assertRaises(IndexError, queue.pop_many, 14)
+            self.assertEqual(queue.drain(), list(range(17, 30)))
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_reopen(self):
+        """Persisted queues must reopen with the same items."""
+
+        with TemporaryDirectory() as directory:
+            queue = SpillingQueue(directory, segment_size=2)
+            queue.push_many(range(10))
+            self.assertEqual(queue.pop(), 0)
+            queue.push_many(["asd", (1, 2)])
+            queue.persist()
+            reopened = SpillingQueue(directory, segment_size=2)
+            self.assertEqual(reopened.size(), 11)
+            self.assertEqual(reopened.drain(),
+                             list(range(1, 10)) + ["asd", (1, 2)])
+
+    def test_iteration(self):
+        """Iterating must read the spilled segments, keeping them."""
+
+        with TemporaryDirectory() as directory:
+            queue = SpillingQueue(directory, segment_size=3)
+            queue.push_many(range(20))
+            self.assertEqual(queue.pop(), 0)
+            queue.push_many(range(20, 25))
+            self.assertGreater(queue.spilled(), 0)
+            self.assertEqual(list(queue), list(range(1, 25)))
+            self.assertEqual(list(reversed(queue)), list(range(24, 0, -1)))
+            self.assertEqual(len(queue), 24)
+            self.assertEqual(list(queue.iter_drain()), list(range(1, 25)))
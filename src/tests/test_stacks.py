@@ -5,11 +5,29 @@ TestStack:
 
 TestTypeRestrictedStack:
     Tests for the TypeRestrictedStack class.
+
+TestNumericStack:
+    Tests for the NumericStack class.
+
+TestAggregateStack:
+    Tests for the AggregateStack class.
+
+TestMinMaxStack:
+    Tests for the MinMaxStack class.
+
+TestSegmentedStack:
+    Tests for the SegmentedStack class.
 """
 
+import io
+import pickle
 import unittest
+from math import gcd
+from operator import add
 from data_structures.elements import Number
-from data_structures.stacks import Stack, TypeRestrictedStack
+from data_structures.stacks import (Stack, TypeRestrictedStack, NumericStack,
+                                    AggregateStack, MinMaxStack,
+                                    SegmentedStack)
 from random import random
 
 
@@ -34,6 +52,27 @@ class TestStack(unittest.TestCase):
 
     test_size:
         Size must return the amount of items in the stack.
+
+    test_push_many:
+        Push many must add the items to the top of the stack, in order.
+
+    test_pop_many:
+        Pop many must remove the n top elements from the stack.
+
+    test_drain:
+        Drain must remove and return every element of the stack.
+
+    test_iteration:
+        Iterating must not remove the items, from the top to the bottom.
+
+    test_iter_drain:
+        Iter drain must remove the items only as they are used.
+
+    test_repr_limit:
+        Repr must show up to repr_limit items.
+
+    test_serialization:
+        Packed and pickled stacks must keep their items in order.
     """
 
     def test_push(self):
@@ -108,6 +147,111 @@ class TestStack(unittest.TestCase):
         stack.pop()
         self.assertEqual(stack.size(), num_elements - 2)
 
+    def test_push_many(self):
+        """Push many must add the items to the top of the stack, in order."""
+
+        stack = Stack()
+        stack.push("first")
+        items = [random() for _ in range(10)]
+        stack.push_many(iter(items))
+        self.assertEqual(stack._items, ["first"] + items)
+        stack.extend(["asd", 1 + 1j])
+        self.assertEqual(stack.peak(), 1 + 1j)
+        self.assertEqual(stack.size(), 13)
+
+    def test_pop_many(self):
+        """Pop many must remove the n top elements from the stack."""
+
+        stack = Stack()
+        items = [random() for _ in range(10)]
+        stack.push_many(items)
+        self.assertEqual(stack.pop_many(0), [])
+        self.assertEqual(stack.pop_many(3), items[:-4:-1])
+        self.assertEqual(stack.size(), 7)
+        # not enough items, the stack must be left unchanged
+        self.assertRaises(IndexError, stack.pop_many, 8)
+        self.assertRaises(ValueError, stack.pop_many, -1)
+        self.assertEqual(stack._items, items[:7])
+        self.assertEqual(stack.pop_many(7), items[6::-1])
+        self.assertRaises(IndexError, stack.pop)
+
+    def test_drain(self):
+        """Drain must remove and return every element of the stack."""
+
+        stack = Stack()
+        self.assertEqual(stack.drain(), [])
+        items = [random() for _ in range(10)]
+        stack.push_many(items)
+        self.assertEqual(stack.drain(), items[::-1])
+        self.assertEqual(stack.size(), 0)
+        stack.push("asd")
+        self.assertEqual(stack.pop(), "asd")
+
+    def test_iteration(self):
+        """Iterating must not remove the items, from the top down."""
+
+        stack = Stack()
+        self.assertFalse(stack)
+        self.assertEqual(list(stack), [])
+        stack.push_many(range(10))
+        self.assertTrue(stack)
+        self.assertEqual(len(stack), 10)
+        self.assertEqual(list(stack), list(range(9, -1, -1)))
+        self.assertEqual(list(reversed(stack)), list(range(10)))
+        self.assertEqual(stack.peak_many(3), [9, 8, 7])
+        self.assertRaises(IndexError, stack.peak_many, 11)
+        self.assertRaises(ValueError, stack.peak_many, -1)
+        self.assertEqual(stack.size(), 10)
+
+    def test_iter_drain(self):
+        """Iter drain must remove the items only as they are used."""
+
+        stack = Stack()
+        stack.push_many(range(10))
+        drained = stack.iter_drain()
+        self.assertEqual(stack.size(), 10)
+        self.assertEqual(next(drained), 9)
+        self.assertEqual(stack.size(), 9)
+        stack.push(10)
+        self.assertEqual(list(drained), [10] + list(range(8, -1, -1)))
+        self.assertEqual(stack.size(), 0)
+
+    def test_repr_limit(self):
+        """Repr must show up to repr_limit items."""
+
+        stack = Stack()
+        self.assertEqual(repr(stack), "Empty Stack")
+        stack.push_many(range(100))
+        stack.repr_limit = 3
+        self.assertEqual(repr(stack), "Stack Elements: 0; 1; 2; ... (97 more)")
+        stack.repr_limit = None
+        self.assertEqual(len(repr(stack).split("; ")), 100)
+
+    def test_serialization(self):
+        """Packed and pickled stacks must keep their items in order."""
+
+        for items in ([], list(range(10)), [Number(x / 2) for x in range(9)],
+                      [1, "two", Number(3), None], [2**80, 1]):
+            stack = Stack()
+            stack.push_many(items)
+            data = stack.to_bytes()
+            self.assertEqual(list(Stack.from_bytes(data)), list(stack))
+            self.assertEqual(list(pickle.loads(pickle.dumps(stack))),
+                             list(stack))
+            self.assertEqual(stack.size(), len(items))
+        numbers = Stack()
+        numbers.push_many(Number(x + .5) for x in range(100))
+        self.assertLess(len(numbers.to_bytes()),
+                        len(pickle.dumps(numbers._items)))
+        file = io.BytesIO()
+        numbers.dump(file)
+        Stack.from_bytes(Stack().to_bytes()).dump(file)
+        file.seek(0)
+        self.assertEqual(Stack.load(file).drain(), numbers.drain())
+        self.assertEqual(Stack.load(file).size(), 0)
+        self.assertRaises(ValueError, Stack.from_bytes, b"")
+        self.assertRaises(ValueError, Stack.load, file)
+
 
 class TestTypeRestrictedStack(unittest.TestCase):
     """Tests for the TypeRestrictedStack class.
@@ -129,6 +273,20 @@ class TestTypeRestrictedStack(unittest.TestCase):
 
     test_restricted_push:
         Pushes in TypeRestrictedStacks must apply type restrictions.
+
+    test_restricted_push_many:
+        Batch pushes must validate the whole batch before pushing.
+
+    test_exact_validation:
+        The exact mode must cache accepted types without accepting
+        forbidden ones.
+
+    test_trusted_validation:
+        The trusted mode must only verify items pushed since the last
+        verification.
+
+    test_serialization:
+        Unpacked items must only be validated when it's needed.
     """
 
     def test_init(self):
@@ -201,3 +359,445 @@ class TestTypeRestrictedStack(unittest.TestCase):
         self.assertRaises(ValueError, x.push, "asd")
         y = TypeRestrictedStack()
         self.assertRaises(ValueError, y.push, 3.14)
+
+    def test_restricted_push_many(self):
+        """Batch pushes must validate the whole batch before pushing."""
+
+        x = TypeRestrictedStack()
+        numbers = [Number(index) for index in range(5)]
+        x.push_many(number for number in numbers)
+        self.assertEqual(x._items, numbers)
+        self.assertRaises(ValueError, x.push_many, [Number(1), 2.5])
+        self.assertRaises(ValueError, x.extend, [Number(1), "asd"])
+        self.assertEqual(x._items, numbers)
+
+    def test_exact_validation(self):
+        """The exact mode must cache types, without forbidden ones."""
+
+        class Integer(Number):
+            pass
+
+        x = TypeRestrictedStack(Number, validation="exact")
+        self.assertEqual(x.validation, "exact")
+        x.push(Number(1))
+        x.push(Integer(2))
+        self.assertEqual(x._accepted_types, {Number, Integer})
+        self.assertRaises(ValueError, x.push, 3)
+        self.assertRaises(ValueError, x.push_many, [Number(4), 5.5])
+        self.assertEqual(x.size(), 2)
+        x.push_many([Integer(6), Number(7)])
+        self.assertEqual(x.size(), 4)
+        x._items.append("asd")
+        self.assertRaises(ValueError, x.verify_types)
+        self.assertRaises(AssertionError, TypeRestrictedStack, Number,
+                          "lazy")
+
+    def test_trusted_validation(self):
+        """The trusted mode must only verify the new items."""
+
+        x = TypeRestrictedStack(int, validation="trusted")
+        x.push_many([1, 2, "three"])
+        self.assertRaises(ValueError, x.verify_types)
+        x.pop()
+        x.verify_types()
+        self.assertEqual(x._verified, 2)
+        x._items[0] = "one"
+        x.push(4)
+        x.verify_types()
+        x.pop_many(3)
+        x.push("five")
+        self.assertRaises(ValueError, x.verify_types)
+        x.drain()
+        x.push(6)
+        x.verify_types()
+
+
+    def test_serialization(self):
+        """Unpacked items must only be validated when it's needed."""
+
+        stack = TypeRestrictedStack(Number, validation="exact")
+        stack.push_many(Number(x) for x in range(5))
+        copy = TypeRestrictedStack.from_bytes(stack.to_bytes(), Number,
+                                              validation="exact")
+        self.assertEqual(copy.drain(), stack.drain())
+        self.assertEqual(copy.validation, "exact")
+        floats = Stack()
+        floats.push_many([1.5, 2.5])
+        self.assertRaises(ValueError, TypeRestrictedStack.from_bytes,
+                          floats.to_bytes())
+        self.assertEqual(TypeRestrictedStack.from_bytes(
+            floats.to_bytes(), float).drain(), [2.5, 1.5])
+        mixed = Stack()
+        mixed.push_many([Number(1), 2])
+        self.assertRaises(ValueError, TypeRestrictedStack.from_bytes,
+                          mixed.to_bytes())
+        stack.push(Number(2))
+        copy = pickle.loads(pickle.dumps(stack))
+        self.assertRaises(ValueError, copy.push, 2)
+        self.assertEqual(copy.pop(), Number(2))
+
+
+class TestNumericStack(unittest.TestCase):
+    """Tests for the NumericStack class.
+
+    Methods
+    -------
+    test_push_and_pop:
+        Real numbers must be stored as doubles and returned as Numbers.
+
+    test_raw:
+        Raw numeric stacks must return floats.
+
+    test_restricted_push:
+        Only Number, int and float instances can be pushed.
+
+    test_batches:
+        Batch operations must keep the stack order.
+
+    test_iteration:
+        Iterating must return the items as they are popped.
+
+    test_reductions:
+        Reductions must be computed over all the items.
+
+    test_serialization:
+        Packed stacks must keep the values as raw doubles.
+    """
+
+    def test_push_and_pop(self):
+        """Real numbers must be stored as doubles and returned as Numbers."""
+
+        stack = NumericStack()
+        self.assertRaises(IndexError, stack.pop)
+        self.assertRaises(IndexError, stack.peak)
+        stack.push(Number(2.5))
+        stack.push(3)
+        stack.push(-1.25)
+        self.assertEqual(stack._items.typecode, 'd')
+        self.assertEqual(stack.size(), 3)
+        self.assertEqual(stack.peak(), Number(-1.25))
+        self.assertEqual(stack.pop(), Number(-1.25))
+        self.assertEqual(stack.pop(), Number(3))
+        self.assertIsInstance(stack.pop(), Number)
+        self.assertEqual(stack.size(), 0)
+
+    def test_raw(self):
+        """Raw numeric stacks must return floats."""
+
+        stack = NumericStack(raw=True)
+        self.assertTrue(stack.raw)
+        stack.push(Number(2))
+        self.assertEqual(stack.peak(), 2.0)
+        self.assertIsInstance(stack.pop(), float)
+
+    def test_restricted_push(self):
+        """Only Number, int and float instances can be pushed."""
+
+        stack = NumericStack()
+        self.assertRaises(ValueError, stack.push, "asd")
+        self.assertRaises(ValueError, stack.push, 1 + 1j)
+        self.assertRaises(ValueError, stack.push_many, [1, 2, "asd"])
+        self.assertRaises(ValueError, stack.push, True)
+        self.assertRaises(ValueError, stack.push_many, [1., False])
+        self.assertRaises(ValueError, stack.push, 10**400)
+        self.assertRaises(ValueError, stack.push, Number(10**400))
+        self.assertRaises(ValueError, stack.push_many, [1, 10**400])
+        self.assertEqual(stack.size(), 0)
+
+    def test_batches(self):
+        """Batch operations must keep the stack order."""
+
+        stack = NumericStack(raw=True)
+        values = [random() for _ in range(10)]
+        stack.push_many([Number(value) for value in values[:5]])
+        stack.extend(values[5:])
+        self.assertEqual(list(stack._items), values)
+        self.assertEqual(stack.pop_many(0), [])
+        self.assertEqual(stack.pop_many(3), values[:-4:-1])
+        self.assertEqual(stack.drain(), values[6::-1])
+        self.assertEqual(stack.size(), 0)
+        numbers = NumericStack()
+        numbers.push_many([1, 2])
+        self.assertEqual(numbers.pop_many(2), [Number(2), Number(1)])
+
+    def test_iteration(self):
+        """Iterating must return the items as they are popped."""
+
+        stack = NumericStack()
+        stack.push_many([1, 2.5, Number(3)])
+        self.assertEqual(list(stack), [Number(3), Number(2.5), Number(1)])
+        self.assertEqual(list(reversed(stack)),
+                         [Number(1), Number(2.5), Number(3)])
+        raw = NumericStack(raw=True)
+        raw.push_many([1, 2.5])
+        self.assertEqual(raw.peak_many(2), [2.5, 1.])
+
+    def test_reductions(self):
+        """Reductions must be computed over all the items."""
+
+        stack = NumericStack()
+        self.assertEqual(stack.sum(), Number(0))
+        self.assertRaises(IndexError, stack.min)
+        self.assertRaises(IndexError, stack.max)
+        self.assertRaises(IndexError, stack.mean)
+        stack.push_many([4, -2, 1.5, 0.5])
+        self.assertEqual(stack.sum(), Number(4))
+        self.assertEqual(stack.min(), Number(-2))
+        self.assertEqual(stack.max(), Number(4))
+        self.assertEqual(stack.mean(), Number(1))
+
+
+    def test_serialization(self):
+        """Packed stacks must keep the values as raw doubles."""
+
+        stack = NumericStack()
+        stack.push_many([1, 2.5, Number(3)])
+        data = stack.to_bytes()
+        self.assertEqual(len(data), len(Number(1).to_bytes()) + 2 * 8)
+        self.assertEqual(NumericStack.from_bytes(data).drain(),
+                         [Number(3), Number(2.5), Number(1)])
+        self.assertEqual(NumericStack.from_bytes(data, raw=True).drain(),
+                         [3., 2.5, 1.])
+        self.assertEqual(Stack.from_bytes(data).drain(),
+                         [Number(3), Number(2.5), Number(1)])
+        ints = Stack()
+        ints.push_many([1, 2])
+        self.assertEqual(NumericStack.from_bytes(ints.to_bytes()).drain(),
+                         [Number(2), Number(1)])
+        raw = pickle.loads(pickle.dumps(stack))
+        self.assertEqual(raw.sum(), Number(6.5))
+
+
+class TestAggregateStack(unittest.TestCase):
+    """Tests for the AggregateStack class.
+
+    Methods
+    -------
+    test_aggregate:
+        The aggregate must cover all the items after pushes and pops.
+
+    test_batches:
+        Batch operations must keep the aggregates correct.
+    """
+
+    def test_aggregate(self):
+        """The aggregate must cover all the items after pushes and pops."""
+
+        stack = AggregateStack(add)
+        self.assertRaises(IndexError, stack.aggregate)
+        values = [random() for _ in range(50)]
+        for index, value in enumerate(values):
+            stack.push(value)
+            self.assertAlmostEqual(stack.aggregate(), sum(values[:index+1]))
+
+        for index in range(49, 0, -1):
+            self.assertEqual(stack.pop(), values[index])
+            self.assertAlmostEqual(stack.aggregate(), sum(values[:index]))
+
+        stack.pop()
+        self.assertRaises(IndexError, stack.aggregate)
+
+    def test_batches(self):
+        """Batch operations must keep the aggregates correct."""
+
+        stack = AggregateStack(gcd)
+        stack.push_many([36, 24])
+        self.assertEqual(stack.aggregate(), 12)
+        stack.extend([18, 9])
+        self.assertEqual(stack.aggregate(), 3)
+        self.assertEqual(stack.pop_many(2), [9, 18])
+        self.assertEqual(stack.aggregate(), 12)
+        self.assertEqual(stack.drain(), [24, 36])
+        self.assertRaises(IndexError, stack.aggregate)
+        stack.push(5)
+        self.assertEqual(stack.aggregate(), 5)
+
+
+class TestMinMaxStack(unittest.TestCase):
+    """Tests for the MinMaxStack class.
+
+    Methods
+    -------
+    test_min_max:
+        Minimum and maximum must be correct after pushes and pops.
+
+    test_restricted_push:
+        Pushes in MinMaxStacks must apply type restrictions.
+
+    test_trusted_push:
+        Items that can't be compared must leave the stack unchanged.
+
+    test_batches:
+        Batch operations must keep the minimum and maximum correct.
+
+    test_smallest_largest:
+        The k smallest and largest items must be sorted.
+
+    test_serialization:
+        Unpacked stacks must track their minimum and maximum.
+    """
+
+    def test_min_max(self):
+        """Minimum and maximum must be correct after pushes and pops."""
+
+        stack = MinMaxStack()
+        self.assertRaises(IndexError, stack.min)
+        self.assertRaises(IndexError, stack.max)
+        numbers = [Number(random()) for _ in range(50)]
+        for index, number in enumerate(numbers):
+            stack.push(number)
+            self.assertIs(stack.min(), min(numbers[:index+1]))
+            self.assertIs(stack.max(), max(numbers[:index+1]))
+
+        for index in range(49, 0, -1):
+            self.assertIs(stack.pop(), numbers[index])
+            self.assertIs(stack.min(), min(numbers[:index]))
+            self.assertIs(stack.max(), max(numbers[:index]))
+
+    def test_restricted_push(self):
+        """Pushes in MinMaxStacks must apply type restrictions."""
+
+        stack = MinMaxStack(int)
+        stack.push(3)
+        self.assertRaises(ValueError, stack.push, 1.5)
+        self.assertRaises(ValueError, stack.push_many, [1, "asd"])
+        self.assertEqual(stack.size(), 1)
+        self.assertEqual(stack.min(), 3)
+        self.assertEqual(len(stack._minima), 1)
+
+    def test_trusted_push(self):
+        """Items that can't be compared must leave the stack unchanged."""
+
+        stack = MinMaxStack(validation="trusted")
+        stack.push(Number(3))
+        self.assertRaises(AttributeError, stack.push, 1.5)
+        self.assertRaises(AttributeError, stack.push_many, [Number(1), 2])
+        self.assertEqual(stack.size(), 1)
+        self.assertEqual(len(stack._minima), 1)
+        stack.push(Number(1))
+        self.assertEqual((stack.min(), stack.max()), (Number(1), Number(3)))
+        self.assertEqual(stack.pop(), Number(1))
+        self.assertEqual((stack.min(), stack.max()), (Number(3), Number(3)))
+
+    def test_batches(self):
+        """Batch operations must keep the minimum and maximum correct."""
+
+        stack = MinMaxStack(int)
+        stack.push_many([5, 3, 8])
+        stack.extend([1, 9])
+        self.assertEqual((stack.min(), stack.max()), (1, 9))
+        self.assertEqual(stack.pop_many(2), [9, 1])
+        self.assertEqual((stack.min(), stack.max()), (3, 8))
+        self.assertEqual(stack.drain(), [8, 3, 5])
+        self.assertRaises(IndexError, stack.min)
+        stack.push(2)
+        self.assertEqual((stack.min(), stack.max()), (2, 2))
+
+    def test_smallest_largest(self):
+        """The k smallest and largest items must be sorted."""
+
+        stack = MinMaxStack()
+        stack.push_many([Number(value) for value in [4, 1, 7, 3, 9]])
+        self.assertEqual(stack.smallest(2), [Number(1), Number(3)])
+        self.assertEqual(stack.largest(3), [Number(9), Number(7), Number(4)])
+
+    def test_serialization(self):
+        """Unpacked stacks must track their minimum and maximum."""
+
+        stack = MinMaxStack()
+        stack.push_many([Number(value) for value in [4, 1, 7]])
+        copy = MinMaxStack.from_bytes(stack.to_bytes())
+        self.assertEqual((copy.min(), copy.max()), (Number(1), Number(7)))
+        copy.pop()
+        self.assertEqual(copy.max(), Number(4))
+        copy = pickle.loads(pickle.dumps(stack))
+        self.assertEqual((copy.min(), copy.max()), (Number(1), Number(7)))
+
+
+class TestSegmentedStack(unittest.TestCase):
+    """Tests for the SegmentedStack class.
+
+    Methods
+    -------
+    test_push_and_pop:
+        Items across blocks must be popped in the stack order.
+
+    test_spare_blocks:
+        Empty blocks must be released, keeping a few spares.
+
+    test_batches:
+        Batch operations must work across blocks.
+
+    test_iteration:
+        Iterating must not remove the items, across blocks.
+    """
+
+    def test_push_and_pop(self):
+        """Items across blocks must be popped in the stack order."""
+
+        stack = SegmentedStack(block_size=4)
+        self.assertRaises(IndexError, stack.pop)
+        self.assertRaises(IndexError, stack.peak)
+        items = [random() for _ in range(10)]
+        for length, item in enumerate(items):
+            self.assertEqual(stack.size(), length)
+            stack.push(item)
+            self.assertEqual(stack.peak(), item)
+
+        self.assertEqual(list(reversed(stack)), items)
+        self.assertEqual(len(stack._blocks), 3)
+        for item in reversed(items):
+            self.assertEqual(stack.pop(), item)
+        self.assertRaises(IndexError, stack.pop)
+
+    def test_spare_blocks(self):
+        """Empty blocks must be released, keeping a few spares."""
+
+        stack = SegmentedStack(block_size=2, max_spare_blocks=1)
+        stack.push_many(range(10))
+        self.assertEqual(len(stack._blocks), 5)
+        stack.pop_many(9)
+        self.assertEqual(len(stack._blocks), 1)
+        self.assertEqual(len(stack._spare_blocks), 1)
+        # the spare block is reused by the next push
+        spare_block = stack._spare_blocks[0]
+        stack.push_many([1, 2])
+        self.assertIs(stack._blocks[-1], spare_block)
+        self.assertEqual(list(reversed(stack)), [0, 1, 2])
+
+    def test_batches(self):
+        """Batch operations must work across blocks."""
+
+        stack = SegmentedStack(block_size=3)
+        stack.push(-1)
+        stack.extend(range(10))
+        self.assertEqual(stack.size(), 11)
+        self.assertEqual(stack.pop_many(0), [])
+        self.assertEqual(stack.pop_many(5), [9, 8, 7, 6, 5])
+        # the blocks hold [-1, 0, 1], [2, 3, 4]
+        self.assertEqual(stack.pop_block(), [4, 3, 2])
+        stack.push_many([2, 3, 4])
+        self.assertRaises(IndexError, stack.pop_many, 7)
+        self.assertRaises(ValueError, stack.pop_many, -1)
+        self.assertEqual(stack.peak(), 4)
+        self.assertEqual(stack.drain(), [4, 3, 2, 1, 0, -1])
+        self.assertEqual(stack.size(), 0)
+        self.assertEqual(stack.pop_block(), [])
+        stack.push("asd")
+        self.assertEqual(stack.pop(), "asd")
+        stack.push_many(range(4))
+        copy = SegmentedStack.from_bytes(stack.to_bytes(), block_size=3)
+        self.assertEqual(copy.drain(), [3, 2, 1, 0])
+
+    def test_iteration(self):
+        """Iterating must not remove the items, across blocks."""
+
+        stack = SegmentedStack(block_size=3)
+        self.assertEqual(list(stack), [])
+        stack.push_many(range(8))
+        self.assertEqual(list(stack), list(range(7, -1, -1)))
+        self.assertEqual(list(reversed(stack)), list(range(8)))
+        stack.pop_many(2)
+        self.assertEqual(list(stack), list(range(5, -1, -1)))
+        self.assertEqual(list(reversed(stack)), list(range(6)))
+        self.assertEqual(len(stack), 6)
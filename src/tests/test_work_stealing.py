@@ -0,0 +1,245 @@
+"""Test for the data_structures.work_stealing module.
+
+TestWorkStealingDeque:
+    Tests for the WorkStealingDeque class.
+
+TestWorkStealingExecutor:
+    Tests for the WorkStealingExecutor and ProcessAdapter classes.
+"""
+
+import pickle
+import sys
+import time
+import unittest
+from threading import Event, Thread
+from data_structures.work_stealing import (WorkStealingDeque,
+                                           WorkStealingExecutor,
+                                           ProcessAdapter)
+
+
+def _square(value):
+    """Squares a value, in a process of a ProcessAdapter."""
+
+    return value * value
+
+
+def _fibonacci(executor, n):
+    """Fibonacci number, spawning a task for one of the branches."""
+
+    if n < 2:
+        return n
+    left = executor.spawn(_fibonacci, executor, n - 1)
+    right = _fibonacci(executor, n - 2)
+    return left.join() + right
+
+
+def _count_leaves(executor, depth):
+    """Leaves of a binary tree, sleeping at each leaf."""
+
+    if depth == 0:
+        time.sleep(0.001)
+        return 1
+    left = executor.spawn(_count_leaves, executor, depth - 1)
+    right = executor.spawn(_count_leaves, executor, depth - 1)
+    return left.join() + right.join()
+
+
+class TestWorkStealingDeque(unittest.TestCase):
+    """Tests for the WorkStealingDeque class.
+
+    Methods
+    -------
+    test_owner_and_thief:
+        The owner must work at the top and thieves at the bottom.
+
+    test_concurrent_steals:
+        Every item must be taken exactly once by the owner or a thief.
+
+    test_serialization:
+        Packed and pickled deques must keep their items and a lock.
+    """
+
+    def test_owner_and_thief(self):
+        """The owner must work at the top and thieves at the bottom."""
+
+        stack = WorkStealingDeque()
+        self.assertRaises(IndexError, stack.pop)
+        self.assertRaises(IndexError, stack.steal)
+        self.assertEqual(stack.steal_many(3), [])
+        stack.push_many(range(10))
+        self.assertEqual(stack.peak(), 9)
+        self.assertEqual(stack.pop(), 9)
+        self.assertEqual(stack.steal(), 0)
+        self.assertEqual(stack.steal_many(2), [1, 2])
+        self.assertEqual(stack.pop_many(2), [8, 7])
+        self.assertEqual(list(stack), [6, 5, 4, 3])
+        self.assertEqual(repr(stack), "Stack Elements: 3; 4; 5; 6")
+        self.assertEqual(stack.steal_many(10), [3, 4, 5, 6])
+        self.assertRaises(ValueError, stack.steal_many, -1)
+        stack.push(1)
+        self.assertEqual(stack.drain(), [1])
+        self.assertEqual(stack.size(), 0)
+
+    def test_serialization(self):
+        """Packed and pickled deques must keep their items and a lock."""
+
+        stack = WorkStealingDeque()
+        stack.push_many(range(5))
+        self.assertFalse(hasattr(stack, '_items'))
+        copy = WorkStealingDeque.from_bytes(stack.to_bytes())
+        self.assertEqual(copy.drain(), [4, 3, 2, 1, 0])
+        copy = pickle.loads(pickle.dumps(stack))
+        self.assertEqual(copy.steal(), 0)
+        self.assertEqual(copy.pop(), 4)
+        self.assertEqual(list(reversed(copy)), [1, 2, 3])
+        self.assertEqual(stack.size(), 5)
+
+    def test_concurrent_steals(self):
+        """Every item must be taken exactly once by the owner or a thief."""
+
+        stack = WorkStealingDeque()
+        n_items = 20000
+        taken = [[] for _ in range(4)]
+
+        def steal(thief):
+            while True:
+                try:
+                    taken[thief].append(stack.steal())
+                except IndexError:
+                    if stack.size() == 0 and done:
+                        return
+
+        done = False
+        thieves = [Thread(target=steal, args=(thief,))
+                   for thief in range(1, 4)]
+        for thief in thieves:
+            thief.start()
+        for item in range(n_items):
+            stack.push(item)
+            if item % 3 == 0:
+                try:
+                    taken[0].append(stack.pop())
+                except IndexError:
+                    pass
+        done = True
+        for thief in thieves:
+            thief.join()
+        taken[0].extend(stack.drain())
+        self.assertEqual(sorted(sum(taken, [])), list(range(n_items)))
+        for thief in range(1, 4):
+            self.assertEqual(taken[thief], sorted(taken[thief]))
+
+
+class TestWorkStealingExecutor(unittest.TestCase):
+    """Tests for the WorkStealingExecutor and ProcessAdapter classes.
+
+    Methods
+    -------
+    test_spawn_and_join:
+        Recursive tasks must spawn and join subtasks without blocking.
+
+    test_stats:
+        Spawned, executed and stolen tasks must be reported.
+
+    test_errors:
+        Exceptions, even SystemExit, and timeouts must reach the joining
+        thread.
+
+    test_shutdown:
+        Shutdown must run or cancel the pending tasks and reject new
+        ones.
+
+    test_process_adapter:
+        Functions run through the adapter must return their results.
+    """
+
+    def test_spawn_and_join(self):
+        """Recursive tasks must spawn and join subtasks without blocking."""
+
+        with WorkStealingExecutor(4) as executor:
+            self.assertEqual(executor.n_workers, 4)
+            task = executor.spawn(_fibonacci, executor, 15)
+            self.assertEqual(task.join(), 610)
+            self.assertTrue(task.done())
+            tasks = [executor.spawn(pow, 2, n) for n in range(20)]
+            self.assertEqual([task.join() for task in tasks],
+                             [2 ** n for n in range(20)])
+        with WorkStealingExecutor(1) as executor:
+            self.assertEqual(executor.spawn(_fibonacci, executor, 10).join(),
+                             55)
+
+    def test_stats(self):
+        """Spawned, executed and stolen tasks must be reported."""
+
+        with WorkStealingExecutor(4) as executor:
+            self.assertEqual(
+                executor.spawn(_count_leaves, executor, 6).join(), 64)
+        # a task is done before its worker counts it, so the metrics
+        # are final once the executor is shut down
+        stats = executor.stats()
+        self.assertEqual(len(stats['workers']), 4)
+        self.assertEqual(stats['submitted'], 1)
+        self.assertEqual(stats['spawned'], 126)
+        self.assertEqual(stats['executed'], 127)
+        self.assertEqual(stats['pending'], 0)
+        self.assertEqual(stats['queued'], 0)
+        self.assertGreater(stats['steals'], 0)
+        self.assertGreaterEqual(stats['steal_attempts'], stats['steals'])
+        self.assertGreater(stats['idle_seconds'], 0)
+        self.assertEqual(sum(worker['steals']
+                             for worker in stats['workers']),
+                         stats['steals'])
+
+    def test_errors(self):
+        """Exceptions and timeouts must reach the joining thread."""
+
+        with WorkStealingExecutor(2) as executor:
+            task = executor.spawn(int, "not a number")
+            self.assertRaises(ValueError, task.join)
+            slow = executor.spawn(time.sleep, 0.5)
+            self.assertRaises(TimeoutError, slow.join, 0.01)
+            self.assertFalse(slow.done())
+            self.assertIsNone(slow.join())
+        with WorkStealingExecutor(1) as executor:
+            task = executor.spawn(sys.exit, 3)
+            with self.assertRaises(SystemExit):
+                task.join(timeout=5)
+            self.assertTrue(task.done())
+            self.assertEqual(executor.spawn(pow, 2, 3).join(timeout=5), 8)
+
+    def test_shutdown(self):
+        """Shutdown must run the pending tasks and reject new ones."""
+
+        executor = WorkStealingExecutor(2)
+        tasks = [executor.spawn(time.sleep, 0.01) for _ in range(10)]
+        executor.shutdown()
+        self.assertTrue(all(task.done() for task in tasks))
+        self.assertEqual(executor.pending(), 0)
+        self.assertRaises(RuntimeError, executor.spawn, print)
+        started = Event()
+
+        def sleep():
+            started.set()
+            time.sleep(0.2)
+
+        executor = WorkStealingExecutor(1)
+        running = executor.spawn(sleep)
+        started.wait(timeout=5)
+        queued = [executor.spawn(pow, 2, n) for n in range(5)]
+        executor.shutdown(wait=False)
+        for task in queued:
+            with self.assertRaises(RuntimeError):
+                task.join(timeout=5)
+        self.assertIsNone(running.join(timeout=5))
+        self.assertEqual(executor.stats()['cancelled'], 5)
+        self.assertEqual(executor.pending(), 0)
+
+    def test_process_adapter(self):
+        """Functions run through the adapter must return their results."""
+
+        with ProcessAdapter(2) as adapter, \
+                WorkStealingExecutor(2) as executor:
+            tasks = [executor.spawn(adapter, _square, value)
+                     for value in range(10)]
+            self.assertEqual([task.join() for task in tasks],
+                             [value * value for value in range(10)])